@@ -0,0 +1,99 @@
+/*
+ * Copyright (c) 2019, NVIDIA CORPORATION.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+#include "profiler.hpp"
+
+#include <pthread.h>
+
+#include <atomic>
+#include <chrono>
+#include <mutex>
+
+#include "../../src_prims/utils.h"
+
+namespace ML {
+
+namespace {
+
+std::atomic<int> profiler_depth(0);
+std::mutex timings_mutex;
+std::vector<StageTiming> timings;
+
+}  // namespace
+
+void profilerStart() { ++profiler_depth; }
+
+void profilerStop() {
+  if (--profiler_depth < 0) profiler_depth = 0;
+}
+
+bool profilerEnabled() { return profiler_depth > 0; }
+
+double profilerNow() {
+  return std::chrono::duration_cast<std::chrono::nanoseconds>(
+           std::chrono::steady_clock::now().time_since_epoch())
+           .count() *
+         1.0e-3;
+}
+
+std::vector<StageTiming> profilerFlush() {
+  std::lock_guard<std::mutex> guard(timings_mutex);
+  std::vector<StageTiming> flushed;
+  flushed.swap(timings);
+  return flushed;
+}
+
+ScopedStage::ScopedStage(const char* algorithm, const char* stage,
+                         cudaStream_t stream)
+  : _enabled(profilerEnabled()),
+    _algorithm(algorithm),
+    _stage(stage),
+    _stream(stream),
+    _start_us(0.0) {
+  if (!_enabled) return;
+  CUDA_CHECK(cudaEventCreate(&_start_event));
+  CUDA_CHECK(cudaEventCreate(&_stop_event));
+  _start_us = profilerNow();
+  CUDA_CHECK(cudaEventRecord(_start_event, _stream));
+}
+
+ScopedStage::~ScopedStage() {
+  if (!_enabled) return;
+  // No CUDA_CHECK in a destructor: a failed stage is not recorded, the error
+  // surfaces on the next checked call of the algorithm.
+  float device_ms = 0.f;
+  bool ok = cudaEventRecord(_stop_event, _stream) == cudaSuccess &&
+            cudaEventSynchronize(_stop_event) == cudaSuccess &&
+            cudaEventElapsedTime(&device_ms, _start_event, _stop_event) ==
+              cudaSuccess;
+  double end_us = profilerNow();
+  cudaEventDestroy(_start_event);
+  cudaEventDestroy(_stop_event);
+  if (!ok) return;
+
+  StageTiming timing;
+  timing.algorithm = _algorithm;
+  timing.stage = _stage;
+  timing.start_us = _start_us;
+  timing.wall_ms = (end_us - _start_us) * 1.0e-3;
+  timing.device_ms = device_ms;
+  timing.thread_id = (unsigned long long)pthread_self();
+
+  std::lock_guard<std::mutex> guard(timings_mutex);
+  timings.push_back(timing);
+}
+
+}  // end namespace ML
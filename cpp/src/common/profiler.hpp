@@ -0,0 +1,90 @@
+/*
+ * Copyright (c) 2019, NVIDIA CORPORATION.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+#pragma once
+
+#include <cuda_runtime.h>
+
+#include <string>
+#include <vector>
+
+namespace ML {
+
+/**
+ * @brief Timing of one stage of an algorithm, recorded while profiling is
+ *        enabled.
+ */
+struct StageTiming {
+  /** name of the algorithm, like "UMAP" */
+  std::string algorithm;
+  /** name of the stage, like "knn_graph" */
+  std::string stage;
+  /** start of the stage in microseconds, on the clock of profilerNow() */
+  double start_us;
+  /** host time in milliseconds until the device work of the stage is done */
+  double wall_ms;
+  /** device time in milliseconds between the start and the end of the stage
+   *  on its stream */
+  float device_ms;
+  /** pthread id of the thread that ran the stage */
+  unsigned long long thread_id;
+};
+
+/**
+ * @brief Enables the recording of stage timings. Calls can be nested, the
+ *        recording stops after the matching number of profilerStop() calls.
+ */
+void profilerStart();
+
+/** @brief Undoes one profilerStart() call. */
+void profilerStop();
+
+/** @brief Whether stage timings are currently recorded. */
+bool profilerEnabled();
+
+/** @brief Current time in microseconds, on the clock of the timings. */
+double profilerNow();
+
+/** @brief Returns the timings recorded so far and clears them. */
+std::vector<StageTiming> profilerFlush();
+
+/**
+ * @brief Times the enclosing scope as a stage of an algorithm.
+ *
+ * Does nothing unless profiling is enabled. Otherwise events are recorded on
+ * the stream when the scope is entered and left, and the destructor waits
+ * for the latter, so that the wall time covers the device work of the stage.
+ * This synchronization only happens while profiling.
+ */
+class ScopedStage {
+ public:
+  ScopedStage(const char* algorithm, const char* stage, cudaStream_t stream);
+  ~ScopedStage();
+
+  ScopedStage(const ScopedStage&) = delete;
+  ScopedStage& operator=(const ScopedStage&) = delete;
+
+ private:
+  bool _enabled;
+  const char* _algorithm;
+  const char* _stage;
+  cudaStream_t _stream;
+  cudaEvent_t _start_event;
+  cudaEvent_t _stop_event;
+  double _start_us;
+};
+
+}  // end namespace ML
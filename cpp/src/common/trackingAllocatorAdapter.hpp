@@ -0,0 +1,146 @@
+/*
+ * Copyright (c) 2019, NVIDIA CORPORATION.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+#pragma once
+
+#include <algorithm>
+#include <memory>
+#include <mutex>
+#include <unordered_map>
+
+#include "../cuML.hpp"
+
+namespace ML {
+
+/**
+ * @brief Device memory consumption recorded by trackingAllocatorAdapter.
+ */
+struct deviceMemoryStats {
+  /** bytes currently allocated */
+  std::size_t current_bytes;
+  /** highest value of current_bytes */
+  std::size_t peak_bytes;
+  /** bytes allocated in total */
+  std::size_t total_bytes;
+  /** number of successful allocations */
+  std::size_t n_allocations;
+  /** number of deallocations */
+  std::size_t n_deallocations;
+  /** number of allocations that threw */
+  std::size_t n_failed;
+};
+
+/**
+ * @brief Implementation of ML::deviceAllocator that forwards to another
+ *        allocator and accounts for the device memory allocated through it.
+ *
+ * Besides the lifetime statistics, scopes can be opened to measure the peak
+ * consumption of a section of work, e.g. a single fit, without resetting the
+ * lifetime peak. All methods are thread safe.
+ */
+class trackingAllocatorAdapter : public ML::deviceAllocator {
+ public:
+  explicit trackingAllocatorAdapter(std::shared_ptr<deviceAllocator> upstream)
+    : _upstream(upstream), _stats(), _next_scope(0) {}
+
+  /**
+     * @brief allocates n bytes with the upstream allocator
+     *
+     * @param[in] n         size of the allocation in bytes
+     * @param[in] stream    the stream to use for the asynchronous allocations
+     * @returns             a pointer to n byte of device memory
+     */
+  virtual void* allocate(std::size_t n, cudaStream_t stream) {
+    void* ptr = 0;
+    try {
+      ptr = _upstream->allocate(n, stream);
+    } catch (...) {
+      std::lock_guard<std::mutex> guard(_mutex);
+      ++_stats.n_failed;
+      throw;
+    }
+    std::lock_guard<std::mutex> guard(_mutex);
+    _stats.current_bytes += n;
+    _stats.total_bytes += n;
+    ++_stats.n_allocations;
+    _stats.peak_bytes = std::max(_stats.peak_bytes, _stats.current_bytes);
+    for (auto& scope : _scope_peaks) {
+      scope.second = std::max(scope.second, _stats.current_bytes);
+    }
+    return ptr;
+  }
+
+  /**
+     * @brief releases an allocation of n bytes with the upstream allocator
+     *
+     * @param[in] p         pointer to n bytes of memory to be deallocated
+     * @param[in] n         size of the allocation to release in bytes
+     * @param[in] stream    the stream to use for the asynchronous free
+     */
+  virtual void deallocate(void* p, std::size_t n, cudaStream_t stream) {
+    _upstream->deallocate(p, n, stream);
+    std::lock_guard<std::mutex> guard(_mutex);
+    _stats.current_bytes -= std::min(n, _stats.current_bytes);
+    ++_stats.n_deallocations;
+  }
+
+  /** @brief returns a snapshot of the statistics */
+  deviceMemoryStats getStats() const {
+    std::lock_guard<std::mutex> guard(_mutex);
+    return _stats;
+  }
+
+  /** @brief sets the lifetime peak to the current consumption */
+  void resetPeak() {
+    std::lock_guard<std::mutex> guard(_mutex);
+    _stats.peak_bytes = _stats.current_bytes;
+  }
+
+  /**
+     * @brief opens a scope whose peak starts at the current consumption
+     * @returns the id of the scope, to be passed to endScope
+     */
+  int startScope() {
+    std::lock_guard<std::mutex> guard(_mutex);
+    int id = _next_scope++;
+    _scope_peaks[id] = _stats.current_bytes;
+    return id;
+  }
+
+  /**
+     * @brief closes a scope opened with startScope
+     * @returns the highest consumption reached while the scope was open
+     */
+  std::size_t endScope(int id) {
+    std::lock_guard<std::mutex> guard(_mutex);
+    auto it = _scope_peaks.find(id);
+    if (it == _scope_peaks.end()) return 0;
+    std::size_t peak = it->second;
+    _scope_peaks.erase(it);
+    return peak;
+  }
+
+  virtual ~trackingAllocatorAdapter() {}
+
+ private:
+  std::shared_ptr<deviceAllocator> _upstream;
+  mutable std::mutex _mutex;
+  deviceMemoryStats _stats;
+  std::unordered_map<int, std::size_t> _scope_peaks;
+  int _next_scope;
+};
+
+}  // end namespace ML
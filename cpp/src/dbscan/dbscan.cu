@@ -43,4 +43,16 @@ void dbscanFit(const cumlHandle &handle, double *input, int n_rows, int n_cols,
                                  handle.getStream(), verbose);
 }
 
+size_t dbscanWorkspaceSize_f32(const cumlHandle &handle, int n_rows,
+                               int n_cols, size_t max_bytes_per_batch) {
+  return dbscanWorkspaceSizeImpl<float, int64_t>(
+    handle.getImpl(), n_rows, n_cols, max_bytes_per_batch, handle.getStream());
+}
+
+size_t dbscanWorkspaceSize_f64(const cumlHandle &handle, int n_rows,
+                               int n_cols, size_t max_bytes_per_batch) {
+  return dbscanWorkspaceSizeImpl<double, int64_t>(
+    handle.getImpl(), n_rows, n_cols, max_bytes_per_batch, handle.getStream());
+}
+
 };  // end namespace ML
@@ -42,6 +42,31 @@ Index_ computeBatchCount(Index_ n_rows, size_t max_bytes_per_batch) {
   return n_batches;
 }
 
+/**
+ * @brief Device memory allocated through the handle by dbscanFitImpl: the
+ *        workspace sized by Dbscan::run, and the adjacency graph of a batch in
+ *        the worst case, where every point of the batch neighbors every point.
+ */
+template <typename T, typename Index_ = int>
+size_t dbscanWorkspaceSizeImpl(const ML::cumlHandle_impl &handle,
+                               Index_ n_rows, Index_ n_cols,
+                               size_t max_bytes_per_batch,
+                               cudaStream_t stream) {
+  int algoVd = 1;
+  int algoAdj = 1;
+  int algoCcl = 2;
+
+  if (max_bytes_per_batch <= 0) max_bytes_per_batch = DEFAULT_MAX_MEM_BYTES;
+
+  Index_ n_batches = computeBatchCount<T, Index_>(n_rows, max_bytes_per_batch);
+  size_t batchSize = ceildiv<size_t>(n_rows, n_batches);
+
+  size_t workspaceSize =
+    Dbscan::run(handle, (T *)NULL, n_rows, n_cols, (T)0, 0, (int *)NULL,
+                algoVd, algoAdj, algoCcl, NULL, n_batches, stream);
+  return workspaceSize + batchSize * n_rows * sizeof(int);
+}
+
 template <typename T, typename Index_ = int>
 void dbscanFitImpl(const ML::cumlHandle_impl &handle, T *input, Index_ n_rows,
                    Index_ n_cols, T eps, int min_pts, int *labels,
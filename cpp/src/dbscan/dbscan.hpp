@@ -43,4 +43,20 @@ void dbscanFit(const cumlHandle &handle, double *input, int n_rows, int n_cols,
                bool verbose = false);
 /** @} */
 
+/**
+ * @brief Upper bound of the device memory that dbscanFit allocates through
+ *        the allocator of the handle for the given input shape and batch
+ *        budget, not counting the input and labels arrays.
+ * @param[in] handle cuml handle to use across the algorithm
+ * @param[in] n_rows number of samples in the input feature matrix
+ * @param[in] n_cols number of features in the input feature matrix
+ * @param[in] max_bytes_per_batch as in dbscanFit, 0 for its default
+ * @{
+ */
+size_t dbscanWorkspaceSize_f32(const cumlHandle &handle, int n_rows,
+                               int n_cols, size_t max_bytes_per_batch);
+size_t dbscanWorkspaceSize_f64(const cumlHandle &handle, int n_rows,
+                               int n_cols, size_t max_bytes_per_batch);
+/** @} */
+
 }  // namespace ML
@@ -19,6 +19,7 @@
 #include <cuda_utils.h>
 #include <common/cumlHandle.hpp>
 #include <common/device_buffer.hpp>
+#include <common/profiler.hpp>
 #include "adjgraph/runner.h"
 #include "vertexdeg/runner.h"
 
@@ -116,8 +117,11 @@ size_t run(const ML::cumlHandle_impl& handle, Type_f* x, Index_ N, Index_ D,
     int nPoints = min(N - startVertexId, batchSize);
 
     if (nPoints <= 0) continue;
-    VertexDeg::run<Type_f, Index_>(handle, adj, vd, x, eps, N, D, algoVd,
-                                   startVertexId, nPoints, stream);
+    {
+      ML::ScopedStage scoped_stage("DBSCAN", "vertexdeg", stream);
+      VertexDeg::run<Type_f, Index_>(handle, adj, vd, x, eps, N, D, algoVd,
+                                     startVertexId, nPoints, stream);
+    }
 
     MLCommon::updateHost(&curradjlen, vd + nPoints, 1, stream);
     CUDA_CHECK(cudaStreamSynchronize(stream));
@@ -128,15 +132,23 @@ size_t run(const ML::cumlHandle_impl& handle, Type_f* x, Index_ N, Index_ D,
       adj_graph.resize(adjlen, stream);
     }
 
-    AdjGraph::run<Type, Index_>(handle, adj, vd, adj_graph.data(), adjlen,
-                                ex_scan, N, minPts, core_pts, algoAdj, nPoints,
-                                stream);
+    {
+      ML::ScopedStage scoped_stage("DBSCAN", "adjgraph", stream);
+      AdjGraph::run<Type, Index_>(handle, adj, vd, adj_graph.data(), adjlen,
+                                  ex_scan, N, minPts, core_pts, algoAdj,
+                                  nPoints, stream);
+    }
 
-    MLCommon::Sparse::weak_cc_batched<Type, TPB>(
-      labels, ex_scan, adj_graph.data(), adjlen, N, startVertexId, batchSize,
-      &state, stream,
-      [core_pts] __device__(Type tid) { return core_pts[tid]; });
+    {
+      ML::ScopedStage scoped_stage("DBSCAN", "labeling", stream);
+      MLCommon::Sparse::weak_cc_batched<Type, TPB>(
+        labels, ex_scan, adj_graph.data(), adjlen, N, startVertexId,
+        batchSize, &state, stream,
+        [core_pts] __device__(Type tid) { return core_pts[tid]; });
+    }
   }
+
+  ML::ScopedStage scoped_stage("DBSCAN", "relabel", stream);
   if (algoCcl == 2) final_relabel(labels, N, stream);
 
   Type MAX_LABEL = std::numeric_limits<Type>::max();
@@ -32,6 +32,7 @@
 #include <map>
 #include <climits>
 #include <common/cumlHandle.hpp>
+#include <common/profiler.hpp>
 
 namespace ML {
 namespace DecisionTree {
@@ -211,6 +212,7 @@ void DecisionTreeClassifier<T>::plant(const cumlHandle_impl& handle, T *data, co
 	for (int i = 0; i < MAXSTREAMS; i++) {
 		tempmem[i] = std::make_shared<TemporaryMemory<T>>(handle, n_sampled_rows, ncols, MAXSTREAMS, unique_labels, n_bins, split_algo);
 		if (split_algo == SPLIT_ALGO::GLOBAL_QUANTILE) {
+			ML::ScopedStage scoped_stage("DecisionTree", "quantile", tempmem[i]->stream);
 			preprocess_quantile(data, rowids, n_sampled_rows, ncols, dinfo.NLocalrows, n_bins, tempmem[i]);
 		}
 	}
@@ -243,6 +245,7 @@ TreeNode<T>* DecisionTreeClassifier<T>::grow_tree(T *data, const float colper, i
 	condition = condition || (n_sampled_rows < min_rows_per_node); // Do not split a node with less than min_rows_per_node samples
 
 	if (!condition)  {
+		ML::ScopedStage scoped_stage("DecisionTree", "gini", tempmem[0]->stream);
 		find_best_fruit_all(data, labels, colper, ques, gain, rowids, n_sampled_rows, &split_info[0], depth);  //ques and gain are output here
 		condition = condition || (gain == 0.0f);
 	}
@@ -262,7 +265,10 @@ TreeNode<T>* DecisionTreeClassifier<T>::grow_tree(T *data, const float colper, i
 			depth_counter = depth;
 	} else {
 		int nrowsleft, nrowsright;
-		split_branch(data, ques, n_sampled_rows, nrowsleft, nrowsright, rowids); // populates ques.value
+		{
+			ML::ScopedStage scoped_stage("DecisionTree", "split", tempmem[0]->stream);
+			split_branch(data, ques, n_sampled_rows, nrowsleft, nrowsright, rowids); // populates ques.value
+		}
 		node_ques.update(ques);
 		node->question = node_ques;
 		node->left = grow_tree(data, colper, labels, depth+1, &rowids[0], nrowsleft, split_info[1]);
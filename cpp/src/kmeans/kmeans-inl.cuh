@@ -509,6 +509,301 @@ void kmeansPlusPlus(const cumlHandle_impl &handle, int verbose, int n_clusters,
   }
 }
 
+// Computes newCentroids[i], the mean of the samples of 'X' assigned to cluster-i by 'labels', and sampleCountInCluster[i], their number. Clusters without samples keep their current centroid centroids[i].
+template <typename DataT, typename IndexT, typename LabelsIteratorT>
+void updateCentroids(const cumlHandle_impl &handle,
+                     Tensor<DataT, 2, IndexT> &X,
+                     Tensor<DataT, 2, IndexT> &centroids,
+                     LabelsIteratorT labels,
+                     Tensor<DataT, 2, IndexT> &newCentroids,
+                     Tensor<int, 1, IndexT> &sampleCountInCluster,
+                     MLCommon::device_buffer<char> &workspace,
+                     cudaStream_t stream) {
+  auto n_samples = X.getSize(0);
+  auto n_clusters = centroids.getSize(0);
+
+  workspace.resize(n_samples, stream);
+
+  // Calculates sum of all the samples assigned to cluster-i and store the result in newCentroids[i]
+  LinAlg::reduce_rows_by_key(X.data(), X.getSize(1), labels, workspace.data(),
+                             X.getSize(0), X.getSize(1), n_clusters,
+                             newCentroids.data(), stream);
+
+  // count # of samples in each cluster
+  kmeans::detail::countLabels(handle, labels, sampleCountInCluster.data(),
+                              n_samples, n_clusters, workspace, stream);
+
+  // Computes newCentroids[i] = newCentroids[i]/sampleCountInCluster[i] where
+  //   newCentroids[n_samples x n_features] - 2D array, newCentroids[i] has sum of all the samples assigned to cluster-i
+  //   sampleCountInCluster[n_clusters] - 1D array, sampleCountInCluster[i] contains # of samples in cluster-i.
+  // Note - when sampleCountInCluster[i] is 0, newCentroid[i] is reset to 0
+
+  // transforms int values in sampleCountInCluster to its inverse and more importantly to DataT because matrixVectorOp supports only when matrix and vector are of same type
+  workspace.resize(sampleCountInCluster.numElements() * sizeof(DataT),
+                   stream);
+  auto sampleCountInClusterInverse = std::move(
+    Tensor<DataT, 1, IndexT>((DataT *)workspace.data(), {n_clusters}));
+
+  ML::thrustAllocatorAdapter alloc(handle.getDeviceAllocator(), stream);
+  auto execution_policy = thrust::cuda::par(alloc).on(stream);
+  thrust::transform(
+    execution_policy, sampleCountInCluster.begin(),
+    sampleCountInCluster.end(), sampleCountInClusterInverse.begin(),
+    [=] __device__(int count) {
+      if (count == 0)
+        return static_cast<DataT>(0);
+      else
+        return static_cast<DataT>(1.0) / static_cast<DataT>(count);
+    });
+
+  LinAlg::matrixVectorOp(
+    newCentroids.data(), newCentroids.data(),
+    sampleCountInClusterInverse.data(), newCentroids.getSize(1),
+    newCentroids.getSize(0), true, false,
+    [=] __device__(DataT mat, DataT vec) { return mat * vec; }, stream);
+
+  // copy the centroids[i] to newCentroids[i] when sampleCountInCluster[i] is 0
+  cub::ArgIndexInputIterator<int *> itr_sc(sampleCountInCluster.data());
+  Matrix::gather_if(
+    centroids.data(), centroids.getSize(1), centroids.getSize(0), itr_sc,
+    itr_sc, sampleCountInCluster.numElements(), newCentroids.data(),
+    [=] __device__(cub::KeyValuePair<ptrdiff_t, int> map) {  // predicate
+      // copy when the # of samples in the cluster is 0
+      if (map.value == 0)
+        return true;
+      else
+        return false;
+    },
+    [=] __device__(cub::KeyValuePair<ptrdiff_t, int> map) {  // map
+      return map.key;
+    },
+    stream);
+}
+
+// Euclidean distance between the rows 'a' and 'b' of n_features values
+template <typename DataT>
+__device__ __forceinline__ DataT rowDistance(const DataT *a, const DataT *b,
+                                             int n_features) {
+  DataT sum = 0;
+  for (int f = 0; f < n_features; ++f) {
+    DataT diff = a[f] - b[f];
+    sum += diff * diff;
+  }
+  return sqrt(sum);
+}
+
+// For the samples X[indices[i]], i in [0, n_indices) (the first n_indices samples when 'indices' is null), stores the index of the closest centroid in 'labels', and the Euclidean distances to the closest and to the second closest centroids in 'upper' and 'lower'.
+// 'gathered' and 'pairwiseDistance' hold a batch of samples and their distances to the centroids.
+template <typename DataT, typename IndexT>
+void minTwoClusterDistances(
+  const cumlHandle_impl &handle, Tensor<DataT, 2, IndexT> &X,
+  const IndexT *indices, IndexT n_indices, Tensor<DataT, 2, IndexT> &centroids,
+  Tensor<DataT, 2, IndexT> &gathered,
+  Tensor<DataT, 2, IndexT> &pairwiseDistance, IndexT *labels, DataT *upper,
+  DataT *lower, MLCommon::device_buffer<char> &workspace,
+  cudaStream_t stream) {
+  auto n_samples = X.getSize(0);
+  auto n_features = X.getSize(1);
+  auto n_clusters = centroids.getSize(0);
+  auto dataBatchSize = pairwiseDistance.getSize(0);
+  const DataT maxDistance = std::numeric_limits<DataT>::max();
+
+  ML::thrustAllocatorAdapter alloc(handle.getDeviceAllocator(), stream);
+  auto execution_policy = thrust::cuda::par(alloc).on(stream);
+
+  for (IndexT dIdx = 0; dIdx < n_indices; dIdx += dataBatchSize) {
+    // # of samples for the current batch
+    IndexT ns = std::min(dataBatchSize, n_indices - dIdx);
+
+    DataT *batchPtr = X.data() + (size_t)dIdx * n_features;
+    if (indices != nullptr) {
+      Matrix::gather(X.data(), n_features, n_samples, indices + dIdx, ns,
+                     gathered.data(), stream);
+      batchPtr = gathered.data();
+    }
+    Tensor<DataT, 2, IndexT> batch(batchPtr, {ns, n_features});
+    Tensor<DataT, 2, IndexT> batchDistance(pairwiseDistance.data(),
+                                           {ns, n_clusters});
+
+    // squared distances, the square root is taken of the two smallest only
+    kmeans::detail::pairwiseDistance(handle, batch, centroids, batchDistance,
+                                     workspace,
+                                     Distance::DistanceType::EucExpandedL2,
+                                     stream);
+
+    const DataT *distances = batchDistance.data();
+    const IndexT *batchIndices =
+      indices == nullptr ? nullptr : indices + dIdx;
+    thrust::for_each_n(
+      execution_policy, thrust::make_counting_iterator<IndexT>(0), ns,
+      [=] __device__(IndexT r) {
+        const DataT *row = distances + (size_t)r * n_clusters;
+        IndexT closest = 0;
+        DataT first = maxDistance;
+        DataT second = maxDistance;
+        for (IndexT j = 0; j < n_clusters; ++j) {
+          DataT value = row[j];
+          if (value < first) {
+            second = first;
+            first = value;
+            closest = j;
+          } else if (value < second) {
+            second = value;
+          }
+        }
+        IndexT i = batchIndices == nullptr ? dIdx + r : batchIndices[r];
+        labels[i] = closest;
+        upper[i] = first > 0 ? sqrt(first) : 0;
+        lower[i] = second > 0 ? sqrt(second) : 0;
+      });
+  }
+}
+
+// Computes centerDistance[i][j], the Euclidean distance between the centroids i and j, and halfMinDistance[i], half the distance of the centroid i to the closest other centroid.
+template <typename DataT, typename IndexT>
+void centroidDistances(const cumlHandle_impl &handle,
+                       Tensor<DataT, 2, IndexT> &centroids,
+                       Tensor<DataT, 2, IndexT> &centerDistance,
+                       Tensor<DataT, 1, IndexT> &halfMinDistance,
+                       MLCommon::device_buffer<char> &workspace,
+                       cudaStream_t stream) {
+  auto n_clusters = centroids.getSize(0);
+  const DataT maxDistance = std::numeric_limits<DataT>::max();
+
+  kmeans::detail::pairwiseDistance(handle, centroids, centroids,
+                                   centerDistance, workspace,
+                                   Distance::DistanceType::EucExpandedL2,
+                                   stream);
+
+  DataT *distances = centerDistance.data();
+  DataT *halfMin = halfMinDistance.data();
+  ML::thrustAllocatorAdapter alloc(handle.getDeviceAllocator(), stream);
+  auto execution_policy = thrust::cuda::par(alloc).on(stream);
+  thrust::for_each_n(execution_policy,
+                     thrust::make_counting_iterator<IndexT>(0), n_clusters,
+                     [=] __device__(IndexT i) {
+                       DataT *row = distances + (size_t)i * n_clusters;
+                       DataT closest = maxDistance;
+                       for (IndexT j = 0; j < n_clusters; ++j) {
+                         DataT value = row[j] > 0 ? sqrt(row[j]) : 0;
+                         row[j] = value;
+                         if (j != i && value < closest) closest = value;
+                       }
+                       halfMin[i] = closest / 2;
+                     });
+}
+
+// Computes shifts[i], the Euclidean distance between centroids[i] and newCentroids[i], and copies them to 'hostShifts'.
+template <typename DataT, typename IndexT>
+void centroidShifts(const cumlHandle_impl &handle,
+                    Tensor<DataT, 2, IndexT> &centroids,
+                    Tensor<DataT, 2, IndexT> &newCentroids,
+                    Tensor<DataT, 1, IndexT> &shifts,
+                    std::vector<DataT> &hostShifts, cudaStream_t stream) {
+  auto n_clusters = centroids.getSize(0);
+  auto n_features = centroids.getSize(1);
+
+  const DataT *oldPtr = centroids.data();
+  const DataT *newPtr = newCentroids.data();
+  DataT *shiftsPtr = shifts.data();
+  ML::thrustAllocatorAdapter alloc(handle.getDeviceAllocator(), stream);
+  auto execution_policy = thrust::cuda::par(alloc).on(stream);
+  thrust::for_each_n(execution_policy,
+                     thrust::make_counting_iterator<IndexT>(0), n_clusters,
+                     [=] __device__(IndexT i) {
+                       shiftsPtr[i] =
+                         rowDistance(oldPtr + (size_t)i * n_features,
+                                     newPtr + (size_t)i * n_features,
+                                     n_features);
+                     });
+
+  hostShifts.resize(n_clusters);
+  MLCommon::copy(hostShifts.data(), shiftsPtr, n_clusters, stream);
+  CUDA_CHECK(cudaStreamSynchronize(stream));
+}
+
+// Computes distances[i][j], the distance between the sample X[i] and centroids[j] for the metric, into a row-major [n_samples x n_clusters] matrix.
+// For the (squared) L2 metrics, ||x||^2 + ||c||^2 - 2 <x, c> is computed with a GEMM from 'centroidNorms', the squared L2 norms of the centroids computed once for all the batches of a call; 'sampleNorms' receives the norms of the samples.
+template <typename DataT, typename IndexT>
+void batchDistances(const cumlHandle_impl &handle,
+                    Tensor<DataT, 2, IndexT> &X,
+                    Tensor<DataT, 2, IndexT> &centroids,
+                    const DataT *centroidNorms, DataT *sampleNorms,
+                    DataT *distances, MLCommon::device_buffer<char> &workspace,
+                    Distance::DistanceType metric, cudaStream_t stream) {
+  auto n_samples = X.getSize(0);
+  auto n_features = X.getSize(1);
+  auto n_clusters = centroids.getSize(0);
+
+  if (metric != Distance::DistanceType::EucExpandedL2 &&
+      metric != Distance::DistanceType::EucExpandedL2Sqrt) {
+    Tensor<DataT, 2, IndexT> distanceView(distances, {n_samples, n_clusters});
+    kmeans::detail::pairwiseDistance(handle, X, centroids, distanceView,
+                                     workspace, metric, stream);
+    return;
+  }
+
+  LinAlg::rowNorm(sampleNorms, X.data(), n_features, n_samples,
+                  LinAlg::L2Norm, true, stream);
+
+  // distances[i][j] = -2 <X[i], centroids[j]>: the row-major [n_samples x n_clusters] matrix is the column-major [n_clusters x n_samples] product of the (column-major) transposed centroids and samples
+  LinAlg::gemm(centroids.data(), n_features, n_clusters, X.data(), distances,
+               n_clusters, n_samples, CUBLAS_OP_T, CUBLAS_OP_N, (DataT)-2,
+               (DataT)0, handle.getCublasHandle(), stream);
+
+  bool takeSqrt = metric == Distance::DistanceType::EucExpandedL2Sqrt;
+  const DataT *sampleNormsPtr = sampleNorms;
+  ML::thrustAllocatorAdapter alloc(handle.getDeviceAllocator(), stream);
+  auto execution_policy = thrust::cuda::par(alloc).on(stream);
+  thrust::for_each_n(
+    execution_policy, thrust::make_counting_iterator<size_t>(0),
+    (size_t)n_samples * n_clusters, [=] __device__(size_t idx) {
+      IndexT i = idx / n_clusters;
+      IndexT j = idx % n_clusters;
+      DataT distance = sampleNormsPtr[i] + centroidNorms[j] + distances[idx];
+      // rounding errors may make the distance of a sample to itself negative
+      distance = distance > 0 ? distance : 0;
+      distances[idx] = takeSqrt ? sqrt(distance) : distance;
+    });
+}
+
+// Stores in the rows of 'nearestDistances' and 'nearestIndices' the n_nearest smallest distances of each row of the row-major [n_samples x n_clusters] matrix 'distances' in increasing order, and their columns. Ties keep the lowest column first.
+template <typename DataT, typename IndexT>
+void selectNearest(const cumlHandle_impl &handle, const DataT *distances,
+                   IndexT n_samples, IndexT n_clusters, IndexT n_nearest,
+                   DataT *nearestDistances, IndexT *nearestIndices,
+                   cudaStream_t stream) {
+  ML::thrustAllocatorAdapter alloc(handle.getDeviceAllocator(), stream);
+  auto execution_policy = thrust::cuda::par(alloc).on(stream);
+  thrust::for_each_n(
+    execution_policy, thrust::make_counting_iterator<IndexT>(0), n_samples,
+    [=] __device__(IndexT i) {
+      const DataT *row = distances + (size_t)i * n_clusters;
+      DataT *nearest = nearestDistances + (size_t)i * n_nearest;
+      IndexT *indices = nearestIndices + (size_t)i * n_nearest;
+      IndexT n_found = 0;
+      for (IndexT j = 0; j < n_clusters; ++j) {
+        DataT distance = row[j];
+        IndexT pos;
+        if (n_found < n_nearest) {
+          pos = n_found++;
+        } else if (distance < nearest[n_nearest - 1]) {
+          pos = n_nearest - 1;
+        } else {
+          continue;
+        }
+        // insertion in the sorted row
+        while (pos > 0 && nearest[pos - 1] > distance) {
+          nearest[pos] = nearest[pos - 1];
+          indices[pos] = indices[pos - 1];
+          --pos;
+        }
+        nearest[pos] = distance;
+        indices[pos] = j;
+      }
+    });
+}
+
 }  // end namespace detail
 }  // end namespace kmeans
 
@@ -525,12 +820,14 @@ template <typename DataT, typename IndexT>
 KMeans<DataT, IndexT>::KMeans(const ML::cumlHandle_impl &handle, int k,
                               MLCommon::Distance::DistanceType metric,
                               kmeans::InitMethod init, int max_iterations,
-                              double tolerance, int seed, int verbose)
+                              double tolerance, int seed, int verbose,
+                              kmeans::Algorithm algorithm)
   : _handle(handle),
     n_clusters(k),
     tol(tolerance),
     max_iter(max_iterations),
     _init(init),
+    _algorithm(algorithm),
     _metric(metric),
     _verbose(verbose),
     _workspace(handle.getDeviceAllocator(), handle.getStream()),
@@ -547,6 +844,7 @@ KMeans<DataT, IndexT>::KMeans(const ML::cumlHandle_impl &handle, int k,
   inertia = std::numeric_limits<DataT>::infinity();
   ;
   n_iter = 0;
+  skippedDistanceFraction = 0.0;
   _n_features = 0;
 }
 
@@ -572,6 +870,26 @@ DataT *KMeans<DataT, IndexT>::centroids() {
   return _centroidsRawData.data();
 }
 
+template <typename DataT, typename IndexT>
+IndexT *KMeans<DataT, IndexT>::labels() {
+  return _labelsRawData.data();
+}
+
+template <typename DataT, typename IndexT>
+double KMeans<DataT, IndexT>::getInertia() {
+  return inertia;
+}
+
+template <typename DataT, typename IndexT>
+int KMeans<DataT, IndexT>::getNumIter() {
+  return n_iter;
+}
+
+template <typename DataT, typename IndexT>
+double KMeans<DataT, IndexT>::getSkippedDistanceFraction() {
+  return skippedDistanceFraction;
+}
+
 // Selects 'n_clusters' samples randomly from X
 template <typename DataT, typename IndexT>
 void KMeans<DataT, IndexT>::initRandom(Tensor<DataT, 2, IndexT> &X) {
@@ -744,7 +1062,24 @@ void KMeans<DataT, IndexT>::initKMeansPlusPlus(Tensor<DataT, 2, IndexT> &X) {
 
 template <typename DataT, typename IndexT>
 __host__ void KMeans<DataT, IndexT>::fit(Tensor<DataT, 2, IndexT> &X) {
+  if (_algorithm != kmeans::Algorithm::Lloyd) {
+    ASSERT(_metric == Distance::DistanceType::EucExpandedL2 ||
+             _metric == Distance::DistanceType::EucExpandedL2Sqrt,
+           "the Hamerly and Elkan algorithms require the (squared) L2 "
+           "metric");
+    ASSERT(!options.inertia_check,
+           "the Hamerly and Elkan algorithms do not compute the inertia at "
+           "each iteration");
+    if (_algorithm == kmeans::Algorithm::Hamerly) {
+      fitHamerly(X);
+    } else {
+      fitElkan(X);
+    }
+    return;
+  }
+
   cudaStream_t stream = _handle.getStream();
+  skippedDistanceFraction = 0.0;
   auto n_samples = X.getSize(0);
   auto n_features = X.getSize(1);
 
@@ -787,62 +1122,8 @@ __host__ void KMeans<DataT, IndexT>::fit(Tensor<DataT, 2, IndexT> &X) {
                                 cub::KeyValuePair<IndexT, DataT> *>
       itr(minClusterAndDistance.data(), conversion_op);
 
-    _workspace.resize(n_samples, stream);
-
-    // Calculates sum of all the samples assigned to cluster-i and store the result in newCentroids[i]
-    LinAlg::reduce_rows_by_key(X.data(), X.getSize(1), itr, _workspace.data(),
-                               X.getSize(0), X.getSize(1), n_clusters,
-                               newCentroids.data(), stream);
-
-    // count # of samples in each cluster
-    kmeans::detail::countLabels(_handle, itr, sampleCountInCluster.data(),
-                                n_samples, n_clusters, _workspace, stream);
-
-    // Computes newCentroids[i] = newCentroids[i]/sampleCountInCluster[i] where
-    //   newCentroids[n_samples x n_features] - 2D array, newCentroids[i] has sum of all the samples assigned to cluster-i
-    //   sampleCountInCluster[n_clusters] - 1D array, sampleCountInCluster[i] contains # of samples in cluster-i.
-    // Note - when sampleCountInCluster[i] is 0, newCentroid[i] is reset to 0
-
-    // transforms int values in sampleCountInCluster to its inverse and more importantly to DataT because matrixVectorOp supports only when matrix and vector are of same type
-    _workspace.resize(sampleCountInCluster.numElements() * sizeof(DataT),
-                      stream);
-    auto sampleCountInClusterInverse = std::move(
-      Tensor<DataT, 1, IndexT>((DataT *)_workspace.data(), {n_clusters}));
-
-    ML::thrustAllocatorAdapter alloc(_handle.getDeviceAllocator(), stream);
-    auto execution_policy = thrust::cuda::par(alloc).on(stream);
-    thrust::transform(
-      execution_policy, sampleCountInCluster.begin(),
-      sampleCountInCluster.end(), sampleCountInClusterInverse.begin(),
-      [=] __device__(int count) {
-        if (count == 0)
-          return static_cast<DataT>(0);
-        else
-          return static_cast<DataT>(1.0) / static_cast<DataT>(count);
-      });
-
-    LinAlg::matrixVectorOp(
-      newCentroids.data(), newCentroids.data(),
-      sampleCountInClusterInverse.data(), newCentroids.getSize(1),
-      newCentroids.getSize(0), true, false,
-      [=] __device__(DataT mat, DataT vec) { return mat * vec; }, stream);
-
-    // copy the centroids[i] to newCentroids[i] when sampleCountInCluster[i] is 0
-    cub::ArgIndexInputIterator<int *> itr_sc(sampleCountInCluster.data());
-    Matrix::gather_if(
-      centroids.data(), centroids.getSize(1), centroids.getSize(0), itr_sc,
-      itr_sc, sampleCountInCluster.numElements(), newCentroids.data(),
-      [=] __device__(cub::KeyValuePair<ptrdiff_t, int> map) {  // predicate
-        // copy when the # of samples in the cluster is 0
-        if (map.value == 0)
-          return true;
-        else
-          return false;
-      },
-      [=] __device__(cub::KeyValuePair<ptrdiff_t, int> map) {  // map
-        return map.key;
-      },
-      stream);
+    kmeans::detail::updateCentroids(_handle, X, centroids, itr, newCentroids,
+                                    sampleCountInCluster, _workspace, stream);
 
     // compute the squared norm between the newCentroids and the original centroids, destructor releases the resource
     Tensor<DataT, 1> sqrdNorm({1}, _handle.getDeviceAllocator(), stream);
@@ -893,6 +1174,8 @@ __host__ void KMeans<DataT, IndexT>::fit(Tensor<DataT, 2, IndexT> &X) {
     if (sqrdNormError < tol) done = true;
 
     if (done) {
+      // count the current iteration
+      ++n_iter;
       LOG(_verbose,
           "Threshold triggered after %d iterations. Terminating early.\n",
           n_iter);
@@ -901,9 +1184,335 @@ __host__ void KMeans<DataT, IndexT>::fit(Tensor<DataT, 2, IndexT> &X) {
   }
 }
 
+// Lloyd iterations that skip the distance computations ruled out by the triangle inequality (Hamerly, "Making k-means even faster", 2010).
+// Each sample keeps an upper bound of the distance to its centroid and a lower bound of the distance to every other centroid. A sample is assigned again only when its bounds overlap, which is rare once the centroids stop moving much; the distances of the samples assigned again are computed in batches as in Lloyd.
+template <typename DataT, typename IndexT>
+__host__ void KMeans<DataT, IndexT>::fitHamerly(Tensor<DataT, 2, IndexT> &X) {
+  cudaStream_t stream = _handle.getStream();
+  auto n_samples = X.getSize(0);
+  auto n_features = X.getSize(1);
+  IndexT k = n_clusters;
+
+  auto dataBatchSize = kmeans::detail::getDataBatchSize(n_samples, n_features);
+
+  // closest centroid of each sample, upper bound of the distance to it and lower bound of the distance to the second closest
+  Tensor<IndexT, 1, IndexT> labels({n_samples}, _handle.getDeviceAllocator(),
+                                   stream);
+  Tensor<DataT, 1, IndexT> upper({n_samples}, _handle.getDeviceAllocator(),
+                                 stream);
+  Tensor<DataT, 1, IndexT> lower({n_samples}, _handle.getDeviceAllocator(),
+                                 stream);
+
+  // 0: the bounds keep the assignment, 1: the tightened upper bound keeps the assignment, 2: the sample must be assigned again
+  Tensor<int, 1, IndexT> status({n_samples}, _handle.getDeviceAllocator(),
+                                stream);
+  Tensor<IndexT, 1, IndexT> indices({n_samples}, _handle.getDeviceAllocator(),
+                                    stream);
+
+  Tensor<DataT, 2, IndexT> gathered({dataBatchSize, n_features},
+                                    _handle.getDeviceAllocator(), stream);
+  Tensor<DataT, 2, IndexT> pairwiseDistance(
+    {dataBatchSize, n_clusters}, _handle.getDeviceAllocator(), stream);
+  Tensor<DataT, 2, IndexT> centerDistance(
+    {n_clusters, n_clusters}, _handle.getDeviceAllocator(), stream);
+  Tensor<DataT, 1, IndexT> halfMinDistance(
+    {n_clusters}, _handle.getDeviceAllocator(), stream);
+  Tensor<DataT, 1, IndexT> shifts({n_clusters}, _handle.getDeviceAllocator(),
+                                  stream);
+  Tensor<DataT, 2, IndexT> newCentroids({n_clusters, n_features},
+                                        _handle.getDeviceAllocator(), stream);
+  Tensor<int, 1, IndexT> sampleCountInCluster(
+    {n_clusters}, _handle.getDeviceAllocator(), stream);
+  std::vector<DataT> hostShifts;
+
+  ML::thrustAllocatorAdapter alloc(_handle.getDeviceAllocator(), stream);
+  auto execution_policy = thrust::cuda::par(alloc).on(stream);
+
+  const DataT *data = X.data();
+  IndexT *labelsPtr = labels.data();
+  DataT *upperPtr = upper.data();
+  DataT *lowerPtr = lower.data();
+  int *statusPtr = status.data();
+  const DataT *halfMinPtr = halfMinDistance.data();
+  const DataT *shiftsPtr = shifts.data();
+
+  double computedDistances = 0;
+  double lloydDistances = 0;
+  for (n_iter = 0; n_iter < max_iter; ++n_iter) {
+    auto centroids = std::move(Tensor<DataT, 2, IndexT>(
+      _centroidsRawData.data(), {n_clusters, n_features}));
+    const DataT *centroidsPtr = centroids.data();
+
+    if (n_iter == 0) {
+      kmeans::detail::minTwoClusterDistances(
+        _handle, X, (const IndexT *)nullptr, n_samples, centroids, gathered,
+        pairwiseDistance, labelsPtr, upperPtr, lowerPtr, _workspace, stream);
+      computedDistances += (double)n_samples * k;
+    } else {
+      kmeans::detail::centroidDistances(_handle, centroids, centerDistance,
+                                        halfMinDistance, _workspace, stream);
+
+      thrust::for_each_n(
+        execution_policy, thrust::make_counting_iterator<IndexT>(0), n_samples,
+        [=] __device__(IndexT i) {
+          IndexT label = labelsPtr[i];
+          DataT bound = halfMinPtr[label] > lowerPtr[i] ? halfMinPtr[label]
+                                                        : lowerPtr[i];
+          if (upperPtr[i] <= bound) {
+            statusPtr[i] = 0;
+            return;
+          }
+          DataT distance =
+            kmeans::detail::rowDistance(data + (size_t)i * n_features,
+                                        centroidsPtr + (size_t)label * n_features,
+                                        n_features);
+          upperPtr[i] = distance;
+          statusPtr[i] = distance <= bound ? 1 : 2;
+        });
+
+      IndexT n_tightened =
+        thrust::count_if(execution_policy, status.begin(), status.end(),
+                         [=] __device__(int st) { return st > 0; });
+      IndexT n_reassigned =
+        thrust::copy_if(execution_policy,
+                        thrust::make_counting_iterator<IndexT>(0),
+                        thrust::make_counting_iterator<IndexT>(n_samples),
+                        status.begin(), indices.begin(),
+                        [=] __device__(int st) { return st == 2; }) -
+        indices.begin();
+
+      kmeans::detail::minTwoClusterDistances(
+        _handle, X, indices.data(), n_reassigned, centroids, gathered,
+        pairwiseDistance, labelsPtr, upperPtr, lowerPtr, _workspace, stream);
+      computedDistances += (double)n_tightened + (double)n_reassigned * k;
+    }
+    lloydDistances += (double)n_samples * k;
+
+    kmeans::detail::updateCentroids(_handle, X, centroids, labelsPtr,
+                                    newCentroids, sampleCountInCluster,
+                                    _workspace, stream);
+
+    kmeans::detail::centroidShifts(_handle, centroids, newCentroids, shifts,
+                                   hostShifts, stream);
+    DataT sqrdNormError = 0;
+    IndexT maxShiftIdx = 0;
+    for (IndexT j = 0; j < k; ++j) {
+      sqrdNormError += hostShifts[j] * hostShifts[j];
+      if (hostShifts[j] > hostShifts[maxShiftIdx]) maxShiftIdx = j;
+    }
+    DataT maxShift = hostShifts[maxShiftIdx];
+    DataT secondMaxShift = 0;
+    for (IndexT j = 0; j < k; ++j) {
+      if (j != maxShiftIdx && hostShifts[j] > secondMaxShift)
+        secondMaxShift = hostShifts[j];
+    }
+
+    // the centroids moved: loosen the bounds by the distance they moved
+    thrust::for_each_n(
+      execution_policy, thrust::make_counting_iterator<IndexT>(0), n_samples,
+      [=] __device__(IndexT i) {
+        IndexT label = labelsPtr[i];
+        upperPtr[i] += shiftsPtr[label];
+        lowerPtr[i] -= label == maxShiftIdx ? secondMaxShift : maxShift;
+      });
+
+    MLCommon::copy(_centroidsRawData.data(), newCentroids.data(),
+                   newCentroids.numElements(), stream);
+    CUDA_CHECK(cudaStreamSynchronize(stream));
+
+    if (sqrdNormError < tol) {
+      // count the current iteration
+      ++n_iter;
+      LOG(_verbose,
+          "Threshold triggered after %d iterations. Terminating early.\n",
+          n_iter);
+      break;
+    }
+  }
+
+  skippedDistanceFraction =
+    lloydDistances > 0 ? 1.0 - computedDistances / lloydDistances : 0.0;
+  LOG(_verbose, "KMeans.fit: skipped %.1f%% of the distance computations.\n",
+      100.0 * skippedDistanceFraction);
+}
+
+// Lloyd iterations that skip the distance computations ruled out by the triangle inequality (Elkan, "Using the triangle inequality to accelerate k-means", 2003).
+// Each sample keeps an upper bound of the distance to its centroid and a lower bound of the distance to each centroid, n_samples x n_clusters values: it skips more distances than Hamerly but needs as much memory as the distances of all the samples to all the centroids.
+template <typename DataT, typename IndexT>
+__host__ void KMeans<DataT, IndexT>::fitElkan(Tensor<DataT, 2, IndexT> &X) {
+  cudaStream_t stream = _handle.getStream();
+  auto n_samples = X.getSize(0);
+  auto n_features = X.getSize(1);
+  IndexT k = n_clusters;
+
+  auto dataBatchSize = kmeans::detail::getDataBatchSize(n_samples, n_features);
+
+  // closest centroid of each sample, upper bound of the distance to it and lower bounds of the distances to all the centroids
+  Tensor<IndexT, 1, IndexT> labels({n_samples}, _handle.getDeviceAllocator(),
+                                   stream);
+  Tensor<DataT, 1, IndexT> upper({n_samples}, _handle.getDeviceAllocator(),
+                                 stream);
+  Tensor<DataT, 2, IndexT> lower({n_samples, n_clusters},
+                                 _handle.getDeviceAllocator(), stream);
+
+  // number of distances computed for each sample in the current iteration
+  Tensor<int, 1, IndexT> computedCount({n_samples},
+                                       _handle.getDeviceAllocator(), stream);
+
+  Tensor<DataT, 2, IndexT> centerDistance(
+    {n_clusters, n_clusters}, _handle.getDeviceAllocator(), stream);
+  Tensor<DataT, 1, IndexT> halfMinDistance(
+    {n_clusters}, _handle.getDeviceAllocator(), stream);
+  Tensor<DataT, 1, IndexT> shifts({n_clusters}, _handle.getDeviceAllocator(),
+                                  stream);
+  Tensor<DataT, 2, IndexT> newCentroids({n_clusters, n_features},
+                                        _handle.getDeviceAllocator(), stream);
+  Tensor<int, 1, IndexT> sampleCountInCluster(
+    {n_clusters}, _handle.getDeviceAllocator(), stream);
+  std::vector<DataT> hostShifts;
+
+  ML::thrustAllocatorAdapter alloc(_handle.getDeviceAllocator(), stream);
+  auto execution_policy = thrust::cuda::par(alloc).on(stream);
+
+  const DataT *data = X.data();
+  IndexT *labelsPtr = labels.data();
+  DataT *upperPtr = upper.data();
+  DataT *lowerPtr = lower.data();
+  int *countPtr = computedCount.data();
+  const DataT *centerDistancePtr = centerDistance.data();
+  const DataT *halfMinPtr = halfMinDistance.data();
+  const DataT *shiftsPtr = shifts.data();
+
+  double computedDistances = 0;
+  double lloydDistances = 0;
+  for (n_iter = 0; n_iter < max_iter; ++n_iter) {
+    auto centroids = std::move(Tensor<DataT, 2, IndexT>(
+      _centroidsRawData.data(), {n_clusters, n_features}));
+    const DataT *centroidsPtr = centroids.data();
+
+    if (n_iter == 0) {
+      // the lower bounds start as the distances to all the centroids, computed in batches as in Lloyd
+      for (IndexT dIdx = 0; dIdx < n_samples; dIdx += dataBatchSize) {
+        IndexT ns = std::min(dataBatchSize, n_samples - dIdx);
+        Tensor<DataT, 2, IndexT> batch(X.data() + (size_t)dIdx * n_features,
+                                       {ns, n_features});
+        Tensor<DataT, 2, IndexT> batchDistance(
+          lower.data() + (size_t)dIdx * n_clusters, {ns, n_clusters});
+        kmeans::detail::pairwiseDistance(
+          _handle, batch, centroids, batchDistance, _workspace,
+          Distance::DistanceType::EucExpandedL2, stream);
+      }
+
+      thrust::for_each_n(
+        execution_policy, thrust::make_counting_iterator<IndexT>(0), n_samples,
+        [=] __device__(IndexT i) {
+          DataT *row = lowerPtr + (size_t)i * k;
+          IndexT closest = 0;
+          for (IndexT j = 0; j < k; ++j) {
+            row[j] = row[j] > 0 ? sqrt(row[j]) : 0;
+            if (row[j] < row[closest]) closest = j;
+          }
+          labelsPtr[i] = closest;
+          upperPtr[i] = row[closest];
+        });
+      computedDistances += (double)n_samples * k;
+    } else {
+      kmeans::detail::centroidDistances(_handle, centroids, centerDistance,
+                                        halfMinDistance, _workspace, stream);
+
+      thrust::for_each_n(
+        execution_policy, thrust::make_counting_iterator<IndexT>(0), n_samples,
+        [=] __device__(IndexT i) {
+          const DataT *sample = data + (size_t)i * n_features;
+          DataT *row = lowerPtr + (size_t)i * k;
+          IndexT label = labelsPtr[i];
+          DataT distance = upperPtr[i];
+          int count = 0;
+          if (distance > halfMinPtr[label]) {
+            bool tight = false;
+            for (IndexT j = 0; j < k; ++j) {
+              if (j == label) continue;
+              DataT halfCenterDistance =
+                centerDistancePtr[(size_t)label * k + j] / 2;
+              DataT bound =
+                row[j] > halfCenterDistance ? row[j] : halfCenterDistance;
+              if (distance <= bound) continue;
+              if (!tight) {
+                distance = kmeans::detail::rowDistance(
+                  sample, centroidsPtr + (size_t)label * n_features,
+                  n_features);
+                row[label] = distance;
+                tight = true;
+                ++count;
+                if (distance <= bound) continue;
+              }
+              DataT candidate = kmeans::detail::rowDistance(
+                sample, centroidsPtr + (size_t)j * n_features, n_features);
+              row[j] = candidate;
+              ++count;
+              if (candidate < distance) {
+                label = j;
+                distance = candidate;
+              }
+            }
+          }
+          labelsPtr[i] = label;
+          upperPtr[i] = distance;
+          countPtr[i] = count;
+        });
+
+      computedDistances +=
+        (double)thrust::reduce(execution_policy, computedCount.begin(),
+                               computedCount.end(), (long long)0);
+    }
+    lloydDistances += (double)n_samples * k;
+
+    kmeans::detail::updateCentroids(_handle, X, centroids, labelsPtr,
+                                    newCentroids, sampleCountInCluster,
+                                    _workspace, stream);
+
+    kmeans::detail::centroidShifts(_handle, centroids, newCentroids, shifts,
+                                   hostShifts, stream);
+    DataT sqrdNormError = 0;
+    for (IndexT j = 0; j < k; ++j) {
+      sqrdNormError += hostShifts[j] * hostShifts[j];
+    }
+
+    // the centroids moved: loosen the bounds by the distance they moved
+    thrust::for_each_n(
+      execution_policy, thrust::make_counting_iterator<IndexT>(0), n_samples,
+      [=] __device__(IndexT i) {
+        DataT *row = lowerPtr + (size_t)i * k;
+        for (IndexT j = 0; j < k; ++j) {
+          DataT bound = row[j] - shiftsPtr[j];
+          row[j] = bound > 0 ? bound : 0;
+        }
+        upperPtr[i] += shiftsPtr[labelsPtr[i]];
+      });
+
+    MLCommon::copy(_centroidsRawData.data(), newCentroids.data(),
+                   newCentroids.numElements(), stream);
+    CUDA_CHECK(cudaStreamSynchronize(stream));
+
+    if (sqrdNormError < tol) {
+      // count the current iteration
+      ++n_iter;
+      LOG(_verbose,
+          "Threshold triggered after %d iterations. Terminating early.\n",
+          n_iter);
+      break;
+    }
+  }
+
+  skippedDistanceFraction =
+    lloydDistances > 0 ? 1.0 - computedDistances / lloydDistances : 0.0;
+  LOG(_verbose, "KMeans.fit: skipped %.1f%% of the distance computations.\n",
+      100.0 * skippedDistanceFraction);
+}
+
 template <typename DataT, typename IndexT>
 __host__ void KMeans<DataT, IndexT>::fit(const DataT *X, int n_samples,
-                                         int n_features) {
+                                         int n_features, bool predictLabels) {
   if (n_clusters >= n_samples) {
     n_clusters = n_samples;
     options.oversampling_factor = 2.0 * n_clusters;
@@ -942,6 +1551,9 @@ __host__ void KMeans<DataT, IndexT>::fit(const DataT *X, int n_samples,
   }
 
   fit(data);
+
+  // labels and inertia of the samples with the final centroids
+  if (predictLabels) predict(data);
 }
 
 template <typename DataT, typename IndexT>
@@ -1022,7 +1634,8 @@ __host__ void KMeans<DataT, IndexT>::predict(const DataT *X, int n_samples,
 
 template <typename DataT, typename IndexT>
 __host__ void KMeans<DataT, IndexT>::transform(const DataT *X, int n_samples,
-                                               int n_features, DataT *X_new) {
+                                               int n_features, DataT *X_new,
+                                               int batch_size) {
   cudaStream_t stream = _handle.getStream();
 
   ASSERT(_n_features == n_features,
@@ -1035,33 +1648,220 @@ __host__ void KMeans<DataT, IndexT>::transform(const DataT *X, int n_samples,
   ASSERT(memory_type(X) == cudaMemoryTypeDevice,
          "input data must be device accessible");
 
+  auto centroids = std::move(Tensor<DataT, 2, IndexT>(
+    _centroidsRawData.data(), {n_clusters, n_features}));
+
+  if (batch_size <= 0) {
+    batch_size = kmeans::detail::getDataBatchSize(n_samples, n_features);
+  }
+  batch_size = std::min(batch_size, n_samples);
+
+  // the norms of the centroids are computed once for all the batches
+  Tensor<DataT, 1, IndexT> centroidNorms({n_clusters},
+                                         _handle.getDeviceAllocator(), stream);
+  LinAlg::rowNorm(centroidNorms.data(), centroids.data(), n_features,
+                  n_clusters, LinAlg::L2Norm, true, stream);
+  Tensor<DataT, 1, IndexT> sampleNorms({batch_size},
+                                       _handle.getDeviceAllocator(), stream);
+
+  // the distances of a batch are computed in place in a device output, and copied from a buffer of one batch to a host output
+  bool deviceOutput = memory_type(X_new) == cudaMemoryTypeDevice;
+  MLCommon::device_buffer<DataT> batchDistance(
+    _handle.getDeviceAllocator(), stream,
+    deviceOutput ? 0 : (size_t)batch_size * n_clusters);
+
+  // tile over the input data and calculate distance matrix [n_samples x n_clusters]
+  for (IndexT dIdx = 0; dIdx < n_samples; dIdx += batch_size) {
+    // # of samples for the current batch
+    IndexT ns = std::min(batch_size, n_samples - dIdx);
+
+    Tensor<DataT, 2, IndexT> datasetView(
+      (DataT *)X + (size_t)dIdx * n_features, {ns, n_features});
+    DataT *output = X_new + (size_t)dIdx * n_clusters;
+    DataT *distances = deviceOutput ? output : batchDistance.data();
+
+    kmeans::detail::batchDistances(_handle, datasetView, centroids,
+                                   centroidNorms.data(), sampleNorms.data(),
+                                   distances, _workspace, _metric, stream);
+
+    if (!deviceOutput) {
+      MLCommon::copy(output, distances, (size_t)ns * n_clusters, stream);
+    }
+  }
+}
+
+template <typename DataT, typename IndexT>
+__host__ void KMeans<DataT, IndexT>::nearestCentroids(
+  const DataT *X, int n_samples, int n_features, int n_nearest,
+  DataT *distances, IndexT *indices, int batch_size) {
+  cudaStream_t stream = _handle.getStream();
+
+  ASSERT(_n_features == n_features,
+         "model is trained for %d-dimensional data (provided data is "
+         "%d-dimensional)",
+         _n_features, n_features);
+
+  ASSERT(n_clusters > 0, "no clusters exist");
+
+  ASSERT(n_nearest > 0 && n_nearest <= n_clusters,
+         "the number of nearest centroids must be in [1, %d] (requested %d)",
+         n_clusters, n_nearest);
+
   ASSERT(memory_type(X) == cudaMemoryTypeDevice,
-         "output data storage must be device accessible");
+         "input data must be device accessible");
+
+  ASSERT(indices != nullptr, "the indices output is null");
 
   auto centroids = std::move(Tensor<DataT, 2, IndexT>(
     _centroidsRawData.data(), {n_clusters, n_features}));
 
-  Tensor<DataT, 2> dataset((DataT *)X, {n_samples, n_features});
-  Tensor<DataT, 2> pairwiseDistance((DataT *)X_new, {n_samples, n_clusters});
+  if (batch_size <= 0) {
+    batch_size = kmeans::detail::getDataBatchSize(n_samples, n_features);
+  }
+  batch_size = std::min(batch_size, n_samples);
+
+  // the norms of the centroids are computed once for all the batches
+  Tensor<DataT, 1, IndexT> centroidNorms({n_clusters},
+                                         _handle.getDeviceAllocator(), stream);
+  LinAlg::rowNorm(centroidNorms.data(), centroids.data(), n_features,
+                  n_clusters, LinAlg::L2Norm, true, stream);
+  Tensor<DataT, 1, IndexT> sampleNorms({batch_size},
+                                       _handle.getDeviceAllocator(), stream);
+  Tensor<DataT, 2, IndexT> pairwiseDistance(
+    {batch_size, n_clusters}, _handle.getDeviceAllocator(), stream);
+
+  // the nearest centroids of a batch are selected in place in device outputs, and copied from buffers of one batch to host (or missing) outputs
+  bool deviceDistances =
+    distances != nullptr && memory_type(distances) == cudaMemoryTypeDevice;
+  bool deviceIndices = memory_type(indices) == cudaMemoryTypeDevice;
+  MLCommon::device_buffer<DataT> batchDistances(
+    _handle.getDeviceAllocator(), stream,
+    deviceDistances ? 0 : (size_t)batch_size * n_nearest);
+  MLCommon::device_buffer<IndexT> batchIndices(
+    _handle.getDeviceAllocator(), stream,
+    deviceIndices ? 0 : (size_t)batch_size * n_nearest);
+
+  for (IndexT dIdx = 0; dIdx < n_samples; dIdx += batch_size) {
+    // # of samples for the current batch
+    IndexT ns = std::min(batch_size, n_samples - dIdx);
+
+    Tensor<DataT, 2, IndexT> datasetView(
+      (DataT *)X + (size_t)dIdx * n_features, {ns, n_features});
+    kmeans::detail::batchDistances(_handle, datasetView, centroids,
+                                   centroidNorms.data(), sampleNorms.data(),
+                                   pairwiseDistance.data(), _workspace,
+                                   _metric, stream);
+
+    size_t offset = (size_t)dIdx * n_nearest;
+    DataT *nearestDistances =
+      deviceDistances ? distances + offset : batchDistances.data();
+    IndexT *nearestIndices =
+      deviceIndices ? indices + offset : batchIndices.data();
+    kmeans::detail::selectNearest(_handle, pairwiseDistance.data(), ns,
+                                  (IndexT)n_clusters, (IndexT)n_nearest,
+                                  nearestDistances, nearestIndices, stream);
+
+    if (distances != nullptr && !deviceDistances) {
+      MLCommon::copy(distances + offset, nearestDistances,
+                     (size_t)ns * n_nearest, stream);
+    }
+    if (!deviceIndices) {
+      MLCommon::copy(indices + offset, nearestIndices, (size_t)ns * n_nearest,
+                     stream);
+    }
+  }
+}
+
+template <typename DataT, typename IndexT>
+__host__ DataT KMeans<DataT, IndexT>::partialFit(const DataT *X, int n_samples,
+                                                 int n_features,
+                                                 int64_t *counts) {
+  cudaStream_t stream = _handle.getStream();
+
+  ASSERT(_n_features == n_features,
+         "model is trained for %d-dimensional data (provided data is "
+         "%d-dimensional)",
+         _n_features, n_features);
+
+  ASSERT(n_clusters > 0, "no clusters exist");
+
+  ASSERT(memory_type(X) == cudaMemoryTypeDevice,
+         "input data must be device accessible");
+
+  Tensor<DataT, 2, IndexT> data((DataT *)X, {n_samples, n_features});
+  auto centroids = std::move(Tensor<DataT, 2, IndexT>(
+    _centroidsRawData.data(), {n_clusters, n_features}));
 
   auto dataBatchSize = kmeans::detail::getDataBatchSize(n_samples, n_features);
 
-  // tile over the input data and calculate distance matrix [n_samples x n_clusters]
-  for (int dIdx = 0; dIdx < n_samples; dIdx += dataBatchSize) {
-    // # of samples for the current batch
-    int ns = std::min(dataBatchSize, n_samples - dIdx);
+  Tensor<cub::KeyValuePair<IndexT, DataT>, 1, IndexT> minClusterAndDistance(
+    {n_samples}, _handle.getDeviceAllocator(), stream);
+  Tensor<DataT, 2, IndexT> pairwiseDistance(
+    {dataBatchSize, n_clusters}, _handle.getDeviceAllocator(), stream);
 
-    // datasetView [ns x n_features] - view representing the current batch of input dataset
-    auto datasetView = dataset.template view<2>({ns, n_features}, {dIdx, 0});
+  // sum and number of the samples of the batch assigned to each centroid
+  Tensor<DataT, 2, IndexT> batchSums({n_clusters, n_features},
+                                     _handle.getDeviceAllocator(), stream);
+  Tensor<int, 1, IndexT> batchCounts({n_clusters},
+                                     _handle.getDeviceAllocator(), stream);
 
-    // pairwiseDistanceView [ns x n_clusters]
-    auto pairwiseDistanceView =
-      pairwiseDistance.template view<2>({ns, n_clusters}, {dIdx, 0});
+  kmeans::detail::minClusterAndDistance(_handle, data, centroids,
+                                        pairwiseDistance, minClusterAndDistance,
+                                        _workspace, _metric, stream);
 
-    // calculate pairwise distance between cluster centroids and current batch of input dataset
-    kmeans::detail::pairwiseDistance(_handle, datasetView, centroids,
-                                     pairwiseDistanceView, _workspace, _metric,
-                                     stream);
-  }
+  // cost of the batch with the centroids before the update
+  const cub::KeyValuePair<IndexT, DataT> clusteringCost =
+    kmeans::detail::computeClusterCost(
+      _handle, minClusterAndDistance, _workspace,
+      [] __device__(const cub::KeyValuePair<IndexT, DataT> &a,
+                    const cub::KeyValuePair<IndexT, DataT> &b) {
+        cub::KeyValuePair<IndexT, DataT> res;
+        res.key = 0;
+        res.value = a.value + b.value;
+        return res;
+      },
+      stream);
+
+  kmeans::detail::KeyValueIndexOp<IndexT, DataT> conversion_op;
+  cub::TransformInputIterator<IndexT,
+                              kmeans::detail::KeyValueIndexOp<IndexT, DataT>,
+                              cub::KeyValuePair<IndexT, DataT> *>
+    itr(minClusterAndDistance.data(), conversion_op);
+
+  _workspace.resize(n_samples, stream);
+  LinAlg::reduce_rows_by_key(data.data(), n_features, itr, _workspace.data(),
+                             n_samples, n_features, n_clusters,
+                             batchSums.data(), stream);
+
+  kmeans::detail::countLabels(_handle, itr, batchCounts.data(), n_samples,
+                              n_clusters, _workspace, stream);
+
+  // centroid += (batch sum - batch count * centroid) / total count, which
+  // makes it the mean of all the samples assigned to it. Centroids without
+  // samples in the batch do not move.
+  DataT *centroidsPtr = centroids.data();
+  const DataT *batchSumsPtr = batchSums.data();
+  const int *batchCountsPtr = batchCounts.data();
+  ML::thrustAllocatorAdapter alloc(_handle.getDeviceAllocator(), stream);
+  auto execution_policy = thrust::cuda::par(alloc).on(stream);
+  thrust::for_each_n(
+    execution_policy, thrust::make_counting_iterator<IndexT>(0),
+    n_clusters * n_features, [=] __device__(IndexT idx) {
+      IndexT cIdx = idx / n_features;
+      int batchCount = batchCountsPtr[cIdx];
+      if (batchCount == 0) return;
+      DataT total = static_cast<DataT>(counts[cIdx] + batchCount);
+      centroidsPtr[idx] +=
+        (batchSumsPtr[idx] - batchCount * centroidsPtr[idx]) / total;
+    });
+
+  thrust::for_each_n(execution_policy,
+                     thrust::make_counting_iterator<IndexT>(0), n_clusters,
+                     [=] __device__(IndexT cIdx) {
+                       counts[cIdx] += batchCountsPtr[cIdx];
+                     });
+
+  CUDA_CHECK(cudaStreamSynchronize(stream));
+  return clusteringCost.value;
 }
 };  // end namespace ML
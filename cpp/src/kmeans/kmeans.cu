@@ -22,14 +22,16 @@ namespace kmeans {
 void fit_predict(const ML::cumlHandle &handle, int n_clusters, int metric,
                  kmeans::InitMethod init, int max_iter, double tol, int seed,
                  const float *X, int n_samples, int n_features,
-                 float *centroids, int *labels, int verbose) {
+                 float *centroids, int *labels, int verbose, double *inertia,
+                 int *n_iter, kmeans::Algorithm algorithm,
+                 double *skipped_fraction) {
   const ML::cumlHandle_impl &h = handle.getImpl();
   ML::detail::streamSyncer _(h);
   cudaStream_t stream = h.getStream();
 
   ML::KMeans<float> kmeans_obj(
     h, n_clusters, static_cast<MLCommon::Distance::DistanceType>(metric), init,
-    max_iter, tol, seed, verbose);
+    max_iter, tol, seed, verbose, algorithm);
 
   if (kmeans::InitMethod::Array == init) {
     ASSERT(centroids != nullptr,
@@ -38,9 +40,19 @@ void fit_predict(const ML::cumlHandle &handle, int n_clusters, int metric,
     kmeans_obj.setCentroids(centroids, n_clusters, n_features);
   }
 
-  kmeans_obj.fit(X, n_samples, n_features);
+  kmeans_obj.fit(X, n_samples, n_features,
+                 labels != nullptr || inertia != nullptr);
   if (labels) {
-    kmeans_obj.predict(X, n_samples, n_features, labels);
+    MLCommon::copy(labels, kmeans_obj.labels(), n_samples, stream);
+  }
+  if (inertia) {
+    *inertia = kmeans_obj.getInertia();
+  }
+  if (n_iter) {
+    *n_iter = kmeans_obj.getNumIter();
+  }
+  if (skipped_fraction) {
+    *skipped_fraction = kmeans_obj.getSkippedDistanceFraction();
   }
 
   MLCommon::copy(centroids, kmeans_obj.centroids(), n_clusters * n_features,
@@ -50,14 +62,16 @@ void fit_predict(const ML::cumlHandle &handle, int n_clusters, int metric,
 void fit_predict(const ML::cumlHandle &handle, int n_clusters, int metric,
                  kmeans::InitMethod init, int max_iter, double tol, int seed,
                  const double *X, int n_samples, int n_features,
-                 double *centroids, int *labels, int verbose) {
+                 double *centroids, int *labels, int verbose, double *inertia,
+                 int *n_iter, kmeans::Algorithm algorithm,
+                 double *skipped_fraction) {
   const ML::cumlHandle_impl &h = handle.getImpl();
   ML::detail::streamSyncer _(h);
   cudaStream_t stream = h.getStream();
 
   ML::KMeans<double> kmeans_obj(
     h, n_clusters, static_cast<MLCommon::Distance::DistanceType>(metric), init,
-    max_iter, tol, seed, verbose);
+    max_iter, tol, seed, verbose, algorithm);
 
   if (kmeans::InitMethod::Array == init) {
     ASSERT(centroids != nullptr,
@@ -66,9 +80,19 @@ void fit_predict(const ML::cumlHandle &handle, int n_clusters, int metric,
     kmeans_obj.setCentroids(centroids, n_clusters, n_features);
   }
 
-  kmeans_obj.fit(X, n_samples, n_features);
+  kmeans_obj.fit(X, n_samples, n_features,
+                 labels != nullptr || inertia != nullptr);
   if (labels) {
-    kmeans_obj.predict(X, n_samples, n_features, labels);
+    MLCommon::copy(labels, kmeans_obj.labels(), n_samples, stream);
+  }
+  if (inertia) {
+    *inertia = kmeans_obj.getInertia();
+  }
+  if (n_iter) {
+    *n_iter = kmeans_obj.getNumIter();
+  }
+  if (skipped_fraction) {
+    *skipped_fraction = kmeans_obj.getSkippedDistanceFraction();
   }
 
   MLCommon::copy(centroids, kmeans_obj.centroids(), n_clusters * n_features,
@@ -78,17 +102,21 @@ void fit_predict(const ML::cumlHandle &handle, int n_clusters, int metric,
 void fit(const ML::cumlHandle &handle, int n_clusters, int metric,
          kmeans::InitMethod init, int max_iter, double tol, int seed,
          const float *X, int n_samples, int n_features, float *centroids,
-         int verbose) {
+         int verbose, double *inertia, int *n_iter,
+         kmeans::Algorithm algorithm, double *skipped_fraction) {
   fit_predict(handle, n_clusters, metric, init, max_iter, tol, seed, X,
-              n_samples, n_features, centroids, nullptr, verbose);
+              n_samples, n_features, centroids, nullptr, verbose, inertia,
+              n_iter, algorithm, skipped_fraction);
 }
 
 void fit(const ML::cumlHandle &handle, int n_clusters, int metric,
          kmeans::InitMethod init, int max_iter, double tol, int seed,
          const double *X, int n_samples, int n_features, double *centroids,
-         int verbose) {
+         int verbose, double *inertia, int *n_iter,
+         kmeans::Algorithm algorithm, double *skipped_fraction) {
   fit_predict(handle, n_clusters, metric, init, max_iter, tol, seed, X,
-              n_samples, n_features, centroids, nullptr, verbose);
+              n_samples, n_features, centroids, nullptr, verbose, inertia,
+              n_iter, algorithm, skipped_fraction);
 }
 
 void predict(const ML::cumlHandle &handle, float *centroids, int n_clusters,
@@ -122,7 +150,7 @@ void predict(const ML::cumlHandle &handle, double *centroids, int n_clusters,
 
 void transform(const ML::cumlHandle &handle, const float *centroids,
                int n_clusters, const float *X, int n_samples, int n_features,
-               int metric, float *X_new, int verbose) {
+               int metric, float *X_new, int verbose, int batch_size) {
   const ML::cumlHandle_impl &h = handle.getImpl();
   ML::detail::streamSyncer _(h);
   cudaStream_t stream = h.getStream();
@@ -130,12 +158,12 @@ void transform(const ML::cumlHandle &handle, const float *centroids,
   ML::KMeans<float> kmeans_obj(
     h, n_clusters, static_cast<MLCommon::Distance::DistanceType>(metric));
   kmeans_obj.setCentroids(centroids, n_clusters, n_features);
-  kmeans_obj.transform(X, n_samples, n_features, X_new);
+  kmeans_obj.transform(X, n_samples, n_features, X_new, batch_size);
 }
 
 void transform(const ML::cumlHandle &handle, const double *centroids,
                int n_clusters, const double *X, int n_samples, int n_features,
-               int metric, double *X_new, int verbose) {
+               int metric, double *X_new, int verbose, int batch_size) {
   const ML::cumlHandle_impl &h = handle.getImpl();
   ML::detail::streamSyncer _(h);
   cudaStream_t stream = h.getStream();
@@ -143,7 +171,75 @@ void transform(const ML::cumlHandle &handle, const double *centroids,
   ML::KMeans<double> kmeans_obj(
     h, n_clusters, static_cast<MLCommon::Distance::DistanceType>(metric));
   kmeans_obj.setCentroids(centroids, n_clusters, n_features);
-  kmeans_obj.transform(X, n_samples, n_features, X_new);
+  kmeans_obj.transform(X, n_samples, n_features, X_new, batch_size);
+}
+
+void nearest_centroids(const ML::cumlHandle &handle, const float *centroids,
+                       int n_clusters, const float *X, int n_samples,
+                       int n_features, int metric, int n_nearest,
+                       float *distances, int *indices, int verbose,
+                       int batch_size) {
+  const ML::cumlHandle_impl &h = handle.getImpl();
+  ML::detail::streamSyncer _(h);
+
+  ML::KMeans<float> kmeans_obj(
+    h, n_clusters, static_cast<MLCommon::Distance::DistanceType>(metric),
+    kmeans::InitMethod::Array, 0, 0.0, -1, verbose);
+  kmeans_obj.setCentroids(centroids, n_clusters, n_features);
+  kmeans_obj.nearestCentroids(X, n_samples, n_features, n_nearest, distances,
+                              indices, batch_size);
+}
+
+void nearest_centroids(const ML::cumlHandle &handle, const double *centroids,
+                       int n_clusters, const double *X, int n_samples,
+                       int n_features, int metric, int n_nearest,
+                       double *distances, int *indices, int verbose,
+                       int batch_size) {
+  const ML::cumlHandle_impl &h = handle.getImpl();
+  ML::detail::streamSyncer _(h);
+
+  ML::KMeans<double> kmeans_obj(
+    h, n_clusters, static_cast<MLCommon::Distance::DistanceType>(metric),
+    kmeans::InitMethod::Array, 0, 0.0, -1, verbose);
+  kmeans_obj.setCentroids(centroids, n_clusters, n_features);
+  kmeans_obj.nearestCentroids(X, n_samples, n_features, n_nearest, distances,
+                              indices, batch_size);
+}
+
+double partial_fit(const ML::cumlHandle &handle, float *centroids,
+                   int64_t *counts, int n_clusters, const float *X,
+                   int n_samples, int n_features, int metric, int verbose) {
+  const ML::cumlHandle_impl &h = handle.getImpl();
+  ML::detail::streamSyncer _(h);
+  cudaStream_t stream = h.getStream();
+
+  ML::KMeans<float> kmeans_obj(
+    h, n_clusters, static_cast<MLCommon::Distance::DistanceType>(metric),
+    kmeans::InitMethod::Array, 0, 0.0, -1, verbose);
+  kmeans_obj.setCentroids(centroids, n_clusters, n_features);
+  double inertia = kmeans_obj.partialFit(X, n_samples, n_features, counts);
+
+  MLCommon::copy(centroids, kmeans_obj.centroids(), n_clusters * n_features,
+                 stream);
+  return inertia;
+}
+
+double partial_fit(const ML::cumlHandle &handle, double *centroids,
+                   int64_t *counts, int n_clusters, const double *X,
+                   int n_samples, int n_features, int metric, int verbose) {
+  const ML::cumlHandle_impl &h = handle.getImpl();
+  ML::detail::streamSyncer _(h);
+  cudaStream_t stream = h.getStream();
+
+  ML::KMeans<double> kmeans_obj(
+    h, n_clusters, static_cast<MLCommon::Distance::DistanceType>(metric),
+    kmeans::InitMethod::Array, 0, 0.0, -1, verbose);
+  kmeans_obj.setCentroids(centroids, n_clusters, n_features);
+  double inertia = kmeans_obj.partialFit(X, n_samples, n_features, counts);
+
+  MLCommon::copy(centroids, kmeans_obj.centroids(), n_clusters * n_features,
+                 stream);
+  return inertia;
 }
 
 };  // end namespace kmeans
@@ -18,19 +18,25 @@
 
 #include <distance/distance.h>
 #include <linalg/binary_op.h>
+#include <linalg/gemm.h>
 #include <linalg/matrix_vector_op.h>
 #include <linalg/mean_squared_error.h>
+#include <linalg/norm.h>
 #include <linalg/reduce_rows_by_key.h>
 #include <matrix/gather.h>
 #include <random/permute.h>
 #include <random/rng.h>
 #include <random>
 
+#include <thrust/copy.h>
+#include <thrust/count.h>
 #include <thrust/execution_policy.h>
 #include <thrust/fill.h>
 #include <thrust/for_each.h>
+#include <thrust/iterator/counting_iterator.h>
 #include <thrust/scan.h>
 #include <numeric>
+#include <vector>
 
 #include <ml_cuda_utils.h>
 #include <common/allocatorAdapter.hpp>
@@ -78,12 +84,14 @@ class KMeans {
      * @param[in] max_iter    Maximum number of iterations for the k-means algorithm.
      * @param[in] tol         Relative tolerance with regards to inertia to declare convergence.
      * @param[in] seed        Seed to the random number generator.
+     * @param[in] algorithm   Algorithm of the iterations, see kmeans::Algorithm. Hamerly and Elkan require the (squared) L2 metric.
      */
   KMeans(const ML::cumlHandle_impl &cumlHandle, int n_clusters = 8,
          MLCommon::Distance::DistanceType metric =
            MLCommon::Distance::DistanceType::EucExpandedL2Sqrt,
          kmeans::InitMethod init = kmeans::InitMethod::KMeansPlusPlus,
-         int max_iter = 300, double tol = 1e-4, int seed = -1, int verbose = 0);
+         int max_iter = 300, double tol = 1e-4, int seed = -1, int verbose = 0,
+         kmeans::Algorithm algorithm = kmeans::Algorithm::Lloyd);
 
   /**
      * @brief Compute k-means clustering.
@@ -91,8 +99,10 @@ class KMeans {
      * @param[in] X          Training instances to cluster. It must be noted that the data must be in row-major format and stored in device accessible location.
      * @param[in] n_samples  Number of samples in the input X.
      * @param[in] n_features Number of features or the dimensions of each sample.
+     * @param[in] predictLabels Whether to compute the labels and inertia of X with the final centroids, an extra pass over X.
      */
-  void fit(const DataT *X, int n_samples, int n_features);
+  void fit(const DataT *X, int n_samples, int n_features,
+           bool predictLabels = false);
 
   /**
      * @brief Predict the closest cluster each sample in X belongs to.
@@ -110,9 +120,38 @@ class KMeans {
      * @param[in]  X          New data to transform.
      * @param[in]  n_samples  Number of samples in the input X.
      * @param[in]  n_features Number of features or the dimensions of each sample.
-     * @param[out] X_new      X transformed in the new space (output size is [n_samples x n_clusters].
+     * @param[out] X_new      X transformed in the new space (output size is [n_samples x n_clusters]. It may be stored in host memory: it is then written one batch at a time.
+     * @param[in]  batch_size Number of samples whose distances are computed at once, 0 for the default.
      */
-  void transform(const DataT *X, int n_samples, int n_features, DataT *X_new);
+  void transform(const DataT *X, int n_samples, int n_features, DataT *X_new,
+                 int batch_size = 0);
+
+  /**
+     * @brief Find the n_nearest closest centroids of each sample in X and their distances, without materializing the distances of all the samples to all the centroids.
+     *
+     * @param[in]  X          New data.
+     * @param[in]  n_samples  Number of samples in the input X.
+     * @param[in]  n_features Number of features or the dimensions of each sample.
+     * @param[in]  n_nearest  Number of centroids to find for each sample, in [1, n_clusters].
+     * @param[out] distances  [optional] Distances to the closest centroids in increasing order [n_samples x n_nearest]. It may be stored in host memory.
+     * @param[out] indices    Indices of the closest centroids [n_samples x n_nearest]. It may be stored in host memory.
+     * @param[in]  batch_size Number of samples whose distances are computed at once, 0 for the default.
+     */
+  void nearestCentroids(const DataT *X, int n_samples, int n_features,
+                        int n_nearest, DataT *distances, IndexT *indices,
+                        int batch_size = 0);
+
+  /**
+     * @brief Update the centroids with a batch of samples (mini-batch k-means): each centroid moves to the mean of all the samples assigned to it so far.
+     *
+     * @param[in]    X          The batch of samples.
+     * @param[in]    n_samples  Number of samples in the input X.
+     * @param[in]    n_features Number of features or the dimensions of each sample.
+     * @param[inout] counts     Number of samples assigned to each centroid by the previous batches, updated with the samples of X.
+     * @return       Sum of the distances of the samples to their closest centroid before the update.
+     */
+  DataT partialFit(const DataT *X, int n_samples, int n_features,
+                   int64_t *counts);
 
   /**
      * @brief Set centroids to be user provided value X
@@ -126,12 +165,28 @@ class KMeans {
   // returns the raw pointer to the generated centroids
   DataT *centroids();
 
+  // returns the raw pointer to the labels computed by the last fit or predict
+  IndexT *labels();
+
+  // returns the sum of the distances of the samples of the last fit or predict to their closest centroid
+  double getInertia();
+
+  // returns the number of iterations run by the last fit
+  int getNumIter();
+
+  // returns the fraction of the distances of Lloyd's algorithm the last fit did not compute
+  double getSkippedDistanceFraction();
+
   // release local resources
   ~KMeans();
 
   // internal functions (ideally must be private methods, but its not possible today because of the lambda limitations of CUDA compiler)
   void fit(Tensor<DataT, 2, IndexT> &);
 
+  void fitHamerly(Tensor<DataT, 2, IndexT> &);
+
+  void fitElkan(Tensor<DataT, 2, IndexT> &);
+
   void predict(Tensor<DataT, 2, IndexT> &);
 
   void initRandom(Tensor<DataT, 2, IndexT> &);
@@ -151,6 +206,9 @@ class KMeans {
   // Number of iterations run.
   int n_iter;
 
+  // Fraction of the distances of Lloyd's algorithm not computed by the last fit.
+  double skippedDistanceFraction;
+
   // number of clusters to form as well as the number of centroids to generate.
   int n_clusters;
 
@@ -174,6 +232,9 @@ class KMeans {
   // method for initialization, defaults to 'k-means++':
   kmeans::InitMethod _init;
 
+  // algorithm of the iterations, defaults to Lloyd
+  kmeans::Algorithm _algorithm;
+
   MLCommon::Distance::DistanceType _metric;
 
   // optional
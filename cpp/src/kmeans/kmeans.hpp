@@ -16,6 +16,7 @@
 
 #pragma once
 
+#include <cstdint>
 #include <cuML.hpp>
 
 namespace ML {
@@ -24,6 +25,8 @@ namespace kmeans {
 
 enum InitMethod { KMeansPlusPlus, Random, Array };
 
+enum Algorithm { Lloyd, Hamerly, Elkan };
+
 /**
  * @brief Compute k-means clustering and optionally predicts cluster index for each sample in the input.
  *
@@ -43,16 +46,29 @@ enum InitMethod { KMeansPlusPlus, Random, Array };
  * @param[in|out] centroids   [in] When init is InitMethod::Array, use centroids as the initial cluster centers
  *                            [out] Otherwise, generated centroids from the kmeans algorithm is stored at the address pointed by 'centroids'.
  * @param[out]    labels      [optional] Index of the cluster each sample in X belongs to.
+ * @param[out]    inertia     [optional] Sum of the distances of the samples to their closest cluster center (sum of squared distances for the squared L2 metric).
+ * @param[out]    n_iter      [optional] Number of iterations run.
+ * @param[in]     algorithm   Algorithm of the iterations, defaults to Lloyd:
+ *                            - Algorithm::Lloyd: Compute the distances of all the samples to all the centroids at each iteration.
+ *                            - Algorithm::Hamerly: Keep an upper and one lower bound per sample to skip the distances ruled out by the triangle inequality. Requires the (squared) L2 metric.
+ *                            - Algorithm::Elkan: Same with one lower bound per sample and centroid, n_samples x n_clusters values: skips more distances for more memory. Requires the (squared) L2 metric.
+ * @param[out]    skipped_fraction [optional] Fraction of the distances of Lloyd's algorithm that were not computed, 0 for Algorithm::Lloyd.
  */
 void fit_predict(const ML::cumlHandle &handle, int n_clusters, int metric,
                  InitMethod init, int max_iter, double tol, int seed,
                  const float *X, int n_samples, int n_features,
-                 float *centroids, int *labels = 0, int verbose = 0);
+                 float *centroids, int *labels = 0, int verbose = 0,
+                 double *inertia = nullptr, int *n_iter = nullptr,
+         Algorithm algorithm = Algorithm::Lloyd,
+         double *skipped_fraction = nullptr);
 
 void fit_predict(const ML::cumlHandle &handle, int n_clusters, int metric,
                  InitMethod init, int max_iter, double tol, int seed,
                  const double *X, int n_samples, int n_features,
-                 double *centroids, int *labels = 0, int verbose = 0);
+                 double *centroids, int *labels = 0, int verbose = 0,
+                 double *inertia = nullptr, int *n_iter = nullptr,
+         Algorithm algorithm = Algorithm::Lloyd,
+         double *skipped_fraction = nullptr);
 
 /**
  * @brief Compute k-means clustering.
@@ -72,14 +88,27 @@ void fit_predict(const ML::cumlHandle &handle, int n_clusters, int metric,
  * @param[in]     n_features  Number of features or the dimensions of each sample.
  * @param[in|out] centroids   [in] When init is InitMethod::Array, use centroids as the initial cluster centers
  *                            [out] Otherwise, generated centroids from the kmeans algorithm is stored at the address pointed by 'centroids'.
+ * @param[out]    inertia     [optional] Sum of the distances of the samples to their closest cluster center (sum of squared distances for the squared L2 metric).
+ * @param[out]    n_iter      [optional] Number of iterations run.
+ * @param[in]     algorithm   Algorithm of the iterations, defaults to Lloyd:
+ *                            - Algorithm::Lloyd: Compute the distances of all the samples to all the centroids at each iteration.
+ *                            - Algorithm::Hamerly: Keep an upper and one lower bound per sample to skip the distances ruled out by the triangle inequality. Requires the (squared) L2 metric.
+ *                            - Algorithm::Elkan: Same with one lower bound per sample and centroid, n_samples x n_clusters values: skips more distances for more memory. Requires the (squared) L2 metric.
+ * @param[out]    skipped_fraction [optional] Fraction of the distances of Lloyd's algorithm that were not computed, 0 for Algorithm::Lloyd.
  */
 void fit(const ML::cumlHandle &handle, int n_clusters, int metric,
          InitMethod init, int max_iter, double tol, int seed, const float *X,
-         int n_samples, int n_features, float *centroids, int verbose = 0);
+         int n_samples, int n_features, float *centroids, int verbose = 0,
+         double *inertia = nullptr, int *n_iter = nullptr,
+         Algorithm algorithm = Algorithm::Lloyd,
+         double *skipped_fraction = nullptr);
 
 void fit(const ML::cumlHandle &handle, int n_clusters, int metric,
          InitMethod init, int max_iter, double tol, int seed, const double *X,
-         int n_samples, int n_features, double *centroids, int verbose = 0);
+         int n_samples, int n_features, double *centroids, int verbose = 0,
+         double *inertia = nullptr, int *n_iter = nullptr,
+         Algorithm algorithm = Algorithm::Lloyd,
+         double *skipped_fraction = nullptr);
 
 /**
  * @brief Predict the closest cluster each sample in X belongs to.
@@ -111,15 +140,67 @@ void predict(const ML::cumlHandle &handle, double *centroids, int n_clusters,
  * @param[in]     n_samples   Number of samples in the input X.
  * @param[in]     n_features  Number of features or the dimensions of each sample in 'X' (it should be same as the dimension for each cluster centers in 'centroids').
  * @param[in]     metric      Metric to use for distance computation. Any metric from MLCommon::Distance::DistanceType can be used 
- * @param[out]    X_new       X transformed in the new space..
+ * @param[out]    X_new       X transformed in the new space. It may be stored in host memory: the distances are then computed one batch at a time in device memory and copied to it.
+ * @param[in]     batch_size  [optional] Number of samples whose distances are computed at once, 0 for the default.
  */
 void transform(const ML::cumlHandle &handle, const float *centroids,
                int n_clusters, const float *X, int n_samples, int n_features,
-               int metric, float *X_new, int verbose = 0);
+               int metric, float *X_new, int verbose = 0, int batch_size = 0);
 
 void transform(const ML::cumlHandle &handle, const double *centroids,
                int n_clusters, const double *X, int n_samples, int n_features,
-               int metric, double *X_new, int verbose = 0);
+               int metric, double *X_new, int verbose = 0,
+               int batch_size = 0);
+
+/**
+ * @brief Find the n_nearest closest cluster centers of each sample in X and their distances. Only the distances of a batch of samples to the centers are held in device memory at a time.
+ *
+ * @param[in]     cumlHandle  The handle to the cuML library context that manages the CUDA resources.
+ * @param[in]     centroids   Cluster centroids. It must be noted that the data must be in row-major format and stored in device accessible location.
+ * @param[in]     n_clusters  The number of clusters.
+ * @param[in]     X           Samples. It must be noted that the data must be in row-major format and stored in device accessible location.
+ * @param[in]     n_samples   Number of samples in the input X.
+ * @param[in]     n_features  Number of features or the dimensions of each sample in 'X' (it should be same as the dimension for each cluster centers in 'centroids').
+ * @param[in]     metric      Metric to use for distance computation. Any metric from MLCommon::Distance::DistanceType can be used
+ * @param[in]     n_nearest   Number of centers to find for each sample, in [1, n_clusters].
+ * @param[out]    distances   [optional] Distances to the closest centers in increasing order [n_samples x n_nearest], row-major. It may be stored in host memory.
+ * @param[out]    indices     Indices of the closest centers [n_samples x n_nearest], row-major. It may be stored in host memory.
+ * @param[in]     batch_size  [optional] Number of samples whose distances are computed at once, 0 for the default.
+ */
+void nearest_centroids(const ML::cumlHandle &handle, const float *centroids,
+                       int n_clusters, const float *X, int n_samples,
+                       int n_features, int metric, int n_nearest,
+                       float *distances, int *indices, int verbose = 0,
+                       int batch_size = 0);
+
+void nearest_centroids(const ML::cumlHandle &handle, const double *centroids,
+                       int n_clusters, const double *X, int n_samples,
+                       int n_features, int metric, int n_nearest,
+                       double *distances, int *indices, int verbose = 0,
+                       int batch_size = 0);
+
+/**
+ * @brief Update the centroids with a batch of samples (mini-batch k-means). Each sample of the batch is assigned to its closest centroid, then every centroid moves to the mean of all the samples assigned to it so far, i.e. by a step of 1 / counts[i] towards each of its new samples.
+ *
+ * @param[in]     cumlHandle  The handle to the cuML library context that manages the CUDA resources.
+ * @param[inout]  centroids   Cluster centroids, updated in place. It must be noted that the data must be in row-major format and stored in device accessible location.
+ * @param[inout]  counts      Number of samples assigned to each centroid by the previous batches, updated in place. Stored in device accessible location.
+ * @param[in]     n_clusters  The number of clusters.
+ * @param[in]     X           The batch of samples. It must be noted that the data must be in row-major format and stored in device accessible location.
+ * @param[in]     n_samples   Number of samples in the input X.
+ * @param[in]     n_features  Number of features or the dimensions of each sample in 'X' (it should be same as the dimension for each cluster centers in 'centroids').
+ * @param[in]     metric      Metric to use for distance computation. Any metric from MLCommon::Distance::DistanceType can be used
+ * @return        Sum of the distances of the samples of the batch to their closest centroid before the update (the inertia of the batch for the squared L2 metric).
+ */
+double partial_fit(const ML::cumlHandle &handle, float *centroids,
+                   int64_t *counts, int n_clusters, const float *X,
+                   int n_samples, int n_features, int metric,
+                   int verbose = 0);
+
+double partial_fit(const ML::cumlHandle &handle, double *centroids,
+                   int64_t *counts, int n_clusters, const double *X,
+                   int n_samples, int n_features, int metric,
+                   int verbose = 0);
 
 };  // end namespace kmeans
 };  // end namespace ML
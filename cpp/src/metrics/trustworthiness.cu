@@ -30,23 +30,25 @@ namespace Metrics {
         * @input param m: Number of features in high/original dimension
         * @input param d: Number of features in low/embedded dimension
         * @input param n_neighbors: Number of neighbors considered by trustworthiness score
+        * @input param batch_size: Number of samples whose distances to all the samples are computed at once
         * @input tparam distance_type: Distance type to consider
         * @return Trustworthiness score
         */
 template <typename math_t, MLCommon::Distance::DistanceType distance_type>
 double trustworthiness_score(const cumlHandle& h, math_t* X, math_t* X_embedded,
-                             int n, int m, int d, int n_neighbors) {
+                             int n, int m, int d, int n_neighbors,
+                             int batch_size) {
   cudaStream_t stream = h.getStream();
   auto d_alloc = h.getDeviceAllocator();
 
   return MLCommon::Score::trustworthiness_score<math_t, distance_type>(
-    X, X_embedded, n, m, d, n_neighbors, d_alloc, stream);
+    X, X_embedded, n, m, d, n_neighbors, d_alloc, stream, batch_size);
 }
 
 template double
 trustworthiness_score<float, MLCommon::Distance::EucUnexpandedL2Sqrt>(
   const cumlHandle& h, float* X, float* X_embedded, int n, int m, int d,
-  int n_neighbors);
+  int n_neighbors, int batch_size);
 
 };  //end namespace Metrics
 };  //end namespace ML
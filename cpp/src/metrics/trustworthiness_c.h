@@ -40,7 +40,8 @@ namespace Metrics {
 
 template <typename math_t, DistanceType distance_type>
 double trustworthiness_score(const cumlHandle& h, math_t* X, math_t* X_embedded,
-                             int n, int m, int d, int n_neighbors);
+                             int n, int m, int d, int n_neighbors,
+                             int batch_size = 512);
 
 }
 }  // namespace ML
\ No newline at end of file
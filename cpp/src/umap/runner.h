@@ -35,6 +35,7 @@
 #include "sparse/coo.h"
 #include "sparse/csr.h"
 
+#include "common/profiler.hpp"
 #include "cuda_utils.h"
 
 #include <cuda_runtime.h>
@@ -112,13 +113,19 @@ void _fit(const cumlHandle &handle,
   MLCommon::allocate(knn_indices, n * k);
   MLCommon::allocate(knn_dists, n * k);
 
-  kNNGraph::run(X, n, d, knn_indices, knn_dists, k, params, stream);
+  {
+    ScopedStage scoped_stage("UMAP", "knn_graph", stream);
+    kNNGraph::run(X, n, d, knn_indices, knn_dists, k, params, stream);
+  }
   CUDA_CHECK(cudaPeekAtLastError());
 
   COO<T> rgraph_coo;
 
-  FuzzySimplSet::run<TPB_X, T>(n, knn_indices, knn_dists, k, &rgraph_coo,
-                               params, stream);
+  {
+    ScopedStage scoped_stage("UMAP", "fuzzy_simpl_set", stream);
+    FuzzySimplSet::run<TPB_X, T>(n, knn_indices, knn_dists, k, &rgraph_coo,
+                                 params, stream);
+  }
 
   /**
 		 * Remove zeros from simplicial set
@@ -134,14 +141,20 @@ void _fit(const cumlHandle &handle,
   /**
          * Run initialization method
          */
-  InitEmbed::run(handle, X, n, d, knn_indices, knn_dists, &cgraph_coo, params,
-                 embeddings, stream, params->init);
+  {
+    ScopedStage scoped_stage("UMAP", "init_embed", stream);
+    InitEmbed::run(handle, X, n, d, knn_indices, knn_dists, &cgraph_coo, params,
+                   embeddings, stream, params->init);
+  }
 
   /**
 		 * Run simplicial set embedding to approximate low-dimensional representation
 		 */
-  SimplSetEmbed::run<TPB_X, T>(X, n, d, &cgraph_coo, params, embeddings,
-                               stream);
+  {
+    ScopedStage scoped_stage("UMAP", "optimize", stream);
+    SimplSetEmbed::run<TPB_X, T>(X, n, d, &cgraph_coo, params, embeddings,
+                                 stream);
+  }
 
   CUDA_CHECK(cudaFree(knn_dists));
   CUDA_CHECK(cudaFree(knn_indices));
@@ -170,7 +183,10 @@ void _fit(const cumlHandle &handle,
   MLCommon::allocate(knn_indices, n * k, true);
   MLCommon::allocate(knn_dists, n * k, true);
 
-  kNNGraph::run(X, n, d, knn_indices, knn_dists, k, params, stream);
+  {
+    ScopedStage scoped_stage("UMAP", "knn_graph", stream);
+    kNNGraph::run(X, n, d, knn_indices, knn_dists, k, params, stream);
+  }
   CUDA_CHECK(cudaPeekAtLastError());
 
   /**
@@ -183,8 +199,11 @@ void _fit(const cumlHandle &handle,
          * Run Fuzzy simplicial set
          */
   //int nnz = n*k*2;
-  FuzzySimplSet::run<TPB_X, T>(n, knn_indices, knn_dists, params->n_neighbors,
-                               &tmp_coo, params, stream);
+  {
+    ScopedStage scoped_stage("UMAP", "fuzzy_simpl_set", stream);
+    FuzzySimplSet::run<TPB_X, T>(n, knn_indices, knn_dists, params->n_neighbors,
+                                 &tmp_coo, params, stream);
+  }
   CUDA_CHECK(cudaPeekAtLastError());
 
   MLCommon::Sparse::coo_remove_zeros<TPB_X, T>(&tmp_coo, &rgraph_coo, stream);
@@ -195,20 +214,23 @@ void _fit(const cumlHandle &handle,
          * If target metric is 'categorical', perform
          * categorical simplicial set intersection.
          */
-  if (params->target_metric == ML::UMAPParams::MetricType::CATEGORICAL) {
-    if (params->verbose)
-      std::cout << "Performing categorical intersection" << std::endl;
-    Supervised::perform_categorical_intersection<TPB_X, T>(
-      y, &rgraph_coo, &final_coo, params, stream);
-
-    /**
-         * Otherwise, perform general simplicial set intersection
-         */
-  } else {
-    if (params->verbose)
-      std::cout << "Performing general intersection" << std::endl;
-    Supervised::perform_general_intersection<TPB_X, T>(
-      handle, y, &rgraph_coo, &final_coo, params, stream);
+  {
+    ScopedStage scoped_stage("UMAP", "intersection", stream);
+    if (params->target_metric == ML::UMAPParams::MetricType::CATEGORICAL) {
+      if (params->verbose)
+        std::cout << "Performing categorical intersection" << std::endl;
+      Supervised::perform_categorical_intersection<TPB_X, T>(
+        y, &rgraph_coo, &final_coo, params, stream);
+
+      /**
+           * Otherwise, perform general simplicial set intersection
+           */
+    } else {
+      if (params->verbose)
+        std::cout << "Performing general intersection" << std::endl;
+      Supervised::perform_general_intersection<TPB_X, T>(
+        handle, y, &rgraph_coo, &final_coo, params, stream);
+    }
   }
 
   /**
@@ -222,13 +244,19 @@ void _fit(const cumlHandle &handle,
   /**
          * Initialize embeddings
          */
-  InitEmbed::run(handle, X, n, d, knn_indices, knn_dists, &ocoo, params,
-                 embeddings, stream, params->init);
+  {
+    ScopedStage scoped_stage("UMAP", "init_embed", stream);
+    InitEmbed::run(handle, X, n, d, knn_indices, knn_dists, &ocoo, params,
+                   embeddings, stream, params->init);
+  }
 
   /**
          * Run simplicial set embedding to approximate low-dimensional representation
          */
-  SimplSetEmbed::run<TPB_X, T>(X, n, d, &ocoo, params, embeddings, stream);
+  {
+    ScopedStage scoped_stage("UMAP", "optimize", stream);
+    SimplSetEmbed::run<TPB_X, T>(X, n, d, &ocoo, params, embeddings, stream);
+  }
 
   CUDA_CHECK(cudaPeekAtLastError());
 
@@ -253,8 +281,11 @@ void _transform(const cumlHandle &handle, float *X, int n, int d, float *orig_X,
   MLCommon::allocate(knn_indices, n * params->n_neighbors);
   MLCommon::allocate(knn_dists, n * params->n_neighbors);
 
-  kNNGraph::run(orig_X, orig_n, d, knn_indices, knn_dists, params->n_neighbors,
-                params, stream);
+  {
+    ScopedStage scoped_stage("UMAP", "knn_graph", stream);
+    kNNGraph::run(orig_X, orig_n, d, knn_indices, knn_dists, params->n_neighbors,
+                  params, stream);
+  }
 
   CUDA_CHECK(cudaPeekAtLastError());
 
@@ -276,9 +307,12 @@ void _transform(const cumlHandle &handle, float *X, int n, int d, float *orig_X,
   dim3 grid_n(MLCommon::ceildiv(n, TPB_X), 1, 1);
   dim3 blk(TPB_X, 1, 1);
 
-  FuzzySimplSetImpl::smooth_knn_dist<TPB_X, T>(
-    n, knn_indices, knn_dists, rhos, sigmas, params, params->n_neighbors,
-    adjusted_local_connectivity, stream);
+  {
+    ScopedStage scoped_stage("UMAP", "fuzzy_simpl_set", stream);
+    FuzzySimplSetImpl::smooth_knn_dist<TPB_X, T>(
+      n, knn_indices, knn_dists, rhos, sigmas, params, params->n_neighbors,
+      adjusted_local_connectivity, stream);
+  }
 
   /**
          * Compute graph of membership strengths
@@ -314,9 +348,12 @@ void _transform(const cumlHandle &handle, float *X, int n, int d, float *orig_X,
     row_ind, graph_coo.vals, graph_coo.nnz, graph_coo.n_rows, vals_normed,
     stream);
 
-  init_transform<TPB_X, T><<<grid_n, blk, 0, stream>>>(
-    graph_coo.cols, vals_normed, graph_coo.n_rows, embedding, embedding_n,
-    params->n_components, transformed, params->n_neighbors);
+  {
+    ScopedStage scoped_stage("UMAP", "init_embed", stream);
+    init_transform<TPB_X, T><<<grid_n, blk, 0, stream>>>(
+      graph_coo.cols, vals_normed, graph_coo.n_rows, embedding, embedding_n,
+      params->n_components, transformed, params->n_neighbors);
+  }
   CUDA_CHECK(cudaPeekAtLastError());
 
   CUDA_CHECK(cudaFree(vals_normed));
@@ -358,10 +395,13 @@ void _transform(const cumlHandle &handle, float *X, int n, int d, float *orig_X,
   SimplSetEmbedImpl::make_epochs_per_sample(
     comp_coo.vals, comp_coo.nnz, params->n_epochs, epochs_per_sample, stream);
 
-  SimplSetEmbedImpl::optimize_layout<TPB_X, T>(
-    transformed, n, embedding, embedding_n, comp_coo.rows, comp_coo.cols,
-    comp_coo.nnz, epochs_per_sample, n, params->repulsion_strength, params,
-    n_epochs, stream);
+  {
+    ScopedStage scoped_stage("UMAP", "optimize", stream);
+    SimplSetEmbedImpl::optimize_layout<TPB_X, T>(
+      transformed, n, embedding, embedding_n, comp_coo.rows, comp_coo.cols,
+      comp_coo.nnz, epochs_per_sample, n, params->repulsion_strength, params,
+      n_epochs, stream);
+  }
 
   CUDA_CHECK(cudaFree(knn_dists));
   CUDA_CHECK(cudaFree(knn_indices));
@@ -24,6 +24,7 @@
 #include <memory>
 
 #include "common/cuml_allocator.hpp"
+#include "common/device_buffer.hpp"
 
 #include "selection/knn.h"
 #include "distance/distance.h"
@@ -79,30 +80,23 @@ namespace MLCommon {
       * @param input Input matrix holding the dataset
       * @param n Number of samples
       * @param d Number of features
+      * @param d_pred_I Output matrix holding the indexes of the nearest neighbors
       * @param d_alloc the device allocator to use for temp device memory
       * @param stream cuda stream to use
-      * @return Matrix holding the indexes of the nearest neighbors
       */
       template<typename math_t>
-      long* get_knn_indexes(math_t* input, int n,
-                            int d, int n_neighbors,
-                            std::shared_ptr<deviceAllocator> d_alloc,
-                            cudaStream_t stream)
+      void get_knn_indexes(math_t* input, int n,
+                           int d, int n_neighbors, long* d_pred_I,
+                           std::shared_ptr<deviceAllocator> d_alloc,
+                           cudaStream_t stream)
       {
-          long* d_pred_I = (long*)d_alloc->allocate(n * n_neighbors * sizeof(long), stream);
-          math_t* d_pred_D = (math_t*)d_alloc->allocate(n * n_neighbors * sizeof(math_t), stream);
+          device_buffer<math_t> d_pred_D(d_alloc, stream, n * n_neighbors);
 
-          float **ptrs = new float*[1];
-          ptrs[0] = input;
-
-          int *sizes = new int[1];
-          sizes[0] = n;
+          float* ptrs[1] = {input};
+          int sizes[1] = {n};
 
           MLCommon::Selection::brute_force_knn(ptrs, sizes, 1, d,
-              input, n, d_pred_I, d_pred_D, n_neighbors, stream);
-
-          d_alloc->deallocate(d_pred_D, n * n_neighbors * sizeof(math_t), stream);
-          return d_pred_I;
+              input, n, d_pred_I, d_pred_D.data(), n_neighbors, stream);
       }
 
       /**
@@ -116,6 +110,7 @@ namespace MLCommon {
       * @param n_neighbors Number of neighbors considered by trustworthiness score
       * @param d_alloc device allocator to use for temp device memory
       * @param stream the cuda stream to use
+      * @param batchSize Number of samples whose distances to all the samples are computed at once
       * @return Trustworthiness score
       */
       template<typename math_t, Distance::DistanceType distance_type>
@@ -123,43 +118,52 @@ namespace MLCommon {
                           math_t* X_embedded, int n, int m, int d,
                           int n_neighbors,
                           std::shared_ptr<deviceAllocator> d_alloc,
-                          cudaStream_t stream)
+                          cudaStream_t stream,
+                          int batchSize = MAX_BATCH_SIZE)
       {
-          const int TMP_SIZE = MAX_BATCH_SIZE * n;
+          const int TMP_SIZE = batchSize * n;
 
           size_t workspaceSize = 0; // EucUnexpandedL2Sqrt does not require workspace (may need change for other distances)
           typedef cutlass::Shape<8, 128, 128> OutputTile_t;
           bool bAllocWorkspace = false;
 
-          math_t* d_pdist_tmp = (math_t*)d_alloc->allocate(TMP_SIZE * sizeof(math_t), stream);
-          int* d_ind_X_tmp = (int*)d_alloc->allocate(TMP_SIZE * sizeof(int), stream);
-
-          long* ind_X_embedded = get_knn_indexes(
+          // The buffers are released when an allocation throws, e.g. when the
+          // device is out of memory, so that the caller can retry
+          device_buffer<math_t> pdist_tmp(d_alloc, stream, TMP_SIZE);
+          device_buffer<int> ind_X_tmp(d_alloc, stream, TMP_SIZE);
+          math_t* d_pdist_tmp = pdist_tmp.data();
+          int* d_ind_X_tmp = ind_X_tmp.data();
+
+          device_buffer<long> ind_X_embedded_buffer(
+              d_alloc, stream, n * (n_neighbors + 1));
+          long* ind_X_embedded = ind_X_embedded_buffer.data();
+          get_knn_indexes(
               X_embedded,
-              n, d, n_neighbors + 1,
+              n, d, n_neighbors + 1, ind_X_embedded,
               d_alloc, stream);
 
           double t_tmp = 0.0;
           double t = 0.0;
-          double* d_t = (double*)d_alloc->allocate(sizeof(double), stream);
+          device_buffer<double> t_buffer(d_alloc, stream, 1);
+          double* d_t = t_buffer.data();
 
           int toDo = n;
           while (toDo > 0)
           {
-              int batchSize = min(toDo, MAX_BATCH_SIZE);
-              // Takes at most MAX_BATCH_SIZE vectors at a time
+              int curBatchSize = min(toDo, batchSize);
+              // Takes at most batchSize vectors at a time
 
               MLCommon::Distance::distance<distance_type, math_t, math_t, math_t, OutputTile_t>
                       (&X[(n - toDo) * m], X,
                       d_pdist_tmp,
-                      batchSize, n, m,
+                      curBatchSize, n, m,
                       (void*)nullptr, workspaceSize,
                       stream
               );
               CUDA_CHECK(cudaPeekAtLastError());
 
               MLCommon::Selection::sortColumnsPerRow(d_pdist_tmp, d_ind_X_tmp,
-                                  batchSize, n,
+                                  curBatchSize, n,
                                   bAllocWorkspace, NULL, workspaceSize,
                                   stream);
               CUDA_CHECK(cudaPeekAtLastError());
@@ -167,29 +171,24 @@ namespace MLCommon {
               t_tmp = 0.0;
               updateDevice(d_t, &t_tmp, 1, stream);
 
-              int work = batchSize * n_neighbors;
+              int work = curBatchSize * n_neighbors;
               int n_blocks = work / N_THREADS + 1;
               compute_rank<<<n_blocks, N_THREADS, 0, stream>>>(d_ind_X_tmp,
                       &ind_X_embedded[(n - toDo) * (n_neighbors+1)],
                       n,
                       n_neighbors,
-                      batchSize * n_neighbors,
+                      curBatchSize * n_neighbors,
                       d_t);
               CUDA_CHECK(cudaPeekAtLastError());
 
               updateHost(&t_tmp, d_t, 1, stream);
               t += t_tmp;
 
-              toDo -= batchSize;
+              toDo -= curBatchSize;
           }
 
           t = 1.0 - ((2.0 / ((n * n_neighbors) * ((2.0 * n) - (3.0 * n_neighbors) - 1.0))) * t);
 
-          d_alloc->deallocate(ind_X_embedded, n * (n_neighbors + 1) * sizeof(long), stream);
-          d_alloc->deallocate(d_pdist_tmp, TMP_SIZE * sizeof(math_t), stream);
-          d_alloc->deallocate(d_ind_X_tmp, TMP_SIZE * sizeof(int), stream);
-          d_alloc->deallocate(d_t, sizeof(double), stream);
-
           return t;
       }
 
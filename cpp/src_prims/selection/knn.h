@@ -25,6 +25,7 @@
 #include <faiss/gpu/IndexProxy.h>
 #include <faiss/gpu/StandardGpuResources.h>
 
+#include <exception>
 #include <iostream>
 
 namespace MLCommon {
@@ -131,6 +132,11 @@ void brute_force_knn(float **input, int *sizes, int n_params, IntType D,
   ASSERT_DEVICE_MEM(res_I, "output index array");
   ASSERT_DEVICE_MEM(res_D, "output distance array");
 
+  // First exception thrown by a partition, rethrown once all are done so
+  // that the caller can react to it, e.g. retry on a smaller query batch
+  // when the device is out of memory
+  std::exception_ptr error = nullptr;
+
 #pragma omp parallel
   {
 #pragma omp for
@@ -138,56 +144,64 @@ void brute_force_knn(float **input, int *sizes, int n_params, IntType D,
       const float *ptr = input[i];
       IntType size = sizes[i];
 
-      cudaPointerAttributes att;
-      cudaError_t err = cudaPointerGetAttributes(&att, ptr);
+      cudaStream_t stream = nullptr;
+
+      try {
+        cudaPointerAttributes att;
+        cudaError_t err = cudaPointerGetAttributes(&att, ptr);
+        ASSERT(err == 0 && att.device > -1,
+               "Input memory for %p failed. isDevice?=%d, N=%d", ptr,
+               att.devicePointer != nullptr, sizes[i]);
 
-      if (err == 0 && att.device > -1) {
         CUDA_CHECK(cudaSetDevice(att.device));
         CUDA_CHECK(cudaPeekAtLastError());
 
-        try {
-          faiss::gpu::StandardGpuResources gpu_res;
-
-          cudaStream_t stream;
-          CUDA_CHECK(cudaStreamCreate(&stream));
+        faiss::gpu::StandardGpuResources gpu_res;
 
-          gpu_res.noTempMemory();
-          gpu_res.setCudaMallocWarning(false);
-          gpu_res.setDefaultStream(att.device, stream);
+        CUDA_CHECK(cudaStreamCreate(&stream));
 
-          faiss::gpu::bruteForceKnn(
-            &gpu_res, faiss::METRIC_L2, ptr, size, search_items, n, D, k,
-            all_D + (long(i) * k * long(n)), all_I + (long(i) * k * long(n)));
+        gpu_res.noTempMemory();
+        gpu_res.setCudaMallocWarning(false);
+        gpu_res.setDefaultStream(att.device, stream);
 
-          CUDA_CHECK(cudaPeekAtLastError());
-          CUDA_CHECK(cudaStreamSynchronize(stream));
-
-          CUDA_CHECK(cudaStreamDestroy(stream));
-
-        } catch (const std::exception &e) {
-          std::cout << "Exception occurred: " << e.what() << std::endl;
-        }
+        faiss::gpu::bruteForceKnn(
+          &gpu_res, faiss::METRIC_L2, ptr, size, search_items, n, D, k,
+          all_D + (long(i) * k * long(n)), all_I + (long(i) * k * long(n)));
 
-      } else {
-        std::stringstream ss;
-        ss << "Input memory for " << ptr
-           << " failed. isDevice?=" << att.devicePointer << ", N=" << sizes[i];
-        std::cout << "Exception: " << ss.str() << std::endl;
+        CUDA_CHECK(cudaPeekAtLastError());
+        CUDA_CHECK(cudaStreamSynchronize(stream));
+      } catch (...) {
+#pragma omp critical
+        if (error == nullptr) error = std::current_exception();
       }
+
+      // Outside of the try block, so that it is not leaked when faiss throws
+      if (stream != nullptr) cudaStreamDestroy(stream);
     }
   }
 
+  if (error != nullptr) {
+    delete[] all_D;
+    delete[] all_I;
+    delete[] result_D;
+    delete[] result_I;
+    delete id_ranges;
+    std::rethrow_exception(error);
+  }
+
   merge_tables<faiss::CMin<float, IntType>>(
     long(n), k, n_params, result_D, result_I, all_D, all_I, id_ranges->data());
 
   MLCommon::updateDevice(res_D, result_D, k * size_t(n), s);
   MLCommon::updateDevice(res_I, result_I, k * size_t(n), s);
 
-  delete all_D;
-  delete all_I;
+  delete[] all_D;
+  delete[] all_I;
+
+  delete[] result_D;
+  delete[] result_I;
 
-  delete result_D;
-  delete result_I;
+  delete id_ranges;
 };
 
 };  // namespace Selection
@@ -14,40 +14,100 @@
 # limitations under the License.
 #
 
-from cuml.common.base import Base
-from cuml.common.handle import Handle
-import cuml.common.cuda as cuda
+import importlib
+import importlib.util
+import sys
 
-from cuml.cluster.dbscan import DBSCAN
-from cuml.cluster.kmeans import KMeans
+from ._version import get_versions
+__version__ = get_versions()['version']
+del get_versions
 
-from cuml.decomposition.pca import PCA
-from cuml.decomposition.tsvd import TruncatedSVD
+# The public names of the package and the module defining each of them. They
+# are imported on first access (PEP 562), so that `import cuml` does not pull
+# in cuDF, Numba and CuPy until an estimator is actually used. A name mapped
+# to None is the module itself.
+_lazy_names = {
+    'Base': ('cuml.common.base', 'Base'),
+    'Handle': ('cuml.common.handle', 'Handle'),
+    'using_handle': ('cuml.common.handle', 'using_handle'),
+    'StreamExecutor': ('cuml.common.executor', 'StreamExecutor'),
+    'profile': ('cuml.common.profiler', 'profile'),
+    'warmup': ('cuml.common.warmup', 'warmup'),
+    'cuda': ('cuml.common.cuda', None),
 
-from cuml.filter.kalman_filter import KalmanFilter
+    'DBSCAN': ('cuml.cluster.dbscan', 'DBSCAN'),
+    'KMeans': ('cuml.cluster.kmeans', 'KMeans'),
+    'MiniBatchKMeans': ('cuml.cluster.minibatch_kmeans',
+                        'MiniBatchKMeans'),
 
-from cuml.linear_model.linear_regression import LinearRegression
-from cuml.linear_model.ridge import Ridge
-from cuml.linear_model.lasso import Lasso
-from cuml.linear_model.elastic_net import ElasticNet
+    'PCA': ('cuml.decomposition.pca', 'PCA'),
+    'TruncatedSVD': ('cuml.decomposition.tsvd', 'TruncatedSVD'),
 
-from cuml.metrics.regression import r2_score
+    'KalmanFilter': ('cuml.filter.kalman_filter', 'KalmanFilter'),
 
-from cuml.neighbors.nearest_neighbors import NearestNeighbors
+    'LinearRegression': ('cuml.linear_model.linear_regression',
+                         'LinearRegression'),
+    'Ridge': ('cuml.linear_model.ridge', 'Ridge'),
+    'Lasso': ('cuml.linear_model.lasso', 'Lasso'),
+    'ElasticNet': ('cuml.linear_model.elastic_net', 'ElasticNet'),
 
-from cuml.utils.pointer_utils import device_of_gpu_matrix
+    'r2_score': ('cuml.metrics.regression', 'r2_score'),
 
-from cuml.solvers.sgd import SGD
-from cuml.solvers.cd import CD
+    'NearestNeighbors': ('cuml.neighbors.nearest_neighbors',
+                         'NearestNeighbors'),
 
-from cuml.manifold.umap import UMAP
+    'device_of_gpu_matrix': ('cuml.utils.pointer_utils',
+                             'device_of_gpu_matrix'),
+    'set_global_output_type': ('cuml.utils.output_utils',
+                               'set_global_output_type'),
+    'using_output_type': ('cuml.utils.output_utils', 'using_output_type'),
 
-from cuml.random_projection.random_projection import GaussianRandomProjection, SparseRandomProjection, johnson_lindenstrauss_min_dim
+    'SGD': ('cuml.solvers.sgd', 'SGD'),
+    'CD': ('cuml.solvers.cd', 'CD'),
 
-from cuml.preprocessing.LabelEncoder import LabelEncoder
+    'UMAP': ('cuml.manifold.umap', 'UMAP'),
 
-from cuml.ensemble.randomforest import RandomForestClassifier
+    'GaussianRandomProjection': ('cuml.random_projection.random_projection',
+                                 'GaussianRandomProjection'),
+    'SparseRandomProjection': ('cuml.random_projection.random_projection',
+                               'SparseRandomProjection'),
+    'johnson_lindenstrauss_min_dim': (
+        'cuml.random_projection.random_projection',
+        'johnson_lindenstrauss_min_dim'),
 
-from ._version import get_versions
-__version__ = get_versions()['version']
-del get_versions
+    'LabelEncoder': ('cuml.preprocessing.LabelEncoder', 'LabelEncoder'),
+
+    'RandomForestClassifier': ('cuml.ensemble.randomforest',
+                               'RandomForestClassifier'),
+}
+
+__all__ = list(_lazy_names)
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _lazy_names[name]
+    except KeyError:
+        # Subpackages like cuml.metrics, imported on first access as well
+        module_name, attr = 'cuml.' + name, None
+        if importlib.util.find_spec(module_name) is None:
+            raise AttributeError("module 'cuml' has no attribute '" + name +
+                                 "'")
+
+    value = importlib.import_module(module_name)
+    if attr is not None:
+        value = getattr(value, attr)
+    # Cache it, later lookups do not go through __getattr__ anymore
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_names))
+
+
+if sys.version_info < (3, 7):
+    # No module __getattr__ before Python 3.7, import everything upfront
+    for _name in _lazy_names:
+        __getattr__(_name)
+    del _name
@@ -0,0 +1,81 @@
+#
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Runs the cuML benchmarks from the command line, e.g.
+
+    python -m cuml.benchmark --algorithms KMeans,PCA --rows 10000,100000 \
+        --cols 32 --dtypes float32 --json results.json --csv results.csv
+"""
+
+import argparse
+
+from cuml.benchmark import runner, startup
+
+
+def _list(cast):
+    return lambda value: [cast(item) for item in value.split(',') if item]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cuml.benchmark',
+        description="Times fit, predict and transform of the cuML "
+                    "estimators, and of their CPU counterparts.")
+    parser.add_argument('--algorithms', type=_list(str), default=None,
+                        help="comma separated names (default: all)")
+    parser.add_argument('--rows', type=_list(int),
+                        default=list(runner.DEFAULT_N_ROWS))
+    parser.add_argument('--cols', type=_list(int),
+                        default=list(runner.DEFAULT_N_COLS))
+    parser.add_argument('--dtypes', type=_list(str),
+                        default=list(runner.DEFAULT_DTYPES))
+    parser.add_argument('--backends', type=_list(str),
+                        default=list(runner.DEFAULT_BACKENDS),
+                        help="among cuml and cpu (default: both)")
+    parser.add_argument('--n-reps', type=int, default=3)
+    parser.add_argument('--random-state', type=int, default=0)
+    parser.add_argument('--import-time', action='store_true',
+                        help="also time `import cuml` in fresh processes")
+    parser.add_argument('--first-call', action='store_true',
+                        help="also time the first calls of fresh processes, "
+                             "without and with cuml.warmup")
+    parser.add_argument('--kernel-cache',
+                        help="kernel cache directory of the warmed up "
+                             "processes of --first-call")
+    parser.add_argument('--json', help="path of the JSON results")
+    parser.add_argument('--csv', help="path of the CSV results")
+    args = parser.parse_args(argv)
+
+    results = runner.run(args.algorithms, n_rows=args.rows, n_cols=args.cols,
+                         dtypes=args.dtypes, backends=args.backends,
+                         n_reps=args.n_reps, random_state=args.random_state)
+    if args.import_time:
+        results.append(startup.import_time(n_reps=args.n_reps))
+    if args.first_call:
+        results.extend(startup.first_call_time(
+            args.algorithms, n_rows=args.rows, n_cols=args.cols,
+            dtypes=args.dtypes, n_reps=args.n_reps,
+            cache_dir=args.kernel_cache))
+    print(runner.format_results(results))
+    if args.json:
+        runner.write_json(results, args.json)
+    if args.csv:
+        runner.write_csv(results, args.csv)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+#
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import importlib
+
+
+class Algorithm(object):
+    """
+    An estimator benchmarked by `cuml.benchmark.run`, with its CPU
+    counterpart.
+
+    Parameters
+    ----------
+    name : str
+        Name of the algorithm in the results.
+    cuml_class : class or str
+        The cuML estimator, or its import path as 'module:Class'.
+    cpu_class : class or str or None
+        The scikit-learn (or other CPU library) estimator to compare with,
+        or its import path as 'module:Class'.
+    cuml_params, cpu_params : dict
+        Parameters of the estimators. They should make both estimators do
+        the same work.
+    target : {None, 'regression', 'classification'}
+        Kind of target `fit` takes, None for unsupervised estimators.
+    methods : list of str
+        Methods timed after `fit`, all called with the training data.
+    """
+
+    def __init__(self, name, cuml_class, cpu_class=None, cuml_params=None,
+                 cpu_params=None, target=None, methods=()):
+        self.name = name
+        self.cuml_class = cuml_class
+        self.cpu_class = cpu_class
+        self.cuml_params = cuml_params or {}
+        self.cpu_params = cpu_params or {}
+        self.target = target
+        self.methods = tuple(methods)
+
+    def estimator_class(self, backend):
+        """
+        Returns the class of the estimator of `backend`, 'cuml' or 'cpu'.
+        Raises ImportError if the backend is not available on the machine.
+        """
+        if backend == 'cuml':
+            estimator_class = self.cuml_class
+        elif backend == 'cpu':
+            estimator_class = self.cpu_class
+        else:
+            raise ValueError("Expected backend 'cuml' or 'cpu' but got " +
+                             str(backend) + ".")
+
+        if estimator_class is None:
+            raise ImportError("No " + backend + " estimator for " +
+                              self.name + ".")
+        if isinstance(estimator_class, str):
+            module, name = estimator_class.split(':')
+            estimator_class = getattr(importlib.import_module(module), name)
+        return estimator_class
+
+    def params(self, backend):
+        return self.cuml_params if backend == 'cuml' else self.cpu_params
+
+    def __repr__(self):
+        return "Algorithm(" + repr(self.name) + ")"
+
+
+# The estimators of `cuml` that take a feature matrix. KalmanFilter and
+# LabelEncoder have other interfaces and are not benchmarked.
+_algorithms = [
+    Algorithm('LinearRegression',
+              'cuml.linear_model.linear_regression:LinearRegression',
+              'sklearn.linear_model:LinearRegression',
+              target='regression', methods=['predict']),
+    Algorithm('Ridge', 'cuml.linear_model.ridge:Ridge',
+              'sklearn.linear_model:Ridge',
+              target='regression', methods=['predict']),
+    Algorithm('Lasso', 'cuml.linear_model.lasso:Lasso',
+              'sklearn.linear_model:Lasso',
+              cuml_params={'alpha': 0.1}, cpu_params={'alpha': 0.1},
+              target='regression', methods=['predict']),
+    Algorithm('ElasticNet', 'cuml.linear_model.elastic_net:ElasticNet',
+              'sklearn.linear_model:ElasticNet',
+              cuml_params={'alpha': 0.1}, cpu_params={'alpha': 0.1},
+              target='regression', methods=['predict']),
+    Algorithm('SGD', 'cuml.solvers.sgd:SGD',
+              'sklearn.linear_model:SGDRegressor',
+              cuml_params={'epochs': 10, 'eta0': 0.001, 'tol': 0.0},
+              cpu_params={'max_iter': 10, 'eta0': 0.001, 'tol': None,
+                          'learning_rate': 'constant', 'penalty': 'none'},
+              target='regression', methods=['predict']),
+    Algorithm('CD', 'cuml.solvers.cd:CD',
+              'sklearn.linear_model:ElasticNet',
+              cpu_params={'alpha': 0.0001, 'l1_ratio': 0.15},
+              target='regression', methods=['predict']),
+    Algorithm('PCA', 'cuml.decomposition.pca:PCA',
+              'sklearn.decomposition:PCA',
+              cuml_params={'n_components': 2},
+              cpu_params={'n_components': 2, 'svd_solver': 'full'},
+              methods=['transform']),
+    Algorithm('TruncatedSVD', 'cuml.decomposition.tsvd:TruncatedSVD',
+              'sklearn.decomposition:TruncatedSVD',
+              cuml_params={'n_components': 2},
+              cpu_params={'n_components': 2, 'algorithm': 'arpack'},
+              methods=['transform']),
+    Algorithm('KMeans', 'cuml.cluster.kmeans:KMeans',
+              'sklearn.cluster:KMeans',
+              cuml_params={'n_clusters': 8, 'max_iter': 100},
+              cpu_params={'n_clusters': 8, 'max_iter': 100, 'n_init': 1},
+              methods=['predict', 'transform']),
+    Algorithm('MiniBatchKMeans',
+              'cuml.cluster.minibatch_kmeans:MiniBatchKMeans',
+              'sklearn.cluster:MiniBatchKMeans',
+              cuml_params={'n_clusters': 8, 'batch_size': 1024},
+              cpu_params={'n_clusters': 8, 'batch_size': 1024,
+                          'compute_labels': False, 'n_init': 1},
+              methods=['predict']),
+    Algorithm('DBSCAN', 'cuml.cluster.dbscan:DBSCAN',
+              'sklearn.cluster:DBSCAN',
+              cuml_params={'eps': 3, 'min_samples': 2},
+              cpu_params={'eps': 3, 'min_samples': 2, 'algorithm': 'brute'}),
+    Algorithm('NearestNeighbors',
+              'cuml.neighbors.nearest_neighbors:NearestNeighbors',
+              'sklearn.neighbors:NearestNeighbors',
+              cuml_params={'n_neighbors': 10},
+              cpu_params={'n_neighbors': 10, 'algorithm': 'brute'},
+              methods=['kneighbors']),
+    Algorithm('UMAP', 'cuml.manifold.umap:UMAP', 'umap:UMAP',
+              cuml_params={'n_neighbors': 5, 'n_epochs': 500},
+              cpu_params={'n_neighbors': 5, 'n_epochs': 500,
+                          'init': 'random'},
+              methods=['transform']),
+    Algorithm('GaussianRandomProjection',
+              'cuml.random_projection.random_projection:'
+              'GaussianRandomProjection',
+              'sklearn.random_projection:GaussianRandomProjection',
+              cuml_params={'n_components': 4},
+              cpu_params={'n_components': 4},
+              methods=['transform']),
+    Algorithm('SparseRandomProjection',
+              'cuml.random_projection.random_projection:'
+              'SparseRandomProjection',
+              'sklearn.random_projection:SparseRandomProjection',
+              cuml_params={'n_components': 4},
+              cpu_params={'n_components': 4, 'dense_output': True},
+              methods=['transform']),
+    Algorithm('RandomForestClassifier',
+              'cuml.ensemble.randomforest:RandomForestClassifier',
+              'sklearn.ensemble:RandomForestClassifier',
+              cuml_params={'n_estimators': 10, 'max_depth': 16},
+              cpu_params={'n_estimators': 10, 'max_depth': 16},
+              target='classification', methods=['predict']),
+]
+
+
+def all_algorithms():
+    """
+    Returns the `Algorithm`s benchmarked by default.
+    """
+    return list(_algorithms)
+
+
+def algorithm_by_name(name):
+    for algorithm in _algorithms:
+        if algorithm.name == name:
+            return algorithm
+    raise ValueError("Expected an algorithm among " +
+                     str([algorithm.name for algorithm in _algorithms]) +
+                     " but got " + str(name) + ".")
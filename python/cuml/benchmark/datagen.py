@@ -0,0 +1,46 @@
+#
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import numpy as np
+
+
+# Number of blobs the samples are drawn around
+N_CENTERS = 8
+
+
+def gen_data(target, n_rows, n_cols, dtype, random_state=0):
+    """
+    Returns synthetic host data (X, y) for a benchmark, the same for a given
+    `random_state`: X has n_rows samples drawn around `N_CENTERS` blobs, y is
+    None if target is None, the blob of each sample as int32 labels for
+    'classification', or a noisy linear function of X for 'regression'.
+    """
+    rng = np.random.RandomState(random_state)
+    centers = rng.uniform(-10, 10, size=(N_CENTERS, n_cols))
+    labels = rng.randint(0, N_CENTERS, size=n_rows)
+    X = (centers[labels] + rng.normal(size=(n_rows, n_cols))).astype(dtype)
+
+    if target is None:
+        y = None
+    elif target == 'classification':
+        y = labels.astype(np.int32)
+    elif target == 'regression':
+        coef = rng.normal(size=n_cols)
+        y = (X.dot(coef) + rng.normal(scale=0.1, size=n_rows)).astype(dtype)
+    else:
+        raise ValueError("Expected target None, 'classification' or "
+                         "'regression' but got " + str(target) + ".")
+    return X, y
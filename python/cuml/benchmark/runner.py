@@ -0,0 +1,282 @@
+#
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import csv
+import json
+import platform
+import sys
+import time
+import warnings
+
+import numpy as np
+
+from cuml.benchmark.algorithms import Algorithm, algorithm_by_name, \
+    all_algorithms
+from cuml.benchmark.datagen import gen_data
+
+
+DEFAULT_N_ROWS = (10000, 100000)
+DEFAULT_N_COLS = (16, 128)
+DEFAULT_DTYPES = ('float32', 'float64')
+DEFAULT_BACKENDS = ('cuml', 'cpu')
+
+# Columns of the results, in the order of the CSV files
+RESULT_FIELDS = ['algorithm', 'backend', 'n_rows', 'n_cols', 'dtype',
+                 'method', 'cold', 'warm_median', 'warm_min', 'n_reps',
+                 'speedup', 'error']
+
+
+def _cuml_sync():
+    import cuml.common.handle
+
+    cuml.common.handle.get_default_handle().sync()
+
+
+def _no_sync():
+    pass
+
+
+def _check_backend(backend):
+    """
+    Raises if `backend` cannot run on this machine.
+    """
+    if backend == 'cuml':
+        # Fails without cuDF, libcuml or a GPU
+        _cuml_sync()
+
+
+def _timed(call, sync):
+    start = time.perf_counter()
+    call()
+    sync()
+    return time.perf_counter() - start
+
+
+def _result(algorithm, backend, n_rows, n_cols, dtype, method, times=None,
+            error=None):
+    result = dict.fromkeys(RESULT_FIELDS)
+    result.update(algorithm=algorithm.name, backend=backend, n_rows=n_rows,
+                  n_cols=n_cols, dtype=np.dtype(dtype).name, method=method,
+                  error=error)
+    if times is not None:
+        result.update(cold=times[0], warm_median=float(np.median(times[1:])),
+                      warm_min=min(times[1:]), n_reps=len(times) - 1)
+    return result
+
+
+def _run_config(algorithm, backend, estimator_class, n_rows, n_cols, dtype,
+                n_reps, random_state):
+    sync = _cuml_sync if backend == 'cuml' else _no_sync
+    params = algorithm.params(backend)
+    X, y = gen_data(algorithm.target, n_rows, n_cols, dtype,
+                    random_state=random_state)
+    fit_args = (X,) if y is None else (X, y)
+    config = (algorithm, backend, n_rows, n_cols, dtype)
+
+    try:
+        estimators = [estimator_class(**params) for _ in range(n_reps + 1)]
+        fit_times = [_timed(lambda: estimator.fit(*fit_args), sync)
+                     for estimator in estimators]
+    except Exception as error:
+        return [_result(*config, 'fit', error=repr(error))]
+
+    results = [_result(*config, 'fit', times=fit_times)]
+    estimator = estimators[0]
+    for method in algorithm.methods:
+        try:
+            call = getattr(estimator, method)
+            times = [_timed(lambda: call(X), sync)
+                     for _ in range(n_reps + 1)]
+        except Exception as error:
+            results.append(_result(*config, method, error=repr(error)))
+        else:
+            results.append(_result(*config, method, times=times))
+    return results
+
+
+def _add_speedups(results):
+    cpu_times = {}
+    for result in results:
+        if result['backend'] == 'cpu' and result['warm_median']:
+            key = (result['algorithm'], result['n_rows'], result['n_cols'],
+                   result['dtype'], result['method'])
+            cpu_times[key] = result['warm_median']
+
+    for result in results:
+        key = (result['algorithm'], result['n_rows'], result['n_cols'],
+               result['dtype'], result['method'])
+        if result['backend'] == 'cuml' and result['warm_median'] and \
+                key in cpu_times:
+            result['speedup'] = cpu_times[key] / result['warm_median']
+
+
+def run(algorithms=None, n_rows=DEFAULT_N_ROWS, n_cols=DEFAULT_N_COLS,
+        dtypes=DEFAULT_DTYPES, backends=DEFAULT_BACKENDS, n_reps=3,
+        random_state=0, verbose=False):
+    """
+    Times `fit` and the other methods of each algorithm on synthetic data of
+    every combination of n_rows, n_cols and dtypes, with cuML and with its
+    CPU counterpart.
+
+    Each timing is done on its own: `cold` is the first call for a
+    configuration, and `warm_median` and `warm_min` are taken over `n_reps`
+    more calls. `fit` is timed on a new estimator each time, the other
+    methods on the first fitted one with the training data. The cuML calls
+    are synchronized with the device before they are timed. Only the first
+    configuration of a process pays one-time costs like the creation of the
+    CUDA context, see `cuml.warmup`.
+
+    Backends that cannot run on this machine (cuML without a GPU, a CPU
+    library that is not installed) are skipped with a warning. Errors of a
+    configuration are reported in the 'error' field of its results.
+
+    Parameters
+    ----------
+    algorithms : list of str or `Algorithm` (default = all_algorithms())
+    n_rows, n_cols : list of int
+    dtypes : list of dtypes
+    backends : list of {'cuml', 'cpu'} (default = both)
+        'cpu' is scikit-learn, or umap-learn for UMAP.
+    n_reps : int (default = 3)
+        Number of warm calls timed.
+    random_state : int (default = 0)
+        Seed of the synthetic data.
+    verbose : bool (default = False)
+        Whether to print each result as it is measured.
+
+    Returns
+    -------
+    results : list of dict with the keys `RESULT_FIELDS`. `speedup` is the
+        ratio of the CPU to the cuML warm median times, for cuML results
+        with a CPU result of the same configuration.
+    """
+    if algorithms is None:
+        algorithms = all_algorithms()
+    algorithms = [algorithm if isinstance(algorithm, Algorithm)
+                  else algorithm_by_name(algorithm)
+                  for algorithm in algorithms]
+    if n_reps < 1:
+        raise ValueError("Expected at least 1 repetition but got " +
+                         str(n_reps) + ".")
+
+    available = []
+    for backend in backends:
+        if backend not in ['cuml', 'cpu']:
+            raise ValueError("Expected backend 'cuml' or 'cpu' but got " +
+                             str(backend) + ".")
+        try:
+            _check_backend(backend)
+        except Exception as error:
+            warnings.warn("Skipping the " + backend + " backend: " +
+                          repr(error))
+        else:
+            available.append(backend)
+
+    results = []
+    for algorithm in algorithms:
+        for backend in available:
+            try:
+                estimator_class = algorithm.estimator_class(backend)
+            except Exception as error:
+                warnings.warn("Skipping " + algorithm.name + " on the " +
+                              backend + " backend: " + repr(error))
+                continue
+
+            for rows in n_rows:
+                for cols in n_cols:
+                    for dtype in dtypes:
+                        config_results = _run_config(
+                            algorithm, backend, estimator_class, rows, cols,
+                            dtype, n_reps, random_state)
+                        if verbose:
+                            print(format_results(config_results,
+                                                 header=False))
+                        results.extend(config_results)
+
+    _add_speedups(results)
+    return results
+
+
+def environment():
+    """
+    Returns a dict describing the machine and the library versions the
+    results were measured with.
+    """
+    import cuml
+
+    env = {'python': sys.version.split()[0],
+           'platform': platform.platform(),
+           'numpy': np.__version__,
+           'cuml': cuml.__version__}
+    try:
+        import sklearn
+        env['sklearn'] = sklearn.__version__
+    except ImportError:
+        env['sklearn'] = None
+    try:
+        from numba import cuda
+        name = cuda.get_current_device().name
+        env['gpu'] = name.decode() if isinstance(name, bytes) else name
+    except Exception:
+        env['gpu'] = None
+    return env
+
+
+def write_json(results, path):
+    """
+    Writes the results of `run` and the `environment` to `path` as JSON.
+    """
+    with open(path, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f,
+                  indent=2)
+
+
+def write_csv(results, path):
+    """
+    Writes the results of `run` to `path` as CSV, one row per result.
+    """
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def format_results(results, header=True):
+    """
+    Returns a human readable table of the results of `run`, with the times
+    in milliseconds.
+    """
+    def ms(value):
+        return '-' if value is None else '%.3f' % (value * 1000)
+
+    lines = []
+    if header:
+        lines.append("%-24s %-7s %9s %6s %-8s %-10s %12s %12s %8s" %
+                     ('algorithm', 'backend', 'n_rows', 'n_cols', 'dtype',
+                      'method', 'cold (ms)', 'warm (ms)', 'speedup'))
+    for result in results:
+        if result['error'] is not None:
+            detail = 'error: ' + result['error']
+        else:
+            detail = "%12s %12s %8s" % (
+                ms(result['cold']), ms(result['warm_median']),
+                '-' if result['speedup'] is None
+                else '%.1fx' % result['speedup'])
+        lines.append("%-24s %-7s %9d %6d %-8s %-10s %s" %
+                     (result['algorithm'], result['backend'],
+                      result['n_rows'], result['n_cols'], result['dtype'],
+                      result['method'], detail))
+    return '\n'.join(lines)
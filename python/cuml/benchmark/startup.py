@@ -0,0 +1,156 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import subprocess
+import sys
+
+import numpy as np
+
+from cuml.benchmark.algorithms import Algorithm, algorithm_by_name, \
+    all_algorithms
+from cuml.benchmark.runner import RESULT_FIELDS
+
+
+def _run_python(code, *flags):
+    return subprocess.run([sys.executable] + list(flags) + ['-c', code],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          check=True, universal_newlines=True)
+
+
+def _startup_result(algorithm, method, times, n_rows=0, n_cols=0,
+                    dtype='-', error=None):
+    result = dict.fromkeys(RESULT_FIELDS)
+    result.update(algorithm=algorithm, backend='cuml', n_rows=n_rows,
+                  n_cols=n_cols, dtype=dtype, method=method, error=error)
+    if error is None:
+        cold, warm = times
+        result.update(cold=cold, warm_median=float(np.median(warm)),
+                      warm_min=min(warm), n_reps=len(warm))
+    return result
+
+
+# Times the first fit and method calls of an algorithm in a fresh process,
+# after warming up the process when `warm` is set
+_FIRST_CALL = """
+import time
+from cuml.benchmark import algorithm_by_name, gen_data
+from cuml.benchmark.runner import _cuml_sync
+
+algorithm = algorithm_by_name({name!r})
+X, y = gen_data(algorithm.target, {n_rows}, {n_cols}, {dtype!r})
+estimator_class = algorithm.estimator_class('cuml')
+if {warm}:
+    import cuml
+    cuml.warmup(estimators=[algorithm.name], dtypes=[{dtype!r}],
+                input_types=['numpy'], cache_dir={cache_dir!r})
+start = time.perf_counter()
+estimator = estimator_class(**algorithm.params('cuml'))
+if y is None:
+    estimator.fit(X)
+else:
+    estimator.fit(X, y)
+for method in algorithm.methods:
+    getattr(estimator, method)(X)
+_cuml_sync()
+print(time.perf_counter() - start)
+"""
+
+
+def _first_call(name, n_rows, n_cols, dtype, warm, cache_dir):
+    code = _FIRST_CALL.format(name=name, n_rows=n_rows, n_cols=n_cols,
+                              dtype=dtype, warm=warm, cache_dir=cache_dir)
+    return float(_run_python(code).stdout.split()[-1])
+
+
+def _import_time():
+    # Lines of -X importtime are "import time: self | cumulative | name",
+    # in microseconds
+    stderr = _run_python("import cuml", '-X', 'importtime').stderr
+    cumulative = [int(line.split('|')[1])
+                  for line in stderr.splitlines()
+                  if line.split('|')[-1].strip() == 'cuml']
+    if len(cumulative) != 1:
+        raise RuntimeError("Expected the import time of cuml in the output "
+                           "of -X importtime.")
+    return cumulative[0] / 1e6
+
+
+def import_time(n_reps=3):
+    """
+    Times `import cuml` in fresh interpreters with `python -X importtime`,
+    which counts the modules imported by cuml and not the startup of the
+    interpreter.
+
+    Returns a result of `cuml.benchmark.run` for the method 'import' of the
+    algorithm 'cuml': `cold` is the first process, whose files may not be
+    in the cache of the operating system yet, and `warm_median` and
+    `warm_min` are taken over `n_reps` more processes.
+    """
+    if n_reps < 1:
+        raise ValueError("Expected at least 1 repetition but got " +
+                         str(n_reps) + ".")
+    if sys.version_info < (3, 7):
+        return _startup_result('cuml', 'import', None,
+                               error="-X importtime needs Python 3.7")
+
+    times = [_import_time() for _ in range(n_reps + 1)]
+    return _startup_result('cuml', 'import', (times[0], times[1:]))
+
+
+def first_call_time(algorithms=None, n_rows=(10000,), n_cols=(16,),
+                    dtypes=('float32',), n_reps=1, cache_dir=None):
+    """
+    Times the first `fit` and method calls of each algorithm in a fresh
+    process, without and with `cuml.warmup` run beforehand, on synthetic
+    data of every combination of n_rows, n_cols and dtypes. The time taken
+    by `cuml.warmup` itself is not counted.
+
+    Returns results of `cuml.benchmark.run` for the method 'first_call':
+    `cold` is a process without warmup, and `warm_median` and `warm_min`
+    are taken over `n_reps` processes warmed up with `cache_dir` as the
+    kernel cache (see `cuml.warmup`). The process without warmup runs
+    first, so it does not reuse the kernels cached by the others.
+    """
+    if algorithms is None:
+        algorithms = all_algorithms()
+    algorithms = [algorithm if isinstance(algorithm, Algorithm)
+                  else algorithm_by_name(algorithm)
+                  for algorithm in algorithms]
+    if n_reps < 1:
+        raise ValueError("Expected at least 1 repetition but got " +
+                         str(n_reps) + ".")
+
+    results = []
+    for algorithm in algorithms:
+        for rows in n_rows:
+            for cols in n_cols:
+                for dtype in dtypes:
+                    data = (rows, cols, np.dtype(dtype).name)
+                    try:
+                        cold = _first_call(algorithm.name, *data, False,
+                                           None)
+                        warm = [_first_call(algorithm.name, *data, True,
+                                            cache_dir)
+                                for _ in range(n_reps)]
+                    except subprocess.CalledProcessError as error:
+                        lines = error.stderr.strip().splitlines()
+                        times = None
+                        message = lines[-1] if lines else repr(error)
+                    else:
+                        times, message = (cold, warm), None
+                    results.append(_startup_result(
+                        algorithm.name, 'first_call', times, *data,
+                        error=message))
+    return results
@@ -16,3 +16,4 @@
 
 from cuml.cluster.dbscan import DBSCAN
 from cuml.cluster.kmeans import KMeans
+from cuml.cluster.minibatch_kmeans import MiniBatchKMeans
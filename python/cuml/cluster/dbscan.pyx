@@ -27,6 +27,8 @@ from libcpp cimport bool
 from libc.stdint cimport uintptr_t
 from libc.stdlib cimport calloc, malloc, free
 
+import cuml.common.memory as memory
+
 from cuml.common.base import Base
 from cuml.common.handle cimport cumlHandle
 from cuml.utils import get_cudf_column_ptr, get_dev_array_ptr, \
@@ -34,7 +36,7 @@ from cuml.utils import get_cudf_column_ptr, get_dev_array_ptr, \
 
 from collections import defaultdict
 
-cdef extern from "dbscan/dbscan.hpp" namespace "ML":
+cdef extern from "dbscan/dbscan.hpp" namespace "ML" nogil:
 
     cdef void dbscanFit(cumlHandle& handle,
                         float *input,
@@ -44,7 +46,7 @@ cdef extern from "dbscan/dbscan.hpp" namespace "ML":
                         int min_pts,
                         int *labels,
                         size_t max_bytes_per_batch,
-                        bool verbose)
+                        bool verbose) except +
 
     cdef void dbscanFit(cumlHandle& handle,
                         double *input,
@@ -54,7 +56,22 @@ cdef extern from "dbscan/dbscan.hpp" namespace "ML":
                         int min_pts,
                         int *labels,
                         size_t max_bytes_per_batch,
-                        bool verbose)
+                        bool verbose) except +
+
+    cdef size_t dbscanWorkspaceSize_f32(cumlHandle& handle,
+                                        int n_rows,
+                                        int n_cols,
+                                        size_t max_bytes_per_batch) except +
+
+    cdef size_t dbscanWorkspaceSize_f64(cumlHandle& handle,
+                                        int n_rows,
+                                        int n_cols,
+                                        size_t max_bytes_per_batch) except +
+
+
+# Batch budget used by the C++ implementation when none is given, for a 16GB
+# card. Automatic budgets do not exceed it either.
+DEFAULT_MAX_BYTES_PER_BATCH = int(13e9)
 
 
 class DBSCAN(Base):
@@ -118,12 +135,18 @@ class DBSCAN(Base):
         Note: this option does not set the maximum total memory used in the
         DBSCAN computation and so this value will not
         be able to be set to the total memory available on the device.
+        If None, `fit` picks the largest batches whose memory, as given by
+        `estimate_memory`, fits in the free memory of the device.
 
     Attributes
     -----------
     labels_ : array
         Which cluster each datapoint belongs to. Noisy samples are labeled as
         -1.
+    max_bytes_per_batch_ : int
+        Batch budget of the last fit. When the device runs out of memory,
+        `fit` halves the budget and starts over, with a warning (see
+        `cuml.common.memory.retry_on_out_of_memory`).
 
     Notes
     ------
@@ -179,41 +202,68 @@ class DBSCAN(Base):
         if self.labels_ is not None:
             del self.labels_
 
-        cdef uintptr_t input_ptr
-
         X_m, input_ptr, n_rows, n_cols, self.dtype = \
             input_to_dev_array(X, order='C')
 
-        cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
         self.labels_ = cudf.Series(zeros(n_rows, dtype=np.int32))
-        cdef uintptr_t labels_ptr = get_cudf_column_ptr(self.labels_)
+        labels_ptr = get_cudf_column_ptr(self.labels_)
 
-        if self.dtype == np.float32:
-            dbscanFit(handle_[0],
-                      <float*>input_ptr,
-                      <int> n_rows,
-                      <int> n_cols,
-                      <float> self.eps,
-                      <int> self.min_samples,
-                      <int*> labels_ptr,
-                      <size_t>self.max_bytes_per_batch,
-                      <bool>self.verbose)
+        if self.max_bytes_per_batch:
+            batch_budget = self.max_bytes_per_batch
         else:
-            dbscanFit(handle_[0],
-                      <double*>input_ptr,
-                      <int> n_rows,
-                      <int> n_cols,
-                      <double> self.eps,
-                      <int> self.min_samples,
-                      <int*> labels_ptr,
-                      <size_t> self.max_bytes_per_batch,
-                      <bool>self.verbose)
-        # make sure that the `dbscanFit` is complete before the following
-        # delete call happens
-        self.handle.sync()
+            batch_budget = self._auto_max_bytes_per_batch(n_rows, n_cols,
+                                                          self.dtype)
+
+        # Smaller batches when the device runs out of memory, down to one
+        # sample per batch
+        _, self.max_bytes_per_batch_ = memory.retry_on_out_of_memory(
+            lambda max_bytes_per_batch: self._fit_batches(
+                input_ptr, labels_ptr, n_rows, n_cols, max_bytes_per_batch),
+            batch_budget, self.handle,
+            min_batch_size=n_rows * np.dtype(self.dtype).itemsize + 1,
+            name='max_bytes_per_batch')
+
         del(X_m)
         return self
 
+    def _fit_batches(self, input_ptr, labels_ptr, n_rows, n_cols,
+                     max_bytes_per_batch):
+        cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
+        cdef uintptr_t c_input_ptr = input_ptr
+        cdef uintptr_t c_labels_ptr = labels_ptr
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = n_cols
+        cdef double eps = self.eps
+        cdef int min_samples = self.min_samples
+        cdef size_t c_max_bytes_per_batch = max_bytes_per_batch
+        cdef bool verbose = self.verbose
+
+        if self.dtype == np.float32:
+            with nogil:
+                dbscanFit(handle_[0],
+                          <float*>c_input_ptr,
+                          c_n_rows,
+                          c_n_cols,
+                          <float> eps,
+                          min_samples,
+                          <int*> c_labels_ptr,
+                          c_max_bytes_per_batch,
+                          verbose)
+        else:
+            with nogil:
+                dbscanFit(handle_[0],
+                          <double*>c_input_ptr,
+                          c_n_rows,
+                          c_n_cols,
+                          eps,
+                          min_samples,
+                          <int*> c_labels_ptr,
+                          c_max_bytes_per_batch,
+                          verbose)
+        # make sure that the `dbscanFit` is complete before the input is
+        # deleted
+        self.handle.sync()
+
     def fit_predict(self, X):
         """
         Performs clustering on input_gdf and returns cluster labels.
@@ -233,5 +283,68 @@ class DBSCAN(Base):
         self.fit(X)
         return self.labels_
 
+    def estimate_memory(self, n_rows, n_cols, **params):
+        """
+        Returns an upper bound, in bytes, of the device memory that `fit`
+        allocates for an input of shape (n_rows, n_cols), not counting the
+        input itself. It assumes the worst case where every sample of a batch
+        neighbors every sample.
+
+        Parameters
+        ----------
+        n_rows, n_cols : int
+            Shape of the input.
+        dtype : np.float32 or np.float64 (default = np.float32)
+            Type of the input.
+        max_bytes_per_batch : int (default = the one of this object)
+            Batch budget, 0 or None for the default of the C++
+            implementation.
+        """
+        dtype = np.dtype(params.get('dtype', np.float32))
+        max_bytes_per_batch = params.get('max_bytes_per_batch',
+                                         self.max_bytes_per_batch)
+
+        cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = n_cols
+        cdef size_t c_max_bytes_per_batch = max_bytes_per_batch or 0
+        cdef size_t workspace_size
+
+        if dtype == np.float32:
+            workspace_size = dbscanWorkspaceSize_f32(handle_[0],
+                                                     c_n_rows,
+                                                     c_n_cols,
+                                                     c_max_bytes_per_batch)
+        elif dtype == np.float64:
+            workspace_size = dbscanWorkspaceSize_f64(handle_[0],
+                                                     c_n_rows,
+                                                     c_n_cols,
+                                                     c_max_bytes_per_batch)
+        else:
+            raise TypeError("Expected float32 or float64 input but got " +
+                            str(dtype) + ".")
+
+        # and the labels
+        return workspace_size + n_rows * np.dtype(np.int32).itemsize
+
+    def _auto_max_bytes_per_batch(self, n_rows, n_cols, dtype):
+        """
+        Returns the batch budget of the largest batches whose fit is
+        estimated to fit in the free device memory.
+        """
+        itemsize = np.dtype(dtype).itemsize
+
+        def batch_budget(batch_size):
+            # The C++ implementation keeps batches of batch_size rows, against
+            # all n_rows, strictly below the budget
+            return batch_size * n_rows * itemsize + 1
+
+        batch_size = memory.largest_batch_size(
+            lambda batch_size: self.estimate_memory(
+                n_rows, n_cols, dtype=dtype,
+                max_bytes_per_batch=batch_budget(batch_size)),
+            n_rows, memory.get_memory_budget())
+        return min(batch_budget(batch_size), DEFAULT_MAX_BYTES_PER_BATCH)
+
     def get_param_names(self):
         return ["eps", "min_samples"]
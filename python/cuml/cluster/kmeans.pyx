@@ -22,24 +22,34 @@
 import ctypes
 import cudf
 import numpy as np
+import queue
+import threading
 import warnings
 
+from concurrent.futures import ThreadPoolExecutor
 from numba import cuda
 
 from libcpp cimport bool
-from libc.stdint cimport uintptr_t
+from libc.stdint cimport uintptr_t, int64_t
 from libc.stdlib cimport calloc, malloc, free
 
+import cuml.common.cuda
+import cuml.common.handle
+import cuml.common.memory as memory
 from cuml.common.base import Base
+from cuml.common.cuda cimport _Error, _Stream, cudaMemsetAsync
 from cuml.common.handle cimport cumlHandle
 from cuml.utils import get_cudf_column_ptr, get_dev_array_ptr, \
-    input_to_dev_array, zeros, numba_utils
+    get_default_pool, input_to_dev_array, zeros, numba_utils
 
-cdef extern from "kmeans/kmeans.hpp" namespace "ML::kmeans":
+cdef extern from "kmeans/kmeans.hpp" namespace "ML::kmeans" nogil:
 
     enum InitMethod:
         KMeansPlusPlus, Random, Array
 
+    enum Algorithm:
+        Lloyd, Hamerly, Elkan
+
     cdef void fit_predict(cumlHandle& handle,
                           int n_clusters,
                           int metric,
@@ -52,7 +62,11 @@ cdef extern from "kmeans/kmeans.hpp" namespace "ML::kmeans":
                           int n_features,
                           float *centroids,
                           int *labels,
-                          int verbose)
+                          int verbose,
+                          double *inertia,
+                          int *n_iter,
+                          Algorithm algorithm,
+                          double *skipped_fraction) except +
 
     cdef void fit_predict(cumlHandle& handle,
                           int n_clusters,
@@ -66,7 +80,11 @@ cdef extern from "kmeans/kmeans.hpp" namespace "ML::kmeans":
                           int n_features,
                           double *centroids,
                           int *labels,
-                          int verbose)
+                          int verbose,
+                          double *inertia,
+                          int *n_iter,
+                          Algorithm algorithm,
+                          double *skipped_fraction) except +
 
     cdef void fit(cumlHandle& handle,
                   int n_clusters,
@@ -92,6 +110,26 @@ cdef extern from "kmeans/kmeans.hpp" namespace "ML::kmeans":
                   double *centroids,
                   int verbose)
 
+    cdef double partial_fit(cumlHandle& handle,
+                            float *centroids,
+                            int64_t *counts,
+                            int n_clusters,
+                            const float *X,
+                            int n_samples,
+                            int n_features,
+                            int metric,
+                            int verbose) except +
+
+    cdef double partial_fit(cumlHandle& handle,
+                            double *centroids,
+                            int64_t *counts,
+                            int n_clusters,
+                            const double *X,
+                            int n_samples,
+                            int n_features,
+                            int metric,
+                            int verbose) except +
+
     cdef void predict(cumlHandle& handle,
                       float *centroids,
                       int n_clusters,
@@ -120,7 +158,21 @@ cdef extern from "kmeans/kmeans.hpp" namespace "ML::kmeans":
                         int n_features,
                         int metric,
                         float *X_new,
-                        int verbose)
+                        int verbose,
+                        int batch_size) except +
+
+    cdef void nearest_centroids(cumlHandle& handle,
+                                const float *centroids,
+                                int n_clusters,
+                                const float *X,
+                                int n_samples,
+                                int n_features,
+                                int metric,
+                                int n_nearest,
+                                float *distances,
+                                int *indices,
+                                int verbose,
+                                int batch_size) except +
 
     cdef void transform(cumlHandle& handle,
                         const double *centroids,
@@ -130,7 +182,336 @@ cdef extern from "kmeans/kmeans.hpp" namespace "ML::kmeans":
                         int n_features,
                         int metric,
                         double *X_new,
-                        int verbose)
+                        int verbose,
+                        int batch_size) except +
+
+    cdef void nearest_centroids(cumlHandle& handle,
+                                const double *centroids,
+                                int n_clusters,
+                                const double *X,
+                                int n_samples,
+                                int n_features,
+                                int metric,
+                                int n_nearest,
+                                double *distances,
+                                int *indices,
+                                int verbose,
+                                int batch_size) except +
+
+
+# Rows whose distances to the centroids the C++ implementation computes at
+# once (kmeans::detail::getDataBatchSize)
+_DATA_BATCH_SIZE = 1 << 16
+
+# Sampling rounds of the scalable k-means++ initialization, at most
+_INIT_ROUNDS = 8
+
+# Values of the algorithm parameter
+_algorithms = {'auto': Lloyd, 'full': Lloyd, 'lloyd': Lloyd,
+               'hamerly': Hamerly, 'elkan': Elkan}
+
+_restart_slots = threading.local()
+
+
+def _restart_handles(n):
+    """
+    Returns n handles of the calling thread, each with a stream of its own,
+    on which `KMeans.fit` runs restarts alongside the one on the handle of
+    the estimator. They are created on first use and reused by later fits.
+    """
+    handles = getattr(_restart_slots, 'handles', None)
+    if handles is None:
+        handles = _restart_slots.handles = []
+    while len(handles) < n:
+        handle = cuml.common.handle.Handle()
+        handle.setStream(cuml.common.cuda.Stream())
+        handles.append(handle)
+    return handles[:n]
+
+
+def _zeros_on(handle, size, dtype):
+    """
+    Like `zeros`, but cleared on the stream of `handle` instead of the
+    default stream, which would serialize the restarts running on the other
+    streams.
+    """
+    out = get_default_pool().empty(size, dtype)
+    cdef cumlHandle* handle_ = <cumlHandle*><size_t>handle.getHandle()
+    cdef _Stream stream = handle_.getStream()
+    cdef uintptr_t out_ptr = get_dev_array_ptr(out)
+    cdef size_t nbytes = out.size * out.dtype.itemsize
+    cdef _Error e
+    with nogil:
+        e = cudaMemsetAsync(<void*>out_ptr, 0, nbytes, stream)
+    if e != 0:
+        raise cuml.common.cuda.CudaRuntimeError("Memset")
+    return out
+
+
+def _fit_restart(handle, X_m, n_rows, n_cols, dtype, n_clusters, init_value,
+                 max_iter, tol, seed, verbose, centroids, algorithm=Lloyd):
+    """
+    Runs one initialization and the iterations of `algorithm` that follow
+    it on `handle` and returns the (labels, inertia, n_iter,
+    skipped_fraction) of the result.
+    `centroids` holds the initial centers for the Array initialization and
+    receives the final ones.
+    """
+    cdef cumlHandle* handle_ = <cumlHandle*><size_t>handle.getHandle()
+
+    labels = cudf.Series(_zeros_on(handle, n_rows, np.int32))
+    cdef uintptr_t labels_ptr = get_cudf_column_ptr(labels)
+    cdef uintptr_t input_ptr = get_dev_array_ptr(X_m)
+    cdef uintptr_t cluster_centers_ptr = get_dev_array_ptr(centroids)
+
+    cdef int c_n_clusters = n_clusters
+    cdef InitMethod c_init = init_value
+    cdef int c_max_iter = max_iter
+    cdef double c_tol = tol
+    cdef int c_seed = seed
+    cdef size_t c_n_rows = n_rows
+    cdef size_t c_n_cols = n_cols
+    cdef int c_verbose = verbose
+    cdef Algorithm c_algorithm = algorithm
+    cdef double inertia = 0.0
+    cdef int n_iter = 0
+    cdef double skipped_fraction = 0.0
+
+    if dtype == np.float32:
+        with nogil:
+            fit_predict(
+                handle_[0],
+                c_n_clusters,                  # n_clusters
+                <int> 0,                       # distance metric as squared L2: @todo - support other metrics # noqa: E501
+                c_init,                        # init method
+                c_max_iter,                    # max_iterations
+                c_tol,                         # threshold
+                c_seed,                        # seed
+                <float*> input_ptr,            # srcdata
+                c_n_rows,                      # n_samples (rows)
+                c_n_cols,                      # n_features (cols)
+                <float*> cluster_centers_ptr,  # pred_centroids);
+                <int*> labels_ptr,             # pred_labels
+                c_verbose,
+                &inertia,
+                &n_iter,
+                c_algorithm,
+                &skipped_fraction)
+    else:
+        with nogil:
+            fit_predict(
+                handle_[0],
+                c_n_clusters,                   # n_clusters
+                <int> 0,                        # distance metric as squared L2: @todo - support other metrics # noqa: E501
+                c_init,                         # init method
+                c_max_iter,                     # max_iterations
+                c_tol,                          # threshold
+                c_seed,                         # seed
+                <double*> input_ptr,            # srcdata
+                c_n_rows,                       # n_samples (rows)
+                c_n_cols,                       # n_features (cols)
+                <double*> cluster_centers_ptr,  # pred_centroids);
+                <int*> labels_ptr,              # pred_labels
+                c_verbose,
+                &inertia,
+                &n_iter,
+                c_algorithm,
+                &skipped_fraction)
+
+    handle.sync()
+    return labels, inertia, n_iter, skipped_fraction
+
+
+def _partial_fit(handle, X_m, n_rows, n_cols, dtype, n_clusters, centroids,
+                 counts, verbose):
+    """
+    Moves each of the `centroids` to the mean of all the samples assigned to
+    it: the `counts` samples it was assigned before, and those of X_m it is
+    the nearest center of. Updates centroids and counts in place and returns
+    the inertia of X_m with the centroids before the update.
+    """
+    cdef cumlHandle* handle_ = <cumlHandle*><size_t>handle.getHandle()
+    cdef uintptr_t input_ptr = get_dev_array_ptr(X_m)
+    cdef uintptr_t centroids_ptr = get_dev_array_ptr(centroids)
+    cdef uintptr_t counts_ptr = get_dev_array_ptr(counts)
+
+    cdef int c_n_clusters = n_clusters
+    cdef int c_n_rows = n_rows
+    cdef int c_n_cols = n_cols
+    cdef int c_verbose = verbose
+    cdef double inertia = 0.0
+
+    if dtype == np.float32:
+        with nogil:
+            inertia = partial_fit(
+                handle_[0],
+                <float*> centroids_ptr,
+                <int64_t*> counts_ptr,
+                c_n_clusters,
+                <float*> input_ptr,
+                c_n_rows,
+                c_n_cols,
+                <int> 0,                       # distance metric as squared L2: @todo - support other metrics # noqa: E501
+                c_verbose)
+    else:
+        with nogil:
+            inertia = partial_fit(
+                handle_[0],
+                <double*> centroids_ptr,
+                <int64_t*> counts_ptr,
+                c_n_clusters,
+                <double*> input_ptr,
+                c_n_rows,
+                c_n_cols,
+                <int> 0,                        # distance metric as squared L2: @todo - support other metrics # noqa: E501
+                c_verbose)
+
+    handle.sync()
+    return inertia
+
+
+def _centers_frame(centroids, n_clusters, n_cols):
+    """
+    Returns the row-major device array of centers `centroids` as a cuDF
+    DataFrame of n_clusters rows.
+    """
+    cc_df = cudf.DataFrame()
+    for i in range(0, n_cols):
+        cc_df[str(i)] = centroids[i:n_clusters*n_cols:n_cols]
+    return cc_df
+
+
+def _out_ptr(out, shape, dtype):
+    """
+    Returns the address of `out`, a C-contiguous host (NumPy, including
+    memory maps) or device (CUDA array interface) array of the given shape
+    and dtype that a result is written to, and whether it is on the host.
+    """
+    if isinstance(out, np.ndarray):
+        host = True
+        contiguous = out.flags['C_CONTIGUOUS'] and out.flags['WRITEABLE']
+    elif hasattr(out, '__cuda_array_interface__'):
+        host = False
+        out = cuda.as_cuda_array(out)
+        contiguous = out.is_c_contiguous()
+    else:
+        raise TypeError("Expected out to be a NumPy or a CUDA array "
+                        "interface array but got " + str(type(out)) + ".")
+
+    if tuple(out.shape) != tuple(shape) or out.dtype != dtype or \
+            not contiguous:
+        raise ValueError("Expected out to be a writable C-contiguous array "
+                         "of shape " + str(tuple(shape)) + " and dtype " +
+                         str(np.dtype(dtype)) + " but got shape " +
+                         str(tuple(out.shape)) + " and dtype " +
+                         str(out.dtype) + ".")
+
+    if host:
+        return out.__array_interface__['data'][0], True
+    return get_dev_array_ptr(out), False
+
+
+def _transform(handle, centers_ptr, n_clusters, input_ptr, n_rows, n_cols,
+               dtype, X_new_ptr, verbose, batch_size):
+    """
+    Writes the Euclidean distances of the n_rows samples at input_ptr to the
+    centers to X_new_ptr, on the host or device, computing those of
+    batch_size samples at a time.
+    """
+    cdef cumlHandle* handle_ = <cumlHandle*><size_t>handle.getHandle()
+    cdef uintptr_t c_centers_ptr = centers_ptr
+    cdef uintptr_t c_input_ptr = input_ptr
+    cdef uintptr_t c_X_new_ptr = X_new_ptr
+    cdef int c_n_clusters = n_clusters
+    cdef int c_n_rows = n_rows
+    cdef int c_n_cols = n_cols
+    cdef int c_verbose = verbose
+    cdef int c_batch_size = batch_size
+
+    if dtype == np.float32:
+        with nogil:
+            transform(
+                handle_[0],
+                <float*> c_centers_ptr,       # centroids
+                c_n_clusters,                 # n_clusters
+                <float*> c_input_ptr,         # srcdata
+                c_n_rows,                     # n_samples (rows)
+                c_n_cols,                     # n_features (cols)
+                <int> 1,                      # distance metric as L2-norm/euclidean distance: @todo - support other metrics # noqa: E501
+                <float*> c_X_new_ptr,         # transformed output
+                c_verbose,
+                c_batch_size)
+    else:
+        with nogil:
+            transform(
+                handle_[0],
+                <double*> c_centers_ptr,      # centroids
+                c_n_clusters,                 # n_clusters
+                <double*> c_input_ptr,        # srcdata
+                c_n_rows,                     # n_samples (rows)
+                c_n_cols,                     # n_features (cols)
+                <int> 1,                      # distance metric as L2-norm/euclidean distance: @todo - support other metrics # noqa: E501
+                <double*> c_X_new_ptr,        # transformed output
+                c_verbose,
+                c_batch_size)
+
+    handle.sync()
+
+
+def _nearest_centroids(handle, centers_ptr, n_clusters, input_ptr, n_rows,
+                       n_cols, dtype, metric, n_nearest, distances_ptr,
+                       indices_ptr, verbose, batch_size):
+    """
+    Writes the indices of the n_nearest closest centers of the n_rows samples
+    at input_ptr to indices_ptr, and their distances for `metric` to
+    distances_ptr unless it is 0, on the host or device, computing the
+    distances of batch_size samples at a time.
+    """
+    cdef cumlHandle* handle_ = <cumlHandle*><size_t>handle.getHandle()
+    cdef uintptr_t c_centers_ptr = centers_ptr
+    cdef uintptr_t c_input_ptr = input_ptr
+    cdef uintptr_t c_distances_ptr = distances_ptr
+    cdef uintptr_t c_indices_ptr = indices_ptr
+    cdef int c_n_clusters = n_clusters
+    cdef int c_n_rows = n_rows
+    cdef int c_n_cols = n_cols
+    cdef int c_metric = metric
+    cdef int c_n_nearest = n_nearest
+    cdef int c_verbose = verbose
+    cdef int c_batch_size = batch_size
+
+    if dtype == np.float32:
+        with nogil:
+            nearest_centroids(
+                handle_[0],
+                <float*> c_centers_ptr,
+                c_n_clusters,
+                <float*> c_input_ptr,
+                c_n_rows,
+                c_n_cols,
+                c_metric,
+                c_n_nearest,
+                <float*> c_distances_ptr,
+                <int*> c_indices_ptr,
+                c_verbose,
+                c_batch_size)
+    else:
+        with nogil:
+            nearest_centroids(
+                handle_[0],
+                <double*> c_centers_ptr,
+                c_n_clusters,
+                <double*> c_input_ptr,
+                c_n_rows,
+                c_n_cols,
+                c_metric,
+                c_n_nearest,
+                <double*> c_distances_ptr,
+                <int*> c_indices_ptr,
+                c_verbose,
+                c_batch_size)
+
+    handle.sync()
 
 
 class KMeans(Base):
@@ -236,13 +617,32 @@ class KMeans(Base):
         for the initial centroids. If an ndarray is passed, it should be of
         shape (n_clusters, n_features) and gives the initial centers.
     n_init : int (default = 1)
-        Number of times intialization is run. More is slower,
-        but can be better.
-    algorithm : "auto"
-        Currently uses full EM, but will support others later.
+        Number of times the algorithm is run from a different initialization
+        (seeds random_state, random_state + 1, ...). The run of lowest
+        inertia is kept. The runs are done concurrently on streams of their
+        own, as many at a time as fit in the free device memory. Ignored
+        when init gives the initial centers.
+    algorithm : {'auto', 'full', 'hamerly', 'elkan'} (default = 'auto')
+        'full' (or 'lloyd') computes the distances of all the samples to all
+        the centers at each iteration. 'hamerly' and 'elkan' give the same
+        clustering but keep bounds of the distances of each sample, which
+        rule out most of them once the centers move little: 'hamerly' keeps
+        2 bounds per sample, 'elkan' keeps n_clusters + 1 bounds per sample
+        (as much memory as the distances of all the samples) and skips more
+        distances, which pays off for many clusters in low dimensions.
+        'auto' is 'full'.
     n_gpu : int (default = 1)
         Number of GPUs to use. Currently uses single GPU, but will support
         multiple GPUs later.
+    output_type : {'input', 'cudf', 'numpy', 'cupy', 'numba'} (optional)
+        Type of the results of `predict` and `transform`. 'numba' and 'cupy'
+        return the device buffer without a copy. Defaults to the global
+        output type, or else to cuDF (see `cuml.set_global_output_type`).
+    warm_start : boolean (default = False)
+        If True, `fit` starts from the centers of the previous fit instead of
+        a new initialization, which converges in a few iterations when the
+        data changed little, and keeps `counts_` so that `partial_fit` can
+        update the centers with new samples only.
 
 
     Attributes
@@ -252,6 +652,17 @@ class KMeans(Base):
         each data cluster.
     labels_ : array
         Which cluster each datapoint belongs to.
+    inertia_ : float
+        Sum of the squared distances of the samples to their closest cluster
+        center.
+    n_iter_ : int
+        Number of iterations of the kept run.
+    skipped_distance_fraction_ : float
+        Fraction of the distances of 'full' that the kept run did not
+        compute, 0 for 'full'.
+    counts_ : cuDF Series
+        Number of samples assigned to each center by the last fit and the
+        later calls of `partial_fit`, with warm_start=True.
 
     Notes
     ------
@@ -277,8 +688,8 @@ class KMeans(Base):
     def __init__(self, handle=None, n_clusters=8, max_iter=300, tol=1e-4,
                  verbose=0, random_state=1, precompute_distances='auto',
                  init='scalable-k-means++', n_init=1, algorithm='auto',
-                 n_gpu=1):
-        super(KMeans, self).__init__(handle, verbose)
+                 n_gpu=1, output_type=None, warm_start=False):
+        super(KMeans, self).__init__(handle, verbose, output_type)
         self.n_clusters = n_clusters
         self.verbose = verbose
         self.random_state = random_state
@@ -292,7 +703,12 @@ class KMeans(Base):
         self.tol = tol
         self.labels_ = None
         self.cluster_centers_ = None
+        self.inertia_ = None
+        self.n_iter_ = None
+        self.skipped_distance_fraction_ = None
+        self.counts_ = None
         self.n_gpu = n_gpu
+        self.warm_start = warm_start
 
     def fit(self, X):
         """
@@ -307,27 +723,35 @@ class KMeans(Base):
 
         """
 
-        cdef uintptr_t input_ptr
-
         X_m, input_ptr, self.n_rows, self.n_cols, self.dtype = \
             input_to_dev_array(X, order='C')
 
-        cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
+        if self.dtype not in [np.float32, np.float64]:
+            raise TypeError('KMeans supports only float32 and float64 input,'
+                            'but input type ' + str(self.dtype) +
+                            ' passed.')
 
-        self.labels_ = cudf.Series(zeros(self.n_rows, dtype=np.int32))
-        cdef uintptr_t labels_ptr = get_cudf_column_ptr(self.labels_)
+        warm = self.warm_start and self.cluster_centers_ is not None
+        if warm:
+            if self.cluster_centers_.shape != (self.n_clusters, self.n_cols):
+                raise ValueError("Expected fitted centers of shape " +
+                                 str((self.n_clusters, self.n_cols)) +
+                                 " to start from but got " +
+                                 str(self.cluster_centers_.shape) + ".")
+            init_value = Array
+            init_centers = numba_utils.row_matrix(self.cluster_centers_)
+            if init_centers.dtype != self.dtype:
+                init_centers = cuda.to_device(
+                    init_centers.copy_to_host().astype(self.dtype))
+            init_centers = init_centers.reshape(-1)
 
-        if (isinstance(self.init, cudf.DataFrame)):
+        elif (isinstance(self.init, cudf.DataFrame)):
             if(len(self.init) != self.n_clusters):
                 raise ValueError('The shape of the initial centers (%s) '
                                  'does not match the number of clusters %i'
                                  % (self.init.shape, self.n_clusters))
             init_value = Array
-            dim_cc = self.n_clusters * self.n_cols
-            self.cluster_centers_ = cuda.device_array(dim_cc,
-                                                      dtype=self.dtype)
-            si = self.init
-            self.cluster_centers_.copy_to_device(numba_utils.row_matrix(si))
+            init_centers = numba_utils.row_matrix(self.init).reshape(-1)
 
         elif (isinstance(self.init, np.ndarray)):
             if(self.init.shape[0] != self.n_clusters):
@@ -335,73 +759,109 @@ class KMeans(Base):
                                  'does not match the number of clusters %i'
                                  % (self.init.shape, self.n_clusters))
             init_value = Array
-            self.cluster_centers_ = cuda.to_device(self.init.flatten())
+            init_centers = cuda.to_device(self.init.flatten())
 
         elif (self.init in ['scalable-k-means++', 'k-means||']):
             init_value = KMeansPlusPlus
-            clust_cent = zeros(self.n_clusters * self.n_cols,
-                               dtype=self.dtype)
-            self.cluster_centers_ = cuda.to_device(clust_cent)
+            init_centers = None
 
         elif (self.init == 'random'):
             init_value = Random
-            clust_cent = zeros(self.n_clusters * self.n_cols,
-                               dtype=self.dtype)
-            self.cluster_centers_ = cuda.to_device(clust_cent)
+            init_centers = None
 
         else:
             raise TypeError('initialization method not supported')
 
-        c_c = self.cluster_centers_
-        cdef uintptr_t cluster_centers_ptr = get_dev_array_ptr(c_c)
-
-        if self.dtype == np.float32:
-            fit_predict(
-                handle_[0],
-                <int> self.n_clusters,         # n_clusters
-                <int> 0,                       # distance metric as squared L2: @todo - support other metrics # noqa: E501
-                <InitMethod> init_value,       # init method
-                <int> self.max_iter,           # max_iterations
-                <double> self.tol,             # threshold
-                <int> self.random_state,       # seed
-                <float*> input_ptr,            # srcdata
-                <size_t> self.n_rows,          # n_samples (rows)
-                <size_t> self.n_cols,          # n_features (cols)
-                <float*> cluster_centers_ptr,  # pred_centroids);
-                <int*> labels_ptr,             # pred_labels
-                <int> self.verbose)
-        elif self.dtype == np.float64:
-            fit_predict(
-                handle_[0],
-                <int> self.n_clusters,          # n_clusters
-                <int> 0,                        # distance metric as squared L2: @todo - support other metrics # noqa: E501
-                <InitMethod> init_value,        # init method
-                <int> self.max_iter,            # max_iterations
-                <double> self.tol,              # threshold
-                <int> self.random_state,        # seed
-                <double*> input_ptr,            # srcdata
-                <size_t> self.n_rows,           # n_samples (rows)
-                <size_t> self.n_cols,           # n_features (cols)
-                <double*> cluster_centers_ptr,  # pred_centroids);
-                <int*> labels_ptr,              # pred_labels
-                <int> self.verbose)
+        algorithm = _algorithms.get(self.algorithm)
+        if algorithm is None:
+            raise ValueError("Expected algorithm among " +
+                             str(sorted(_algorithms)) + " but got " +
+                             str(self.algorithm) + ".")
+
+        n_init = self.n_init
+        if warm:
+            n_init = 1
+        elif init_value == Array and n_init > 1:
+            warnings.warn("Explicit initial centers were given, running a "
+                          "single initialization instead of n_init=" +
+                          str(n_init) + ".")
+            n_init = 1
+
+        def new_centers(handle):
+            centers = _zeros_on(handle, self.n_clusters * self.n_cols,
+                                self.dtype)
+            if init_centers is not None:
+                centers.copy_to_device(init_centers)
+            return centers
+
+        def run(handle, restart):
+            centers = new_centers(handle)
+            labels, inertia, n_iter, skipped_fraction = _fit_restart(
+                handle, X_m, self.n_rows, self.n_cols, self.dtype,
+                self.n_clusters, init_value, self.max_iter, self.tol,
+                self.random_state + restart, self.verbose, centers,
+                algorithm)
+            return (inertia, restart, centers, labels, n_iter,
+                    skipped_fraction)
+
+        if n_init <= 1:
+            best = run(self.handle, 0)
         else:
-            raise TypeError('KMeans supports only float32 and float64 input,'
-                            'but input type ' + str(self.dtype) +
-                            ' passed.')
+            best = self._run_restarts(run, n_init)
 
-        self.handle.sync()
-        cc_df = cudf.DataFrame()
-        for i in range(0, self.n_cols):
-            n_c = self.n_clusters
-            n_cols = self.n_cols
-            cc_df[str(i)] = self.cluster_centers_[i:n_c*n_cols:n_cols]
-        self.cluster_centers_ = cc_df
+        self.inertia_, _, self.cluster_centers_, self.labels_, \
+            self.n_iter_, self.skipped_distance_fraction_ = best
 
-        del(X_m)
+        self.cluster_centers_ = _centers_frame(self.cluster_centers_,
+                                               self.n_clusters, self.n_cols)
+        if self.warm_start:
+            counts = np.bincount(self.labels_.to_array(),
+                                 minlength=self.n_clusters)
+            self.counts_ = cudf.Series(counts.astype(np.int64))
 
         return self
 
+    def _run_restarts(self, run, n_init):
+        """
+        Runs the n_init restarts of fit with `run(handle, restart)`, as many
+        at a time as fit in the free device memory, each on a stream of its
+        own, and returns the result of the lowest inertia.
+        """
+        n_concurrent = memory.largest_batch_size(
+            lambda n: n * self.estimate_memory(self.n_rows, self.n_cols,
+                                               dtype=self.dtype),
+            n_init, memory.get_memory_budget())
+
+        handles = queue.Queue()
+        handles.put(self.handle)
+        for handle in _restart_handles(n_concurrent - 1):
+            handles.put(handle)
+
+        best = []
+        lock = threading.Lock()
+
+        def run_restart(restart):
+            handle = handles.get()
+            try:
+                result = run(handle, restart)
+            finally:
+                handles.put(handle)
+            # Only the best result is kept alive, ties go to the first
+            # restart so that the result does not depend on the timing
+            with lock:
+                if not best or result[:2] < best[0][:2]:
+                    best[:] = [result]
+
+        # The input is read from all the streams
+        self.handle.sync()
+        with ThreadPoolExecutor(max_workers=n_concurrent) as executor:
+            futures = [executor.submit(run_restart, restart)
+                       for restart in range(n_init)]
+            for future in futures:
+                future.result()
+
+        return best[0]
+
     def fit_predict(self, X):
         """
         Compute cluster centers and predict cluster index for each sample.
@@ -416,10 +876,65 @@ class KMeans(Base):
         """
         return self.fit(X).labels_
 
+    def partial_fit(self, X):
+        """
+        Update the fitted centers with the new samples X only: each sample
+        is assigned to its closest center, then each center moves to the mean
+        of all the samples assigned to it, the `counts_` samples of the
+        previous fits and updates and the new ones. This is a single pass
+        over X, much cheaper than a fit on all the data when X is small.
+
+        The model must have been fitted with warm_start=True, which keeps
+        `counts_`; the first call fits it on X if it was not fitted. labels_
+        and inertia_ describe the samples of a fit, they are reset to None.
+
+        Parameters
+        ----------
+        X : array-like (device or host) shape = (n_samples, n_features)
+            Dense matrix (floats or doubles) of shape (n_samples, n_features).
+            Acceptable formats: cuDF DataFrame, NumPy ndarray, Numba device
+            ndarray, cuda array interface compliant array like CuPy
+
+        """
+        if self.cluster_centers_ is None:
+            self.fit(X)
+            if self.counts_ is None:
+                counts = np.bincount(self.labels_.to_array(),
+                                     minlength=self.n_clusters)
+                self.counts_ = cudf.Series(counts.astype(np.int64))
+            return self
+
+        if self.counts_ is None:
+            raise ValueError("Expected a model fitted with warm_start=True "
+                             "to update with new samples.")
+
+        X_m, _, n_rows, n_cols, dtype = \
+            input_to_dev_array(X, order='C', check_dtype=self.dtype)
+        if n_cols != self.n_cols:
+            raise ValueError("Expected " + str(self.n_cols) +
+                             " columns but got " + str(n_cols) + ".")
+
+        centroids = numba_utils.row_matrix(self.cluster_centers_).reshape(-1)
+        counts = cuda.to_device(self.counts_.to_array().astype(np.int64))
+        _partial_fit(self.handle, X_m, n_rows, n_cols, dtype,
+                     self.n_clusters, centroids, counts, self.verbose)
+
+        self.cluster_centers_ = _centers_frame(centroids, self.n_clusters,
+                                               self.n_cols)
+        self.counts_ = cudf.Series(counts.copy_to_host())
+        self.labels_ = None
+        self.inertia_ = None
+
+        del(X_m)
+        return self
+
     def predict(self, X):
         """
         Predict the closest cluster each sample in X belongs to.
 
+        The distances to the centers are computed for as many samples at a
+        time as fit in the free device memory.
+
         Parameters
         ----------
         X : array-like (device or host) shape = (n_samples, n_features)
@@ -429,110 +944,138 @@ class KMeans(Base):
 
         """
 
-        cdef uintptr_t input_ptr
-        X_m, input_ptr, self.n_rows, self.n_cols, self.dtype = \
+        X_m, input_ptr, n_rows, n_cols, dtype = \
             input_to_dev_array(X, order='C')
 
-        cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
+        if dtype not in [np.float32, np.float64]:
+            raise TypeError('KMeans supports only float32 and float64 input,'
+                            'but input type ' + str(dtype) +
+                            ' passed.')
+
         clust_mat = numba_utils.row_matrix(self.cluster_centers_)
-        cdef uintptr_t cluster_centers_ptr = get_dev_array_ptr(clust_mat)
+        labels = cudf.Series(zeros(n_rows, dtype=np.int32))
+        labels_ptr = get_cudf_column_ptr(labels)
 
-        self.labels_ = cudf.Series(zeros(self.n_rows, dtype=np.int32))
-        cdef uintptr_t labels_ptr = get_cudf_column_ptr(self.labels_)
+        def run(batch_size):
+            # distances as squared L2: @todo - support other metrics
+            _nearest_centroids(
+                self.handle, get_dev_array_ptr(clust_mat), self.n_clusters,
+                input_ptr, n_rows, n_cols, dtype, 0, 1, 0, labels_ptr,
+                self.verbose, batch_size)
 
-        if self.dtype == np.float32:
-            predict(
-                handle_[0],
-                <float*> cluster_centers_ptr,  # pred_centroids
-                <int> self.n_clusters,         # n_clusters
-                <float*> input_ptr,            # srcdata
-                <size_t> self.n_rows,          # n_samples (rows)
-                <size_t> self.n_cols,          # n_features (cols)
-                <int> 0,                       # distance metric as squared L2: @todo - support other metrics # noqa: E501
-                <int*> labels_ptr,             # pred_labels
-                <int> self.verbose)
-        elif self.dtype == np.float64:
-            predict(
-                handle_[0],
-                <double*> cluster_centers_ptr,  # pred_centroids
-                <int> self.n_clusters,         # n_clusters
-                <double*> input_ptr,           # srcdata
-                <size_t> self.n_rows,          # n_samples (rows)
-                <size_t> self.n_cols,          # n_features (cols)
-                <int> 0,                       # distance metric as squared L2: @todo - support other metrics # noqa: E501
-                <int*> labels_ptr,             # pred_labels
-                <int> self.verbose)
-        else:
-            raise TypeError('KMeans supports only float32 and float64 input,'
-                            'but input type ' + str(self.dtype) +
-                            ' passed.')
+        self._run_batched(run, n_rows, n_cols, dtype, n_nearest=1)
 
-        self.handle.sync()
         del(X_m)
-        del(clust_mat)
-        return self.labels_
+        self.labels_ = labels
+        return self._output(labels, X, default='cudf')
 
-    def transform(self, X):
+    def transform(self, X, n_nearest=None, out=None):
         """
         Transform X to a cluster-distance space.
 
+        The distances to the centers are computed for as many samples at a
+        time as fit in the free device memory, and written to the output as
+        they are: with a host `out`, or with `n_nearest`, the device memory
+        used does not grow with n_samples * n_clusters.
+
         Parameters
         ----------
         X : array-like (device or host) shape = (n_samples, n_features)
             Dense matrix (floats or doubles) of shape (n_samples, n_features).
             Acceptable formats: cuDF DataFrame, NumPy ndarray, Numba device
             ndarray, cuda array interface compliant array like CuPy
-
+        n_nearest : int (default = None)
+            If given, only the distances to the n_nearest closest centers of
+            each sample are returned, in increasing order, with the indices
+            of these centers.
+        out : array (default = None)
+            Array the distances are written to instead of a new device
+            array, of shape (n_samples, n_clusters), or (n_samples,
+            n_nearest) with n_nearest, and of the dtype of X: a C-contiguous
+            NumPy array, including a memory map, or a device array with the
+            CUDA array interface. It is returned as is.
+
+        Returns
+        -------
+        X_new : array, shape (n_samples, n_clusters)
+            Euclidean distances to the centers, if n_nearest is None.
+        distances, indices : arrays, shape (n_samples, n_nearest)
+            Euclidean distances to the n_nearest closest centers and their
+            indices (int32), if n_nearest is given.
         """
 
-        cdef uintptr_t input_ptr
-        X_m, input_ptr, self.n_rows, self.n_cols, self.dtype = \
+        X_m, input_ptr, n_rows, n_cols, dtype = \
             input_to_dev_array(X, order='C', check_dtype=self.dtype)
 
-        cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
-        clust_mat = numba_utils.row_matrix(self.cluster_centers_)
-        cdef uintptr_t cluster_centers_ptr = get_dev_array_ptr(clust_mat)
+        if dtype not in [np.float32, np.float64]:
+            raise TypeError('KMeans supports only float32 and float64 input,'
+                            'but input type ' + str(dtype) +
+                            ' passed.')
 
-        preds_data = cuda.to_device(zeros(self.n_clusters*self.n_rows,
-                                    dtype=self.dtype))
+        if n_nearest is not None and \
+                not 1 <= n_nearest <= self.n_clusters:
+            raise ValueError("Expected n_nearest in [1, " +
+                             str(self.n_clusters) + "] but got " +
+                             str(n_nearest) + ".")
+
+        n_outputs = self.n_clusters if n_nearest is None else n_nearest
+        if out is None:
+            preds_data = cuda.to_device(zeros(n_rows * n_outputs,
+                                              dtype=dtype))
+            preds_data = preds_data.reshape(n_rows, n_outputs)
+            preds_ptr = get_dev_array_ptr(preds_data)
+        else:
+            preds_data = out
+            preds_ptr, _ = _out_ptr(out, (n_rows, n_outputs), dtype)
 
-        cdef uintptr_t preds_ptr = get_dev_array_ptr(preds_data)
+        clust_mat = numba_utils.row_matrix(self.cluster_centers_)
 
-        if self.dtype == np.float32:
-            transform(
-                handle_[0],
-                <float*> cluster_centers_ptr,  # centroids
-                <int> self.n_clusters,         # n_clusters
-                <float*> input_ptr,            # srcdata
-                <size_t> self.n_rows,          # n_samples (rows)
-                <size_t> self.n_cols,          # n_features (cols)
-                <int> 1,                       # distance metric as L2-norm/euclidean distance: @todo - support other metrics # noqa: E501
-                <float*> preds_ptr,            # transformed output
-                <int> self.verbose)
-        elif self.dtype == np.float64:
-            transform(
-                handle_[0],
-                <double*> cluster_centers_ptr,  # centroids
-                <int> self.n_clusters,          # n_clusters
-                <double*> input_ptr,            # srcdata
-                <size_t> self.n_rows,           # n_samples (rows)
-                <size_t> self.n_cols,           # n_features (cols)
-                <int> 1,                        # distance metric as L2-norm/euclidean distance: @todo - support other metrics # noqa: E501
-                <double*> preds_ptr,            # transformed output
-                <int> self.verbose)
-        else:
-            raise TypeError('KMeans supports only float32 and float64 input,'
-                            'but input type ' + str(self.dtype) +
-                            ' passed.')
+        if n_nearest is None:
+            def run(batch_size):
+                _transform(self.handle, get_dev_array_ptr(clust_mat),
+                           self.n_clusters, input_ptr, n_rows, n_cols, dtype,
+                           preds_ptr, self.verbose, batch_size)
 
-        self.handle.sync()
-        preds_gdf = cudf.DataFrame()
-        for i in range(0, self.n_clusters):
-            preds_gdf[str(i)] = preds_data[i:self.n_rows * self.n_clusters:self.n_clusters]  # noqa: E501
+            self._run_batched(run, n_rows, n_cols, dtype)
+        else:
+            indices = cuda.to_device(zeros(n_rows * n_nearest,
+                                           dtype=np.int32))
+            indices = indices.reshape(n_rows, n_nearest)
+
+            def run(batch_size):
+                # distances as L2-norm/euclidean distance: @todo - support
+                # other metrics
+                _nearest_centroids(
+                    self.handle, get_dev_array_ptr(clust_mat),
+                    self.n_clusters, input_ptr, n_rows, n_cols, dtype, 1,
+                    n_nearest, preds_ptr, get_dev_array_ptr(indices),
+                    self.verbose, batch_size)
+
+            self._run_batched(run, n_rows, n_cols, dtype,
+                              n_nearest=n_nearest)
 
         del(X_m)
-        del(clust_mat)
-        return preds_gdf
+        if out is None:
+            preds_data = self._output(preds_data, X, default='cudf')
+        if n_nearest is None:
+            return preds_data
+        return preds_data, self._output(indices, X, default='cudf')
+
+    def _run_batched(self, run, n_rows, n_cols, dtype, n_nearest=None):
+        """
+        Calls `run(batch_size)` with the largest batch of samples whose
+        distances to the centers fit in the free device memory, and smaller
+        ones if the device runs out of memory.
+        """
+        # The outputs are already allocated, only the buffers of a batch
+        # are counted: the estimate for an input of batch_size rows
+        batch_size = memory.largest_batch_size(
+            lambda batch_size: self.estimate_memory(
+                batch_size, n_cols, dtype=dtype, method='transform',
+                batch_size=batch_size, n_nearest=n_nearest,
+                host_output=True),
+            n_rows, memory.get_memory_budget())
+        memory.retry_on_out_of_memory(run, batch_size, self.handle)
 
     def fit_transform(self, X):
         """
@@ -548,6 +1091,103 @@ class KMeans(Base):
         """
         return self.fit(X).transform(X)
 
+    def estimate_memory(self, n_rows, n_cols, **params):
+        """
+        Returns an estimate, in bytes, of the device memory that `fit`
+        allocates for an input of shape (n_rows, n_cols), not counting the
+        input itself. The number of candidate centroids sampled by the
+        scalable k-means++ initialization is random, the estimate uses its
+        expected value.
+
+        Parameters
+        ----------
+        n_rows, n_cols : int
+            Shape of the input.
+        dtype : np.float32 or np.float64 (default = np.float32)
+            Type of the input.
+        n_clusters : int (default = the one of this object)
+        init : (default = the one of this object)
+        algorithm : (default = the one of this object)
+        method : {'fit', 'predict', 'transform'} (default = 'fit')
+            Method whose memory is estimated.
+        batch_size : int (default = 65536)
+            For predict and transform, number of samples whose distances to
+            the centers are computed at once.
+        n_nearest : int (default = None)
+            For transform, number of closest centers returned per sample.
+        host_output : bool (default = False)
+            For transform, whether the result is written to a host array,
+            which is then not counted.
+        """
+        itemsize = np.dtype(params.get('dtype', np.float32)).itemsize
+        n_clusters = params.get('n_clusters', self.n_clusters)
+        method = params.get('method', 'fit')
+
+        if method in ['predict', 'transform']:
+            n_nearest = 1 if method == 'predict' \
+                else params.get('n_nearest')
+            batch_size = min(params.get('batch_size', _DATA_BATCH_SIZE),
+                             n_rows)
+            int_size = np.dtype(np.int32).itemsize
+            # the centers and their norms, and for a batch the distances to
+            # the centers and the norms of the samples
+            total = n_clusters * (n_cols + 1) * itemsize + \
+                batch_size * (n_clusters + 1) * itemsize
+            if n_nearest is None:
+                output = n_rows * n_clusters * itemsize
+            else:
+                # the nearest centers of a batch before their copy to a host
+                # output, and the indices (labels) on the device
+                total += batch_size * n_nearest * (itemsize + int_size)
+                output = n_rows * n_nearest * itemsize
+                total += n_rows * n_nearest * int_size
+            if method == 'transform' and not params.get('host_output'):
+                total += output
+            return total
+        elif method != 'fit':
+            raise ValueError("Expected method 'fit', 'predict' or "
+                             "'transform' but got " + str(method) + ".")
+
+        init = params.get('init', self.init)
+        algorithm = _algorithms.get(params.get('algorithm', self.algorithm),
+                                    Lloyd)
+
+        batch_size = min(_DATA_BATCH_SIZE, n_rows)
+        labels = n_rows * np.dtype(np.int32).itemsize
+        centroids = n_clusters * n_cols * itemsize
+
+        # Lloyd iterations: the nearest centroid and its distance for each
+        # sample, and the distances of a batch of samples to the centroids
+        key_value_size = 2 * max(itemsize, np.dtype(np.int32).itemsize)
+        iterations = n_rows * key_value_size + \
+            batch_size * n_clusters * itemsize + centroids
+
+        # Hamerly keeps 2 bounds, a status and an index per sample, and a
+        # batch of the samples to assign again; Elkan keeps n_clusters + 1
+        # bounds and a count per sample. Both keep the distances between
+        # the centroids.
+        int_size = np.dtype(np.int32).itemsize
+        if algorithm == Hamerly:
+            iterations = n_rows * (2 * itemsize + 2 * int_size) + \
+                batch_size * (n_cols + n_clusters) * itemsize + \
+                n_clusters * n_clusters * itemsize + centroids
+        elif algorithm == Elkan:
+            iterations = n_rows * ((n_clusters + 1) * itemsize + int_size) + \
+                n_clusters * n_clusters * itemsize + centroids
+
+        # k-means|| samples about 2 * n_clusters candidates per round, and
+        # keeps a flag, a distance and a random number per sample
+        initialization = 0
+        if isinstance(init, str) and \
+                init in ['scalable-k-means++', 'k-means||']:
+            n_candidates = 1 + _INIT_ROUNDS * 2 * n_clusters
+            initialization = \
+                n_rows * (np.dtype(np.int32).itemsize + 2 * itemsize) + \
+                batch_size * n_candidates * itemsize + \
+                n_candidates * n_cols * itemsize
+
+        return labels + centroids + max(iterations, initialization)
+
     def get_params(self, deep=True):
         """
         Scikit-learn style return parameter state
@@ -559,7 +1199,7 @@ class KMeans(Base):
         params = dict()
         variables = ['algorithm', 'copy_x', 'init', 'max_iter', 'n_clusters',
                      'n_init', 'n_jobs', 'precompute_distances',
-                     'random_state', 'tol', 'verbose']
+                     'random_state', 'tol', 'verbose', 'warm_start']
         for key in variables:
             var_value = getattr(self, key, None)
             params[key] = var_value
@@ -585,7 +1225,8 @@ class KMeans(Base):
                           "precompute_distances": self.precompute_distances,
                           "random_state": self.random_state,
                           "tol": self.tol,
-                          "verbose": self.verbose
+                          "verbose": self.verbose,
+                          "warm_start": self.warm_start
                           }
         for key, value in params.items():
             if key not in current_params:
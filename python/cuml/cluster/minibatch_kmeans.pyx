@@ -0,0 +1,490 @@
+#
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+# cython: profile=False
+# distutils: language = c++
+# cython: embedsignature = True
+# cython: language_level = 3
+
+import cudf
+import numpy as np
+
+from collections.abc import Iterator
+from numba import cuda
+
+from libc.stdint cimport uintptr_t
+
+from cuml.cluster.kmeans import KMeans, _centers_frame, _partial_fit
+from cuml.common.handle cimport cumlHandle
+from cuml.utils import get_dev_array_ptr, input_to_dev_array, zeros, \
+    numba_utils
+
+cdef extern from "kmeans/kmeans.hpp" namespace "ML::kmeans" nogil:
+
+    enum InitMethod:
+        KMeansPlusPlus, Random, Array
+
+    cdef void fit(cumlHandle& handle,
+                  int n_clusters,
+                  int metric,
+                  InitMethod init,
+                  int max_iter,
+                  double tol,
+                  int seed,
+                  const float *X,
+                  int n_samples,
+                  int n_features,
+                  float *centroids,
+                  int verbose) except +
+
+    cdef void fit(cumlHandle& handle,
+                  int n_clusters,
+                  int metric,
+                  InitMethod init,
+                  int max_iter,
+                  double tol,
+                  int seed,
+                  const double *X,
+                  int n_samples,
+                  int n_features,
+                  double *centroids,
+                  int verbose) except +
+
+
+# Rows whose distances to the centroids the C++ implementation computes at
+# once (kmeans::detail::getDataBatchSize)
+_DATA_BATCH_SIZE = 1 << 16
+
+
+class MiniBatchKMeans(KMeans):
+
+    """
+    MiniBatchKMeans is a variant of KMeans that updates the centers from
+    small batches of samples instead of the whole dataset at each
+    iteration. Each sample of a batch moves its nearest center towards it
+    by 1 / (number of samples assigned to that center so far), so that every
+    center stays the mean of all the samples it was assigned.
+
+    Only one batch is on the device at a time: the data can be larger than
+    the memory of the device, be kept on the host, or arrive over time
+    through `partial_fit` or an iterator of chunks. The centers converge to
+    a clustering of a quality close to the one of KMeans.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import numpy as np
+        from cuml.cluster import MiniBatchKMeans
+
+        X = np.random.rand(1000000, 16).astype(np.float32)
+
+        # Host data, copied to the device one shuffled batch at a time
+        kmeans = MiniBatchKMeans(n_clusters=8, batch_size=4096).fit(X)
+
+        # Streaming data, one chunk at a time
+        kmeans = MiniBatchKMeans(n_clusters=8)
+        for chunk in chunks:
+            kmeans.partial_fit(chunk)
+        labels = kmeans.predict(X[:1000])
+
+    Parameters
+    ----------
+    handle : cuml.Handle
+        If it is None, a new one is created just for this class.
+    n_clusters : int (default = 8)
+        The number of centroids or clusters you want.
+    batch_size : int (default = 1024)
+        Number of samples of each batch.
+    max_iter : int (default = 100)
+        Maximum number of passes over the data of `fit`.
+    max_no_improvement : int or None (default = 10)
+        `fit` stops once this many consecutive batches did not improve the
+        smoothed inertia of the batches. None disables early stopping.
+    verbose : boolean (default = 0)
+        If True, prints diagnositc information.
+    random_state : int (default = 1)
+        Seed of the initialization and of the order of the batches.
+    init : {'scalable-k-means++', 'k-means||' , 'random' or an ndarray}
+           (default = 'scalable-k-means++')
+        Initialization of the centers, run on the first batch (see
+        `KMeans`). If an ndarray is passed, it should be of shape
+        (n_clusters, n_features) and gives the initial centers.
+    output_type : {'input', 'cudf', 'numpy', 'cupy', 'numba'} (optional)
+        Type of the results of `predict` and `transform`.
+
+    Attributes
+    ----------
+    cluster_centers_ : cuDF DataFrame
+        The coordinates of the centers.
+    counts_ : cuDF Series of int64
+        Number of samples assigned to each center so far.
+    n_steps_ : int
+        Number of batches processed.
+    n_iter_ : int
+        Number of passes over the data of the last `fit`.
+
+    Notes
+    ------
+    Centers that are assigned no samples are not moved or reassigned, and
+    the first batch must hold at least n_clusters samples.
+
+    `fit` accepts the inputs of `KMeans`, where NumPy arrays (including
+    memory-mapped ones) stay on the host and are shuffled between passes,
+    objects with `iter_chunks` like `cuml.io.ArrayFileReader`, read again
+    at each pass, and iterators of chunks, consumed in a single pass. Device
+    arrays and cuDF DataFrames are processed in batches in a random order.
+
+    For additional docs, see `scikitlearn's MiniBatchKMeans
+    <http://scikit-learn.org/stable/modules/generated/sklearn.cluster.MiniBatchKMeans.html>`_.
+    """
+
+    def __init__(self, handle=None, n_clusters=8, batch_size=1024,
+                 max_iter=100, max_no_improvement=10, verbose=0,
+                 random_state=1, init='scalable-k-means++',
+                 output_type=None):
+        super(MiniBatchKMeans, self).__init__(
+            handle=handle, n_clusters=n_clusters, max_iter=max_iter,
+            verbose=verbose, random_state=random_state, init=init,
+            output_type=output_type)
+        self.batch_size = batch_size
+        self.max_no_improvement = max_no_improvement
+        self.counts_ = None
+        self.n_steps_ = 0
+        self.n_iter_ = 0
+        self._centroids = None
+        self._counts = None
+
+    def _reset(self):
+        self.cluster_centers_ = None
+        self.labels_ = None
+        self.counts_ = None
+        self.n_steps_ = 0
+        self.n_iter_ = 0
+        self._centroids = None
+        self._counts = None
+
+    def _init_centers(self, X_m, n_rows, n_cols):
+        """
+        Initializes the centers from the first batch, with the
+        initialization of KMeans and no Lloyd iteration.
+        """
+        if isinstance(self.init, (cudf.DataFrame, np.ndarray)):
+            if self.init.shape[0] != self.n_clusters:
+                raise ValueError('The shape of the initial centers (%s) '
+                                 'does not match the number of clusters %i'
+                                 % (self.init.shape, self.n_clusters))
+            if self.init.shape[1] != n_cols:
+                raise ValueError("Expected initial centers of " +
+                                 str(n_cols) + " columns but got " +
+                                 str(self.init.shape[1]) + ".")
+            if isinstance(self.init, cudf.DataFrame):
+                init = numba_utils.row_matrix(self.init)
+                self._centroids = cuda.device_array(
+                    self.n_clusters * n_cols, dtype=self.dtype)
+                self._centroids.copy_to_device(init.reshape(-1))
+            else:
+                self._centroids = cuda.to_device(
+                    np.ascontiguousarray(self.init,
+                                         dtype=self.dtype).flatten())
+        elif self.init in ['scalable-k-means++', 'k-means||', 'random']:
+            if n_rows < self.n_clusters:
+                raise ValueError("Expected a first batch of at least " +
+                                 str(self.n_clusters) + " samples to "
+                                 "initialize the centers but got " +
+                                 str(n_rows) + ".")
+            init_value = Random if self.init == 'random' else KMeansPlusPlus
+            self._centroids = zeros(self.n_clusters * n_cols,
+                                    dtype=self.dtype)
+            self._run_init(X_m, n_rows, n_cols, init_value)
+        else:
+            raise TypeError('initialization method not supported')
+
+        self._counts = zeros(self.n_clusters, dtype=np.int64)
+
+    def _run_init(self, X_m, n_rows, n_cols, init_value):
+        cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
+        cdef uintptr_t input_ptr = get_dev_array_ptr(X_m)
+        cdef uintptr_t centroids_ptr = get_dev_array_ptr(self._centroids)
+
+        cdef int n_clusters = self.n_clusters
+        cdef InitMethod c_init = init_value
+        cdef int seed = self.random_state
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = n_cols
+        cdef int verbose = self.verbose
+
+        if self.dtype == np.float32:
+            with nogil:
+                fit(handle_[0], n_clusters, <int> 0, c_init, <int> 0,
+                    <double> 0.0, seed, <float*> input_ptr, c_n_rows,
+                    c_n_cols, <float*> centroids_ptr, verbose)
+        else:
+            with nogil:
+                fit(handle_[0], n_clusters, <int> 0, c_init, <int> 0,
+                    <double> 0.0, seed, <double*> input_ptr, c_n_rows,
+                    c_n_cols, <double*> centroids_ptr, verbose)
+        self.handle.sync()
+
+    def _step(self, X_m):
+        """
+        Updates the centers with the device batch X_m and returns the
+        inertia of the batch with the centers before the update.
+        """
+        n_rows, n_cols = X_m.shape
+
+        if self._centroids is None:
+            self.dtype = X_m.dtype
+            self.n_cols = n_cols
+            if self.dtype not in [np.float32, np.float64]:
+                raise TypeError('MiniBatchKMeans supports only float32 and '
+                                'float64 input, but input type ' +
+                                str(self.dtype) + ' passed.')
+            self._init_centers(X_m, n_rows, n_cols)
+        elif n_cols != self.n_cols:
+            raise ValueError("Expected " + str(self.n_cols) +
+                             " columns but got " + str(n_cols) + ".")
+
+        inertia = _partial_fit(self.handle, X_m, n_rows, n_cols, self.dtype,
+                               self.n_clusters, self._centroids,
+                               self._counts, self.verbose)
+
+        self.n_steps_ += 1
+        return inertia
+
+    def _to_batch(self, X):
+        check_dtype = False if self._centroids is None else self.dtype
+        return input_to_dev_array(X, order='C', check_dtype=check_dtype)[0]
+
+    def _chunk_batches(self, chunk):
+        """
+        Yields the device batches of a chunk, in order.
+        """
+        if isinstance(chunk, np.ndarray):
+            for start in range(0, chunk.shape[0], self.batch_size):
+                yield self._to_batch(chunk[start:start + self.batch_size])
+        else:
+            X_m = self._to_batch(chunk)
+            for start in range(0, X_m.shape[0], self.batch_size):
+                yield X_m[start:start + self.batch_size]
+
+    def _epoch_batches(self, X, rng):
+        """
+        Yields the device batches of a pass over X.
+        """
+        if isinstance(X, np.ndarray):
+            # Shuffled rows, only a batch is copied to the device at a time.
+            # They are sorted so that memory-mapped files are read forward.
+            order = rng.permutation(X.shape[0])
+            for start in range(0, X.shape[0], self.batch_size):
+                rows = np.sort(order[start:start + self.batch_size])
+                yield self._to_batch(np.ascontiguousarray(X[rows]))
+        elif hasattr(X, 'iter_chunks'):
+            row_bytes = max(X.row_bytes, 1)
+            for chunk in X.iter_chunks(self.batch_size * row_bytes):
+                yield from self._chunk_batches(chunk)
+        else:
+            # Contiguous batches of the device array, in a random order
+            X_m = self._to_batch(X)
+            starts = np.arange(0, X_m.shape[0], self.batch_size)
+            rng.shuffle(starts)
+            for start in starts:
+                yield X_m[start:start + self.batch_size]
+
+    def fit(self, X):
+        """
+        Compute the centers with batches of X, starting over from new
+        centers.
+
+        Parameters
+        ----------
+        X : array-like (device or host) shape = (n_samples, n_features)
+            Dense matrix (floats or doubles) of shape (n_samples, n_features).
+            Acceptable formats: cuDF DataFrame, NumPy ndarray (possibly
+            memory-mapped), Numba device ndarray, cuda array interface
+            compliant array like CuPy, `cuml.io.ArrayFileReader`, or an
+            iterator of chunks of these formats.
+
+        """
+        self._reset()
+
+        if isinstance(X, Iterator):
+            for chunk in X:
+                for X_m in self._chunk_batches(chunk):
+                    self._step(X_m)
+            self.n_iter_ = 1
+            self._set_cluster_centers()
+            return self
+
+        rng = np.random.RandomState(self.random_state)
+        n_samples = X.shape[0]
+
+        # Early stopping on the exponentially weighted average of the
+        # inertia per sample of the batches, as in scikit-learn
+        ewa_inertia = None
+        ewa_inertia_min = None
+        no_improvement = 0
+        converged = False
+
+        for epoch in range(self.max_iter):
+            for X_m in self._epoch_batches(X, rng):
+                n_rows = X_m.shape[0]
+                batch_inertia = self._step(X_m) / n_rows
+                if ewa_inertia is None:
+                    ewa_inertia = batch_inertia
+                else:
+                    alpha = min(2.0 * n_rows / (n_samples + 1), 1.0)
+                    ewa_inertia = ewa_inertia * (1 - alpha) + \
+                        batch_inertia * alpha
+
+                if ewa_inertia_min is None or ewa_inertia < ewa_inertia_min:
+                    no_improvement = 0
+                    ewa_inertia_min = ewa_inertia
+                else:
+                    no_improvement += 1
+
+                if self.max_no_improvement is not None and \
+                        no_improvement >= self.max_no_improvement:
+                    converged = True
+                    break
+
+            self.n_iter_ = epoch + 1
+            if converged:
+                break
+
+        self._set_cluster_centers()
+        return self
+
+    def partial_fit(self, X):
+        """
+        Update the centers with the samples of X, in batches of batch_size
+        samples. The first call initializes the centers.
+
+        Parameters
+        ----------
+        X : array-like (device or host) shape = (n_samples, n_features)
+            Dense matrix (floats or doubles) of shape (n_samples, n_features).
+            Acceptable formats: cuDF DataFrame, NumPy ndarray, Numba device
+            ndarray, cuda array interface compliant array like CuPy
+
+        """
+        for X_m in self._chunk_batches(X):
+            self._step(X_m)
+        self._set_cluster_centers()
+        return self
+
+    def _set_cluster_centers(self):
+        if self._centroids is None:
+            raise ValueError("Expected at least one sample to fit but got "
+                             "an empty input.")
+        self.handle.sync()
+        self.cluster_centers_ = _centers_frame(self._centroids,
+                                               self.n_clusters, self.n_cols)
+        self.counts_ = cudf.Series(self._counts.copy_to_host())
+
+    def fit_predict(self, X):
+        """
+        Compute the centers and predict the cluster index of each sample.
+
+        Parameters
+        ----------
+        X : array-like (device or host) shape = (n_samples, n_features)
+            Dense matrix (floats or doubles) of shape (n_samples, n_features).
+            Acceptable formats: cuDF DataFrame, NumPy ndarray, Numba device
+            ndarray, cuda array interface compliant array like CuPy
+
+        """
+        return self.fit(X).predict(X)
+
+    def estimate_memory(self, n_rows, n_cols, **params):
+        """
+        Returns an estimate, in bytes, of the device memory that `fit`
+        allocates, not counting a device input. It does not depend on
+        n_rows beyond the size of a batch.
+
+        Parameters
+        ----------
+        n_rows, n_cols : int
+            Shape of the input.
+        dtype : np.float32 or np.float64 (default = np.float32)
+            Type of the input.
+        n_clusters : int (default = the one of this object)
+        batch_size : int (default = the one of this object)
+        init : (default = the one of this object)
+        method : {'fit', 'predict', 'transform'} (default = 'fit')
+            Method whose memory is estimated, see `KMeans.estimate_memory`
+            for the parameters of predict and transform.
+        """
+        if params.get('method', 'fit') != 'fit':
+            return super(MiniBatchKMeans, self).estimate_memory(
+                n_rows, n_cols, **params)
+
+        itemsize = np.dtype(params.get('dtype', np.float32)).itemsize
+        n_clusters = params.get('n_clusters', self.n_clusters)
+        batch_size = min(params.get('batch_size', self.batch_size), n_rows)
+
+        centroids = n_clusters * n_cols * itemsize
+        counts = n_clusters * np.dtype(np.int64).itemsize
+        host_batch = batch_size * n_cols * itemsize
+
+        # Each batch: the nearest centroid of each sample, the distances to
+        # the centroids and the sums and counts of the samples per centroid
+        key_value_size = 2 * max(itemsize, np.dtype(np.int32).itemsize)
+        step = batch_size * key_value_size + \
+            min(_DATA_BATCH_SIZE, batch_size) * n_clusters * itemsize + \
+            centroids + n_clusters * np.dtype(np.int32).itemsize
+
+        initialization = super(MiniBatchKMeans, self).estimate_memory(
+            batch_size, n_cols, dtype=params.get('dtype', np.float32),
+            n_clusters=n_clusters, init=params.get('init', self.init))
+
+        return centroids + counts + host_batch + max(step, initialization)
+
+    def get_params(self, deep=True):
+        """
+        Scikit-learn style return parameter state
+
+        Parameters
+        -----------
+        deep : boolean (default = True)
+        """
+        params = dict()
+        variables = ['batch_size', 'init', 'max_iter', 'max_no_improvement',
+                     'n_clusters', 'random_state', 'verbose']
+        for key in variables:
+            var_value = getattr(self, key, None)
+            params[key] = var_value
+        return params
+
+    def set_params(self, **params):
+        """
+        Scikit-learn style set parameter state to dictionary of params.
+
+        Parameters
+        -----------
+        params : dict of new params
+        """
+        if not params:
+            return self
+        current_params = self.get_params()
+        for key, value in params.items():
+            if key not in current_params:
+                raise ValueError('Invalid parameter for estimator')
+            else:
+                setattr(self, key, value)
+                current_params[key] = value
+        return self
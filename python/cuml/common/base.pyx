@@ -20,8 +20,53 @@
 # cython: language_level = 3
 
 
+import functools
+
 import cuml.common.handle
 import cuml.common.cuda
+import cuml.common.executor
+import cuml.common.memory as memory
+import cuml.common.profiler as profiler
+import cuml.utils.output_utils as output_utils
+import cuml.utils.serialization as serialization
+import cuml.utils.transfer_audit as transfer_audit
+
+
+# Public methods of the estimators that are wrapped by
+# `Base.__init_subclass__`, so that instrumentation can attribute the work
+# done inside them to the estimator and method that was called.
+_instrumented_methods = ['fit', 'fit_predict', 'fit_transform', 'predict',
+                         'transform', 'inverse_transform', 'kneighbors',
+                         'score']
+
+# Methods whose device memory consumption is reported in `last_fit_memory_`
+_memory_tracked_methods = ['fit', 'fit_predict', 'fit_transform']
+
+
+def _instrumented(func, method):
+    def call(self, *args, **kwargs):
+        if not (transfer_audit.is_enabled() or profiler.is_enabled()):
+            return func(self, *args, **kwargs)
+        with transfer_audit.estimator_call(self, method), \
+                profiler.estimator_call(self, method):
+            return func(self, *args, **kwargs)
+
+    if method not in _memory_tracked_methods:
+        wrapper = functools.wraps(func)(call)
+        wrapper._cuml_instrumented = True
+        return wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        tracker = memory.MemoryTracker(self.handle)
+        try:
+            with tracker:
+                return call(self, *args, **kwargs)
+        finally:
+            # Also set when the fit failed, e.g. out of device memory
+            self.last_fit_memory_ = tracker.report
+    wrapper._cuml_instrumented = True
+    return wrapper
 
 
 class Base:
@@ -64,21 +109,56 @@ class Base:
         # the default stream inside the `cumlHandle` is being used
         base.handle.sync()
         del base  # optional!
+
+    After each `fit`, `fit_predict` or `fit_transform`, `last_fit_memory_`
+    holds a `cuml.common.memory.MemoryReport` of the device memory the call
+    allocated through the handle, including its peak.
     """
 
-    def __init__(self, handle=None, verbose=False):
+    def __init__(self, handle=None, verbose=False, output_type=None):
         """
         Constructor. All children must call init method of this base class.
 
         Parameters
         ----------
         handle : cuml.Handle
-               If it is None, a new one is created just for this class
+               If it is None, the default handle of the thread that makes the
+               first GPU call of this object is used (see
+               `cuml.common.handle.get_default_handle`)
         verbose : bool
                 Whether to print debug spews
+        output_type : {'input', 'cudf', 'numpy', 'cupy', 'numba'} or None
+                Type of the results returned by this estimator. If None, the
+                global output type is used (see
+                `cuml.set_global_output_type`), or else the default type of
+                each method.
         """
-        self.handle = cuml.common.handle.Handle() if handle is None else handle
+        self._handle = handle
         self.verbose = verbose
+        self.output_type = output_utils._check_output_type(output_type)
+
+    @property
+    def handle(self):
+        """
+        The `cuml.Handle` this object runs on. Unless one was given to the
+        constructor, it is drawn from the default handles on first access.
+        """
+        if self._handle is None:
+            self._handle = cuml.common.handle.get_default_handle()
+        return self._handle
+
+    @handle.setter
+    def handle(self, handle):
+        self._handle = handle
+
+    @classmethod
+    def __init_subclass__(cls, **kwargs):
+        super(Base, cls).__init_subclass__(**kwargs)
+        for method in _instrumented_methods:
+            func = cls.__dict__.get(method)
+            if callable(func) and \
+                    not getattr(func, '_cuml_instrumented', False):
+                setattr(cls, method, _instrumented(func, method))
 
     def get_param_names(self):
         """
@@ -120,13 +200,57 @@ class Base:
                 setattr(self, key, value)
         return self
 
+    def estimate_memory(self, n_rows, n_cols, **params):
+        """
+        Returns an upper bound, in bytes, of the device memory that `fit`
+        allocates for an input of shape (n_rows, n_cols), not counting the
+        input itself. Keyword arguments override the hyperparameters of this
+        object for the estimate, e.g. `dtype` or a batch size.
+
+        Estimators that batch their work use it to choose their batch sizes
+        from the free device memory.
+        """
+        raise NotImplementedError(type(self).__name__ + " does not estimate "
+                                  "its memory usage.")
+
+    def fit_async(self, *args, **kwargs):
+        """
+        Schedules `fit` on a stream of the default `cuml.StreamExecutor` and
+        returns a `concurrent.futures.Future` of its result. Use
+        `asyncio.wrap_future` on it to await it from a coroutine.
+        """
+        return cuml.common.executor.get_default_executor().submit(
+            self, 'fit', *args, **kwargs)
+
+    def predict_async(self, *args, **kwargs):
+        """
+        Schedules `predict` like `fit_async` does for `fit`. Calls on the same
+        estimator run in submission order, so it can directly follow a
+        `fit_async`.
+        """
+        return cuml.common.executor.get_default_executor().submit(
+            self, 'predict', *args, **kwargs)
+
+    def _output(self, result, X, default='input'):
+        """
+        Returns `result`, computed from the input X, converted to the output
+        type of this estimator in a single bulk conversion. `default` is the
+        type the calling method returns when no output type is configured.
+        """
+        output_type = output_utils.resolve_output_type(
+            getattr(self, 'output_type', None), X, default)
+        return output_utils.to_output(result, output_type)
+
     def __getstate__(self):
-        state = self.__dict__.copy()
-        # Remove the unpicklable handle.
+        # Device arrays are exported as out-of-band buffers with pickle
+        # protocol 5, see `cuml.utils.serialization`
+        state = serialization.serialize_state(self.__dict__)
+        # Remove the unpicklable handle, a default one is drawn again on the
+        # first GPU call after unpickling.
         # todo: look into/enable pickling handle if necessary
-        del state['handle']
+        state['_handle'] = None
         return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
-        self.handle = cuml.common.handle.Handle()
+        self._handle = None
@@ -28,9 +28,17 @@ cdef extern from * nogil:
 
 # Populate this with more runtime api method declarations as and when needed
 cdef extern from "cuda_runtime_api.h" nogil:
+    enum cudaMemcpyKind:
+        cudaMemcpyDefault
+
     _Error cudaStreamCreate(_Stream* s)
     _Error cudaStreamDestroy(_Stream s)
     _Error cudaStreamSynchronize(_Stream s)
     _Error cudaGetLastError()
+    _Error cudaGetDevice(int* device)
+    _Error cudaMemGetInfo(size_t* free, size_t* total)
+    _Error cudaMemsetAsync(void* ptr, int value, size_t count, _Stream s)
+    _Error cudaMemcpy(void* dst, const void* src, size_t count,
+                      cudaMemcpyKind kind)
     const char* cudaGetErrorString(_Error e)
     const char* cudaGetErrorName(_Error e)
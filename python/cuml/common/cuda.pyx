@@ -77,9 +77,34 @@ cdef class Stream:
         launches
         """
         cdef _Stream stream = <_Stream>self.s
-        cdef _Error e = cudaStreamSynchronize(stream)
+        cdef _Error e
+        with nogil:
+            e = cudaStreamSynchronize(stream)
         if e != 0:
             raise CudaRuntimeError("Stream sync")
 
     def getStream(self):
         return self.s
+
+
+def getMemoryInfo():
+    """
+    Returns the free and the total device memory of the current device, in
+    bytes. Memory held by a pool allocator like RMM counts as used even when
+    the pool has it available.
+    """
+    cdef size_t free = 0
+    cdef size_t total = 0
+    cdef _Error e = cudaMemGetInfo(&free, &total)
+    if e != 0:
+        raise CudaRuntimeError("Memory info")
+    return free, total
+
+
+def resetLastError():
+    """
+    Clears the error of the last failed CUDA runtime call of this thread,
+    e.g. an out of memory error, so that later error checks do not report
+    it again.
+    """
+    cudaGetLastError()
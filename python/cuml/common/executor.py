@@ -0,0 +1,186 @@
+#
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+import cuml.common.cuda
+import cuml.common.handle
+
+
+# Number of streams of the executor used by `Base.fit_async` and friends
+DEFAULT_N_STREAMS = 4
+
+
+class _StreamSlot:
+    """
+    A handle and the single thread that issues all the work run on it, so
+    that calls on the same handle are serialized while calls on different
+    slots overlap.
+    """
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.pending = 0
+        self.worker = ThreadPoolExecutor(max_workers=1)
+
+    def submit(self, func, *args, **kwargs):
+        def run():
+            with cuml.common.handle.using_handle(self.handle):
+                return func(*args, **kwargs)
+        return self.worker.submit(run)
+
+
+class StreamExecutor:
+    """
+    Runs estimator methods asynchronously on a pool of CUDA streams, so that
+    the work of independent estimators overlaps on the GPU.
+
+    Each stream has its own `cuml.Handle` and a dedicated thread issuing the
+    calls on it. An estimator without a handle is bound on its first call to
+    the stream with the fewest pending calls, and all its later calls run on
+    that stream, in submission order. An estimator that already has a handle
+    keeps running on it. The estimators keep their handle, and with it its
+    stream, once the executor is shut down.
+
+    Parameters
+    ----------
+    n_streams : int (default = 4)
+        Number of streams in the pool.
+    enable_rmm : bool (default = False)
+        Whether to use RMM as the device allocator of the stream handles.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import cuml
+
+        with cuml.StreamExecutor(n_streams=4) as executor:
+            futures = [executor.submit(cuml.KMeans(n_clusters=8), 'fit', X)
+                       for X in segments]
+            models = [future.result() for future in futures]
+
+        # or, from a coroutine
+        model = await executor.run(cuml.Ridge(), 'fit', X, y)
+    """
+
+    def __init__(self, n_streams=DEFAULT_N_STREAMS, enable_rmm=False):
+        if n_streams < 1:
+            raise ValueError("Expected at least 1 stream but got " +
+                             str(n_streams) + ".")
+        self.n_streams = n_streams
+        self.enable_rmm = enable_rmm
+        self._slots = None
+        self._foreign_slots = {}
+        self._lock = threading.Lock()
+
+    def _create_slots(self):
+        slots = []
+        for _ in range(self.n_streams):
+            stream = cuml.common.cuda.Stream()
+            handle = cuml.common.handle.Handle()
+            handle.setStream(stream)
+            if self.enable_rmm:
+                handle.enableRMM()
+            slots.append(_StreamSlot(handle))
+        return slots
+
+    def _slot_for(self, estimator):
+        if self._slots is None:
+            self._slots = self._create_slots()
+
+        handle = getattr(estimator, '_handle', None)
+        if handle is None:
+            slot = min(self._slots, key=lambda slot: slot.pending)
+            # Bind the estimator now rather than on its first GPU call, so
+            # that calls queued before that one use the same stream
+            estimator.handle = slot.handle
+            return slot
+
+        for slot in self._slots:
+            if slot.handle is handle:
+                return slot
+
+        slot = self._foreign_slots.get(id(handle))
+        if slot is None:
+            slot = _StreamSlot(handle)
+            self._foreign_slots[id(handle)] = slot
+        return slot
+
+    def submit(self, estimator, method, *args, **kwargs):
+        """
+        Schedules `estimator.method(*args, **kwargs)` and returns a
+        `concurrent.futures.Future` of its result.
+        """
+        func = getattr(estimator, method)
+
+        with self._lock:
+            slot = self._slot_for(estimator)
+            slot.pending += 1
+
+        future = slot.submit(func, *args, **kwargs)
+
+        def done(_):
+            with self._lock:
+                slot.pending -= 1
+        future.add_done_callback(done)
+        return future
+
+    async def run(self, estimator, method, *args, **kwargs):
+        """
+        Coroutine version of `submit`: awaits and returns the result of
+        `estimator.method(*args, **kwargs)` without blocking the event loop.
+        """
+        return await asyncio.wrap_future(
+            self.submit(estimator, method, *args, **kwargs))
+
+    def shutdown(self, wait=True):
+        """
+        Stops the threads of the executor once the scheduled calls are done.
+        """
+        with self._lock:
+            slots = (self._slots or []) + list(self._foreign_slots.values())
+            self._slots = None
+            self._foreign_slots = {}
+        for slot in slots:
+            slot.worker.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown(wait=True)
+        return False
+
+
+_default_executor = None
+_default_executor_lock = threading.Lock()
+
+
+def get_default_executor():
+    """
+    Returns the executor used by the `*_async` methods of the estimators,
+    created with `DEFAULT_N_STREAMS` streams on first use.
+    """
+    global _default_executor
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = StreamExecutor()
+        return _default_executor
@@ -32,4 +32,5 @@ cdef extern from "cuML.hpp" namespace "ML" nogil:
         cumlHandle() except +
         void setStream(cuml.common.cuda._Stream s)
         void setDeviceAllocator(shared_ptr[deviceAllocator] a)
+        shared_ptr[deviceAllocator] getDeviceAllocator()
         cuml.common.cuda._Stream getStream()
@@ -21,8 +21,12 @@
 
 
 import cuml
+import threading
+
+from contextlib import contextmanager
 from libcpp.memory cimport shared_ptr
-from cuml.common.cuda cimport _Stream, _Error, cudaStreamSynchronize
+from cuml.common.cuda cimport _Stream, _Error, cudaStreamSynchronize, \
+    cudaGetDevice
 
 
 cdef extern from "common/rmmAllocatorAdapter.hpp" namespace "ML" nogil:
@@ -30,6 +34,23 @@ cdef extern from "common/rmmAllocatorAdapter.hpp" namespace "ML" nogil:
         pass
 
 
+cdef extern from "common/trackingAllocatorAdapter.hpp" namespace "ML" nogil:
+    cdef struct deviceMemoryStats:
+        size_t current_bytes
+        size_t peak_bytes
+        size_t total_bytes
+        size_t n_allocations
+        size_t n_deallocations
+        size_t n_failed
+
+    cdef cppclass trackingAllocatorAdapter(deviceAllocator):
+        trackingAllocatorAdapter(shared_ptr[deviceAllocator] upstream)
+        deviceMemoryStats getStats()
+        void resetPeak()
+        int startScope()
+        size_t endScope(int id)
+
+
 cdef class Handle:
     """
     Handle is a lightweight python wrapper around the corresponding C++ class
@@ -49,6 +70,9 @@ cdef class Handle:
 
         # call ML algos here
 
+        # device memory allocated by the algos through this handle
+        handle.getMemoryStats()['peak_bytes']
+
         # final sync of all work launched in the stream of this handle
         # this is same as `cuml.cuda.Stream.sync()` call, but safer in case
         # the default stream inside the `cumlHandle` is being used
@@ -61,8 +85,26 @@ cdef class Handle:
     # 'size_t'!
     cdef size_t h
 
+    # Accounting adaptor wrapping the device allocator of the handle, owned
+    # by `allocator`
+    cdef trackingAllocatorAdapter* tracker
+    cdef shared_ptr[deviceAllocator] allocator
+
+    # The `cuml.cuda.Stream` set with `setStream`, referenced here so that
+    # the stream is not destroyed while the handle still uses it
+    cdef object stream
+
     def __cinit__(self):
-        self.h = <size_t>(new cumlHandle())
+        cdef cumlHandle* h_ = new cumlHandle()
+        self.h = <size_t>h_
+        self._setTrackedAllocator(h_.getDeviceAllocator())
+
+    cdef _setTrackedAllocator(self, shared_ptr[deviceAllocator] upstream):
+        self.tracker = new trackingAllocatorAdapter(upstream)
+        self.allocator = shared_ptr[deviceAllocator](
+            <deviceAllocator*>self.tracker)
+        cdef cumlHandle* h_ = <cumlHandle*>self.h
+        h_.setDeviceAllocator(self.allocator)
 
     def __dealloc_(self):
         h_ = <cumlHandle*>self.h
@@ -72,6 +114,7 @@ cdef class Handle:
         cdef size_t s = <size_t>stream.getStream()
         cdef cumlHandle* h_ = <cumlHandle*>self.h
         h_.setStream(<_Stream>s)
+        self.stream = stream
 
     # TODO: in future, we should just enable RMM by default
     def enableRMM(self):
@@ -81,11 +124,52 @@ cdef class Handle:
         First, the usual cudaMalloc/Free, which is the default for cumlHandle.
         Second, the allocator based on RMM. So, this function, basically makes
         the cumlHandle use a more efficient allocator, instead of the default.
+
+        The memory statistics of the handle start over, since they only cover
+        the allocations of the current allocator.
         """
         cdef shared_ptr[deviceAllocator] rmmAlloc = (
             shared_ptr[deviceAllocator](new rmmAllocatorAdapter()))
-        cdef cumlHandle* h_ = <cumlHandle*>self.h
-        h_.setDeviceAllocator(rmmAlloc)
+        self._setTrackedAllocator(rmmAlloc)
+
+    def getMemoryStats(self):
+        """
+        Returns the device memory allocated by cuML through this handle, as a
+        dict of:
+
+        * current_bytes: bytes allocated now
+        * peak_bytes: highest value of current_bytes, see `resetPeakMemory`
+        * total_bytes: bytes allocated in total
+        * n_allocations, n_deallocations: number of calls to the allocator
+        * n_failed: number of allocations that failed, e.g. out of memory
+
+        Memory allocated outside of the allocator of the handle, like the
+        buffers of UMAP and of the inputs of the estimators, is not counted.
+        """
+        cdef deviceMemoryStats stats = self.tracker.getStats()
+        return {'current_bytes': stats.current_bytes,
+                'peak_bytes': stats.peak_bytes,
+                'total_bytes': stats.total_bytes,
+                'n_allocations': stats.n_allocations,
+                'n_deallocations': stats.n_deallocations,
+                'n_failed': stats.n_failed}
+
+    def resetPeakMemory(self):
+        """
+        Sets the `peak_bytes` of `getMemoryStats` to the memory allocated now.
+        """
+        self.tracker.resetPeak()
+
+    def _startMemoryScope(self):
+        """
+        Starts measuring the peak of the allocated memory for a section of
+        work, without resetting `peak_bytes`. Returns the id to pass to
+        `_endMemoryScope`, which returns that peak.
+        """
+        return self.tracker.startScope()
+
+    def _endMemoryScope(self, scope_id):
+        return self.tracker.endScope(scope_id)
 
     def sync(self):
         """
@@ -96,9 +180,76 @@ cdef class Handle:
         """
         cdef cumlHandle* h_ = <cumlHandle*>self.h
         cdef _Stream stream = h_.getStream()
-        cdef _Error e = cudaStreamSynchronize(stream)
+        cdef _Error e
+        # Release the GIL while waiting so that other threads can keep
+        # issuing work, e.g. on the other streams of a `cuml.StreamExecutor`
+        with nogil:
+            e = cudaStreamSynchronize(stream)
         if e != 0:
             raise cuml.cuda.CudaRuntimeError("Stream sync")
 
     def getHandle(self):
         return self.h
+
+
+# Per-thread state of the default handles: `pool` maps a device id to the
+# handle shared by the estimators of this thread on that device, `stack`
+# holds the handles set by `using_handle`.
+_default_handles = threading.local()
+
+
+def get_default_handle():
+    """
+    Returns the handle used by estimators and functions that were not given
+    one: the innermost handle set with `using_handle` in the calling thread,
+    or else the handle shared by the calling thread on the current device,
+    which is created on first use.
+
+    Since the shared handle is reused across estimators, changes made to it
+    (e.g. `setStream` or `enableRMM`) apply to all of them. Pass a dedicated
+    `cuml.Handle` to an estimator to configure it alone.
+    """
+    stack = getattr(_default_handles, 'stack', None)
+    if stack:
+        return stack[-1]
+
+    cdef int device = 0
+    if cudaGetDevice(&device) != 0:
+        raise cuml.cuda.CudaRuntimeError("Get device")
+
+    pool = _default_handles.__dict__.setdefault('pool', {})
+    handle = pool.get(device)
+    if handle is None:
+        handle = Handle()
+        pool[device] = handle
+    return handle
+
+
+@contextmanager
+def using_handle(handle):
+    """
+    Context manager that sets `handle` as the default handle of the calling
+    thread for the duration of the block. Estimators without a handle of
+    their own pick up the default handle on their first GPU call, and keep
+    it afterwards.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import cuml
+        stream = cuml.cuda.Stream()
+        handle = cuml.Handle()
+        handle.setStream(stream)
+
+        with cuml.using_handle(handle):
+            pca = cuml.PCA(n_components=2).fit(X)  # runs on `stream`
+    """
+    stack = _default_handles.__dict__.setdefault('stack', [])
+    stack.append(handle)
+    try:
+        yield handle
+    finally:
+        stack.pop()
+
@@ -0,0 +1,208 @@
+#
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import warnings
+
+from collections import namedtuple
+
+
+# Share of the free device memory that the batch sizes chosen automatically
+# may use, the rest is left for fragmentation and other allocations
+DEFAULT_MEMORY_FRACTION = 0.8
+
+_retry_on_out_of_memory = True
+
+MemoryReport = namedtuple('MemoryReport', ['peak_bytes', 'allocated_bytes',
+                                           'retained_bytes', 'n_allocations',
+                                           'n_failed'])
+MemoryReport.__doc__ = """
+Device memory allocated through a `cuml.Handle` during a call, as reported by
+`last_fit_memory_` on the estimators.
+
+peak_bytes : highest amount of memory allocated during the call, above what
+    was allocated when it started
+allocated_bytes : sum of the sizes of the allocations of the call
+retained_bytes : memory still allocated when the call returned, e.g. held by
+    the fitted attributes. Negative if the call released memory.
+n_allocations : number of allocations of the call
+n_failed : number of allocations that failed, e.g. because the device was out
+    of memory
+"""
+
+
+class MemoryTracker(object):
+    """
+    Context manager measuring the device memory allocated through `handle`
+    while it is active. `report` holds a `MemoryReport` once it exits, also
+    when the block raised.
+
+    The statistics are those of the whole handle: allocations made on it by
+    other threads during the block are counted as well.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import cuml
+        from cuml.common.memory import MemoryTracker
+
+        handle = cuml.Handle()
+        with MemoryTracker(handle) as tracker:
+            cuml.DBSCAN(eps=0.5, handle=handle).fit(X)
+        tracker.report.peak_bytes
+    """
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.report = None
+        self._start = None
+        self._scope = None
+
+    def __enter__(self):
+        self._start = self.handle.getMemoryStats()
+        self._scope = self.handle._startMemoryScope()
+        return self
+
+    def __exit__(self, *exc_info):
+        peak = self.handle._endMemoryScope(self._scope)
+        end = self.handle.getMemoryStats()
+        start = self._start
+        self.report = MemoryReport(
+            peak_bytes=max(peak - start['current_bytes'], 0),
+            allocated_bytes=end['total_bytes'] - start['total_bytes'],
+            retained_bytes=end['current_bytes'] - start['current_bytes'],
+            n_allocations=end['n_allocations'] - start['n_allocations'],
+            n_failed=end['n_failed'] - start['n_failed'])
+        return False
+
+
+def _free_device_bytes():
+    import cuml.common.cuda
+
+    free, _ = cuml.common.cuda.getMemoryInfo()
+    return free
+
+
+def _pool_cached_bytes():
+    from cuml.utils.device_pool import get_default_pool
+
+    return get_default_pool().stats()['cached_bytes']
+
+
+def _release_pool_cache():
+    from cuml.utils.device_pool import get_default_pool
+
+    get_default_pool().clear()
+
+
+def get_memory_budget(fraction=DEFAULT_MEMORY_FRACTION):
+    """
+    Returns the number of bytes that automatically sized batches may use on
+    the current device: `fraction` of its free memory, counting the free
+    buffers kept by the default `cuml.utils.DevicePool` as free.
+    """
+    return int((_free_device_bytes() + _pool_cached_bytes()) * fraction)
+
+
+def largest_batch_size(estimate, n_items, budget):
+    """
+    Returns the largest batch size in [1, n_items] for which
+    `estimate(batch_size)`, a non-decreasing number of bytes, is within
+    `budget`, or 1 if no batch size is.
+    """
+    if n_items <= 1 or estimate(n_items) <= budget:
+        return max(n_items, 1)
+
+    low, high = 1, n_items
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate(middle) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def set_retry_on_out_of_memory(enabled):
+    """
+    Sets whether the estimators that batch their work retry with smaller
+    batches when the device runs out of memory (the default), see
+    `retry_on_out_of_memory`.
+    """
+    global _retry_on_out_of_memory
+    _retry_on_out_of_memory = bool(enabled)
+
+
+def is_out_of_memory(error):
+    """
+    Returns whether `error`, raised by a call into the C++ library, reports
+    that the device ran out of memory.
+    """
+    if isinstance(error, MemoryError):
+        return True
+    message = str(error).lower()
+    return 'out of memory' in message or 'out_of_memory' in message
+
+
+def _reset_device_error():
+    import cuml.common.cuda
+
+    cuml.common.cuda.resetLastError()
+
+
+def retry_on_out_of_memory(run, batch_size, handle, min_batch_size=1,
+                           name='batch size'):
+    """
+    Calls `run(batch_size)` and returns its result. Whenever it fails because
+    the device is out of memory, the batch size is halved, down to
+    `min_batch_size`, and `run` is called again. The buffers of the failed
+    call must be released when it raises, as the C++ algorithms do; the
+    free buffers of the default `cuml.utils.DevicePool` are released before
+    each retry.
+
+    A warning reports the batch size that succeeded after a retry, `name`
+    names it in the message.
+
+    Returns
+    -------
+    result : the result of `run`
+    batch_size : the batch size of the call that succeeded
+    """
+    first_batch_size = batch_size
+    while True:
+        n_failed = handle.getMemoryStats()['n_failed']
+        try:
+            result = run(batch_size)
+            break
+        except Exception as error:
+            out_of_memory = is_out_of_memory(error) or \
+                handle.getMemoryStats()['n_failed'] > n_failed
+            if not (_retry_on_out_of_memory and out_of_memory and
+                    batch_size > min_batch_size):
+                raise
+
+        # Let the frees of the failed call complete and clear its error
+        handle.sync()
+        _reset_device_error()
+        _release_pool_cache()
+        batch_size = max(batch_size // 2, min_batch_size)
+
+    if batch_size != first_batch_size:
+        warnings.warn("The device ran out of memory with a " + name +
+                      " of " + str(first_batch_size) + ", succeeded with " +
+                      str(batch_size) + ".")
+    return result, batch_size
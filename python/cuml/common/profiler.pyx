@@ -0,0 +1,276 @@
+#
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+# cython: profile=False
+# distutils: language = c++
+# cython: embedsignature = True
+# cython: language_level = 3
+
+import json
+import os
+import threading
+
+from collections import namedtuple
+from contextlib import contextmanager
+
+from libcpp cimport bool
+from libcpp.string cimport string
+from libcpp.vector cimport vector
+
+
+cdef extern from "common/profiler.hpp" namespace "ML" nogil:
+
+    cdef cppclass StageTiming:
+        string algorithm
+        string stage
+        double start_us
+        double wall_ms
+        float device_ms
+        unsigned long long thread_id
+
+    void profilerStart()
+    void profilerStop()
+    bool profilerEnabled()
+    double profilerNow()
+    vector[StageTiming] profilerFlush()
+
+
+StageEvent = namedtuple('StageEvent', ['algorithm', 'stage', 'start',
+                                       'wall_time', 'device_time', 'thread'])
+StageEvent.__doc__ = """
+A timed span recorded by `cuml.profile`.
+
+algorithm : name of the C++ algorithm ('UMAP', 'DBSCAN', 'DecisionTree'), or
+    class name of the estimator for the spans of estimator methods
+stage : name of the stage, like 'knn_graph', or the estimator method
+start : start time in seconds, on the clock of `now`
+wall_time : host time in seconds. For C++ stages it runs until the device
+    work of the stage is done.
+device_time : time in seconds between the start and the end of the stage on
+    its CUDA stream, None for estimator methods
+thread : id of the thread, as returned by `threading.get_ident`
+"""
+
+_active_profiles = []
+_profiles_lock = threading.Lock()
+
+
+def now():
+    """
+    Returns the time in seconds on the clock of the recorded spans.
+    """
+    return profilerNow() * 1e-6
+
+
+def is_enabled():
+    return len(_active_profiles) > 0
+
+
+def _drain():
+    """
+    Moves the stage timings recorded by the C++ algorithms into the active
+    profiles. Must be called with `_profiles_lock` held.
+    """
+    cdef vector[StageTiming] timings = profilerFlush()
+    cdef size_t i
+    events = []
+    for i in range(timings.size()):
+        events.append(StageEvent(
+            algorithm=timings[i].algorithm.decode('utf-8'),
+            stage=timings[i].stage.decode('utf-8'),
+            start=timings[i].start_us * 1e-6,
+            wall_time=timings[i].wall_ms * 1e-3,
+            device_time=timings[i].device_ms * 1e-3,
+            thread=timings[i].thread_id))
+    for profile in _active_profiles:
+        profile._add_all(events)
+
+
+class Profile(object):
+    """
+    Collects the wall and device times of the internal stages of the C++
+    algorithms, and the wall times of the estimator methods, while it is
+    active:
+
+    * UMAP: knn_graph, fuzzy_simpl_set, intersection (supervised fit),
+      init_embed, optimize
+    * DBSCAN: vertexdeg, adjgraph, labeling (once per batch), relabel
+    * DecisionTree (each tree of RandomForestClassifier): quantile, gini and
+      split (once per node)
+
+    Every stage waits for its device work while profiling, so that the wall
+    times are accurate and the stages do not overlap: profiling should only
+    be enabled for diagnostics.
+
+    Profiles can be nested and are shared by all threads.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import cuml
+
+        with cuml.profile() as profile:
+            cuml.UMAP().fit_transform(X)
+            cuml.DBSCAN(eps=0.5).fit(X)
+
+        print(profile.summary())
+        profile.by_stage()['UMAP']['knn_graph']['device_time']
+        profile.to_chrome_trace('trace.json')  # open in chrome://tracing
+    """
+
+    def __init__(self):
+        self._events = []
+        self._lock = threading.Lock()
+        self._start = None
+
+    def start(self):
+        with _profiles_lock:
+            self._start = now()
+            _active_profiles.append(self)
+            profilerStart()
+        return self
+
+    def stop(self):
+        with _profiles_lock:
+            if self in _active_profiles:
+                _drain()
+                _active_profiles.remove(self)
+                profilerStop()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _add(self, event):
+        with self._lock:
+            self._events.append(event)
+
+    def _add_all(self, events):
+        with self._lock:
+            self._events.extend(event for event in events
+                                if event.start >= self._start)
+
+    @property
+    def events(self):
+        """
+        The recorded `StageEvent`s, in the order they ended.
+        """
+        with _profiles_lock:
+            if self in _active_profiles:
+                _drain()
+        with self._lock:
+            return list(self._events)
+
+    def by_stage(self):
+        """
+        Aggregates the events per algorithm and stage.
+
+        Returns: dict of algorithm to dict of stage to
+        {'count', 'wall_time', 'device_time'}, with the times in seconds
+        """
+        report = {}
+        for event in self.events:
+            per_stage = report.setdefault(event.algorithm, {})
+            stats = per_stage.setdefault(event.stage, {'count': 0,
+                                                       'wall_time': 0.0,
+                                                       'device_time': None})
+            stats['count'] += 1
+            stats['wall_time'] += event.wall_time
+            if event.device_time is not None:
+                stats['device_time'] = (stats['device_time'] or 0.0) + \
+                    event.device_time
+        return report
+
+    def summary(self):
+        """
+        Returns a human readable table of `by_stage`.
+        """
+        lines = ["%-24s %-18s %8s %14s %14s" % ('algorithm', 'stage',
+                                                 'count', 'wall (ms)',
+                                                 'device (ms)')]
+        report = self.by_stage()
+        for algorithm in sorted(report):
+            for stage, stats in sorted(report[algorithm].items()):
+                device_time = stats['device_time']
+                lines.append("%-24s %-18s %8d %14.3f %14s" %
+                             (algorithm, stage, stats['count'],
+                              stats['wall_time'] * 1000,
+                              '-' if device_time is None
+                              else '%.3f' % (device_time * 1000)))
+        return '\n'.join(lines)
+
+    def to_chrome_trace(self, path=None):
+        """
+        Returns the events in the Chrome trace event format, which
+        chrome://tracing and Perfetto display as a timeline per thread.
+        Writes it as JSON to `path` if given.
+        """
+        pid = os.getpid()
+        trace_events = []
+        for event in self.events:
+            args = {}
+            if event.device_time is not None:
+                args['device_ms'] = event.device_time * 1000
+            trace_events.append({'name': event.stage,
+                                 'cat': event.algorithm,
+                                 'ph': 'X',
+                                 'ts': event.start * 1e6,
+                                 'dur': event.wall_time * 1e6,
+                                 'pid': pid,
+                                 'tid': event.thread,
+                                 'args': args})
+        trace = {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+        if path is not None:
+            with open(path, 'w') as f:
+                json.dump(trace, f)
+        return trace
+
+
+def profile():
+    """
+    Returns a new `Profile`, to be used as a context manager or started and
+    stopped explicitly.
+    """
+    return Profile()
+
+
+@contextmanager
+def estimator_call(estimator, method):
+    """
+    Records the block as a span of `method` of `estimator` in the active
+    profiles. Entered by the public methods of every `cuml.Base` subclass.
+    """
+    if not _active_profiles:
+        yield
+        return
+
+    start = now()
+    try:
+        yield
+    finally:
+        event = StageEvent(algorithm=type(estimator).__name__, stage=method,
+                           start=start, wall_time=now() - start,
+                           device_time=None, thread=threading.get_ident())
+        with _profiles_lock:
+            profiles = list(_active_profiles)
+        for profile in profiles:
+            if start >= profile._start:
+                profile._add(event)
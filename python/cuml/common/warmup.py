@@ -0,0 +1,212 @@
+#
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import importlib
+import os
+import time
+
+import numpy as np
+
+
+# Size of the CUDA driver's cache of the kernels compiled from PTX set by
+# `warmup` when it is given a cache directory. The driver default, 256 MiB,
+# is too small to hold the kernels of libcuml and the Numba kernels.
+KERNEL_CACHE_MAX_SIZE = 1 << 30
+
+# Shape of the synthetic data the estimators are warmed up on
+_N_ROWS = 64
+_N_COLS = 4
+
+# Estimators warmed up by `warmup`: name to (module, constructor parameters,
+# kind of target of fit, methods called on the fitted estimator)
+_estimators = {
+    'LinearRegression': ('cuml.linear_model.linear_regression', {},
+                         'regression', ('predict',)),
+    'Ridge': ('cuml.linear_model.ridge', {}, 'regression', ('predict',)),
+    'Lasso': ('cuml.linear_model.lasso', {}, 'regression', ('predict',)),
+    'ElasticNet': ('cuml.linear_model.elastic_net', {}, 'regression',
+                   ('predict',)),
+    'SGD': ('cuml.solvers.sgd', {'epochs': 1}, 'regression', ('predict',)),
+    'CD': ('cuml.solvers.cd', {'max_iter': 1}, 'regression', ('predict',)),
+    'PCA': ('cuml.decomposition.pca', {'n_components': 2}, None,
+            ('transform',)),
+    'TruncatedSVD': ('cuml.decomposition.tsvd', {'n_components': 2}, None,
+                     ('transform',)),
+    'KMeans': ('cuml.cluster.kmeans', {'n_clusters': 2}, None,
+               ('predict', 'transform')),
+    'MiniBatchKMeans': ('cuml.cluster.minibatch_kmeans',
+                        {'n_clusters': 2, 'batch_size': 32, 'max_iter': 1},
+                        None, ('predict',)),
+    'DBSCAN': ('cuml.cluster.dbscan', {}, None, ()),
+    'NearestNeighbors': ('cuml.neighbors.nearest_neighbors', {}, None,
+                         ('kneighbors',)),
+    'UMAP': ('cuml.manifold.umap', {'n_epochs': 1}, None, ('transform',)),
+    'GaussianRandomProjection': ('cuml.random_projection.random_projection',
+                                 {'n_components': 2}, None, ('transform',)),
+    'SparseRandomProjection': ('cuml.random_projection.random_projection',
+                               {'n_components': 2}, None, ('transform',)),
+    'RandomForestClassifier': ('cuml.ensemble.randomforest',
+                               {'n_estimators': 1}, 'classification',
+                               ('predict',)),
+}
+
+# Estimators whose methods only take NumPy input, warmed up on it whatever
+# the input types asked for
+_numpy_only = {'RandomForestClassifier'}
+
+
+def set_kernel_cache(path, max_size=KERNEL_CACHE_MAX_SIZE):
+    """
+    Makes the CUDA driver keep the kernels it compiles from PTX, the Numba
+    kernels and the kernels of libcuml built for another architecture, in
+    the directory `path`, so that later processes load them instead of
+    compiling them again.
+
+    The driver reads this setting when it is initialized: it only applies if
+    no GPU work was done yet in the process.
+    """
+    os.makedirs(path, exist_ok=True)
+    os.environ['CUDA_CACHE_PATH'] = path
+    os.environ['CUDA_CACHE_MAXSIZE'] = str(max_size)
+    os.environ['CUDA_CACHE_DISABLE'] = '0'
+
+
+def _estimator_name(estimator):
+    if isinstance(estimator, str):
+        name = estimator
+    elif isinstance(estimator, type):
+        name = estimator.__name__
+    else:
+        name = type(estimator).__name__
+    if name not in _estimators:
+        raise ValueError("Expected an estimator among " +
+                         str(sorted(_estimators)) + " but got " +
+                         str(estimator) + ".")
+    return name
+
+
+def _make_data(target, dtype, input_type):
+    rng = np.random.RandomState(0)
+    X = rng.rand(_N_ROWS, _N_COLS).astype(dtype)
+    if target == 'classification':
+        y = (X[:, 0] > 0.5).astype(np.int32)
+    elif target == 'regression':
+        y = X.sum(axis=1).astype(dtype)
+    else:
+        y = None
+
+    if input_type == 'cudf':
+        import cudf
+        import pandas as pd
+
+        X = cudf.DataFrame.from_pandas(pd.DataFrame(X))
+        if y is not None:
+            y = cudf.Series(y)
+    elif input_type != 'numpy':
+        raise ValueError("Expected input type 'numpy' or 'cudf' but got " +
+                         str(input_type) + ".")
+    return X, y
+
+
+def _warmup_estimator(name, dtypes, input_types):
+    module, params, target, methods = _estimators[name]
+    estimator_class = getattr(importlib.import_module(module), name)
+    if name in _numpy_only:
+        input_types = ('numpy',)
+    for dtype in dtypes:
+        for input_type in input_types:
+            X, y = _make_data(target, dtype, input_type)
+            estimator = estimator_class(**params)
+            if y is None:
+                estimator.fit(X)
+            else:
+                estimator.fit(X, y)
+            for method in methods:
+                getattr(estimator, method)(X)
+
+
+def warmup(estimators=None, dtypes=(np.float32, np.float64),
+           input_types=('numpy', 'cudf'), cache_dir=None, handle=None):
+    """
+    Does ahead of time the work that makes the first calls of a process
+    slow: creates the CUDA context and the cuBLAS, cuSOLVER and cuSPARSE
+    handles of the default `cuml.Handle`, and fits each estimator on a
+    small synthetic dataset, which compiles the Numba kernels converting
+    its inputs and loads its kernels.
+
+    The default handles are per thread: call it from the thread that runs
+    the estimators, or pass the handle they use.
+
+    Parameters
+    ----------
+    estimators : list of str, estimator classes or instances (default = all)
+        Estimators to warm up, among those of `cuml`.
+    dtypes : list of dtypes (default = [np.float32, np.float64])
+        Data types of the inputs to warm up for, Numba compiles kernels for
+        each of them.
+    input_types : list of {'numpy', 'cudf'} (default = both)
+        Types of the inputs to warm up for.
+    cache_dir : str (default = None)
+        If given, the kernels compiled by the CUDA driver are kept in this
+        directory (see `set_kernel_cache`), e.g. on a volume shared by the
+        processes of a deployment. Only applies if `warmup` runs before any
+        other GPU work of the process.
+    handle : cuml.Handle (default = None)
+        Handle to warm up, the default handle of the calling thread if None.
+
+    Returns
+    -------
+    timings : dict
+        Time in seconds spent on 'handle' and each estimator.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import cuml
+
+        # at the start of the process, before serving requests
+        cuml.warmup(estimators=['KMeans', 'NearestNeighbors'],
+                    dtypes=['float32'], cache_dir='/cache/cuml')
+    """
+    if estimators is None:
+        names = list(_estimators)
+    else:
+        names = [_estimator_name(estimator) for estimator in estimators]
+
+    if cache_dir is not None:
+        set_kernel_cache(cache_dir)
+
+    import cuml.common.handle
+
+    timings = {}
+
+    start = time.perf_counter()
+    if handle is None:
+        handle = cuml.common.handle.get_default_handle()
+    handle.sync()
+    timings['handle'] = time.perf_counter() - start
+
+    # Lasso and ElasticNet take no handle, they use the default one
+    with cuml.common.handle.using_handle(handle):
+        for name in names:
+            start = time.perf_counter()
+            _warmup_estimator(name, dtypes, input_types)
+            handle.sync()
+            timings[name] = time.perf_counter() - start
+
+    return timings
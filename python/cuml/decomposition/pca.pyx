@@ -35,7 +35,7 @@ from cuml.utils import get_cudf_column_ptr, get_dev_array_ptr, \
     input_to_dev_array, zeros
 
 
-cdef extern from "pca/pca.hpp" namespace "ML":
+cdef extern from "pca/pca.hpp" namespace "ML" nogil:
 
     cdef void pcaFit(cumlHandle& handle,
                      float *input,
@@ -220,6 +220,11 @@ class PCA(Base):
     n_components : int (default = 1)
         The number of top K singular vectors / values you want.
         Must be <= number(columns).
+    output_type : {'input', 'cudf', 'numpy', 'cupy', 'numba'} (optional)
+        Type of the results of `transform`, `fit_transform` and
+        `inverse_transform`. 'numba' and 'cupy' return the device buffer
+        without a copy. Defaults to the global output type, or else to cuDF
+        (see `cuml.set_global_output_type`).
     random_state : int / None (default = None)
         If you want results to be the same when you restart Python, select a
         state.
@@ -280,9 +285,10 @@ class PCA(Base):
 
     def __init__(self, copy=True, handle=None, iterated_power=15,
                  n_components=1, random_state=None, svd_solver='auto',
-                 tol=1e-7, verbose=False, whiten=False):
+                 tol=1e-7, verbose=False, whiten=False, output_type=None):
         # parameters
-        super(PCA, self).__init__(handle=handle, verbose=verbose)
+        super(PCA, self).__init__(handle=handle, verbose=verbose,
+                                  output_type=output_type)
         self.copy = copy
         self.iterated_power = iterated_power
         self.n_components = n_components
@@ -389,27 +395,29 @@ class PCA(Base):
 
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
         if self.dtype == np.float32:
-            pcaFitTransform(handle_[0],
-                            <float*> input_ptr,
-                            <float*> t_input_ptr,
-                            <float*> comp_ptr,
-                            <float*> explained_var_ptr,
-                            <float*> explained_var_ratio_ptr,
-                            <float*> singular_vals_ptr,
-                            <float*> mean_ptr,
-                            <float*> noise_vars_ptr,
-                            params)
+            with nogil:
+                pcaFitTransform(handle_[0],
+                                <float*> input_ptr,
+                                <float*> t_input_ptr,
+                                <float*> comp_ptr,
+                                <float*> explained_var_ptr,
+                                <float*> explained_var_ratio_ptr,
+                                <float*> singular_vals_ptr,
+                                <float*> mean_ptr,
+                                <float*> noise_vars_ptr,
+                                params)
         else:
-            pcaFitTransform(handle_[0],
-                            <double*> input_ptr,
-                            <double*> t_input_ptr,
-                            <double*> comp_ptr,
-                            <double*> explained_var_ptr,
-                            <double*> explained_var_ratio_ptr,
-                            <double*> singular_vals_ptr,
-                            <double*> mean_ptr,
-                            <double*> noise_vars_ptr,
-                            params)
+            with nogil:
+                pcaFitTransform(handle_[0],
+                                <double*> input_ptr,
+                                <double*> t_input_ptr,
+                                <double*> comp_ptr,
+                                <double*> explained_var_ptr,
+                                <double*> explained_var_ratio_ptr,
+                                <double*> singular_vals_ptr,
+                                <double*> mean_ptr,
+                                <double*> noise_vars_ptr,
+                                params)
 
         # make sure the previously scheduled gpu tasks are complete before the
         # following transfers start
@@ -452,16 +460,14 @@ class PCA(Base):
 
         Returns
         -------
-        X_new : cuDF DataFrame, shape (n_samples, n_components)
+        X_new : cuDF DataFrame (default) or the configured output type,
+            shape (n_samples, n_components)
         """
         self.fit(X, _transform=True)
-        X_new = cudf.DataFrame()
-        num_rows = self.n_rows
-
-        for i in range(0, self.n_components):
-            X_new[str(i)] = self.trans_input_[i*num_rows:(i+1)*num_rows]
 
-        return X_new
+        X_new = self.trans_input_.reshape(self.n_rows, self.n_components,
+                                          order='F')
+        return self._output(X_new, X, default='cudf')
 
     def inverse_transform(self, X):
         """
@@ -479,7 +485,8 @@ class PCA(Base):
 
         Returns
         -------
-        X_original : cuDF DataFrame, shape (n_samples, n_features)
+        X_original : cuDF DataFrame (default) or the configured output
+            type, shape (n_samples, n_features)
 
         """
         cdef uintptr_t trans_input_ptr
@@ -504,34 +511,34 @@ class PCA(Base):
 
         cdef cumlHandle* h_ = <cumlHandle*><size_t>self.handle.getHandle()
         if dtype.type == np.float32:
-            pcaInverseTransform(h_[0],
-                                <float*> trans_input_ptr,
-                                <float*> components_ptr,
-                                <float*> singular_vals_ptr,
-                                <float*> mean_ptr,
-                                <float*> input_ptr,
-                                params)
+            with nogil:
+                pcaInverseTransform(h_[0],
+                                    <float*> trans_input_ptr,
+                                    <float*> components_ptr,
+                                    <float*> singular_vals_ptr,
+                                    <float*> mean_ptr,
+                                    <float*> input_ptr,
+                                    params)
         else:
-            pcaInverseTransform(h_[0],
-                                <double*> trans_input_ptr,
-                                <double*> components_ptr,
-                                <double*> singular_vals_ptr,
-                                <double*> mean_ptr,
-                                <double*> input_ptr,
-                                params)
+            with nogil:
+                pcaInverseTransform(h_[0],
+                                    <double*> trans_input_ptr,
+                                    <double*> components_ptr,
+                                    <double*> singular_vals_ptr,
+                                    <double*> mean_ptr,
+                                    <double*> input_ptr,
+                                    params)
 
         # make sure the previously scheduled gpu tasks are complete before the
         # following transfers start
         self.handle.sync()
 
-        X_original = cudf.DataFrame()
-        for i in range(0, params.n_cols):
-            n_r = params.n_rows
-            X_original[str(i)] = input_data[i*n_r:(i+1)*n_r]
+        X_original = input_data.reshape(params.n_rows, params.n_cols,
+                                        order='F')
 
         del(X_m)
 
-        return X_original
+        return self._output(X_original, X, default='cudf')
 
     def transform(self, X):
         """
@@ -550,7 +557,8 @@ class PCA(Base):
 
         Returns
         -------
-        X_new : cuDF DataFrame, shape (n_samples, n_components)
+        X_new : cuDF DataFrame (default) or the configured output type,
+            shape (n_samples, n_components)
 
         """
 
@@ -576,32 +584,33 @@ class PCA(Base):
 
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
         if dtype.type == np.float32:
-            pcaTransform(handle_[0],
-                         <float*> input_ptr,
-                         <float*> components_ptr,
-                         <float*> trans_input_ptr,
-                         <float*> singular_vals_ptr,
-                         <float*> mean_ptr,
-                         params)
+            with nogil:
+                pcaTransform(handle_[0],
+                             <float*> input_ptr,
+                             <float*> components_ptr,
+                             <float*> trans_input_ptr,
+                             <float*> singular_vals_ptr,
+                             <float*> mean_ptr,
+                             params)
         else:
-            pcaTransform(handle_[0],
-                         <double*> input_ptr,
-                         <double*> components_ptr,
-                         <double*> trans_input_ptr,
-                         <double*> singular_vals_ptr,
-                         <double*> mean_ptr,
-                         params)
+            with nogil:
+                pcaTransform(handle_[0],
+                             <double*> input_ptr,
+                             <double*> components_ptr,
+                             <double*> trans_input_ptr,
+                             <double*> singular_vals_ptr,
+                             <double*> mean_ptr,
+                             params)
 
         # make sure the previously scheduled gpu tasks are complete before the
         # following transfers start
         self.handle.sync()
 
-        X_new = cudf.DataFrame()
-        for i in range(0, params.n_components):
-            X_new[str(i)] = t_input_data[i*params.n_rows:(i+1)*params.n_rows]
+        X_new = t_input_data.reshape(params.n_rows, params.n_components,
+                                     order='F')
 
         del(X_m)
-        return X_new
+        return self._output(X_new, X, default='cudf')
 
     def get_param_names(self):
         return ["copy", "iterated_power", "n_components", "svd_solver", "tol",
@@ -21,6 +21,7 @@
 
 import ctypes
 import cudf
+import cupy as cp
 import numpy as np
 
 from numba import cuda
@@ -32,9 +33,9 @@ from cuml.common.base import Base
 from cuml.common.handle cimport cumlHandle
 from cuml.decomposition.utils cimport *
 from cuml.utils import get_cudf_column_ptr, get_dev_array_ptr, \
-    input_to_dev_array, zeros
+    input_to_dev_array, input_to_csr_matrix, is_sparse_input, zeros
 
-cdef extern from "tsvd/tsvd.hpp" namespace "ML":
+cdef extern from "tsvd/tsvd.hpp" namespace "ML" nogil:
 
     cdef void tsvdFit(cumlHandle& handle,
                       float *input,
@@ -177,6 +178,11 @@ class TruncatedSVD(Base):
     n_components : int (default = 1)
         The number of top K singular vectors / values you want.
         Must be <= number(columns).
+    output_type : {'input', 'cudf', 'numpy', 'cupy', 'numba'} (optional)
+        Type of the results of `transform`, `fit_transform` and
+        `inverse_transform`. 'numba' and 'cupy' return the device buffer
+        without a copy. Defaults to the global output type, or else to cuDF
+        (see `cuml.set_global_output_type`).
     n_iter : int (default = 15)
         Used in Jacobi solver. The more iterations, the more accurate, but
         slower.
@@ -223,9 +229,10 @@ class TruncatedSVD(Base):
     """
 
     def __init__(self, algorithm='full', handle=None, n_components=1,
-                 n_iter=15, random_state=None, tol=1e-7, verbose=False):
+                 n_iter=15, random_state=None, tol=1e-7, verbose=False,
+                 output_type=None):
         # params
-        super(TruncatedSVD, self).__init__(handle, verbose)
+        super(TruncatedSVD, self).__init__(handle, verbose, output_type)
         self.algorithm = algorithm
         self.n_components = n_components
         self.n_iter = n_iter
@@ -277,9 +284,13 @@ class TruncatedSVD(Base):
        X : array-like (device or host) shape = (n_samples, n_features)
            Dense matrix (floats or doubles) of shape (n_samples, n_features).
            Acceptable formats: cuDF DataFrame, NumPy ndarray, Numba device
-           ndarray, cuda array interface compliant array like CuPy
+           ndarray, cuda array interface compliant array like CuPy, or
+           sparse matrix (floats or doubles) like SciPy or CuPy CSR/COO
 
         """
+        if is_sparse_input(X):
+            return self._fit_sparse(X, _transform)
+
         cdef uintptr_t input_ptr
         X_m, input_ptr, self.n_rows, self.n_cols, self.dtype = \
             input_to_dev_array(X)
@@ -311,23 +322,25 @@ class TruncatedSVD(Base):
 
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
         if self.dtype == np.float32:
-            tsvdFitTransform(handle_[0],
-                             <float*> input_ptr,
-                             <float*> t_input_ptr,
-                             <float*> comp_ptr,
-                             <float*> explained_var_ptr,
-                             <float*> explained_var_ratio_ptr,
-                             <float*> singular_vals_ptr,
-                             params)
+            with nogil:
+                tsvdFitTransform(handle_[0],
+                                 <float*> input_ptr,
+                                 <float*> t_input_ptr,
+                                 <float*> comp_ptr,
+                                 <float*> explained_var_ptr,
+                                 <float*> explained_var_ratio_ptr,
+                                 <float*> singular_vals_ptr,
+                                 params)
         else:
-            tsvdFitTransform(handle_[0],
-                             <double*> input_ptr,
-                             <double*> t_input_ptr,
-                             <double*> comp_ptr,
-                             <double*> explained_var_ptr,
-                             <double*> explained_var_ratio_ptr,
-                             <double*> singular_vals_ptr,
-                             params)
+            with nogil:
+                tsvdFitTransform(handle_[0],
+                                 <double*> input_ptr,
+                                 <double*> t_input_ptr,
+                                 <double*> comp_ptr,
+                                 <double*> explained_var_ptr,
+                                 <double*> explained_var_ratio_ptr,
+                                 <double*> singular_vals_ptr,
+                                 params)
 
         # make sure the previously scheduled gpu tasks are complete before the
         # following transfers start
@@ -350,6 +363,88 @@ class TruncatedSVD(Base):
         del(X_m)
         return self
 
+    def _fit_sparse(self, X, _transform):
+        """
+        Fit on a sparse matrix with the same covariance eigendecomposition as
+        the 'full' algorithm. X^T * X is computed by cuSPARSE, so only the
+        non-zero values of X and the (n_features, n_features) cross product
+        are stored, never the dense X.
+        """
+        X_m, self.n_rows, self.n_cols, _, self.dtype = \
+            input_to_csr_matrix(X)
+
+        if self.n_components > self.n_cols:
+            raise ValueError(' n_components must be < n_features')
+
+        n_c = self.n_components
+
+        cross_mult = X_m.T.dot(X_m).toarray()
+        eig_vals, eig_vecs = cp.linalg.eigh(cross_mult)
+        del cross_mult
+
+        # eigh sorts in ascending order
+        eig_vals = eig_vals[::-1][:n_c]
+        components = cp.ascontiguousarray(eig_vecs[:, ::-1][:, :n_c].T)
+        del eig_vecs
+
+        trans_input = X_m.dot(components.T)
+
+        # Same sign convention as the dense path: the entry of largest
+        # magnitude of each column of the transformed data is positive
+        max_idx = cp.argmax(cp.abs(trans_input), axis=0)
+        signs = cp.sign(trans_input[max_idx, cp.arange(n_c)])
+        signs[signs == 0] = 1
+        trans_input *= signs
+        components *= signs[:, None]
+
+        explained_variance = trans_input.var(axis=0, ddof=1)
+        mean = cp.bincount(X_m.indices, weights=X_m.data,
+                           minlength=self.n_cols) / self.n_rows
+        sq_mean = cp.bincount(X_m.indices, weights=X_m.data ** 2,
+                              minlength=self.n_cols) / self.n_rows
+        total_var = float(((sq_mean - mean ** 2) * self.n_rows /
+                           (self.n_rows - 1)).sum())
+
+        # Column major (n_components, n_features), as filled by tsvdFit
+        self.components_ = cuda.as_cuda_array(components.ravel(order='F'))
+        self.explained_variance_ = \
+            cudf.Series(cuda.as_cuda_array(explained_variance))
+        self.explained_variance_ratio_ = \
+            cudf.Series(cuda.as_cuda_array(explained_variance / total_var))
+        self.singular_values_ = \
+            cudf.Series(cuda.as_cuda_array(cp.sqrt(cp.abs(eig_vals))))
+        self.mean_ = cudf.Series(cuda.as_cuda_array(mean.astype(self.dtype)))
+        self.noise_variance_ = cudf.Series(zeros(1, dtype=self.dtype))
+
+        if _transform:
+            self.trans_input_ = \
+                cuda.as_cuda_array(trans_input.ravel(order='F'))
+
+        self.components_ptr = get_dev_array_ptr(self.components_)
+        self.explained_variance_ptr = \
+            get_cudf_column_ptr(self.explained_variance_)
+        self.explained_variance_ratio_ptr = \
+            get_cudf_column_ptr(self.explained_variance_ratio_)
+        self.singular_values_ptr = get_cudf_column_ptr(self.singular_values_)
+
+        components_gdf = cudf.DataFrame()
+        for i in range(0, self.n_cols):
+            components_gdf[str(i)] = self.components_[i*n_c:(i+1)*n_c]
+
+        self.components_ = components_gdf
+
+        return self
+
+    def _transform_sparse(self, X):
+        X_m, _, _, _, _ = input_to_csr_matrix(X, check_dtype=self.dtype,
+                                              check_cols=self.n_cols)
+
+        components = cp.asarray(self.components_.as_gpu_matrix(order='F'))
+        X_new = cuda.as_cuda_array(
+            cp.asfortranarray(X_m.dot(components.T)))
+
+        return self._output(X_new, X, default='cudf')
+
     def fit_transform(self, X):
         """
         Fit LSI model to X and perform dimensionality reduction on X.
@@ -359,22 +454,21 @@ class TruncatedSVD(Base):
         X : array-like (device or host) shape = (n_samples, n_features)
             Dense matrix (floats or doubles) of shape (n_samples, n_features).
             Acceptable formats: cuDF DataFrame, NumPy ndarray, Numba device
-            ndarray, cuda array interface compliant array like CuPy
+            ndarray, cuda array interface compliant array like CuPy, or
+            sparse matrix (floats or doubles) like SciPy or CuPy CSR/COO
 
         Returns
         ----------
-        X_new : cuDF DataFrame, shape (n_samples, n_components)
-            Reduced version of X as a dense cuDF DataFrame
+        X_new : cuDF DataFrame (default) or the configured output type,
+            shape (n_samples, n_components)
+            Reduced version of X
 
         """
         self.fit(X, _transform=True)
-        X_new = cudf.DataFrame()
-        num_rows = self.n_rows
 
-        for i in range(0, self.n_components):
-            X_new[str(i)] = self.trans_input_[i*num_rows:(i+1)*num_rows]
-
-        return X_new
+        X_new = self.trans_input_.reshape(self.n_rows, self.n_components,
+                                          order='F')
+        return self._output(X_new, X, default='cudf')
 
     def inverse_transform(self, X):
         """
@@ -391,8 +485,9 @@ class TruncatedSVD(Base):
 
         Returns
         ----------
-        X_original : cuDF DataFrame, shape (n_samples, n_features)
-            Note that this is always a dense cuDF DataFrame.
+        X_original : cuDF DataFrame (default) or the configured output
+            type, shape (n_samples, n_features)
+            Note that this is always dense.
 
         """
 
@@ -415,28 +510,30 @@ class TruncatedSVD(Base):
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
 
         if dtype.type == np.float32:
-            tsvdInverseTransform(handle_[0],
-                                 <float*> trans_input_ptr,
-                                 <float*> components_ptr,
-                                 <float*> input_ptr,
-                                 params)
+            with nogil:
+                tsvdInverseTransform(handle_[0],
+                                     <float*> trans_input_ptr,
+                                     <float*> components_ptr,
+                                     <float*> input_ptr,
+                                     params)
         else:
-            tsvdInverseTransform(handle_[0],
-                                 <double*> trans_input_ptr,
-                                 <double*> components_ptr,
-                                 <double*> input_ptr,
-                                 params)
+            with nogil:
+                tsvdInverseTransform(handle_[0],
+                                     <double*> trans_input_ptr,
+                                     <double*> components_ptr,
+                                     <double*> input_ptr,
+                                     params)
 
         # make sure the previously scheduled gpu tasks are complete before the
         # following transfers start
         self.handle.sync()
 
-        X_original = cudf.DataFrame()
-        for i in range(0, params.n_cols):
-            n_r = params.n_rows
-            X_original[str(i)] = input_data[i*n_r:(i+1)*n_r]
+        X_original = input_data.reshape(params.n_rows, params.n_cols,
+                                        order='F')
+
+        del(X_m)
 
-        return X_original
+        return self._output(X_original, X, default='cudf')
 
     def transform(self, X):
         """
@@ -447,16 +544,21 @@ class TruncatedSVD(Base):
         X : array-like (device or host) shape = (n_samples, n_features)
             Dense matrix (floats or doubles) of shape (n_samples, n_features).
             Acceptable formats: cuDF DataFrame, NumPy ndarray, Numba device
-            ndarray, cuda array interface compliant array like CuPy
+            ndarray, cuda array interface compliant array like CuPy, or
+            sparse matrix (floats or doubles) like SciPy or CuPy CSR/COO
 
         Returns
         ----------
-        X_new : cuDF DataFrame, shape (n_samples, n_components)
-            Reduced version of X. This will always be a dense DataFrame.
+        X_new : cuDF DataFrame (default) or the configured output type,
+            shape (n_samples, n_components)
+            Reduced version of X. This will always be dense.
 
         """
+        if is_sparse_input(X):
+            return self._transform_sparse(X)
+
         cdef uintptr_t input_ptr
-        X_m, n_rows, _, dtype = input_to_dev_array(X)
+        X_m, input_ptr, n_rows, _, dtype = input_to_dev_array(X)
 
         cpdef paramsTSVD params
         params.n_components = self.n_components
@@ -473,28 +575,29 @@ class TruncatedSVD(Base):
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
 
         if dtype.type == np.float32:
-            tsvdTransform(handle_[0],
-                          <float*> input_ptr,
-                          <float*> components_ptr,
-                          <float*> trans_input_ptr,
-                          params)
+            with nogil:
+                tsvdTransform(handle_[0],
+                              <float*> input_ptr,
+                              <float*> components_ptr,
+                              <float*> trans_input_ptr,
+                              params)
         else:
-            tsvdTransform(handle_[0],
-                          <double*> input_ptr,
-                          <double*> components_ptr,
-                          <double*> trans_input_ptr,
-                          params)
+            with nogil:
+                tsvdTransform(handle_[0],
+                              <double*> input_ptr,
+                              <double*> components_ptr,
+                              <double*> trans_input_ptr,
+                              params)
 
         # make sure the previously scheduled gpu tasks are complete before the
         # following transfers start
         self.handle.sync()
 
-        X_new = cudf.DataFrame()
-        for i in range(0, params.n_components):
-            X_new[str(i)] = t_input_data[i*params.n_rows:(i+1)*params.n_rows]
+        X_new = t_input_data.reshape(params.n_rows, params.n_components,
+                                     order='F')
 
         del(X_m)
-        return X_new
+        return self._output(X_new, X, default='cudf')
 
     def get_param_names(self):
         return ["algorithm", "n_components", "n_iter", "random_state", "tol"]
@@ -31,7 +31,7 @@ from libc.stdint cimport uintptr_t
 from cuml.decomposition.utils cimport *
 from cuml.utils import zeros
 
-cdef extern from "tsvd/tsvd_spmg.h" namespace "ML":
+cdef extern from "tsvd/tsvd_spmg.h" namespace "ML" nogil:
 
     cdef void tsvdFitSPMG(float *h_input,
                           float *h_components,
@@ -243,7 +243,7 @@ class TruncatedSVDSPMG:
                   + " in the next version."
             raise TypeError(msg)
 
-        n_gpus = len(gpu_ids)
+        cdef int n_gpus = len(gpu_ids)
 
         n_rows = X.shape[0]
         n_cols = X.shape[1]
@@ -298,42 +298,46 @@ class TruncatedSVDSPMG:
 
         if not _transform:
             if self.dtype == np.float32:
-                tsvdFitSPMG(<float*>X_ptr,
-                            <float*>components_ptr,
-                            <float*>singular_values_ptr,
-                            params,
-                            <int*>gpu_ids_ptr,
-                            <int>n_gpus)
+                with nogil:
+                    tsvdFitSPMG(<float*>X_ptr,
+                                <float*>components_ptr,
+                                <float*>singular_values_ptr,
+                                params,
+                                <int*>gpu_ids_ptr,
+                                <int>n_gpus)
 
             else:
-                tsvdFitSPMG(<float*>X_ptr,
-                            <float*>components_ptr,
-                            <float*>singular_values_ptr,
-                            params,
-                            <int*>gpu_ids_ptr,
-                            <int>n_gpus)
+                with nogil:
+                    tsvdFitSPMG(<float*>X_ptr,
+                                <float*>components_ptr,
+                                <float*>singular_values_ptr,
+                                params,
+                                <int*>gpu_ids_ptr,
+                                <int>n_gpus)
         else:
             if self.dtype == np.float32:
-                tsvdFitTransformSPMG(<float*>X_ptr,
-                                     <float*>trans_input_ptr,
-                                     <float*>components_ptr,
-                                     <float*>explained_variance_ptr,
-                                     <float*>explained_variance_ratio_ptr,
-                                     <float*>singular_values_ptr,
-                                     params,
-                                     <int*>gpu_ids_ptr,
-                                     <int>n_gpus)
+                with nogil:
+                    tsvdFitTransformSPMG(<float*>X_ptr,
+                                         <float*>trans_input_ptr,
+                                         <float*>components_ptr,
+                                         <float*>explained_variance_ptr,
+                                         <float*>explained_variance_ratio_ptr,
+                                         <float*>singular_values_ptr,
+                                         params,
+                                         <int*>gpu_ids_ptr,
+                                         <int>n_gpus)
 
             else:
-                tsvdFitTransformSPMG(<double*>X_ptr,
-                                     <double*>trans_input_ptr,
-                                     <double*>components_ptr,
-                                     <double*>explained_variance_ptr,
-                                     <double*>explained_variance_ratio_ptr,
-                                     <double*>singular_values_ptr,
-                                     params,
-                                     <int*>gpu_ids_ptr,
-                                     <int>n_gpus)
+                with nogil:
+                    tsvdFitTransformSPMG(<double*>X_ptr,
+                                         <double*>trans_input_ptr,
+                                         <double*>components_ptr,
+                                         <double*>explained_variance_ptr,
+                                         <double*>explained_variance_ratio_ptr,
+                                         <double*>singular_values_ptr,
+                                         params,
+                                         <int*>gpu_ids_ptr,
+                                         <int>n_gpus)
 
         self.components_ = np.transpose(self.components_)
 
@@ -344,7 +348,7 @@ class TruncatedSVDSPMG:
         return self.trans_input_
 
     def _inverse_transform_spmg(self, X, gpu_ids=[]):
-        n_gpus = len(gpu_ids)
+        cdef int n_gpus = len(gpu_ids)
 
         if (not np.isfortran(X)):
             X = np.array(X, order='F')
@@ -383,27 +387,29 @@ class TruncatedSVDSPMG:
         components_ptr = self.components_.ctypes.data
 
         if self.dtype == np.float32:
-            tsvdInverseTransformSPMG(<float*>X_ptr,
-                                     <float*>components_ptr,
-                                     <bool>False,
-                                     <float*>original_X_ptr,
-                                     params,
-                                     <int*>gpu_ids_ptr,
-                                     <int>n_gpus)
+            with nogil:
+                tsvdInverseTransformSPMG(<float*>X_ptr,
+                                         <float*>components_ptr,
+                                         <bool>False,
+                                         <float*>original_X_ptr,
+                                         params,
+                                         <int*>gpu_ids_ptr,
+                                         <int>n_gpus)
 
         else:
-            tsvdInverseTransformSPMG(<double*>X_ptr,
-                                     <double*>components_ptr,
-                                     <bool>False,
-                                     <double*>original_X_ptr,
-                                     params,
-                                     <int*>gpu_ids_ptr,
-                                     <int>n_gpus)
+            with nogil:
+                tsvdInverseTransformSPMG(<double*>X_ptr,
+                                         <double*>components_ptr,
+                                         <bool>False,
+                                         <double*>original_X_ptr,
+                                         params,
+                                         <int*>gpu_ids_ptr,
+                                         <int>n_gpus)
 
         return original_X
 
     def _transform_spmg(self, X, gpu_ids=[]):
-        n_gpus = len(gpu_ids)
+        cdef int n_gpus = len(gpu_ids)
 
         if (not np.isfortran(X)):
             X = np.array(X, order='F')
@@ -442,22 +448,24 @@ class TruncatedSVDSPMG:
         components_ptr = self.components_.ctypes.data
 
         if self.dtype == np.float32:
-            tsvdTransformSPMG(<float*>X_ptr,
-                              <float*>components_ptr,
-                              <bool>True,
-                              <float*>trans_X_ptr,
-                              params,
-                              <int*>gpu_ids_ptr,
-                              <int>n_gpus)
+            with nogil:
+                tsvdTransformSPMG(<float*>X_ptr,
+                                  <float*>components_ptr,
+                                  <bool>True,
+                                  <float*>trans_X_ptr,
+                                  params,
+                                  <int*>gpu_ids_ptr,
+                                  <int>n_gpus)
 
         else:
-            tsvdTransformSPMG(<double*>X_ptr,
-                              <double*>components_ptr,
-                              <bool>True,
-                              <double*>trans_X_ptr,
-                              params,
-                              <int*>gpu_ids_ptr,
-                              <int>n_gpus)
+            with nogil:
+                tsvdTransformSPMG(<double*>X_ptr,
+                                  <double*>components_ptr,
+                                  <bool>True,
+                                  <double*>trans_X_ptr,
+                                  params,
+                                  <int*>gpu_ids_ptr,
+                                  <int>n_gpus)
 
         return trans_X
 
@@ -39,7 +39,7 @@ cimport cuml.common.handle
 cimport cuml.common.cuda
 
 
-cdef extern from "randomforest/randomforest.h" namespace "ML":
+cdef extern from "randomforest/randomforest.h" namespace "ML" nogil:
 
     cdef struct RF_metrics:
         float accuracy
@@ -204,22 +204,30 @@ cdef class RandomForest_impl():
         self.rf_classifier64 = new \
             rfClassifier[double](rf_param)
 
+        cdef rfClassifier[float]* rf_classifier32 = self.rf_classifier32
+        cdef rfClassifier[double]* rf_classifier64 = self.rf_classifier64
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = self.n_cols
+        cdef int n_unique_labels = num_unique_labels
+
         if self.dtype == np.float32:
-            fit(handle_[0],
-                self.rf_classifier32,
-                <float*> X_ptr,
-                <int> n_rows,
-                <int> self.n_cols,
-                <int*> y_ptr,
-                <int> num_unique_labels)
+            with nogil:
+                fit(handle_[0],
+                    rf_classifier32,
+                    <float*> X_ptr,
+                    <int> c_n_rows,
+                    <int> c_n_cols,
+                    <int*> y_ptr,
+                    <int> n_unique_labels)
         else:
-            fit(handle_[0],
-                self.rf_classifier64,
-                <double*> X_ptr,
-                <int> n_rows,
-                <int> self.n_cols,
-                <int*> y_ptr,
-                <int> num_unique_labels)
+            with nogil:
+                fit(handle_[0],
+                    rf_classifier64,
+                    <double*> X_ptr,
+                    <int> c_n_rows,
+                    <int> c_n_cols,
+                    <int*> y_ptr,
+                    <int> n_unique_labels)
 
         # make sure that the `fit` is complete before the following delete
         # call happens
@@ -244,23 +252,31 @@ cdef class RandomForest_impl():
         cdef cumlHandle* handle_ =\
             <cumlHandle*><size_t>self.handle.getHandle()
 
+        cdef rfClassifier[float]* rf_classifier32 = self.rf_classifier32
+        cdef rfClassifier[double]* rf_classifier64 = self.rf_classifier64
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = n_cols
+        cdef bool verbose = self.verbose
+
         if self.dtype == np.float32:
-            predict(handle_[0],
-                    self.rf_classifier32,
-                    <float*> X_ptr,
-                    <int> n_rows,
-                    <int> n_cols,
-                    <int*> preds_ptr,
-                    <bool> self.verbose)
+            with nogil:
+                predict(handle_[0],
+                        rf_classifier32,
+                        <float*> X_ptr,
+                        <int> c_n_rows,
+                        <int> c_n_cols,
+                        <int*> preds_ptr,
+                        <bool> verbose)
 
         elif self.dtype == np.float64:
-            predict(handle_[0],
-                    self.rf_classifier64,
-                    <double*> X_ptr,
-                    <int> n_rows,
-                    <int> n_cols,
-                    <int*> preds_ptr,
-                    <bool> self.verbose)
+            with nogil:
+                predict(handle_[0],
+                        rf_classifier64,
+                        <double*> X_ptr,
+                        <int> c_n_rows,
+                        <int> c_n_cols,
+                        <int*> preds_ptr,
+                        <bool> verbose)
 
         else:
             raise TypeError("supports only float32 and float64 input,"
@@ -289,25 +305,36 @@ cdef class RandomForest_impl():
         cdef cumlHandle* handle_ =\
             <cumlHandle*><size_t>self.handle.getHandle()
 
+        cdef rfClassifier[float]* rf_classifier32 = self.rf_classifier32
+        cdef rfClassifier[double]* rf_classifier64 = self.rf_classifier64
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = n_cols
+        cdef bool verbose = self.verbose
+        cdef RF_metrics stats
+
         if self.dtype == np.float32:
-            self.stats = cross_validate(handle_[0],
-                                        self.rf_classifier32,
-                                        <float*> X_ptr,
-                                        <int*> y_ptr,
-                                        <int> n_rows,
-                                        <int> n_cols,
-                                        <int*> preds_ptr,
-                                        <bool> self.verbose)
+            with nogil:
+                stats = cross_validate(handle_[0],
+                                       rf_classifier32,
+                                       <float*> X_ptr,
+                                       <int*> y_ptr,
+                                       <int> c_n_rows,
+                                       <int> c_n_cols,
+                                       <int*> preds_ptr,
+                                       <bool> verbose)
+            self.stats = stats
 
         elif self.dtype == np.float64:
-            self.stats = cross_validate(handle_[0],
-                                        self.rf_classifier64,
-                                        <double*> X_ptr,
-                                        <int*> y_ptr,
-                                        <int> n_rows,
-                                        <int> n_cols,
-                                        <int*> preds_ptr,
-                                        <bool> self.verbose)
+            with nogil:
+                stats = cross_validate(handle_[0],
+                                       rf_classifier64,
+                                       <double*> X_ptr,
+                                       <int*> y_ptr,
+                                       <int> c_n_rows,
+                                       <int> c_n_cols,
+                                       <int*> preds_ptr,
+                                       <bool> verbose)
+            self.stats = stats
 
         self.handle.sync()
         return self.stats
@@ -375,6 +402,10 @@ class RandomForestClassifier(Base):
     n_bins :  Number of bins used by the split algorithm
     min_rows_per_node : The minimum number of samples (rows) needed
                         to split a node
+    output_type : {'input', 'cudf', 'numpy', 'cupy', 'numba'} (optional)
+                  Type of the predictions. Defaults to the global output
+                  type, or else to NumPy (see
+                  `cuml.set_global_output_type`).
 
     """
     def __init__(self, n_estimators=10, max_depth=-1, handle=None,
@@ -387,7 +418,8 @@ class RandomForestClassifier(Base):
                  min_samples_leaf=None, min_weight_fraction_leaf=None,
                  max_leaf_nodes=None, min_impurity_decrease=None,
                  min_impurity_split=None, oob_score=None, n_jobs=None,
-                 random_state=None, warm_start=None, class_weight=None):
+                 random_state=None, warm_start=None, class_weight=None,
+                 output_type=None):
 
         sklearn_params = {"criterion": criterion,
                           "min_samples_leaf": min_samples_leaf,
@@ -407,7 +439,8 @@ class RandomForestClassifier(Base):
                                 " please read the cuML documentation for"
                                 " more information")
 
-        super(RandomForestClassifier, self).__init__(handle, verbose)
+        super(RandomForestClassifier, self).__init__(handle, verbose,
+                                                     output_type)
 
         self.split_algo = split_algo
         self.min_rows_per_node = min_rows_per_node
@@ -461,12 +494,12 @@ class RandomForestClassifier(Base):
 
         Returns
         ----------
-        y: NumPy
+        y: NumPy, or the configured output type
            Dense vector (int) of shape (n_samples, 1)
 
         """
 
-        return self._impl.predict(X)
+        return self._output(self._impl.predict(X), X, default='numpy')
 
     def cross_validate(self, X, y):
         """
@@ -0,0 +1,275 @@
+#
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import math
+import os
+import numpy as np
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from numba import cuda
+
+# Byte alignment of the slabs read from disk, relative to the start of the
+# array data. Matches the page size of the common Linux configurations.
+SLAB_ALIGNMENT = 4096
+
+
+class ArrayFileReader(object):
+    """
+    Reads a 1D or 2D array stored in a `.npy` or raw binary file without
+    loading it in host memory first.
+
+    The file is memory-mapped and read in row slabs whose size is a multiple
+    of `SLAB_ALIGNMENT` bytes. Readers can be passed directly to any
+    estimator, `input_to_dev_array` streams the slabs to the device through
+    pinned staging buffers so that peak host memory stays bounded by the
+    staging size instead of the size of the file.
+
+    Use `load_npy` or `load_raw` to create readers.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import cuml
+        import cuml.io
+
+        X = cuml.io.load_npy('features.npy', n_threads=4)
+        kmeans = cuml.KMeans(n_clusters=8).fit(X)
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+    dtype : NumPy dtype
+        Element type of the array.
+    shape : tuple of int
+        Shape of the array.
+    order : 'C' or 'F' (default = 'C')
+        Memory layout of the array in the file.
+    offset : int (default = 0)
+        Position in bytes of the first element of the array in the file.
+    n_threads : int (default = 1)
+        Number of threads reading slabs concurrently. With a single thread,
+        slabs are views on the memory map and pages are faulted in by the
+        copy to the device. With more threads, up to `n_threads` slabs are
+        read ahead with `os.preadv`, which keeps more requests in flight on
+        fast NVMe drives. Files stored in 'F' order are always read through
+        the memory map.
+    """
+
+    def __init__(self, path, dtype, shape, order='C', offset=0, n_threads=1):
+        if order not in ['C', 'F']:
+            raise ValueError("Order must be 'C' or 'F' but got " +
+                             str(order) + " instead.")
+        if len(shape) not in [1, 2]:
+            raise ValueError("Only 1D and 2D arrays are supported, but got "
+                             "shape " + str(shape) + ".")
+
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.shape = tuple(int(dim) for dim in shape)
+        self.order = order
+        self.offset = offset
+        self.n_threads = n_threads
+        self._memmap = None
+
+        expected = self.offset + self.nbytes
+        size = os.path.getsize(path)
+        if size < expected:
+            raise ValueError("File " + str(path) + " has " + str(size) +
+                             " bytes but " + str(expected) + " bytes are "
+                             "needed for an array of shape " +
+                             str(self.shape) + " and dtype " +
+                             str(self.dtype) + ".")
+
+    @property
+    def nbytes(self):
+        return int(np.prod(self.shape)) * self.dtype.itemsize
+
+    @property
+    def row_bytes(self):
+        return int(np.prod(self.shape[1:])) * self.dtype.itemsize
+
+    @property
+    def memmap(self):
+        """
+        Read-only `np.memmap` over the whole array.
+        """
+        if self._memmap is None:
+            self._memmap = np.memmap(self.path, dtype=self.dtype, mode='r',
+                                     offset=self.offset, shape=self.shape,
+                                     order=self.order)
+        return self._memmap
+
+    def slab_rows(self, max_bytes):
+        """
+        Largest number of rows per slab that fits in `max_bytes` and keeps
+        every slab boundary on a multiple of `SLAB_ALIGNMENT` bytes. When
+        a single aligned block does not fit, the alignment is dropped.
+        """
+        row_bytes = max(self.row_bytes, 1)
+        aligned_bytes = row_bytes * SLAB_ALIGNMENT // \
+            math.gcd(row_bytes, SLAB_ALIGNMENT)
+
+        if aligned_bytes <= max_bytes:
+            return (max_bytes // aligned_bytes) * (aligned_bytes // row_bytes)
+        else:
+            return max(max_bytes // row_bytes, 1)
+
+    def iter_chunks(self, max_bytes):
+        """
+        Yields the array in consecutive row slabs of at most `max_bytes`
+        bytes each (at least one row per slab).
+        """
+        step = self.slab_rows(max_bytes)
+        n_rows = self.shape[0]
+        bounds = [(start, min(start + step, n_rows))
+                  for start in range(0, n_rows, step)]
+
+        transposed = self.order == 'F' and len(self.shape) > 1 and \
+            self.shape[1] > 1
+
+        if self.n_threads <= 1 or transposed:
+            mmap = self.memmap
+            for start, stop in bounds:
+                yield mmap[start:stop]
+            return
+
+        fd = os.open(self.path, os.O_RDONLY)
+        try:
+            with ThreadPoolExecutor(max_workers=self.n_threads) as pool:
+                pending = deque()
+                for start, stop in bounds:
+                    if len(pending) == self.n_threads:
+                        yield pending.popleft().result()
+                    pending.append(pool.submit(self._read_slab, fd, start,
+                                               stop))
+                while pending:
+                    yield pending.popleft().result()
+        finally:
+            os.close(fd)
+
+    def _read_slab(self, fd, start, stop):
+        out = np.empty((stop - start,) + self.shape[1:], dtype=self.dtype)
+        buf = memoryview(out).cast('B')
+        position = self.offset + start * self.row_bytes
+        done = 0
+        while done < len(buf):
+            n_read = os.preadv(fd, [buf[done:]], position + done)
+            if n_read == 0:
+                raise EOFError("Unexpected end of file " + str(self.path) +
+                               " while reading rows " + str(start) + " to " +
+                               str(stop) + ".")
+            done += n_read
+        return out
+
+    def read(self, order='F', convert_to_dtype=False, device=None):
+        """
+        Read the whole array.
+
+        Parameters
+        ----------
+        order : 'C' or 'F' (default = 'F')
+            Memory layout of the returned array.
+        convert_to_dtype : (optional) dtype
+            Convert the array to this dtype while reading it.
+        device : (optional) bool
+            If True, returns a numba device array. If False, returns a NumPy
+            array, which is a zero-copy view on the memory map when no
+            dtype or layout conversion is needed. By default a device array
+            is returned only if a CUDA device is available.
+        """
+        if device is None:
+            device = cuda.is_available()
+
+        if not device:
+            X = np.asarray(self.memmap)
+            if convert_to_dtype:
+                X = X.astype(convert_to_dtype, order=order)
+            return np.asarray(X, order=order)
+
+        from cuml.utils.input_utils import stream_to_dev_array
+
+        return stream_to_dev_array(self, order=order,
+                                   convert_to_dtype=convert_to_dtype)
+
+
+def load_npy(path, n_threads=1):
+    """
+    Returns an `ArrayFileReader` over the array stored in the `.npy` file at
+    `path`. Dtype, shape and memory layout are taken from the file header.
+
+    Parameters
+    ----------
+    path : str
+        Path of the `.npy` file.
+    n_threads : int (default = 1)
+        Number of threads reading slabs concurrently.
+    """
+    with open(path, 'rb') as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = \
+                np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = \
+                np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+    if dtype.hasobject:
+        raise TypeError("Arrays of Python objects cannot be memory-mapped.")
+
+    return ArrayFileReader(path, dtype, shape,
+                           order='F' if fortran_order else 'C',
+                           offset=offset, n_threads=n_threads)
+
+
+def load_raw(path, dtype, shape=None, order='C', offset=0, n_threads=1):
+    """
+    Returns an `ArrayFileReader` over an array stored as raw binary at
+    `path`.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+    dtype : NumPy dtype
+        Element type of the array.
+    shape : (optional) tuple of int
+        Shape of the array. One dimension can be -1, in which case it is
+        inferred from the size of the file. By default the whole file is read
+        as a 1D array.
+    order : 'C' or 'F' (default = 'C')
+        Memory layout of the array in the file.
+    offset : int (default = 0)
+        Number of bytes to skip at the beginning of the file.
+    n_threads : int (default = 1)
+        Number of threads reading slabs concurrently.
+    """
+    dtype = np.dtype(dtype)
+    n_items = (os.path.getsize(path) - offset) // dtype.itemsize
+
+    if shape is None:
+        shape = (n_items,)
+    elif -1 in shape:
+        known = int(np.prod([dim for dim in shape if dim != -1]))
+        shape = tuple(n_items // max(known, 1) if dim == -1 else dim
+                      for dim in shape)
+
+    return ArrayFileReader(path, dtype, shape, order=order, offset=offset,
+                           n_threads=n_threads)
@@ -35,7 +35,7 @@ from cuml.common.handle cimport cumlHandle
 from cuml.utils import get_cudf_column_ptr, get_dev_array_ptr, \
     input_to_dev_array, zeros
 
-cdef extern from "glm/glm.hpp" namespace "ML::GLM":
+cdef extern from "glm/glm.hpp" namespace "ML::GLM" nogil:
 
     cdef void olsFit(cumlHandle& handle,
                      float *input,
@@ -260,31 +260,39 @@ class LinearRegression(Base):
         cdef double c_intercept2
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
 
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = self.n_cols
+        cdef bool c_fit_intercept = self.fit_intercept
+        cdef bool c_normalize = self.normalize
+        cdef int c_algo = self.algo
+
         if self.dtype == np.float32:
 
-            olsFit(handle_[0],
-                   <float*>X_ptr,
-                   <int>n_rows,
-                   <int>self.n_cols,
-                   <float*>y_ptr,
-                   <float*>coef_ptr,
-                   <float*>&c_intercept1,
-                   <bool>self.fit_intercept,
-                   <bool>self.normalize,
-                   <int>self.algo)
+            with nogil:
+                olsFit(handle_[0],
+                       <float*>X_ptr,
+                       <int>c_n_rows,
+                       <int>c_n_cols,
+                       <float*>y_ptr,
+                       <float*>coef_ptr,
+                       <float*>&c_intercept1,
+                       <bool>c_fit_intercept,
+                       <bool>c_normalize,
+                       <int>c_algo)
 
             self.intercept_ = c_intercept1
         else:
-            olsFit(handle_[0],
-                   <double*>X_ptr,
-                   <int>n_rows,
-                   <int>self.n_cols,
-                   <double*>y_ptr,
-                   <double*>coef_ptr,
-                   <double*>&c_intercept2,
-                   <bool>self.fit_intercept,
-                   <bool>self.normalize,
-                   <int>self.algo)
+            with nogil:
+                olsFit(handle_[0],
+                       <double*>X_ptr,
+                       <int>c_n_rows,
+                       <int>c_n_cols,
+                       <double*>y_ptr,
+                       <double*>coef_ptr,
+                       <double*>&c_intercept2,
+                       <bool>c_fit_intercept,
+                       <bool>c_normalize,
+                       <int>c_algo)
 
             self.intercept_ = c_intercept2
 
@@ -319,22 +327,28 @@ class LinearRegression(Base):
         cdef uintptr_t preds_ptr = get_cudf_column_ptr(preds)
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
 
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = n_cols
+        cdef double c_intercept_ = self.intercept_
+
         if dtype.type == np.float32:
-            olsPredict(handle_[0],
-                       <float*>X_ptr,
-                       <int>n_rows,
-                       <int>n_cols,
-                       <float*>coef_ptr,
-                       <float>self.intercept_,
-                       <float*>preds_ptr)
+            with nogil:
+                olsPredict(handle_[0],
+                           <float*>X_ptr,
+                           <int>c_n_rows,
+                           <int>c_n_cols,
+                           <float*>coef_ptr,
+                           <float>c_intercept_,
+                           <float*>preds_ptr)
         else:
-            olsPredict(handle_[0],
-                       <double*>X_ptr,
-                       <int>n_rows,
-                       <int>n_cols,
-                       <double*>coef_ptr,
-                       <double>self.intercept_,
-                       <double*>preds_ptr)
+            with nogil:
+                olsPredict(handle_[0],
+                           <double*>X_ptr,
+                           <int>c_n_rows,
+                           <int>c_n_cols,
+                           <double*>coef_ptr,
+                           <double>c_intercept_,
+                           <double*>preds_ptr)
 
         self.handle.sync()
 
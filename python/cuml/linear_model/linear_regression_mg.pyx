@@ -32,7 +32,7 @@ from libc.stdlib cimport calloc, malloc, free
 from cuml.utils import zeros
 
 
-cdef extern from "glm/glm_spmg.h" namespace "ML::GLM":
+cdef extern from "glm/glm_spmg.h" namespace "ML::GLM" nogil:
 
     cdef void olsFitSPMG(float *h_input,
                          int n_rows,
@@ -333,31 +333,39 @@ class LinearRegressionMG:
         cdef float intercept32
         cdef double intercept64
 
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = n_cols
+        cdef bool c_fit_intercept = self.fit_intercept
+        cdef bool c_normalize = self.normalize
+        cdef int c_n_gpus = n_gpus
+
         if self.gdf_datatype.type == np.float32:
-            olsFitSPMG(<float*>X_ptr,
-                       <int> n_rows,
-                       <int> n_cols,
-                       <float*>y_ptr,
-                       <float*>coef_ptr,
-                       <float*>&intercept32,
-                       <bool>self.fit_intercept,
-                       <bool>self.normalize,
-                       <int*>gpu_ids_ptr,
-                       <int>n_gpus)
+            with nogil:
+                olsFitSPMG(<float*>X_ptr,
+                           <int> c_n_rows,
+                           <int> c_n_cols,
+                           <float*>y_ptr,
+                           <float*>coef_ptr,
+                           <float*>&intercept32,
+                           <bool>c_fit_intercept,
+                           <bool>c_normalize,
+                           <int*>gpu_ids_ptr,
+                           <int>c_n_gpus)
 
             self.intercept_ = intercept32
 
         else:
-            olsFitSPMG(<double*>X_ptr,
-                       <int> n_rows,
-                       <int> n_cols,
-                       <double*>y_ptr,
-                       <double*>coef_ptr,
-                       <double*>&intercept64,
-                       <bool>self.fit_intercept,
-                       <bool>self.normalize,
-                       <int*>gpu_ids_ptr,
-                       <int>n_gpus)
+            with nogil:
+                olsFitSPMG(<double*>X_ptr,
+                           <int> c_n_rows,
+                           <int> c_n_cols,
+                           <double*>y_ptr,
+                           <double*>coef_ptr,
+                           <double*>&intercept64,
+                           <bool>c_fit_intercept,
+                           <bool>c_normalize,
+                           <int*>gpu_ids_ptr,
+                           <int>c_n_gpus)
 
             self.intercept_ = intercept64
 
@@ -393,25 +401,32 @@ class LinearRegressionMG:
         gpu_ids_ptr = gpu_id_32.ctypes.data
         coef_ptr = self.coef_.ctypes.data
 
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = n_cols
+        cdef double c_intercept_ = self.intercept_
+        cdef int c_n_gpus = n_gpus
+
         if self.gdf_datatype.type == np.float32:
-            olsPredictSPMG(<float*>X_ptr,
-                           <int> n_rows,
-                           <int> n_cols,
-                           <float*>coef_ptr,
-                           <float>self.intercept_,
-                           <float*>pred_ptr,
-                           <int*>gpu_ids_ptr,
-                           <int>n_gpus)
+            with nogil:
+                olsPredictSPMG(<float*>X_ptr,
+                               <int> c_n_rows,
+                               <int> c_n_cols,
+                               <float*>coef_ptr,
+                               <float>c_intercept_,
+                               <float*>pred_ptr,
+                               <int*>gpu_ids_ptr,
+                               <int>c_n_gpus)
 
         else:
-            olsPredictSPMG(<double*>X_ptr,
-                           <int> n_rows,
-                           <int> n_cols,
-                           <double*>coef_ptr,
-                           <double>self.intercept_,
-                           <double*>pred_ptr,
-                           <int*>gpu_ids_ptr,
-                           <int>n_gpus)
+            with nogil:
+                olsPredictSPMG(<double*>X_ptr,
+                               <int> c_n_rows,
+                               <int> c_n_cols,
+                               <double*>coef_ptr,
+                               <double>c_intercept_,
+                               <double*>pred_ptr,
+                               <int*>gpu_ids_ptr,
+                               <int>c_n_gpus)
 
         return pred
 
@@ -454,6 +469,10 @@ class LinearRegressionMG:
         intercept_f32 = 0
         intercept_f64 = 0
 
+        cdef bool c_fit_intercept = self.fit_intercept
+        cdef bool c_normalize = self.normalize
+        cdef int c_n_allocs = n_allocs
+
         if dtype == "single":
             input32 = <float**>malloc(len(alloc_info)*sizeof(float*))
             labels32 = <float**>malloc(len(alloc_info)*sizeof(float*))
@@ -476,18 +495,19 @@ class LinearRegressionMG:
 
                 idx = idx + 1
 
-            spmgOlsFit(<float**> input32,
-                       <int*> input_cols,
-                       <int> n_rows,
-                       <int> n_cols,
-                       <float**> labels32,
-                       <int*> label_rows,
-                       <float**> coef32,
-                       <int*> coef_cols,
-                       <float*> &intercept_f32,
-                       <bool> self.fit_intercept,
-                       <bool> self.normalize,
-                       <int> n_allocs)
+            with nogil:
+                spmgOlsFit(<float**> input32,
+                           <int*> input_cols,
+                           <int> n_rows,
+                           <int> n_cols,
+                           <float**> labels32,
+                           <int*> label_rows,
+                           <float**> coef32,
+                           <int*> coef_cols,
+                           <float*> &intercept_f32,
+                           <bool> c_fit_intercept,
+                           <bool> c_normalize,
+                           <int> c_n_allocs)
 
             return intercept_f32
 
@@ -514,18 +534,19 @@ class LinearRegressionMG:
 
                 idx = idx + 1
 
-            spmgOlsFit(<double**> input64,
-                       <int*> input_cols,
-                       <int> n_rows,
-                       <int> n_cols,
-                       <double**> labels64,
-                       <int*> label_rows,
-                       <double**> coef64,
-                       <int*> coef_cols,
-                       <double*> &intercept_f64,
-                       <bool> self.fit_intercept,
-                       <bool> self.normalize,
-                       <int> n_allocs)
+            with nogil:
+                spmgOlsFit(<double**> input64,
+                           <int*> input_cols,
+                           <int> n_rows,
+                           <int> n_cols,
+                           <double**> labels64,
+                           <int*> label_rows,
+                           <double**> coef64,
+                           <int*> coef_cols,
+                           <double*> &intercept_f64,
+                           <bool> c_fit_intercept,
+                           <bool> c_normalize,
+                           <int> c_n_allocs)
 
             return intercept_f64
 
@@ -563,6 +584,9 @@ class LinearRegressionMG:
         cdef uintptr_t input_ptr
         n_allocs = len(alloc_info)
 
+        cdef double c_intercept = intercept
+        cdef int c_n_allocs = n_allocs
+
         if dtype == "single":
 
             input32 = <float**>malloc(len(alloc_info)*sizeof(float*))
@@ -586,16 +610,17 @@ class LinearRegressionMG:
 
                 idx = idx + 1
 
-            spmgOlsPredict(<float**>input32,
-                           <int*>input_cols,
-                           <int> n_rows,
-                           <int> n_cols,
-                           <float**>coef32,
-                           <int*>coef_cols,
-                           <float>intercept,
-                           <float**>pred32,
-                           <int*>pred_rows,
-                           <int> n_allocs)
+            with nogil:
+                spmgOlsPredict(<float**>input32,
+                               <int*>input_cols,
+                               <int> n_rows,
+                               <int> n_cols,
+                               <float**>coef32,
+                               <int*>coef_cols,
+                               <float>c_intercept,
+                               <float**>pred32,
+                               <int*>pred_rows,
+                               <int> c_n_allocs)
 
         else:
 
@@ -620,13 +645,14 @@ class LinearRegressionMG:
 
                 idx = idx + 1
 
-            spmgOlsPredict(<double**>input64,
-                           <int*>input_cols,
-                           <int> n_rows,
-                           <int> n_cols,
-                           <double**>coef64,
-                           <int*>coef_cols,
-                           <double>intercept,
-                           <double**>pred64,
-                           <int*>pred_rows,
-                           <int> n_allocs)
+            with nogil:
+                spmgOlsPredict(<double**>input64,
+                               <int*>input_cols,
+                               <int> n_rows,
+                               <int> n_cols,
+                               <double**>coef64,
+                               <int*>coef_cols,
+                               <double>c_intercept,
+                               <double**>pred64,
+                               <int*>pred_rows,
+                               <int> c_n_allocs)
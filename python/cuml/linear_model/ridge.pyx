@@ -35,7 +35,7 @@ from cuml.common.handle cimport cumlHandle
 from cuml.utils import get_cudf_column_ptr, get_dev_array_ptr, \
     input_to_dev_array, zeros
 
-cdef extern from "glm/glm.hpp" namespace "ML::GLM":
+cdef extern from "glm/glm.hpp" namespace "ML::GLM" nogil:
 
     cdef void ridgeFit(cumlHandle& handle,
                        float *input,
@@ -283,37 +283,46 @@ class Ridge(Base, RegressorMixin):
         cdef double c_alpha2
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
 
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = self.n_cols
+        cdef int c_n_alpha = self.n_alpha
+        cdef bool c_fit_intercept = self.fit_intercept
+        cdef bool c_normalize = self.normalize
+        cdef int c_algo = self.algo
+
         if self.dtype == np.float32:
             c_alpha1 = self.alpha
-            ridgeFit(handle_[0],
-                     <float*>X_ptr,
-                     <int>n_rows,
-                     <int>self.n_cols,
-                     <float*>y_ptr,
-                     <float*>&c_alpha1,
-                     <int>self.n_alpha,
-                     <float*>coef_ptr,
-                     <float*>&c_intercept1,
-                     <bool>self.fit_intercept,
-                     <bool>self.normalize,
-                     <int>self.algo)
+            with nogil:
+                ridgeFit(handle_[0],
+                         <float*>X_ptr,
+                         <int>c_n_rows,
+                         <int>c_n_cols,
+                         <float*>y_ptr,
+                         <float*>&c_alpha1,
+                         <int>c_n_alpha,
+                         <float*>coef_ptr,
+                         <float*>&c_intercept1,
+                         <bool>c_fit_intercept,
+                         <bool>c_normalize,
+                         <int>c_algo)
 
             self.intercept_ = c_intercept1
         else:
             c_alpha2 = self.alpha
 
-            ridgeFit(handle_[0],
-                     <double*>X_ptr,
-                     <int>n_rows,
-                     <int>self.n_cols,
-                     <double*>y_ptr,
-                     <double*>&c_alpha2,
-                     <int>self.n_alpha,
-                     <double*>coef_ptr,
-                     <double*>&c_intercept2,
-                     <bool>self.fit_intercept,
-                     <bool>self.normalize,
-                     <int>self.algo)
+            with nogil:
+                ridgeFit(handle_[0],
+                         <double*>X_ptr,
+                         <int>c_n_rows,
+                         <int>c_n_cols,
+                         <double*>y_ptr,
+                         <double*>&c_alpha2,
+                         <int>c_n_alpha,
+                         <double*>coef_ptr,
+                         <double*>&c_intercept2,
+                         <bool>c_fit_intercept,
+                         <bool>c_normalize,
+                         <int>c_algo)
 
             self.intercept_ = c_intercept2
 
@@ -350,22 +359,28 @@ class Ridge(Base, RegressorMixin):
         cdef uintptr_t preds_ptr = get_cudf_column_ptr(preds)
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
 
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = n_cols
+        cdef double c_intercept_ = self.intercept_
+
         if dtype.type == np.float32:
-            ridgePredict(handle_[0],
-                         <float*>X_ptr,
-                         <int>n_rows,
-                         <int>n_cols,
-                         <float*>coef_ptr,
-                         <float>self.intercept_,
-                         <float*>preds_ptr)
+            with nogil:
+                ridgePredict(handle_[0],
+                             <float*>X_ptr,
+                             <int>c_n_rows,
+                             <int>c_n_cols,
+                             <float*>coef_ptr,
+                             <float>c_intercept_,
+                             <float*>preds_ptr)
         else:
-            ridgePredict(handle_[0],
-                         <double*>X_ptr,
-                         <int>n_rows,
-                         <int>n_cols,
-                         <double*>coef_ptr,
-                         <double>self.intercept_,
-                         <double*>preds_ptr)
+            with nogil:
+                ridgePredict(handle_[0],
+                             <double*>X_ptr,
+                             <int>c_n_rows,
+                             <int>c_n_cols,
+                             <double*>coef_ptr,
+                             <double>c_intercept_,
+                             <double*>preds_ptr)
 
         self.handle.sync()
 
@@ -70,7 +70,7 @@ cdef extern from "umap/umapparams.h" namespace "ML":
         MetricType target_metric
 
 
-cdef extern from "umap/umap.hpp" namespace "ML":
+cdef extern from "umap/umap.hpp" namespace "ML" nogil:
     void fit(cumlHandle & handle,
              float * X,
              int n,
@@ -175,6 +175,10 @@ class UMAP(Base):
         ``spread``.
     verbose: bool (optional, default False)
         Controls verbosity of logging.
+    output_type: {'input', 'cudf', 'numpy', 'cupy', 'numba'} (optional)
+        Type of the returned embeddings. 'numba' and 'cupy' return the
+        device buffer without a copy. Defaults to the global output type, or
+        else to the type of the input (see `cuml.set_global_output_type`).
 
     Notes
     -----
@@ -223,9 +227,10 @@ class UMAP(Base):
                  target_weights=0.5,
                  target_metric="euclidean",
                  should_downcast=True,
-                 handle=None):
+                 handle=None,
+                 output_type=None):
 
-        super(UMAP, self).__init__(handle, verbose)
+        super(UMAP, self).__init__(handle, verbose, output_type)
 
         cdef UMAPParams * umap_params = new UMAPParams()
 
@@ -277,6 +282,66 @@ class UMAP(Base):
             <UMAPParams*> < size_t > self.umap_params
         del umap_params
 
+    def __getstate__(self):
+        state = super(UMAP, self).__getstate__()
+        cdef UMAPParams * umap_params = \
+            <UMAPParams*> < size_t > self.umap_params
+        # Raw pointers, rebuilt from the parameters and arrays when unpickled
+        del state['umap_params']
+        state.pop('raw_data', None)
+        state.pop('embeddings', None)
+        state['_umap_params'] = dict(
+            n_neighbors=umap_params.n_neighbors,
+            n_components=umap_params.n_components,
+            n_epochs=umap_params.n_epochs,
+            learning_rate=umap_params.learning_rate,
+            min_dist=umap_params.min_dist,
+            spread=umap_params.spread,
+            init=umap_params.init,
+            set_op_mix_ratio=umap_params.set_op_mix_ratio,
+            local_connectivity=umap_params.local_connectivity,
+            repulsion_strength=umap_params.repulsion_strength,
+            negative_sample_rate=umap_params.negative_sample_rate,
+            transform_queue_size=umap_params.transform_queue_size,
+            verbose=umap_params.verbose,
+            a=umap_params.a,
+            b=umap_params.b,
+            target_n_neighbors=umap_params.target_n_neighbors,
+            target_weights=umap_params.target_weights,
+            target_metric=<int> umap_params.target_metric)
+        return state
+
+    def __setstate__(self, state):
+        state = state.copy()
+        params = state.pop('_umap_params')
+        super(UMAP, self).__setstate__(state)
+
+        cdef UMAPParams * umap_params = new UMAPParams()
+        umap_params.n_neighbors = params['n_neighbors']
+        umap_params.n_components = params['n_components']
+        umap_params.n_epochs = params['n_epochs']
+        umap_params.learning_rate = params['learning_rate']
+        umap_params.min_dist = params['min_dist']
+        umap_params.spread = params['spread']
+        umap_params.init = params['init']
+        umap_params.set_op_mix_ratio = params['set_op_mix_ratio']
+        umap_params.local_connectivity = params['local_connectivity']
+        umap_params.repulsion_strength = params['repulsion_strength']
+        umap_params.negative_sample_rate = params['negative_sample_rate']
+        umap_params.transform_queue_size = params['transform_queue_size']
+        umap_params.verbose = params['verbose']
+        umap_params.a = params['a']
+        umap_params.b = params['b']
+        umap_params.target_n_neighbors = params['target_n_neighbors']
+        umap_params.target_weights = params['target_weights']
+        umap_params.target_metric = <MetricType> params['target_metric']
+        self.umap_params = <size_t > umap_params
+
+        if getattr(self, 'X_m', None) is not None:
+            self.raw_data = get_dev_array_ptr(self.X_m)
+            self.embeddings = \
+                self.arr_embed.device_ctypes_pointer.value
+
     def fit(self, X, y=None):
         """Fit X into an embedded space.
         Parameters
@@ -308,6 +373,8 @@ class UMAP(Base):
             <UMAPParams*> < size_t > self.umap_params
         umap_params.n_neighbors = min(n_rows, umap_params.n_neighbors)
         self.n_dims = n_cols
+        # transform searches the neighbors of new points in the training data
+        self.X_m = X_m
         self.raw_data = X_ctype
         self.raw_data_rows = n_rows
 
@@ -325,27 +392,30 @@ class UMAP(Base):
 
         cdef uintptr_t embed_raw = self.embeddings
 
+        cdef int c_n_rows = X_m.shape[0]
+        cdef int c_n_cols = X_m.shape[1]
+
         if y is not None:
             y_m, y_raw, _, _, _ = \
                 input_to_dev_array(y)
-            fit(handle_[0],
-                < float*> x_raw,
-                < float*> y_raw,
-                < int > X_m.shape[0],
-                < int > X_m.shape[1],
-                < UMAPParams*>umap_params,
-                < float*>embed_raw)
+            with nogil:
+                fit(handle_[0],
+                    < float*> x_raw,
+                    < float*> y_raw,
+                    < int > c_n_rows,
+                    < int > c_n_cols,
+                    < UMAPParams*>umap_params,
+                    < float*>embed_raw)
 
         else:
 
-            fit(handle_[0],
-                < float*> x_raw,
-                < int > X_m.shape[0],
-                < int > X_m.shape[1],
-                < UMAPParams*>umap_params,
-                < float*>embed_raw)
-
-        del X_m
+            with nogil:
+                fit(handle_[0],
+                    < float*> x_raw,
+                    < int > c_n_rows,
+                    < int > c_n_cols,
+                    < UMAPParams*>umap_params,
+                    < float*>embed_raw)
 
     def fit_transform(self, X, y=None):
         """Fit X into an embedded space and return that transformed
@@ -363,14 +433,7 @@ class UMAP(Base):
         """
         self.fit(X, y)
 
-        if isinstance(X, cudf.DataFrame):
-            ret = cudf.DataFrame()
-            for i in range(0, self.arr_embed.shape[1]):
-                ret[str(i)] = self.arr_embed[:, i]
-        elif isinstance(X, np.ndarray):
-            ret = np.asarray(self.arr_embed)
-
-        return ret
+        return self._output(self.arr_embed, X)
 
     def transform(self, X):
         """Transform X into the existing embedded space and return that
@@ -427,24 +490,23 @@ class UMAP(Base):
 
         cdef uintptr_t embed_ptr = self.embeddings
 
-        transform(handle_[0],
-                  < float*>x_ptr,
-                  < int > X_m.shape[0],
-                  < int > X_m.shape[1],
-                  < float*>orig_x_raw,
-                  < int > self.raw_data_rows,
-                  < float*> embed_ptr,
-                  < int > self.arr_embed.shape[0],
-                  < UMAPParams*> umap_params,
-                  < float*> xformed_ptr)
-
-        if isinstance(X, cudf.DataFrame):
-            ret = cudf.DataFrame()
-            for i in range(0, embedding.shape[1]):
-                ret[str(i)] = embedding[:, i]
-        elif isinstance(X, np.ndarray):
-            ret = np.asarray(embedding)
+        cdef int c_n_rows = X_m.shape[0]
+        cdef int c_n_cols = X_m.shape[1]
+        cdef int orig_n = self.raw_data_rows
+        cdef int embedding_n = self.arr_embed.shape[0]
+
+        with nogil:
+            transform(handle_[0],
+                      < float*>x_ptr,
+                      < int > c_n_rows,
+                      < int > c_n_cols,
+                      < float*>orig_x_raw,
+                      < int > orig_n,
+                      < float*> embed_ptr,
+                      < int > embedding_n,
+                      < UMAPParams*> umap_params,
+                      < float*> xformed_ptr)
 
         del X_m
 
-        return ret
+        return self._output(embedding, X)
@@ -14,5 +14,6 @@
 # limitations under the License.
 #
 
-from cuml.metrics.trustworthiness import trustworthiness
+from cuml.metrics.trustworthiness import trustworthiness, \
+    estimate_trustworthiness_memory
 from cuml.metrics.regression import r2_score
\ No newline at end of file
@@ -27,7 +27,8 @@ from cuml.metrics cimport regression
 
 
 def r2_score(y, y_hat, handle=None):
-    handle = cuml.common.handle.Handle() if handle is None else handle
+    if handle is None:
+        handle = cuml.common.handle.get_default_handle()
     cdef cumlHandle* handle_ = <cumlHandle*><size_t>handle.getHandle()
 
     cdef uintptr_t y_ptr = y.device_ctypes_pointer.value
@@ -36,22 +37,24 @@ def r2_score(y, y_hat, handle=None):
     cdef float result_f32
     cdef double result_f64
 
-    n = len(y)
+    cdef int n = len(y)
 
     if y.dtype == 'float32':
 
-        result_f32 = regression.r2_score_py(handle_[0],
-                                            <float*> y_ptr,
-                                            <float*> y_hat_ptr,
-                                            <int> n)
+        with nogil:
+            result_f32 = regression.r2_score_py(handle_[0],
+                                                <float*> y_ptr,
+                                                <float*> y_hat_ptr,
+                                                <int> n)
 
         result = result_f32
 
     else:
-        result_f64 = regression.r2_score_py(handle_[0],
-                                            <double*> y_ptr,
-                                            <double*> y_hat_ptr,
-                                            <int> n)
+        with nogil:
+            result_f64 = regression.r2_score_py(handle_[0],
+                                                <double*> y_ptr,
+                                                <double*> y_hat_ptr,
+                                                <int> n)
 
         result = result_f64
 
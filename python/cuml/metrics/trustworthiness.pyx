@@ -24,6 +24,9 @@ import numpy as np
 
 from numba import cuda
 
+import cuml.common.handle
+import cuml.common.memory as memory
+
 from libc.stdint cimport uintptr_t
 from cuml.common.handle cimport cumlHandle
 from cuml.utils import get_cudf_column_ptr, get_dev_array_ptr, \
@@ -34,14 +37,20 @@ cdef extern from "metrics/trustworthiness_c.h" namespace "MLCommon::Distance":
     ctypedef int DistanceType
     ctypedef DistanceType euclidean "(MLCommon::Distance::DistanceType)5"
 
-cdef extern from "metrics/trustworthiness_c.h" namespace "ML::Metrics":
+cdef extern from "metrics/trustworthiness_c.h" namespace "ML::Metrics" nogil:
 
     cdef double trustworthiness_score[T, DistanceType](const cumlHandle& h,
                                                        T* X,
                                                        T* X_embedded,
                                                        int n, int m,
                                                        int d,
-                                                       int n_neighbors)
+                                                       int n_neighbors,
+                                                       int batch_size) except +
+
+
+# Samples whose distances to all the samples are computed at once by default
+# (MAX_BATCH_SIZE of the C++ implementation)
+DEFAULT_BATCH_SIZE = 512
 
 
 def _get_array_ptr(obj):
@@ -51,8 +60,29 @@ def _get_array_ptr(obj):
     return obj.device_ctypes_pointer.value
 
 
+def estimate_trustworthiness_memory(n_samples, n_features, n_components,
+                                    n_neighbors=5,
+                                    batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Returns an estimate, in bytes, of the device memory that
+    `trustworthiness` allocates for inputs of n_samples rows, not counting
+    the inputs themselves.
+    """
+    float_size = np.dtype(np.float32).itemsize
+    index_size = np.dtype(np.int64).itemsize
+    batch_size = min(batch_size, n_samples)
+    # distances of a batch of samples to all the samples and their ranks
+    distances = batch_size * n_samples * \
+        (float_size + np.dtype(np.int32).itemsize)
+    # neighbors of the samples in the embedding, with their distances while
+    # they are searched
+    neighbors = n_samples * (n_neighbors + 1) * (index_size + float_size)
+    return distances + neighbors
+
+
 def trustworthiness(X, X_embedded, handle=None, n_neighbors=5,
-                    metric='euclidean', should_downcast=True):
+                    metric='euclidean', should_downcast=True,
+                    batch_size=None):
     """
     Expresses to what extent the local structure is retained in embedding.
     The score is defined in the range [0, 1].
@@ -68,15 +98,19 @@ def trustworthiness(X, X_embedded, handle=None, n_neighbors=5,
         n_neighbors : int, optional (default: 5)
             Number of neighbors considered
 
+        batch_size : int, optional (default: None)
+            Number of samples whose distances to all the samples are
+            computed at once. If None, the largest size up to 512 whose
+            `estimate_trustworthiness_memory` fits in the free device
+            memory. It is halved when the device runs out of memory, with a
+            warning.
+
     Returns
     -------
         trustworthiness score : double
             Trustworthiness of the low-dimensional embedding
     """
 
-    cdef uintptr_t d_X_ptr
-    cdef uintptr_t d_X_embedded_ptr
-
     if should_downcast:
         X_m, d_X_ptr, n_samples, n_features, dtype1 = \
             input_to_dev_array(X, order='C', convert_to_dtype=np.float32)
@@ -89,27 +123,54 @@ def trustworthiness(X, X_embedded, handle=None, n_neighbors=5,
         X_m2, d_X_embedded_ptr, n_rows, n_components, dtype = \
             input_to_dev_array(X_embedded, order='C', check_dtype=np.float32)
 
-    cdef cumlHandle* handle_ = <cumlHandle*>0
-    if handle is None:
-        handle_ = <cumlHandle*><size_t>(new cumlHandle())
-    else:
-        handle_ = <cumlHandle*><size_t>handle.getHandle()
-
-    if metric == 'euclidean':
-        res = trustworthiness_score[float, euclidean](handle_[0],
-                                                      <float*>d_X_ptr,
-                                                      <float*>d_X_embedded_ptr,
-                                                      n_samples,
-                                                      n_features,
-                                                      n_components,
-                                                      n_neighbors)
-        del X_m
-        del X_m2
-    else:
+    if metric != 'euclidean':
         del X_m
         del X_m2
         raise Exception("Unknown metric")
 
     if handle is None:
-        del handle_
+        handle = cuml.common.handle.get_default_handle()
+
+    if batch_size is None:
+        batch_size = memory.largest_batch_size(
+            lambda batch_size: estimate_trustworthiness_memory(
+                n_samples, n_features, n_components, n_neighbors,
+                batch_size),
+            min(DEFAULT_BATCH_SIZE, n_samples), memory.get_memory_budget())
+
+    # Smaller batches when the device runs out of memory
+    res, _ = memory.retry_on_out_of_memory(
+        lambda batch_size: _trustworthiness_score(
+            handle, d_X_ptr, d_X_embedded_ptr, n_samples, n_features,
+            n_components, n_neighbors, batch_size),
+        batch_size, handle)
+
+    del X_m
+    del X_m2
+
+    return res
+
+
+def _trustworthiness_score(handle, X_ptr, X_embedded_ptr, n_samples,
+                           n_features, n_components, n_neighbors, batch_size):
+    cdef cumlHandle* handle_ = <cumlHandle*><size_t>handle.getHandle()
+    cdef uintptr_t d_X_ptr = X_ptr
+    cdef uintptr_t d_X_embedded_ptr = X_embedded_ptr
+    cdef int c_n_samples = n_samples
+    cdef int c_n_features = n_features
+    cdef int c_n_components = n_components
+    cdef int c_n_neighbors = n_neighbors
+    cdef int c_batch_size = batch_size
+    cdef double res
+
+    with nogil:
+        res = trustworthiness_score[float, euclidean](
+            handle_[0],
+            <float*>d_X_ptr,
+            <float*>d_X_embedded_ptr,
+            c_n_samples,
+            c_n_features,
+            c_n_components,
+            c_n_neighbors,
+            c_batch_size)
     return res
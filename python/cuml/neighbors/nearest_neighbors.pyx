@@ -24,6 +24,7 @@ import pandas as pd
 import cudf
 import ctypes
 import cuml
+import cuml.common.memory as memory
 
 from cuml.common.base import Base
 from cuml.utils import get_cudf_column_ptr, get_dev_array_ptr, \
@@ -44,6 +45,7 @@ from numba import cuda
 
 cimport cuml.common.handle
 cimport cuml.common.cuda
+from cuml.common.cuda cimport _Error, cudaMemcpy, cudaMemcpyDefault
 
 cdef extern from "cuML.hpp" namespace "ML" nogil:
     cdef cppclass deviceAllocator:
@@ -55,7 +57,7 @@ cdef extern from "cuML.hpp" namespace "ML" nogil:
         void setDeviceAllocator(shared_ptr[deviceAllocator] a)
         cuml.common.cuda._Stream getStream()
 
-cdef extern from "knn/knn.hpp" namespace "ML":
+cdef extern from "knn/knn.hpp" namespace "ML" nogil:
 
     void brute_force_knn(
         cumlHandle &handle,
@@ -68,7 +70,7 @@ cdef extern from "knn/knn.hpp" namespace "ML":
         long *res_I,
         float *res_D,
         int k
-    )
+    ) except +
 
     void chunk_host_array(
         cumlHandle &handle,
@@ -166,6 +168,13 @@ class NearestNeighbors(Base):
         Setting this to true will allow single-precision input arrays to be
         automatically downcasted to single precision.
 
+    Attributes
+    ----------
+    batch_size_ : int
+        Number of queries searched at once by the last `kneighbors`, sized
+        from the free device memory. When the device runs out of memory, the
+        batch size is halved for the remaining queries, with a warning.
+
     Notes
     ------
     NearestNeighbors is a generative model. This means the data X has to be
@@ -227,6 +236,7 @@ class NearestNeighbors(Base):
 
         cdef float** input_arr
         cdef int* sizes_arr
+        cdef int n_rows_host, n_cols_host, n_chunks
 
         if isinstance(X, np.ndarray):
 
@@ -265,21 +275,30 @@ class NearestNeighbors(Base):
             input_arr = <float**> malloc(len(final_devices) * sizeof(float *))
             sizes_arr = <int*> malloc(len(final_devices) * sizeof(int))
 
-            chunk_host_array(
-                handle_[0],
-                <float*>X_ctype,
-                <int>X.shape[0],
-                <int>X.shape[1],
-                <int*>dev_ptr,
-                <float**>input_arr,
-                <int*>sizes_arr,
-                <int>len(final_devices)
-            )
+            n_rows_host = X.shape[0]
+            n_cols_host = X.shape[1]
+            n_chunks = len(final_devices)
+
+            with nogil:
+                chunk_host_array(
+                    handle_[0],
+                    <float*>X_ctype,
+                    <int>n_rows_host,
+                    <int>n_cols_host,
+                    <int*>dev_ptr,
+                    <float**>input_arr,
+                    <int*>sizes_arr,
+                    <int>n_chunks
+                )
 
             self.input = <size_t>input_arr
             self.sizes = <size_t>sizes_arr
             self.n_indices = len(final_devices)
 
+            # The chunks are copied back from the devices when pickled
+            self.X_m = None
+            self._host_index = True
+
         else:
             if self._should_downcast:
                 self.X_m, X_ctype, n_rows, _, dtype = \
@@ -289,18 +308,25 @@ class NearestNeighbors(Base):
                 self.X_m, X_ctype, n_rows, _, dtype = \
                     input_to_dev_array(X, order='C')
 
-            input_arr = <float**> malloc(sizeof(float *))
-            sizes_arr = <int*> malloc(sizeof(int))
+            self._host_index = False
+            self._set_device_index(X_ctype, n_rows)
 
-            sizes_arr[0] = <int>len(X)
-            input_arr[0] = <float*>X_ctype
+    def _set_device_index(self, X_ctype, n_rows):
+        """
+        Points the index to the single device array of n_rows rows at
+        X_ctype.
+        """
+        cdef float** input_arr = <float**> malloc(sizeof(float *))
+        cdef int* sizes_arr = <int*> malloc(sizeof(int))
+        cdef uintptr_t X_ptr = X_ctype
 
-            self.n_indices = 1
+        sizes_arr[0] = <int>n_rows
+        input_arr[0] = <float*>X_ptr
 
-            inp = <uintptr_t>deref(input_arr)
+        self.n_indices = 1
 
-            self.sizes = <size_t>sizes_arr
-            self.input = <size_t>input_arr
+        self.sizes = <size_t>sizes_arr
+        self.input = <size_t>input_arr
 
     def _fit_mg(self, n_dims, alloc_info):
         """
@@ -335,6 +361,60 @@ class NearestNeighbors(Base):
 
         self.n_dims = n_dims
 
+        # The index data is owned by the caller
+        self.X_m = None
+        self._host_index = False
+
+    def _index_to_host(self):
+        """
+        Copies the chunks of an index fitted on host data, spread over the
+        devices, back into a single host array.
+        """
+        cdef float** input_arr = <float**><size_t>self.input
+        cdef int* sizes_arr = <int*><size_t>self.sizes
+
+        n_rows = 0
+        for i in range(self.n_indices):
+            n_rows += sizes_arr[i]
+        X = np.empty((n_rows, self.n_dims), dtype=np.float32)
+
+        cdef uintptr_t X_ptr = X.ctypes.data
+        cdef size_t row_bytes = self.n_dims * sizeof(float)
+        cdef size_t nbytes
+        cdef _Error e
+        for i in range(self.n_indices):
+            nbytes = sizes_arr[i] * row_bytes
+            e = cudaMemcpy(<void*>X_ptr, <void*>input_arr[i], nbytes,
+                           cudaMemcpyDefault)
+            if e != 0:
+                raise cuml.cuda.CudaRuntimeError("Memcpy")
+            X_ptr += nbytes
+        return X
+
+    def __getstate__(self):
+        state = super(NearestNeighbors, self).__getstate__()
+        if 'input' in state:
+            host_index = state.pop('_host_index', False)
+            if state.get('X_m') is None and not host_index:
+                raise TypeError("NearestNeighbors fitted with _fit_mg cannot "
+                                "be pickled, it does not own its index.")
+            if host_index:
+                state['_X_host'] = self._index_to_host()
+            # Raw pointers, rebuilt from the index data when unpickled
+            del state['input']
+            del state['sizes']
+        return state
+
+    def __setstate__(self, state):
+        state = state.copy()
+        X_host = state.pop('_X_host', None)
+        super(NearestNeighbors, self).__setstate__(state)
+        if getattr(self, 'X_m', None) is not None:
+            self._set_device_index(get_dev_array_ptr(self.X_m),
+                                   self.X_m.shape[0])
+        elif X_host is not None:
+            self.fit(X_host)
+
     def kneighbors(self, X, k=None):
         """
         Query the GPU index for the k nearest neighbors of column vectors in X.
@@ -368,6 +448,14 @@ class NearestNeighbors(Base):
         else:
             X_m, X_ctype, N, _, dtype = input_to_dev_array(X, order='C')
 
+        # Queries searched at once, so that their distances to the index fit
+        # in the free device memory
+        batch_size = memory.largest_batch_size(
+            lambda batch_size: self.estimate_memory(
+                self._max_index_rows(), self.n_dims, n_queries=N, k=k,
+                batch_size=batch_size),
+            N, memory.get_memory_budget())
+
         # Need to establish result matrices for indices (Nxk)
         # and for distances (Nxk)
         I_ndarr = cuda.to_device(zeros(N*k, dtype=np.int64, order="C"))
@@ -376,25 +464,24 @@ class NearestNeighbors(Base):
         cdef uintptr_t I_ptr = get_dev_array_ptr(I_ndarr)
         cdef uintptr_t D_ptr = get_dev_array_ptr(D_ndarr)
 
-        cdef float** inputs = <float**><size_t>self.input
-        cdef int* sizes = <int*><size_t>self.sizes
-
-        cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
-
-        cdef uintptr_t x_ctype_st = X_ctype
-
-        brute_force_knn(
-            handle_[0],
-            <float**>inputs,
-            <int*>sizes,
-            <int>self.n_indices,
-            <int>self.n_dims,
-            <float*>x_ctype_st,
-            <int>N,
-            <long*>I_ptr,
-            <float*>D_ptr,
-            <int>k
-        )
+        row_size = self.n_dims * np.dtype(dtype).itemsize
+        inds_ptr, dists_ptr = I_ptr, D_ptr
+        start = 0
+        while start < N:
+            def search(batch_size):
+                n_queries = min(batch_size, N - start)
+                self._kneighbors(
+                    X_ctype + start * row_size, n_queries,
+                    inds_ptr + start * k * np.dtype(np.int64).itemsize,
+                    dists_ptr + start * k * np.dtype(np.float32).itemsize, k)
+                return n_queries
+
+            # Smaller batches for the remaining queries when the device runs
+            # out of memory
+            n_queries, batch_size = memory.retry_on_out_of_memory(
+                search, batch_size, self.handle)
+            start += n_queries
+        self.batch_size_ = batch_size
 
         I_ndarr = I_ndarr.reshape((N, k))
         D_ndarr = D_ndarr.reshape((N, k))
@@ -420,6 +507,46 @@ class NearestNeighbors(Base):
 
         return dists, inds
 
+    def estimate_memory(self, n_rows, n_cols, **params):
+        """
+        Returns an upper bound, in bytes, of the device memory that `fit`
+        and `kneighbors` allocate for an index of shape (n_rows, n_cols), not
+        counting the index and the queries themselves.
+
+        Parameters
+        ----------
+        n_rows, n_cols : int
+            Shape of the index.
+        n_queries : int (default = n_rows)
+            Number of rows passed to `kneighbors`.
+        k : int (default = n_neighbors of this object)
+            Number of neighbors searched.
+        batch_size : int (default = n_queries)
+            Number of queries searched at once.
+        """
+        n_queries = params.get('n_queries', n_rows)
+        k = params.get('k', self.n_neighbors)
+        batch_size = min(params.get('batch_size') or n_queries, n_queries)
+
+        float_size = np.dtype(np.float32).itemsize
+        # indices and distances of the neighbors of all the queries
+        neighbors = n_queries * k * (np.dtype(np.int64).itemsize + float_size)
+        # distances of a batch of queries to the index, which FAISS computes
+        # in tiles of at most that size
+        distances = batch_size * n_rows * float_size
+        return neighbors + distances
+
+    def _max_index_rows(self):
+        """
+        Returns the number of rows of the largest part of the index.
+        """
+        cdef int* sizes = <int*><size_t>self.sizes
+        cdef int i
+        n_rows = 0
+        for i in range(self.n_indices):
+            n_rows = max(n_rows, sizes[i])
+        return n_rows
+
     def _kneighbors(self, X_ctype, N, I_ptr, D_ptr, k):
 
         cdef uintptr_t inds = I_ptr
@@ -431,15 +558,21 @@ class NearestNeighbors(Base):
 
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
 
-        brute_force_knn(
-            handle_[0],
-            <float**>input_arr,
-            <int*>sizes_arr,
-            <int>self.n_indices,
-            <int>self.n_dims,
-            <float*>x,
-            <int>N,
-            <long*>inds,
-            <float*>dists,
-            <int>k
-        )
+        cdef int n_indices = self.n_indices
+        cdef int n_dims = self.n_dims
+        cdef int n_queries = N
+        cdef int c_k = k
+
+        with nogil:
+            brute_force_knn(
+                handle_[0],
+                <float**>input_arr,
+                <int*>sizes_arr,
+                <int>n_indices,
+                <int>n_dims,
+                <float*>x,
+                <int>n_queries,
+                <long*>inds,
+                <float*>dists,
+                <int>c_k
+            )
@@ -20,6 +20,8 @@
 # cython: language_level = 3
 
 import cudf
+import cupy as cp
+import cupyx.scipy.sparse as cp_sparse
 import numpy as np
 
 from numba import cuda
@@ -30,9 +32,9 @@ from libcpp cimport bool
 from cuml.common.base import Base
 from cuml.common.handle cimport cumlHandle
 from cuml.utils import get_cudf_column_ptr, get_dev_array_ptr, \
-    input_to_dev_array
+    input_to_dev_array, input_to_csr_matrix, is_sparse_input
 
-cdef extern from "random_projection/rproj_c.h" namespace "ML":
+cdef extern from "random_projection/rproj_c.h" namespace "ML" nogil:
 
     # Structure holding random projection hyperparameters
     cdef struct paramsRPROJ:
@@ -181,7 +183,8 @@ cdef class BaseRandomProjection():
             X : array-like (device or host) shape = (n_samples, n_features)
                 Used to provide shape information.
                 Acceptable formats: cuDF DataFrame, NumPy ndarray, Numba device
-                ndarray, cuda array interface compliant array like CuPy
+                ndarray, cuda array interface compliant array like CuPy, or
+                sparse matrix like SciPy or CuPy CSR/COO
 
         Returns
         -------
@@ -190,17 +193,23 @@ cdef class BaseRandomProjection():
 
         """
 
-        _, _, n_samples, n_features, self.dtype = \
-            input_to_dev_array(X)
+        if is_sparse_input(X):
+            n_samples, n_features = X.shape
+            self.dtype = np.dtype(X.dtype)
+        else:
+            _, _, n_samples, n_features, self.dtype = \
+                input_to_dev_array(X)
 
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
         self.params.n_samples = n_samples
         self.params.n_features = n_features
 
         if self.dtype == np.float32:
-            RPROJfit[float](handle_[0], self.rand_matS, &self.params)
+            with nogil:
+                RPROJfit[float](handle_[0], self.rand_matS, &self.params)
         else:
-            RPROJfit[double](handle_[0], self.rand_matD, &self.params)
+            with nogil:
+                RPROJfit[double](handle_[0], self.rand_matD, &self.params)
 
         self.handle.sync()
 
@@ -218,14 +227,20 @@ cdef class BaseRandomProjection():
                 Dense matrix (floats or doubles) of shape (n_samples,
                 n_features).
                 Acceptable formats: cuDF DataFrame, NumPy ndarray, Numba device
-                ndarray, cuda array interface compliant array like CuPy
+                ndarray, cuda array interface compliant array like CuPy, or
+                sparse matrix (floats or doubles) like SciPy or CuPy CSR/COO
 
         Returns
         -------
             The output projected matrix of shape (n_samples, n_components)
-            Result of multiplication between input matrix and random matrix
+            Result of multiplication between input matrix and random matrix.
+            For sparse input it is a NumPy ndarray for SciPy input and a CuPy
+            array otherwise, or a sparse CSR matrix of the same library if
+            `dense_output` is False and the random matrix is sparse.
 
         """
+        if is_sparse_input(X):
+            return self._transform_sparse(X)
 
         cdef uintptr_t input_ptr
 
@@ -245,17 +260,19 @@ cdef class BaseRandomProjection():
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
 
         if dtype == np.float32:
-            RPROJtransform[float](handle_[0],
-                                  <float*> input_ptr,
-                                  self.rand_matS,
-                                  <float*> output_ptr,
-                                  &self.params)
+            with nogil:
+                RPROJtransform[float](handle_[0],
+                                      <float*> input_ptr,
+                                      self.rand_matS,
+                                      <float*> output_ptr,
+                                      &self.params)
         else:
-            RPROJtransform[double](handle_[0],
-                                   <double*> input_ptr,
-                                   self.rand_matD,
-                                   <double*> output_ptr,
-                                   &self.params)
+            with nogil:
+                RPROJtransform[double](handle_[0],
+                                       <double*> input_ptr,
+                                       self.rand_matD,
+                                       <double*> output_ptr,
+                                       &self.params)
 
         self.handle.sync()
 
@@ -276,6 +293,70 @@ cdef class BaseRandomProjection():
 
         del X_m
 
+    def _transform_sparse(self, X):
+        """
+        Multiply a sparse input by the random matrix with cuSPARSE, so that
+        the input is never densified.
+        """
+        X_m, n_samples, n_features, _, _ = \
+            input_to_csr_matrix(X, check_dtype=self.dtype)
+
+        if self.params.n_features != n_features:
+            raise ValueError("n_features must be same as on fitting: %d" %
+                             self.params.n_features)
+
+        X_new = X_m.dot(self._random_matrix())
+
+        if cp_sparse.issparse(X_new) and self.params.dense_output:
+            X_new = X_new.toarray()
+
+        if cp_sparse.issparse(X):
+            return X_new
+        return X_new.get()
+
+    def _random_matrix(self):
+        """
+        CuPy view of the fitted (n_features, n_components) random matrix, a
+        column major dense array or a CSC matrix.
+        """
+        cdef uintptr_t dense_ptr, data_ptr, indices_ptr, indptr_ptr
+        cdef size_t nnz
+
+        if self.dtype == np.float32:
+            dense_ptr = <uintptr_t> self.rand_matS.dense_data
+            data_ptr = <uintptr_t> self.rand_matS.sparse_data
+            indices_ptr = <uintptr_t> self.rand_matS.indices
+            indptr_ptr = <uintptr_t> self.rand_matS.indptr
+            nnz = self.rand_matS.sparse_data_size
+        else:
+            dense_ptr = <uintptr_t> self.rand_matD.dense_data
+            data_ptr = <uintptr_t> self.rand_matD.sparse_data
+            indices_ptr = <uintptr_t> self.rand_matD.indices
+            indptr_ptr = <uintptr_t> self.rand_matD.indptr
+            nnz = self.rand_matD.sparse_data_size
+
+        shape = (self.params.n_features, self.params.n_components)
+
+        if dense_ptr != 0:
+            return _device_view(dense_ptr, shape, self.dtype, self,
+                                order='F')
+
+        data = _device_view(data_ptr, (nnz,), self.dtype, self)
+        indices = _device_view(indices_ptr, (nnz,), np.int32, self)
+        indptr = _device_view(indptr_ptr, (shape[1] + 1,), np.int32, self)
+        return cp_sparse.csc_matrix((data, indices, indptr), shape=shape)
+
+
+def _device_view(ptr, shape, dtype, owner, order='C'):
+    """
+    CuPy array on device memory at `ptr` owned by `owner`, without a copy.
+    """
+    dtype = np.dtype(dtype)
+    mem = cp.cuda.UnownedMemory(ptr, int(np.prod(shape)) * dtype.itemsize,
+                                owner)
+    return cp.ndarray(shape, dtype=dtype,
+                      memptr=cp.cuda.MemoryPointer(mem, 0), order=order)
+
 
 class GaussianRandomProjection(Base, BaseRandomProjection):
     """
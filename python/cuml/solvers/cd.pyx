@@ -29,7 +29,7 @@ from cuml.common.handle cimport cumlHandle
 from cuml.utils import get_cudf_column_ptr, get_dev_array_ptr, \
     input_to_dev_array, zeros
 
-cdef extern from "solver/solver.hpp" namespace "ML::Solver":
+cdef extern from "solver/solver.hpp" namespace "ML::Solver" nogil:
 
     cdef void cdFit(cumlHandle& handle,
                     float *input,
@@ -219,40 +219,53 @@ class CD(Base):
         cdef double c_intercept2
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
 
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = self.n_cols
+        cdef bool c_fit_intercept = self.fit_intercept
+        cdef bool c_normalize = self.normalize
+        cdef int c_max_iter = self.max_iter
+        cdef int c_loss = self.loss
+        cdef double c_alpha = self.alpha
+        cdef double c_l1_ratio = self.l1_ratio
+        cdef bool c_shuffle = self.shuffle
+        cdef double c_tol = self.tol
+
         if self.dtype == np.float32:
-            cdFit(handle_[0],
-                  <float*>X_ptr,
-                  <int>n_rows,
-                  <int>self.n_cols,
-                  <float*>y_ptr,
-                  <float*>coef_ptr,
-                  <float*>&c_intercept1,
-                  <bool>self.fit_intercept,
-                  <bool>self.normalize,
-                  <int>self.max_iter,
-                  <int>self.loss,
-                  <float>self.alpha,
-                  <float>self.l1_ratio,
-                  <bool>self.shuffle,
-                  <float>self.tol)
+            with nogil:
+                cdFit(handle_[0],
+                      <float*>X_ptr,
+                      <int>c_n_rows,
+                      <int>c_n_cols,
+                      <float*>y_ptr,
+                      <float*>coef_ptr,
+                      <float*>&c_intercept1,
+                      <bool>c_fit_intercept,
+                      <bool>c_normalize,
+                      <int>c_max_iter,
+                      <int>c_loss,
+                      <float>c_alpha,
+                      <float>c_l1_ratio,
+                      <bool>c_shuffle,
+                      <float>c_tol)
 
             self.intercept_ = c_intercept1
         else:
-            cdFit(handle_[0],
-                  <double*>X_ptr,
-                  <int>n_rows,
-                  <int>self.n_cols,
-                  <double*>y_ptr,
-                  <double*>coef_ptr,
-                  <double*>&c_intercept2,
-                  <bool>self.fit_intercept,
-                  <bool>self.normalize,
-                  <int>self.max_iter,
-                  <int>self.loss,
-                  <double>self.alpha,
-                  <double>self.l1_ratio,
-                  <bool>self.shuffle,
-                  <double>self.tol)
+            with nogil:
+                cdFit(handle_[0],
+                      <double*>X_ptr,
+                      <int>c_n_rows,
+                      <int>c_n_cols,
+                      <double*>y_ptr,
+                      <double*>coef_ptr,
+                      <double*>&c_intercept2,
+                      <bool>c_fit_intercept,
+                      <bool>c_normalize,
+                      <int>c_max_iter,
+                      <int>c_loss,
+                      <double>c_alpha,
+                      <double>c_l1_ratio,
+                      <bool>c_shuffle,
+                      <double>c_tol)
 
             self.intercept_ = c_intercept2
 
@@ -284,24 +297,31 @@ class CD(Base):
         cdef uintptr_t preds_ptr = get_cudf_column_ptr(preds)
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
 
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = n_cols
+        cdef double c_intercept_ = self.intercept_
+        cdef int c_loss = self.loss
+
         if self.dtype == np.float32:
-            cdPredict(handle_[0],
-                      <float*>X_ptr,
-                      <int>n_rows,
-                      <int>n_cols,
-                      <float*>coef_ptr,
-                      <float>self.intercept_,
-                      <float*>preds_ptr,
-                      <int>self.loss)
+            with nogil:
+                cdPredict(handle_[0],
+                          <float*>X_ptr,
+                          <int>c_n_rows,
+                          <int>c_n_cols,
+                          <float*>coef_ptr,
+                          <float>c_intercept_,
+                          <float*>preds_ptr,
+                          <int>c_loss)
         else:
-            cdPredict(handle_[0],
-                      <double*>X_ptr,
-                      <int>n_rows,
-                      <int>n_cols,
-                      <double*>coef_ptr,
-                      <double>self.intercept_,
-                      <double*>preds_ptr,
-                      <int>self.loss)
+            with nogil:
+                cdPredict(handle_[0],
+                          <double*>X_ptr,
+                          <int>c_n_rows,
+                          <int>c_n_cols,
+                          <double*>coef_ptr,
+                          <double>c_intercept_,
+                          <double*>preds_ptr,
+                          <int>c_loss)
 
         self.handle.sync()
 
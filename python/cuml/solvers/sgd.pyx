@@ -16,6 +16,8 @@
 
 import ctypes
 import cudf
+import cupy as cp
+import cupyx.scipy.sparse as cp_sparse
 import numpy as np
 
 from numba import cuda
@@ -27,9 +29,9 @@ from libc.stdlib cimport calloc, malloc, free
 from cuml.common.base import Base
 from cuml.common.handle cimport cumlHandle
 from cuml.utils import get_cudf_column_ptr, get_dev_array_ptr, \
-    input_to_dev_array, zeros
+    input_to_dev_array, input_to_csr_matrix, is_sparse_input, zeros
 
-cdef extern from "solver/solver.hpp" namespace "ML::Solver":
+cdef extern from "solver/solver.hpp" namespace "ML::Solver" nogil:
 
     cdef void sgdFit(cumlHandle& handle,
                      float *input,
@@ -119,7 +121,8 @@ class SGD(Base):
 
     cuML's SGD algorithm accepts a numpy matrix or a cuDF DataFrame as the
     input dataset. The SGD algorithm currently works with linear regression,
-    ridge regression and SVM models.
+    ridge regression and SVM models. Sparse SciPy or CuPy matrices are also
+    accepted, and are processed without being densified.
 
     Examples
     ---------
@@ -289,13 +292,16 @@ class SGD(Base):
         X : array-like (device or host) shape = (n_samples, n_features)
             Dense matrix (floats or doubles) of shape (n_samples, n_features).
             Acceptable formats: cuDF DataFrame, NumPy ndarray, Numba device
-            ndarray, cuda array interface compliant array like CuPy
+            ndarray, cuda array interface compliant array like CuPy, or
+            sparse matrix (floats or doubles) like SciPy or CuPy CSR/COO
 
         y : array-like (device or host) shape = (n_samples, 1)
             Dense vector (floats or doubles) of shape (n_samples, 1).
             Acceptable formats: cuDF Series, NumPy ndarray, Numba device
             ndarray, cuda array interface compliant array like CuPy
         """
+        if is_sparse_input(X):
+            return self._fit_sparse(X, y)
 
         cdef uintptr_t X_ptr, y_ptr
         X_m, X_ptr, n_rows, self.n_cols, self.dtype = \
@@ -314,50 +320,68 @@ class SGD(Base):
         cdef double c_intercept2
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
 
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = self.n_cols
+        cdef bool c_fit_intercept = self.fit_intercept
+        cdef int c_batch_size = self.batch_size
+        cdef int c_epochs = self.epochs
+        cdef int c_lr_type = self.lr_type
+        cdef double c_eta0 = self.eta0
+        cdef double c_power_t = self.power_t
+        cdef int c_loss = self.loss
+        cdef int c_penalty = self.penalty
+        cdef double c_alpha = self.alpha
+        cdef double c_l1_ratio = self.l1_ratio
+        cdef bool c_shuffle = self.shuffle
+        cdef double c_tol = self.tol
+        cdef int c_n_iter_no_change = self.n_iter_no_change
+
         if self.dtype == np.float32:
-            sgdFit(handle_[0],
-                   <float*>X_ptr,
-                   <int>n_rows,
-                   <int>self.n_cols,
-                   <float*>y_ptr,
-                   <float*>coef_ptr,
-                   <float*>&c_intercept1,
-                   <bool>self.fit_intercept,
-                   <int>self.batch_size,
-                   <int>self.epochs,
-                   <int>self.lr_type,
-                   <float>self.eta0,
-                   <float>self.power_t,
-                   <int>self.loss,
-                   <int>self.penalty,
-                   <float>self.alpha,
-                   <float>self.l1_ratio,
-                   <bool>self.shuffle,
-                   <float>self.tol,
-                   <int>self.n_iter_no_change)
+            with nogil:
+                sgdFit(handle_[0],
+                       <float*>X_ptr,
+                       <int>c_n_rows,
+                       <int>c_n_cols,
+                       <float*>y_ptr,
+                       <float*>coef_ptr,
+                       <float*>&c_intercept1,
+                       <bool>c_fit_intercept,
+                       <int>c_batch_size,
+                       <int>c_epochs,
+                       <int>c_lr_type,
+                       <float>c_eta0,
+                       <float>c_power_t,
+                       <int>c_loss,
+                       <int>c_penalty,
+                       <float>c_alpha,
+                       <float>c_l1_ratio,
+                       <bool>c_shuffle,
+                       <float>c_tol,
+                       <int>c_n_iter_no_change)
 
             self.intercept_ = c_intercept1
         else:
-            sgdFit(handle_[0],
-                   <double*>X_ptr,
-                   <int>n_rows,
-                   <int>self.n_cols,
-                   <double*>y_ptr,
-                   <double*>coef_ptr,
-                   <double*>&c_intercept2,
-                   <bool>self.fit_intercept,
-                   <int>self.batch_size,
-                   <int>self.epochs,
-                   <int>self.lr_type,
-                   <double>self.eta0,
-                   <double>self.power_t,
-                   <int>self.loss,
-                   <int>self.penalty,
-                   <double>self.alpha,
-                   <double>self.l1_ratio,
-                   <bool>self.shuffle,
-                   <double>self.tol,
-                   <int>self.n_iter_no_change)
+            with nogil:
+                sgdFit(handle_[0],
+                       <double*>X_ptr,
+                       <int>c_n_rows,
+                       <int>c_n_cols,
+                       <double*>y_ptr,
+                       <double*>coef_ptr,
+                       <double*>&c_intercept2,
+                       <bool>c_fit_intercept,
+                       <int>c_batch_size,
+                       <int>c_epochs,
+                       <int>c_lr_type,
+                       <double>c_eta0,
+                       <double>c_power_t,
+                       <int>c_loss,
+                       <int>c_penalty,
+                       <double>c_alpha,
+                       <double>c_l1_ratio,
+                       <bool>c_shuffle,
+                       <double>c_tol,
+                       <int>c_n_iter_no_change)
 
             self.intercept_ = c_intercept2
 
@@ -376,12 +400,15 @@ class SGD(Base):
         X : array-like (device or host) shape = (n_samples, n_features)
             Dense matrix (floats or doubles) of shape (n_samples, n_features).
             Acceptable formats: cuDF DataFrame, NumPy ndarray, Numba device
-            ndarray, cuda array interface compliant array like CuPy
+            ndarray, cuda array interface compliant array like CuPy, or
+            sparse matrix (floats or doubles) like SciPy or CuPy CSR/COO
         Returns
         ----------
         y: cuDF DataFrame
            Dense vector (floats or doubles) of shape (n_samples, 1)
         """
+        if is_sparse_input(X):
+            return self._predict_sparse(X)
 
         cdef uintptr_t X_ptr
         X_m, X_ptr, n_rows, n_cols, self.dtype = \
@@ -393,24 +420,31 @@ class SGD(Base):
 
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
 
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = n_cols
+        cdef double c_intercept_ = self.intercept_
+        cdef int c_loss = self.loss
+
         if self.dtype == np.float32:
-            sgdPredict(handle_[0],
-                       <float*>X_ptr,
-                       <int>n_rows,
-                       <int>n_cols,
-                       <float*>coef_ptr,
-                       <float>self.intercept_,
-                       <float*>preds_ptr,
-                       <int>self.loss)
+            with nogil:
+                sgdPredict(handle_[0],
+                           <float*>X_ptr,
+                           <int>c_n_rows,
+                           <int>c_n_cols,
+                           <float*>coef_ptr,
+                           <float>c_intercept_,
+                           <float*>preds_ptr,
+                           <int>c_loss)
         else:
-            sgdPredict(handle_[0],
-                       <double*>X_ptr,
-                       <int>n_rows,
-                       <int>n_cols,
-                       <double*>coef_ptr,
-                       <double>self.intercept_,
-                       <double*>preds_ptr,
-                       <int>self.loss)
+            with nogil:
+                sgdPredict(handle_[0],
+                           <double*>X_ptr,
+                           <int>c_n_rows,
+                           <int>c_n_cols,
+                           <double*>coef_ptr,
+                           <double>c_intercept_,
+                           <double*>preds_ptr,
+                           <int>c_loss)
 
         self.handle.sync()
 
@@ -426,12 +460,17 @@ class SGD(Base):
         X : array-like (device or host) shape = (n_samples, n_features)
             Dense matrix (floats or doubles) of shape (n_samples, n_features).
             Acceptable formats: cuDF DataFrame, NumPy ndarray, Numba device
-            ndarray, cuda array interface compliant array like CuPy
+            ndarray, cuda array interface compliant array like CuPy, or
+            sparse matrix (floats or doubles) like SciPy or CuPy CSR/COO
         Returns
         ----------
         y: cuDF DataFrame
            Dense vector (floats or doubles) of shape (n_samples, 1)
         """
+        if is_sparse_input(X):
+            preds = self._predict_sparse(X)
+            threshold = 0.0 if self.loss == 2 else 0.5
+            return (preds >= threshold).astype(preds.dtype)
 
         cdef uintptr_t X_ptr
         X_m, X_ptr, n_rows, n_cols, dtype = \
@@ -442,27 +481,201 @@ class SGD(Base):
         cdef uintptr_t preds_ptr = get_cudf_column_ptr(preds)
         cdef cumlHandle* handle_ = <cumlHandle*><size_t>self.handle.getHandle()
 
+        cdef int c_n_rows = n_rows
+        cdef int c_n_cols = n_cols
+        cdef double c_intercept_ = self.intercept_
+        cdef int c_loss = self.loss
+
         if dtype.type == np.float32:
-            sgdPredictBinaryClass(handle_[0],
-                                  <float*>X_ptr,
-                                  <int>n_rows,
-                                  <int>n_cols,
-                                  <float*>coef_ptr,
-                                  <float>self.intercept_,
-                                  <float*>preds_ptr,
-                                  <int>self.loss)
+            with nogil:
+                sgdPredictBinaryClass(handle_[0],
+                                      <float*>X_ptr,
+                                      <int>c_n_rows,
+                                      <int>c_n_cols,
+                                      <float*>coef_ptr,
+                                      <float>c_intercept_,
+                                      <float*>preds_ptr,
+                                      <int>c_loss)
         else:
-            sgdPredictBinaryClass(handle_[0],
-                                  <double*>X_ptr,
-                                  <int>n_rows,
-                                  <int>n_cols,
-                                  <double*>coef_ptr,
-                                  <double>self.intercept_,
-                                  <double*>preds_ptr,
-                                  <int>self.loss)
+            with nogil:
+                sgdPredictBinaryClass(handle_[0],
+                                      <double*>X_ptr,
+                                      <int>c_n_rows,
+                                      <int>c_n_cols,
+                                      <double*>coef_ptr,
+                                      <double>c_intercept_,
+                                      <double*>preds_ptr,
+                                      <int>c_loss)
 
         self.handle.sync()
 
         del(X_m)
 
         return preds
+
+    def _fit_sparse(self, X, y):
+        """
+        Mini-batch SGD on a sparse matrix, following the dense solver step by
+        step. Every batch is a slice of the rows of the CSR matrix and the
+        gradients are cuSPARSE products, while centering for the intercept is
+        applied implicitly, so X is never densified.
+        """
+        X_m, n_rows, self.n_cols, _, self.dtype = input_to_csr_matrix(X)
+
+        y_m, _, _, _, _ = input_to_dev_array(y, check_dtype=self.dtype,
+                                             check_rows=n_rows)
+        labels = cp.asarray(y_m)
+
+        if self.fit_intercept:
+            mu_input = cp.bincount(X_m.indices, weights=X_m.data,
+                                   minlength=self.n_cols) / n_rows
+            mu_input = mu_input.astype(self.dtype)
+            mu_labels = labels.mean()
+            labels = labels - mu_labels
+        else:
+            mu_input = cp.zeros(self.n_cols, dtype=self.dtype)
+            mu_labels = 0.0
+
+        coef = cp.zeros(self.n_cols, dtype=self.dtype)
+
+        t = 1
+        learning_rate = self.eta0
+        prev_loss_value = 0.0
+        n_iter_no_change_curr = 0
+
+        X_epoch, labels_epoch = X_m, labels
+        indptr = X_m.indptr.get()
+
+        for i in range(self.epochs):
+            if i > 0 and self.shuffle:
+                X_epoch, labels_epoch = _shuffle_rows(X_m, labels)
+                indptr = X_epoch.indptr.get()
+
+            for j in range(0, n_rows, self.batch_size):
+                end = min(j + self.batch_size, n_rows)
+                X_batch = _csr_row_slice(X_epoch, indptr, j, end)
+
+                grads = self._sparse_loss_grads(X_batch, mu_input,
+                                                labels_epoch[j:end], coef)
+
+                if self.lr_type == 2:
+                    learning_rate = self.eta0 / t ** self.power_t
+                elif self.lr_type != 3:
+                    learning_rate = self.eta0
+
+                coef -= learning_rate * grads
+                t += 1
+
+            if self.tol > 0.0:
+                curr_loss_value = self._sparse_loss(X_m, mu_input, labels,
+                                                    coef)
+                if i > 0:
+                    if curr_loss_value > (prev_loss_value - self.tol):
+                        n_iter_no_change_curr += 1
+                        if n_iter_no_change_curr > self.n_iter_no_change:
+                            if self.lr_type == 3 and learning_rate > 1e-6:
+                                learning_rate = learning_rate / 5
+                                n_iter_no_change_curr = 0
+                            else:
+                                break
+                    else:
+                        n_iter_no_change_curr = 0
+
+                prev_loss_value = curr_loss_value
+
+        if self.fit_intercept:
+            self.intercept_ = float(mu_labels - mu_input.dot(coef))
+        else:
+            self.intercept_ = 0.0
+
+        self.coef_ = cudf.Series(cuda.as_cuda_array(coef))
+
+        return self
+
+    def _sparse_loss_grads(self, X_batch, mu_input, labels, coef):
+        n_rows = X_batch.shape[0]
+        pred = X_batch.dot(coef) - mu_input.dot(coef)
+
+        if self.loss == 0:
+            diff = 2 * (pred - labels)
+        elif self.loss == 1:
+            diff = 1 / (1 + cp.exp(-pred)) - labels
+        else:
+            diff = cp.where(pred * labels < 1, -labels, 0).astype(self.dtype)
+
+        grads = (X_batch.T.dot(diff) - mu_input * diff.sum()) / n_rows
+        return grads + self._penalty_grads(coef)
+
+    def _sparse_loss(self, X_m, mu_input, labels, coef):
+        pred = X_m.dot(coef) - mu_input.dot(coef)
+
+        if self.loss == 0:
+            loss = ((labels - pred) ** 2).mean()
+        elif self.loss == 1:
+            pred = 1 / (1 + cp.exp(-pred))
+            loss = (-labels * cp.log(pred) -
+                    (1 - labels) * cp.log(1 - pred)).mean()
+        else:
+            loss = cp.maximum(1 - pred * labels, 0).sum()
+
+        return float(loss) + self._penalty(coef)
+
+    def _penalty_grads(self, coef):
+        if self.penalty == 1:
+            return self.alpha * cp.sign(coef)
+        elif self.penalty == 2:
+            return 2 * self.alpha * coef
+        elif self.penalty == 3:
+            return 2 * self.alpha * (1 - self.l1_ratio) * coef + \
+                self.alpha * self.l1_ratio * cp.sign(coef)
+        return 0
+
+    def _penalty(self, coef):
+        l1 = float(cp.abs(coef).sum())
+        l2 = float(cp.sqrt((coef ** 2).sum()))
+        if self.penalty == 1:
+            return self.alpha * l1
+        elif self.penalty == 2:
+            return self.alpha * l2
+        elif self.penalty == 3:
+            return self.alpha * ((1 - self.l1_ratio) * l2 +
+                                 self.l1_ratio * l1)
+        return 0.0
+
+    def _predict_sparse(self, X):
+        X_m, _, _, _, _ = input_to_csr_matrix(X, check_dtype=self.dtype,
+                                              check_cols=self.n_cols)
+
+        coef = cp.asarray(self.coef_._column._data.mem)
+        preds = X_m.dot(coef) + self.intercept_
+
+        if self.loss == 1:
+            preds = 1 / (1 + cp.exp(-preds))
+        elif self.loss == 2:
+            preds = cp.sign(preds)
+
+        return cudf.Series(cuda.as_cuda_array(preds.astype(self.dtype)))
+
+
+def _shuffle_rows(X_m, labels):
+    """
+    Randomly permute the rows of a CSR matrix and its labels. The
+    permutation is a sparse product, linear in the number of non-zeros.
+    """
+    n_rows = X_m.shape[0]
+    perm = cp.random.permutation(n_rows).astype(np.int32)
+    P = cp_sparse.csr_matrix((cp.ones(n_rows, dtype=X_m.dtype), perm,
+                              cp.arange(n_rows + 1, dtype=np.int32)),
+                             shape=(n_rows, n_rows))
+    return P.dot(X_m), labels[perm]
+
+
+def _csr_row_slice(X_m, indptr, start, end):
+    """
+    Rows [start, end) of a CSR matrix as a CSR matrix sharing its arrays.
+    `indptr` is the host copy of the row pointers of X_m.
+    """
+    lo, hi = indptr[start], indptr[end]
+    return cp_sparse.csr_matrix((X_m.data[lo:hi], X_m.indices[lo:hi],
+                                 X_m.indptr[start:end + 1] - lo),
+                                shape=(end - start, X_m.shape[1]))
@@ -31,3 +31,64 @@ def test_base_class_usage_with_handle():
     base = cuml.Base(handle=handle)
     base.handle.sync()
     del base
+
+
+def test_base_class_default_handle():
+    first, second = cuml.Base(), cuml.Base()
+    assert first._handle is None
+    assert first.handle is second.handle
+    assert first.handle is cuml.common.handle.get_default_handle()
+
+    handle = cuml.Handle()
+    with cuml.using_handle(handle):
+        base = cuml.Base()
+        assert base.handle is handle
+    assert base.handle is handle
+    assert cuml.Base().handle is first.handle
+
+
+def test_base_class_default_handle_per_thread():
+    from concurrent.futures import ThreadPoolExecutor
+
+    handle = cuml.Base().handle
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        other = pool.submit(lambda: cuml.Base().handle).result()
+    assert other is not handle
+
+
+def test_handle_memory_stats():
+    from sklearn.datasets.samples_generator import make_blobs
+
+    handle = cuml.Handle()
+    stats = handle.getMemoryStats()
+    assert stats['current_bytes'] == 0
+    assert stats['n_allocations'] == 0
+
+    X, _ = make_blobs(n_samples=1000, n_features=10, random_state=0)
+    cuml.DBSCAN(eps=1.0, handle=handle).fit(X.astype('float32'))
+    handle.sync()
+
+    stats = handle.getMemoryStats()
+    assert stats['n_allocations'] > 0
+    assert stats['peak_bytes'] >= stats['current_bytes']
+    assert stats['total_bytes'] >= stats['peak_bytes']
+
+    handle.resetPeakMemory()
+    assert handle.getMemoryStats()['peak_bytes'] == stats['current_bytes']
+
+
+def test_last_fit_memory():
+    from sklearn.datasets.samples_generator import make_blobs
+
+    X, _ = make_blobs(n_samples=1000, n_features=10, random_state=0)
+    dbscan = cuml.DBSCAN(eps=1.0, handle=cuml.Handle())
+    dbscan.fit(X.astype('float32'))
+
+    report = dbscan.last_fit_memory_
+    assert isinstance(report, cuml.common.memory.MemoryReport)
+    assert report.n_allocations > 0
+    assert report.n_failed == 0
+    assert 0 < report.peak_bytes <= report.allocated_bytes
+
+    dbscan.fit_predict(X[:100].astype('float32'))
+    assert dbscan.last_fit_memory_.peak_bytes < report.peak_bytes
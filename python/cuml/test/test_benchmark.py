@@ -0,0 +1,99 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from cuml import benchmark
+
+
+class _MeanRegressor(object):
+    def fit(self, X, y):
+        self.mean_ = y.mean()
+        return self
+
+    def predict(self, X):
+        return np.full(len(X), self.mean_)
+
+
+_mean_regressor = benchmark.Algorithm(
+    'MeanRegressor', 'cuml.linear_model.ridge:Ridge', _MeanRegressor,
+    target='regression', methods=['predict', 'transform'])
+
+
+@pytest.mark.parametrize('target', [None, 'classification', 'regression'])
+def test_gen_data(target):
+    X, y = benchmark.gen_data(target, 100, 5, np.float32, random_state=1)
+    X2, y2 = benchmark.gen_data(target, 100, 5, np.float32, random_state=1)
+    assert X.shape == (100, 5) and X.dtype == np.float32
+    assert np.array_equal(X, X2)
+    if target is None:
+        assert y is None
+    else:
+        assert y.shape == (100,)
+        assert np.array_equal(y, y2)
+
+
+def test_run_cpu(tmpdir):
+    results = benchmark.run([_mean_regressor], n_rows=[10, 20], n_cols=[3],
+                            dtypes=['float32', 'float64'], backends=['cpu'],
+                            n_reps=2)
+    assert len(results) == 2 * 2 * 3
+    for result in results:
+        assert set(result) == set(benchmark.runner.RESULT_FIELDS)
+        assert result['backend'] == 'cpu'
+        if result['method'] == 'transform':
+            assert 'AttributeError' in result['error']
+        else:
+            assert result['error'] is None
+            assert result['n_reps'] == 2
+            assert 0 <= result['warm_min'] <= result['warm_median']
+
+    json_path = str(tmpdir.join('results.json'))
+    benchmark.write_json(results, json_path)
+    with open(json_path) as f:
+        written = json.load(f)
+    assert written['results'] == results
+    assert 'numpy' in written['environment']
+
+    csv_path = str(tmpdir.join('results.csv'))
+    benchmark.write_csv(results, csv_path)
+    with open(csv_path) as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == len(results)
+
+    assert len(benchmark.format_results(results).splitlines()) == \
+        len(results) + 1
+
+
+@pytest.mark.filterwarnings('ignore:Skipping')
+def test_run_cuml_and_cpu():
+    # Backends that are not available are skipped
+    results = benchmark.run(['LinearRegression'], n_rows=[100], n_cols=[4],
+                            dtypes=['float32'], n_reps=1)
+    for result in results:
+        assert result['error'] is None
+        if result['backend'] == 'cuml' and len(results) == 4:
+            assert result['speedup'] > 0
+
+
+def test_algorithms():
+    names = [algorithm.name for algorithm in benchmark.all_algorithms()]
+    assert 'KMeans' in names
+    with pytest.raises(ValueError):
+        benchmark.algorithm_by_name('KalmanFilter')
@@ -22,7 +22,8 @@ import pandas as pd
 import cudf
 import numpy as np
 from sklearn.preprocessing import StandardScaler
-from cuml.test.utils import fit_predict, get_pattern, clusters_equal
+from cuml.test.utils import fit_predict, get_pattern, clusters_equal, \
+    array_equal
 
 
 def unit_param(*args, **kwargs):
@@ -109,3 +110,24 @@ def test_dbscan_sklearn_comparison(name, nrows):
     if nrows != 500000:
         assert(sk_n_clusters == cu_n_clusters)
         clusters_equal(sk_y_pred, cu_y_pred, sk_n_clusters)
+
+
+@pytest.mark.parametrize('datatype', [np.float32, np.float64])
+def test_dbscan_estimate_memory(datatype):
+    n_rows, n_cols = 1000, 10
+    dbscan = cuDBSCAN(eps=3, min_samples=2)
+
+    one_batch = dbscan.estimate_memory(n_rows, n_cols, dtype=datatype)
+    two_batches = dbscan.estimate_memory(
+        n_rows, n_cols, dtype=datatype,
+        max_bytes_per_batch=n_rows * n_rows * np.dtype(datatype).itemsize)
+    # at least the adjacency matrix of a batch
+    assert one_batch >= n_rows * n_rows
+    assert two_batches < one_batch
+
+    X, _ = make_blobs(n_samples=n_rows, n_features=n_cols, random_state=0)
+    X = X.astype(datatype)
+    auto_labels = dbscan.fit_predict(X).to_array()
+    explicit = cuDBSCAN(eps=3, min_samples=2, max_bytes_per_batch=200000)
+    assert array_equal(auto_labels, explicit.fit_predict(X).to_array())
+    assert dbscan.last_fit_memory_.peak_bytes <= one_batch
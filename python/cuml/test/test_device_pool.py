@@ -0,0 +1,97 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import gc
+
+import numpy as np
+import pytest
+
+from cuml import LinearRegression as cuLinearRegression
+from cuml.utils import DevicePool, get_default_pool
+from cuml.utils.device_pool import _bucket_size
+from librmm_cffi import librmm as rmm
+
+
+@pytest.mark.parametrize('nbytes, bucket', [
+    (1, 512), (512, 512), (513, 1024), (1 << 20, 1 << 20),
+    ((1 << 20) + 1, 5 << 18), (5 << 18, 5 << 18), ((5 << 18) + 1, 6 << 18),
+    (9 << 30, 10 << 30), (1 << 34, 1 << 34)])
+def test_bucket_size(nbytes, bucket):
+    assert _bucket_size(nbytes) == bucket
+    assert nbytes <= _bucket_size(nbytes)
+
+
+@pytest.mark.parametrize('shape', [0, 10, (10, 3), (1000, 7)])
+@pytest.mark.parametrize('dtype', [np.float32, np.float64, np.int32])
+@pytest.mark.parametrize('order', ['C', 'F'])
+def test_pool_zeros(shape, dtype, order):
+    pool = DevicePool()
+    X = pool.zeros(shape, dtype, order=order)
+    expected = np.zeros(shape, dtype=dtype, order=order)
+    assert X.shape == expected.shape
+    assert X.strides == expected.strides
+    assert np.array_equal(X.copy_to_host(), expected)
+
+
+def test_pool_reuse():
+    pool = DevicePool()
+    X = pool.zeros((100, 4), np.float32)
+    X.copy_to_device(np.ones((100, 4), dtype=np.float32, order='F'))
+    pool.release(X)
+    assert pool.stats()['cached_bytes'] == 2048
+
+    # Same bucket, cleared again
+    X = pool.zeros(500, np.float32)
+    assert np.all(X.copy_to_host() == 0)
+    assert pool.stats()['n_allocations'] == 1
+    assert pool.stats()['n_reused'] == 1
+
+    # Back to the pool once collected, also through a reshape
+    Y = X.reshape((50, 10))
+    del X
+    gc.collect()
+    assert pool.stats()['in_use_bytes'] == 2048
+    del Y
+    gc.collect()
+    assert pool.stats()['in_use_bytes'] == 0
+
+    pool.clear()
+    assert pool.stats()['cached_bytes'] == 0
+
+    with pytest.raises(ValueError):
+        pool.release(rmm.device_array(10, dtype=np.float32))
+
+
+def test_pool_max_cached_bytes():
+    pool = DevicePool(max_cached_bytes=1024)
+    X = pool.zeros(1024, np.float32)
+    pool.release(X)
+    assert pool.stats()['cached_bytes'] == 0
+
+
+def test_repeated_predict_no_allocations():
+    rng = np.random.RandomState(0)
+    X = rng.rand(1000, 10).astype(np.float32)
+    y = X.sum(axis=1)
+    model = cuLinearRegression().fit(X, y)
+    batch = rng.rand(100, 10).astype(np.float32)
+
+    model.predict(batch)
+    gc.collect()
+    n_allocations = get_default_pool().stats()['n_allocations']
+    for _ in range(3):
+        model.predict(batch)
+        gc.collect()
+    assert get_default_pool().stats()['n_allocations'] == n_allocations
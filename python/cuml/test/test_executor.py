@@ -0,0 +1,119 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import cuml
+from sklearn.datasets.samples_generator import make_blobs
+
+
+def _segments(n_segments):
+    return [make_blobs(n_samples=1000, n_features=8, centers=4,
+                       random_state=i)[0].astype(np.float32)
+            for i in range(n_segments)]
+
+
+@pytest.mark.parametrize('n_streams', [1, 3])
+def test_stream_executor_submit(n_streams):
+    segments = _segments(6)
+    expected = [cuml.KMeans(n_clusters=4, random_state=0).fit(X)
+                .cluster_centers_.to_pandas().values for X in segments]
+
+    with cuml.StreamExecutor(n_streams=n_streams) as executor:
+        models = [cuml.KMeans(n_clusters=4, random_state=0)
+                  for _ in segments]
+        futures = [executor.submit(model, 'fit', X)
+                   for model, X in zip(models, segments)]
+        results = [future.result() for future in futures]
+
+    handles = set()
+    for model, result, centers in zip(models, results, expected):
+        assert result is model
+        handles.add(id(model.handle))
+        np.testing.assert_allclose(model.cluster_centers_.to_pandas().values,
+                                   centers, rtol=1e-4, atol=1e-4)
+    assert len(handles) == n_streams
+
+
+def test_stream_executor_predict_after_shutdown():
+    X = _segments(1)[0]
+    expected = cuml.KMeans(n_clusters=4, random_state=0).fit(X).predict(X)
+
+    with cuml.StreamExecutor(n_streams=2) as executor:
+        model = cuml.KMeans(n_clusters=4, random_state=0)
+        executor.submit(model, 'fit', X).result()
+
+    # The streams of the executor outlive it, through the model handles
+    labels = model.predict(X)
+    np.testing.assert_array_equal(labels.to_array(), expected.to_array())
+
+
+def test_stream_executor_run():
+    X = _segments(1)[0]
+
+    async def fit_predict():
+        with cuml.StreamExecutor(n_streams=2) as executor:
+            model = cuml.KMeans(n_clusters=4, random_state=0)
+            await executor.run(model, 'fit', X)
+            return await executor.run(model, 'predict', X)
+
+    labels = asyncio.get_event_loop().run_until_complete(fit_predict())
+    assert len(labels) == len(X)
+
+
+def test_fit_async_predict_async():
+    X = _segments(1)[0]
+    model = cuml.KMeans(n_clusters=4, random_state=0)
+
+    fit_future = model.fit_async(X)
+    predict_future = model.predict_async(X)
+
+    assert fit_future.result() is model
+    expected = cuml.KMeans(n_clusters=4, random_state=0).fit(X).predict(X)
+    np.testing.assert_array_equal(predict_future.result().to_array(),
+                                  expected.to_array())
+
+
+def test_concurrent_threads():
+    # The C++ calls release the GIL, so plain Python threads run estimators
+    # concurrently on their per-thread default handles
+    segments = _segments(4)
+    y = [X.sum(axis=1) for X in segments]
+    expected = [cuml.Ridge().fit(X, target).coef_.to_array()
+                for X, target in zip(segments, y)]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        models = list(pool.map(lambda args: cuml.Ridge().fit(*args),
+                               zip(segments, y)))
+
+    for model, coef in zip(models, expected):
+        np.testing.assert_allclose(model.coef_.to_array(), coef,
+                                   rtol=1e-4, atol=1e-4)
+
+    # predict only reads the centroids of the model, so it can be shared.
+    # It also sets labels_, which ends up holding the result of any one of
+    # the calls, so only the returned labels are checked
+    kmeans = cuml.KMeans(n_clusters=4, random_state=0).fit(segments[0])
+    expected = [kmeans.predict(X).to_array() for X in segments]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        labels = list(pool.map(kmeans.predict, segments))
+
+    for result, expected_labels in zip(labels, expected):
+        np.testing.assert_array_equal(result.to_array(), expected_labels)
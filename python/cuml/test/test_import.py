@@ -0,0 +1,81 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import importlib
+import os
+import subprocess
+import sys
+
+import pytest
+
+import cuml
+from cuml.benchmark import import_time
+
+
+# Time allowed for `import cuml` in a fresh interpreter, as measured by
+# -X importtime. The eager imports of cuDF, Numba and CuPy take seconds,
+# well above it.
+IMPORT_TIME_BUDGET = float(os.environ.get('CUML_IMPORT_TIME_BUDGET', 1.0))
+
+
+def _run(code):
+    return subprocess.run([sys.executable, '-c', code],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          check=True, universal_newlines=True)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason="lazy imports need Python 3.7")
+def test_import_is_lazy():
+    modules = _run("import sys, cuml; print(' '.join(sys.modules))").stdout
+    modules = set(modules.split())
+    for heavy in ['cudf', 'numba', 'cupy', 'cuml.common.base']:
+        assert heavy not in modules
+
+    modules = _run("import sys, cuml; cuml.LinearRegression; "
+                   "print(' '.join(sys.modules))").stdout
+    modules = set(modules.split())
+    assert 'cuml.linear_model.linear_regression' in modules
+    assert 'cuml.manifold.umap' not in modules
+
+
+@pytest.mark.parametrize('name', cuml.__all__)
+def test_lazy_names(name):
+    module_name, attr = cuml._lazy_names[name]
+    expected = importlib.import_module(module_name)
+    if attr is not None:
+        expected = getattr(expected, attr)
+
+    assert getattr(cuml, name) is expected
+    assert name in dir(cuml)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason="lazy imports need Python 3.7")
+def test_subpackage_access():
+    modules = _run("import sys, cuml; cuml.metrics; "
+                   "print(' '.join(sys.modules))").stdout
+    assert 'cuml.metrics' in set(modules.split())
+
+    with pytest.raises(AttributeError):
+        cuml.no_such_name
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason="-X importtime needs Python 3.7")
+def test_import_time():
+    result = import_time(n_reps=2)
+    assert result['method'] == 'import' and result['error'] is None
+    assert 0 < result['warm_min'] < IMPORT_TIME_BUDGET
@@ -22,9 +22,12 @@ import numpy as np
 from numba import cuda
 from copy import deepcopy
 
-from cuml.utils import input_to_dev_array
+import cuml
+from cuml.utils import audit_transfers, input_to_dev_array, \
+    input_to_csr_matrix
 
-from cuml.utils.input_utils import convert_dtype
+from cuml.utils.input_utils import convert_dtype, stream_to_dev_array
+from cuml.utils.numba_utils import gpu_major_converter
 
 test_dtypes_all = [
     np.float16, np.float32, np.float64,
@@ -92,6 +95,225 @@ def test_convert_inputs(from_dtype, to_dtype, input_type, num_rows, num_cols):
         np.testing.assert_equal(converted_data.as_matrix(), real_data)
 
 
+@pytest.mark.parametrize('input_type', test_input_types)
+@pytest.mark.parametrize('overflow_value', [1e300, -1e300])
+def test_convert_dtype_overflow(input_type, overflow_value):
+    input_data, real_data = get_input(input_type, 100, 10, np.float64)
+
+    if input_data is None:
+        pytest.skip('cupy not installed')
+
+    real_data[42, 3] = overflow_value
+    real_data[7, 1] = np.nan
+    input_data, _ = to_input_type(input_type, real_data)
+
+    with pytest.raises(TypeError):
+        convert_dtype(input_data, to_dtype=np.float32)
+
+    # NaNs already present in the input are not overflows
+    real_data[42, 3] = 0
+    input_data, _ = to_input_type(input_type, real_data)
+    convert_dtype(input_data, to_dtype=np.float32)
+
+
+@pytest.mark.parametrize('input_type', test_input_types)
+def test_convert_dtype_out(input_type):
+    input_data, real_data = get_input(input_type, 1000, 10, np.float64,
+                                      out_dtype=np.float32)
+
+    if input_data is None:
+        pytest.skip('cupy not installed')
+
+    if input_type == 'numpy':
+        out = np.empty((1000, 10), dtype=np.float32)
+        assert convert_dtype(input_data, np.float32, out=out,
+                             n_threads=4) is out
+    else:
+        out = cuda.device_array((1000, 10), dtype=np.float32, order='F')
+        convert_dtype(input_data, np.float32, out=out)
+        out = out.copy_to_host()
+
+    np.testing.assert_equal(out, real_data)
+
+
+@pytest.mark.parametrize('dtype', test_dtypes_acceptable)
+@pytest.mark.parametrize('order', ['C', 'F'])
+def test_input_to_dev_array_arrow(dtype, order):
+    pa = pytest.importorskip('pyarrow')
+
+    real_data = np.random.rand(1000, 5).astype(dtype)
+    columns = [pa.chunked_array([real_data[:300, i], real_data[300:, i]])
+               for i in range(5)]
+    table = pa.Table.from_arrays(columns, names=[str(i) for i in range(5)])
+
+    X, X_ptr, n_rows, n_cols, X_dtype = input_to_dev_array(table,
+                                                           order=order)
+
+    assert (n_rows, n_cols) == (1000, 5)
+    assert X_dtype == dtype
+    if order == 'F':
+        assert X.is_f_contiguous()
+    else:
+        assert X.is_c_contiguous()
+    np.testing.assert_equal(X.copy_to_host(), real_data)
+
+    batch = table.to_batches()[0]
+    X = input_to_dev_array(batch, convert_to_dtype=np.float32).array
+    np.testing.assert_equal(X.copy_to_host(),
+                            real_data[:batch.num_rows].astype(np.float32))
+
+    X = input_to_dev_array(pa.array(real_data[:, 0])).array
+    np.testing.assert_equal(X.copy_to_host(), real_data[:, 0])
+
+
+def test_input_to_dev_array_arrow_nulls():
+    pa = pytest.importorskip('pyarrow')
+
+    table = pa.Table.from_arrays([pa.array([1.0, None, 3.0])], names=['a'])
+
+    with pytest.raises(ValueError):
+        input_to_dev_array(table)
+
+
+def test_audit_transfers():
+    X = np.asfortranarray(np.random.rand(100, 10))
+
+    input_to_dev_array(X)
+
+    with audit_transfers() as audit:
+        input_to_dev_array(X, order='F')
+        input_to_dev_array(X, order='C', convert_to_dtype=np.float32)
+        cuml.KMeans(n_clusters=2).fit(X)
+
+    input_to_dev_array(X)
+
+    kinds = [event.kind for event in audit.events]
+    assert kinds[0] == 'host_to_device'
+    assert audit.events[0].nbytes == X.nbytes
+    assert audit.events[0].estimator is None
+    assert 'dtype_conversion' in kinds
+
+    report = audit.by_estimator()
+    assert report['KMeans']['host_to_device']['count'] >= 1
+    assert report[None]['dtype_conversion']['nbytes'] == X.size * 4
+    assert audit.total_bytes > 0
+    assert 'KMeans' in audit.summary()
+
+
+def to_input_type(type, data):
+    if type == 'numpy':
+        return data, data
+    if type == 'numba':
+        return cuda.to_device(data), data
+    if type == 'cupy':
+        import cupy as cp
+        return cp.asarray(data), data
+    if type == 'dataframe':
+        X_df = cudf.DataFrame()
+        return X_df.from_gpu_matrix(cuda.to_device(data)), data
+
+
+@pytest.mark.parametrize('dtype', test_dtypes_acceptable)
+@pytest.mark.parametrize('input_type', test_input_types)
+@pytest.mark.parametrize('order', ['C', 'F'])
+def test_input_to_dev_array_chunks(dtype, input_type, order):
+    chunks, real_chunks = zip(*[get_input(input_type, nrows, 10, dtype)
+                                for nrows in [1, 100, 1000]])
+
+    if chunks[0] is None:
+        pytest.skip('cupy not installed')
+
+    X, X_ptr, n_rows, n_cols, dtype = \
+        input_to_dev_array(iter(chunks), order=order)
+
+    np.testing.assert_equal(X.copy_to_host(), np.vstack(real_chunks))
+    assert n_rows == 1101
+    assert n_cols == 10
+    if order == 'F':
+        assert X.is_f_contiguous()
+    else:
+        assert X.is_c_contiguous()
+
+
+@pytest.mark.parametrize('dtype', test_dtypes_acceptable)
+@pytest.mark.parametrize('order', ['C', 'F'])
+def test_input_to_dev_array_memmap(tmpdir, dtype, order):
+    real_data = np.random.rand(5000, 20).astype(dtype)
+    path = str(tmpdir.join('X.npy'))
+    np.save(path, real_data)
+
+    X_mmap = np.load(path, mmap_mode='r')
+    X = stream_to_dev_array(X_mmap, order=order, staging_bytes=4096)
+
+    np.testing.assert_equal(X.copy_to_host(), real_data)
+
+    X, X_ptr, n_rows, n_cols, dtype = \
+        input_to_dev_array(X_mmap, order=order, convert_to_dtype=np.float32)
+
+    assert dtype == np.float32
+    np.testing.assert_equal(X.copy_to_host(), real_data.astype(np.float32))
+
+
+def test_input_to_dev_array_chunks_mismatch():
+    chunks = [np.zeros((10, 5), dtype=np.float32),
+              np.zeros((10, 4), dtype=np.float32)]
+    with pytest.raises(ValueError):
+        input_to_dev_array(iter(chunks))
+
+    chunks = [np.zeros((10, 5), dtype=np.float32),
+              np.zeros((10, 5), dtype=np.float64)]
+    with pytest.raises(TypeError):
+        input_to_dev_array(iter(chunks))
+
+
+@pytest.mark.parametrize('dtype', test_dtypes_acceptable)
+@pytest.mark.parametrize('input_type', ['numpy', 'numba'])
+@pytest.mark.parametrize('num_rows', [1, 10, 8000])
+@pytest.mark.parametrize('num_cols', [1, 10, 100])
+@pytest.mark.parametrize('to_order', ['C', 'F'])
+def test_gpu_major_converter(dtype, input_type, num_rows, num_cols, to_order):
+    from_order = 'F' if to_order == 'C' else 'C'
+    real_data = np.array(np.random.rand(num_rows, num_cols), dtype=dtype,
+                         order=from_order)
+
+    if input_type == 'numpy':
+        input_data = real_data
+    else:
+        input_data = cuda.to_device(real_data)
+
+    converted = gpu_major_converter(input_data, num_rows, num_cols, dtype,
+                                    to_order=to_order)
+
+    if input_type == 'numba':
+        assert cuda.devicearray.is_cuda_ndarray(converted)
+        converted = converted.copy_to_host()
+    else:
+        assert isinstance(converted, np.ndarray)
+
+    if to_order == 'C':
+        assert converted.flags['C_CONTIGUOUS']
+    else:
+        assert converted.flags['F_CONTIGUOUS']
+
+    np.testing.assert_equal(converted, real_data)
+
+
+@pytest.mark.parametrize('dtype', test_dtypes_acceptable)
+def test_gpu_major_converter_out(dtype):
+    real_data = np.asfortranarray(np.random.rand(100, 10).astype(dtype))
+    out = cuda.device_array((100, 10), dtype=dtype, order='C')
+
+    converted = gpu_major_converter(cuda.to_device(real_data), 100, 10, dtype,
+                                    to_order='C', out=out)
+
+    assert converted is out
+    np.testing.assert_equal(out.copy_to_host(), real_data)
+
+    with pytest.raises(ValueError):
+        gpu_major_converter(cuda.to_device(real_data), 100, 10, dtype,
+                            to_order='F', out=out)
+
+
 def get_input(type, nrows, ncols, dtype, out_dtype=False):
     try:
         import cupy as cp
@@ -135,3 +357,42 @@ def get_input(type, nrows, ncols, dtype, out_dtype=False):
             return result, rand_mat.astype(out_dtype)
         else:
             return result, rand_mat
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+@pytest.mark.parametrize('input_type', ['scipy_csr', 'scipy_coo',
+                                        'cupy_csr'])
+def test_input_to_csr_matrix(dtype, input_type):
+    scipy_sparse = pytest.importorskip('scipy.sparse')
+    cp_sparse = pytest.importorskip('cupyx.scipy.sparse')
+
+    X = scipy_sparse.random(100, 40, density=0.05, format='csr',
+                            dtype=dtype, random_state=0)
+    if input_type == 'scipy_coo':
+        X_in = X.tocoo()
+    elif input_type == 'cupy_csr':
+        X_in = cp_sparse.csr_matrix(X)
+    else:
+        X_in = X
+
+    X_m, n_rows, n_cols, nnz, X_dtype = input_to_csr_matrix(X_in)
+
+    assert cp_sparse.isspmatrix_csr(X_m)
+    assert (n_rows, n_cols, nnz) == (100, 40, X.nnz)
+    assert X_dtype == dtype
+    np.testing.assert_array_equal(X_m.toarray().get(), X.toarray())
+
+    with pytest.raises(ValueError):
+        input_to_csr_matrix(X_in, check_cols=41)
+
+    X_m = input_to_csr_matrix(X_in, convert_to_dtype=np.float64).matrix
+    assert X_m.dtype == np.float64
+
+
+def test_input_to_csr_matrix_index_overflow():
+    scipy_sparse = pytest.importorskip('scipy.sparse')
+
+    X = scipy_sparse.csr_matrix((2, 2 ** 31), dtype=np.float32)
+
+    with pytest.raises(ValueError):
+        input_to_csr_matrix(X)
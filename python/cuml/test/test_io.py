@@ -0,0 +1,77 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+
+import numpy as np
+
+import cuml
+import cuml.io
+
+from cuml.utils import input_to_dev_array
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+@pytest.mark.parametrize('file_order', ['C', 'F'])
+@pytest.mark.parametrize('n_threads', [1, 4])
+def test_load_npy(tmpdir, dtype, file_order, n_threads):
+    X = np.array(np.random.rand(10007, 13), dtype=dtype, order=file_order)
+    path = str(tmpdir.join('X.npy'))
+    np.save(path, X)
+
+    reader = cuml.io.load_npy(path, n_threads=n_threads)
+    assert reader.shape == X.shape
+    assert reader.dtype == X.dtype
+    assert reader.order == file_order
+
+    slabs = list(reader.iter_chunks(100000))
+    assert all(slab.nbytes % cuml.io.array_reader.SLAB_ALIGNMENT == 0
+               for slab in slabs[:-1])
+    np.testing.assert_equal(np.vstack(slabs), X)
+
+    X_m, X_ptr, n_rows, n_cols, X_dtype = input_to_dev_array(reader,
+                                                             order='F')
+    assert X_m.is_f_contiguous()
+    assert (n_rows, n_cols) == X.shape
+    np.testing.assert_equal(X_m.copy_to_host(), X)
+
+
+def test_load_raw(tmpdir):
+    X = np.random.rand(1000, 7).astype(np.float32)
+    path = str(tmpdir.join('X.bin'))
+    X.tofile(path)
+
+    reader = cuml.io.load_raw(path, np.float32, shape=(-1, 7), n_threads=2)
+    assert reader.shape == X.shape
+
+    np.testing.assert_equal(reader.read(order='C', device=False), X)
+    np.testing.assert_equal(reader.read(order='C').copy_to_host(), X)
+
+    X_64 = reader.read(convert_to_dtype=np.float64, device=False)
+    assert X_64.dtype == np.float64
+
+    with pytest.raises(ValueError):
+        cuml.io.load_raw(path, np.float32, shape=(2000, 7))
+
+
+def test_kmeans_from_npy(tmpdir):
+    X = np.random.rand(1000, 4).astype(np.float32)
+    path = str(tmpdir.join('X.npy'))
+    np.save(path, X)
+
+    labels = cuml.KMeans(n_clusters=4).fit(X).labels_
+    labels_mmap = cuml.KMeans(n_clusters=4).fit(cuml.io.load_npy(path)).labels_
+
+    np.testing.assert_equal(labels.to_array(), labels_mmap.to_array())
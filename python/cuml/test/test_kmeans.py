@@ -17,8 +17,11 @@ import pytest
 import numpy as np
 import cuml
 from sklearn import cluster
+from sklearn.datasets import make_blobs
+from sklearn.metrics import adjusted_rand_score
 from sklearn.preprocessing import StandardScaler
-from cuml.test.utils import fit_predict, get_pattern, clusters_equal
+from cuml.test.utils import fit_predict, get_pattern, clusters_equal, \
+    np_to_cudf
 
 dataset_names = ['blobs', 'noisy_circles'] + \
                 [pytest.param(ds, marks=pytest.mark.xfail)
@@ -77,3 +80,191 @@ def test_kmeans_sklearn_comparison(name, nrows):
 
         else:
             assert clusters_equal(sk_y_pred, cu_y_pred, params['n_clusters'])
+
+
+def _inertia(X, centers):
+    distances = ((X[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+    return distances.min(axis=1).sum()
+
+
+@pytest.mark.parametrize('datatype', [np.float32, np.float64])
+def test_kmeans_n_init(datatype):
+    X, y = make_blobs(n_samples=5000, n_features=4, centers=10,
+                      cluster_std=2.0, random_state=0)
+    X = X.astype(datatype)
+
+    single = cuml.KMeans(n_clusters=10, init='random', random_state=3)
+    single.fit(X)
+    restarts = cuml.KMeans(n_clusters=10, init='random', random_state=3,
+                           n_init=5)
+    restarts.fit(X)
+
+    # The first restart is the single run, the best one is kept
+    assert restarts.inertia_ <= single.inertia_ * (1 + 1e-5)
+    centers = restarts.cluster_centers_.as_matrix()
+    np.testing.assert_allclose(restarts.inertia_, _inertia(X, centers),
+                               rtol=1e-3)
+    assert 1 <= restarts.n_iter_ <= restarts.max_iter
+
+    labels = restarts.labels_.to_array()
+    np.testing.assert_array_equal(labels,
+                                  restarts.predict(X).to_array())
+
+
+def test_kmeans_n_init_array_init():
+    X = np.random.RandomState(0).rand(100, 2).astype(np.float32)
+    kmeans = cuml.KMeans(n_clusters=2, init=X[:2], n_init=3)
+    with pytest.warns(UserWarning):
+        kmeans.fit(X)
+    assert kmeans.inertia_ > 0
+
+
+@pytest.mark.parametrize('datatype', [np.float32, np.float64])
+@pytest.mark.parametrize('algorithm', ['hamerly', 'elkan'])
+def test_kmeans_bounded_algorithms(datatype, algorithm):
+    X, y = make_blobs(n_samples=5000, n_features=4, centers=20,
+                      cluster_std=1.0, random_state=0)
+    X = X.astype(datatype)
+
+    full = cuml.KMeans(n_clusters=20, algorithm='full', random_state=0)
+    full.fit(X)
+    bounded = cuml.KMeans(n_clusters=20, algorithm=algorithm,
+                          random_state=0)
+    bounded.fit(X)
+
+    # Same initialization and same iterations, only fewer distances
+    np.testing.assert_allclose(bounded.inertia_, full.inertia_, rtol=1e-3)
+    assert full.skipped_distance_fraction_ == 0
+    assert 0 < bounded.skipped_distance_fraction_ < 1
+    np.testing.assert_array_equal(bounded.labels_.to_array(),
+                                  bounded.predict(X).to_array())
+
+    with pytest.raises(ValueError):
+        cuml.KMeans(n_clusters=20, algorithm='unknown').fit(X)
+
+
+@pytest.mark.parametrize('datatype', [np.float32, np.float64])
+def test_kmeans_transform_batched(datatype):
+    X, y = make_blobs(n_samples=3000, n_features=5, centers=12,
+                      random_state=0)
+    X = X.astype(datatype)
+    kmeans = cuml.KMeans(n_clusters=12, output_type='numpy').fit(X)
+    centers = kmeans.cluster_centers_.as_matrix()
+    expected = np.sqrt(((X[:, None, :] - centers[None, :, :]) ** 2)
+                       .sum(axis=2))
+
+    rtol = 1e-3 if datatype == np.float32 else 1e-6
+    np.testing.assert_allclose(kmeans.transform(X), expected, rtol=rtol,
+                               atol=rtol)
+
+    # Written batch by batch to a host array
+    out = np.empty((3000, 12), dtype=datatype)
+    assert kmeans.transform(X, out=out) is out
+    np.testing.assert_allclose(out, expected, rtol=rtol, atol=rtol)
+
+    distances, indices = kmeans.transform(X, n_nearest=3)
+    order = np.argsort(expected, axis=1, kind='stable')[:, :3]
+    np.testing.assert_array_equal(indices[:, 0], order[:, 0])
+    np.testing.assert_allclose(
+        distances, np.take_along_axis(expected, indices, axis=1),
+        rtol=rtol, atol=rtol)
+    assert np.all(np.diff(distances, axis=1) >= 0)
+    np.testing.assert_array_equal(indices[:, 0], kmeans.predict(X))
+
+    with pytest.raises(ValueError):
+        kmeans.transform(X, n_nearest=13)
+    with pytest.raises(ValueError):
+        kmeans.transform(X, out=np.empty((3000, 11), dtype=datatype))
+
+
+@pytest.mark.parametrize('datatype', [np.float32, np.float64])
+def test_kmeans_warm_start(datatype):
+    X, y = make_blobs(n_samples=11000, n_features=4, centers=6,
+                      random_state=0)
+    X = X.astype(datatype)
+    old, delta = X[:10000], X[10000:]
+
+    kmeans = cuml.KMeans(n_clusters=6, warm_start=True).fit(old)
+    assert kmeans.counts_.to_array().sum() == 10000
+    cold_n_iter = kmeans.n_iter_
+
+    # Refit on all the data from the previous centers
+    previous = kmeans.cluster_centers_.as_matrix()
+    kmeans.fit(X)
+    assert kmeans.n_iter_ <= cold_n_iter
+    assert _inertia(X, kmeans.cluster_centers_.as_matrix()) <= \
+        _inertia(X, previous) * (1 + 1e-5)
+    assert kmeans.counts_.to_array().sum() == 11000
+
+    # Count-weighted update with the new rows only
+    kmeans = cuml.KMeans(n_clusters=6, warm_start=True).fit(old)
+    full = cuml.KMeans(n_clusters=6).fit(X)
+    kmeans.partial_fit(delta)
+    assert kmeans.counts_.to_array().sum() == 11000
+    assert kmeans.labels_ is None
+    assert _inertia(X, kmeans.cluster_centers_.as_matrix()) <= \
+        1.05 * _inertia(X, full.cluster_centers_.as_matrix())
+
+    with pytest.raises(ValueError):
+        cuml.KMeans(n_clusters=6).fit(old).partial_fit(delta)
+
+
+@pytest.mark.parametrize('datatype', [np.float32, np.float64])
+@pytest.mark.parametrize('input_type', ['numpy', 'cudf'])
+def test_minibatch_kmeans_quality(datatype, input_type):
+    X, y = make_blobs(n_samples=20000, n_features=8, centers=5,
+                      random_state=0)
+    X = X.astype(datatype)
+    X_input = np_to_cudf(X) if input_type == 'cudf' else X
+
+    kmeans = cuml.KMeans(n_clusters=5).fit(X_input)
+    minibatch = cuml.MiniBatchKMeans(n_clusters=5, batch_size=512)
+    minibatch.fit(X_input)
+
+    centers = minibatch.cluster_centers_.as_matrix()
+    assert centers.shape == (5, 8)
+    assert _inertia(X, centers) <= \
+        1.05 * _inertia(X, kmeans.cluster_centers_.as_matrix())
+
+    labels = minibatch.predict(X).to_array()
+    assert adjusted_rand_score(y, labels) > 0.95
+    assert 0 < minibatch.n_iter_ <= minibatch.max_iter
+
+
+def test_minibatch_kmeans_partial_fit():
+    X, y = make_blobs(n_samples=10000, n_features=4, centers=4,
+                      random_state=0)
+    X = X.astype(np.float32)
+
+    minibatch = cuml.MiniBatchKMeans(n_clusters=4, batch_size=1000)
+    for chunk in np.array_split(X, 7):
+        minibatch.partial_fit(chunk)
+
+    assert minibatch.counts_.to_array().sum() == X.shape[0]
+    assert minibatch.n_steps_ == 14
+    labels = minibatch.predict(X).to_array()
+    assert adjusted_rand_score(y, labels) > 0.95
+
+    with pytest.raises(ValueError):
+        minibatch.partial_fit(np.zeros((10, 3), dtype=np.float32))
+
+
+def test_minibatch_kmeans_iterator():
+    X, y = make_blobs(n_samples=10000, n_features=4, centers=4,
+                      random_state=0)
+    X = X.astype(np.float32)
+
+    minibatch = cuml.MiniBatchKMeans(n_clusters=4, batch_size=1000)
+    minibatch.fit(iter(np.array_split(X, 4)))
+
+    assert minibatch.n_iter_ == 1
+    assert minibatch.n_steps_ == 12
+    assert minibatch.counts_.to_array().sum() == X.shape[0]
+    labels = minibatch.predict(X).to_array()
+    assert adjusted_rand_score(y, labels) > 0.95
+
+
+def test_minibatch_kmeans_small_first_batch():
+    minibatch = cuml.MiniBatchKMeans(n_clusters=8)
+    with pytest.raises(ValueError):
+        minibatch.partial_fit(np.random.rand(4, 2).astype(np.float32))
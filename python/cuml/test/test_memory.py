@@ -0,0 +1,102 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+
+import cuml.common.memory as memory
+
+from cuml.common.memory import largest_batch_size
+
+
+@pytest.mark.parametrize('n_items', [1, 7, 1000])
+@pytest.mark.parametrize('budget', [0, 10, 999, 10**6])
+def test_largest_batch_size(n_items, budget):
+    def estimate(batch_size):
+        return 100 + batch_size * 3
+
+    batch_size = largest_batch_size(estimate, n_items, budget)
+    assert 1 <= batch_size <= n_items
+    if batch_size < n_items:
+        assert estimate(batch_size + 1) > budget
+    if batch_size > 1:
+        assert estimate(batch_size) <= budget
+
+
+class _FakeHandle(object):
+    def __init__(self):
+        self.n_failed = 0
+
+    def getMemoryStats(self):
+        return {'n_failed': self.n_failed}
+
+    def sync(self):
+        pass
+
+
+@pytest.mark.parametrize('fails_above', [0, 3, 100])
+def test_retry_on_out_of_memory(monkeypatch, fails_above):
+    monkeypatch.setattr(memory, '_reset_device_error', lambda: None)
+    releases = []
+    monkeypatch.setattr(memory, '_release_pool_cache',
+                        lambda: releases.append(True))
+    handle = _FakeHandle()
+    calls = []
+
+    def run(batch_size):
+        calls.append(batch_size)
+        if batch_size > fails_above:
+            handle.n_failed += 1
+            raise RuntimeError("exception occured! file=allocator.hpp")
+        return batch_size * 2
+
+    if fails_above == 0:
+        with pytest.raises(RuntimeError):
+            memory.retry_on_out_of_memory(run, 64, handle)
+        assert calls == [64, 32, 16, 8, 4, 2, 1]
+    elif fails_above < 64:
+        with pytest.warns(UserWarning, match="succeeded with 2"):
+            result, batch_size = memory.retry_on_out_of_memory(run, 64,
+                                                               handle)
+        assert (result, batch_size) == (4, 2)
+        assert calls == [64, 32, 16, 8, 4, 2]
+    else:
+        result, batch_size = memory.retry_on_out_of_memory(run, 64, handle)
+        assert (result, batch_size) == (128, 64)
+        assert calls == [64]
+    # The pooled free buffers are released before each retry
+    assert len(releases) == len(calls) - 1
+
+
+def test_get_memory_budget(monkeypatch):
+    monkeypatch.setattr(memory, '_free_device_bytes', lambda: 1000)
+    monkeypatch.setattr(memory, '_pool_cached_bytes', lambda: 600)
+    assert memory.get_memory_budget(fraction=0.5) == 800
+
+
+def test_retry_on_out_of_memory_errors(monkeypatch):
+    handle = _FakeHandle()
+
+    def out_of_memory(batch_size):
+        raise MemoryError("std::bad_alloc: out of memory")
+
+    def value_error(batch_size):
+        raise ValueError("Expected 2 columns")
+
+    with pytest.raises(ValueError):
+        memory.retry_on_out_of_memory(value_error, 64, handle)
+
+    monkeypatch.setattr(memory, '_retry_on_out_of_memory', False)
+    with pytest.raises(MemoryError):
+        memory.retry_on_out_of_memory(out_of_memory, 64, handle)
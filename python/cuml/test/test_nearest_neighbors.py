@@ -112,3 +112,12 @@ def test_nn_downcast_fails(input_type, nrows, n_feats):
 
     with pytest.raises(Exception):
         knn_cu.fit(X, should_downcast=True)
+
+
+def test_knn_estimate_memory():
+    knn = cuKNN(n_neighbors=4)
+    whole = knn.estimate_memory(1000, 10)
+    batched = knn.estimate_memory(1000, 10, batch_size=100)
+    # distances of the queries to the index, and the results
+    assert whole == 1000 * 1000 * 4 + 1000 * 4 * (8 + 4)
+    assert batched < whole
@@ -0,0 +1,94 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+
+import cudf
+import cupy as cp
+import numpy as np
+
+from numba import cuda
+from sklearn.datasets import make_blobs
+
+import cuml
+
+
+output_types = ['cudf', 'numpy', 'cupy', 'numba']
+
+
+def check_type(result, output_type):
+    if output_type == 'cudf':
+        assert isinstance(result, (cudf.DataFrame, cudf.Series))
+    elif output_type == 'numpy':
+        assert isinstance(result, np.ndarray)
+    elif output_type == 'cupy':
+        assert isinstance(result, cp.ndarray)
+    else:
+        assert cuda.devicearray.is_cuda_ndarray(result)
+
+
+def get_data():
+    X, _ = make_blobs(n_samples=200, n_features=5, centers=3,
+                      random_state=0)
+    return X.astype(np.float32)
+
+
+@pytest.mark.parametrize('output_type', output_types)
+def test_estimator_output_type(output_type):
+    X = get_data()
+
+    kmeans = cuml.KMeans(n_clusters=3, output_type=output_type).fit(X)
+    check_type(kmeans.predict(X), output_type)
+    check_type(kmeans.transform(X), output_type)
+
+    pca = cuml.PCA(n_components=2, output_type=output_type)
+    check_type(pca.fit_transform(X), output_type)
+    check_type(pca.transform(X), output_type)
+
+
+@pytest.mark.parametrize('output_type', output_types)
+def test_global_output_type(output_type):
+    X = get_data()
+    kmeans = cuml.KMeans(n_clusters=3).fit(X)
+
+    # legacy default of KMeans.predict
+    check_type(kmeans.predict(X), 'cudf')
+
+    with cuml.using_output_type(output_type):
+        check_type(kmeans.predict(X), output_type)
+
+        # the estimator setting has precedence over the global one
+        kmeans.output_type = 'numpy'
+        check_type(kmeans.predict(X), 'numpy')
+        kmeans.output_type = None
+
+    with cuml.using_output_type('input'):
+        check_type(kmeans.predict(X), 'numpy')
+        check_type(kmeans.predict(cuda.to_device(X)), 'numba')
+
+    check_type(kmeans.predict(X), 'cudf')
+
+
+def test_output_type_values():
+    X = get_data()
+    kmeans = cuml.KMeans(n_clusters=3).fit(X)
+
+    distances = kmeans.transform(X).as_matrix()
+
+    with cuml.using_output_type('numpy'):
+        np.testing.assert_equal(kmeans.transform(X), distances)
+
+    with pytest.raises(ValueError):
+        cuml.set_global_output_type('pandas')
@@ -16,6 +16,7 @@
 import pytest
 import cuml
 from cuml.test.utils import array_equal, np_to_cudf
+from cuml.utils import serialization
 import cudf
 import numpy as np
 from sklearn.datasets import make_regression
@@ -39,8 +40,7 @@ cluster_models = dict(
 
 decomposition_models = dict(
     PCA=cuml.PCA(),
-    TruncatedSVD=cuml.TruncatedSVD(),
-    UMAP=cuml.UMAP()
+    TruncatedSVD=cuml.TruncatedSVD()
 )
 
 neighbor_models = dict(
@@ -151,7 +151,6 @@ def test_cluster_pickle(tmpdir, datatype, input_type, model, nrows, ncols):
 @pytest.mark.parametrize('model', decomposition_models.values())
 @pytest.mark.parametrize('nrows', [unit_param(20)])
 @pytest.mark.parametrize('ncols', [unit_param(3)])
-@pytest.mark.xfail
 def test_decomposition_pickle(tmpdir, datatype, input_type, model, nrows,
                               ncols):
     X_train, _, _ = make_dataset(datatype, input_type, nrows, ncols)
@@ -165,13 +164,31 @@ def test_decomposition_pickle(tmpdir, datatype, input_type, model, nrows,
     assert array_equal(cu_before_pickle_transform, cu_after_pickle_transform)
 
 
+@pytest.mark.parametrize('input_type', ['dataframe', 'ndarray'])
+@pytest.mark.parametrize('nrows', [unit_param(50)])
+@pytest.mark.parametrize('ncols', [unit_param(3)])
+def test_umap_pickle(tmpdir, input_type, nrows, ncols):
+    X_train, _, X_test = make_dataset(np.float32, input_type, nrows, ncols)
+
+    model = cuml.UMAP(n_neighbors=5)
+    cu_before_pickle_embedding = model.fit_transform(X_train)
+
+    cu_after_pickle_model = pickle_save_load(tmpdir, model)
+
+    # transform is stochastic, so compare the fitted state and check that
+    # the unpickled model can embed new data
+    assert array_equal(cu_before_pickle_embedding,
+                       cu_after_pickle_model.arr_embed.copy_to_host())
+    cu_after_pickle_transform = cu_after_pickle_model.transform(X_test)
+    assert cu_after_pickle_transform.shape == (X_test.shape[0], 2)
+
+
 @pytest.mark.parametrize('datatype', [np.float32])
 @pytest.mark.parametrize('input_type', ['dataframe'])
 @pytest.mark.parametrize('model', neighbor_models.values())
 @pytest.mark.parametrize('nrows', [unit_param(20)])
 @pytest.mark.parametrize('ncols', [unit_param(3)])
 @pytest.mark.parametrize('k', [unit_param(3)])
-@pytest.mark.xfail
 def test_neighbors_pickle(tmpdir, datatype, input_type, model, nrows,
                           ncols, k):
     X_train, _, X_test = make_dataset(datatype, input_type, nrows, ncols)
@@ -185,3 +202,71 @@ def test_neighbors_pickle(tmpdir, datatype, input_type, model, nrows,
 
     assert array_equal(D_before, D_after)
     assert array_equal(I_before, I_after)
+
+
+@pytest.mark.skipif(serialization.PICKLE_PROTOCOL < 5,
+                    reason="pickle protocol 5 is not available")
+@pytest.mark.parametrize('datatype', [np.float32, np.float64])
+def test_out_of_band_buffers(datatype):
+    X_train, _, X_test = make_dataset(datatype, 'ndarray', 1000, 20)
+
+    model = cuml.KMeans(n_clusters=8, random_state=0)
+    model.fit(X_train)
+    cu_before_pickle_predict = model.predict(X_test).to_array()
+
+    data, buffers = serialization.dumps(model)
+    assert len(buffers) > 0
+    centers_nbytes = 8 * 20 * np.dtype(datatype).itemsize
+    assert sum(buffer.raw().nbytes for buffer in buffers) >= centers_nbytes
+    assert len(data) < centers_nbytes
+
+    cu_after_pickle_model = serialization.loads(
+        data, [bytes(buffer.raw()) for buffer in buffers])
+    cu_after_pickle_predict = cu_after_pickle_model.predict(X_test).to_array()
+
+    assert array_equal(cu_before_pickle_predict, cu_after_pickle_predict)
+
+
+@pytest.mark.parametrize('mmap_mode', [True, False])
+@pytest.mark.parametrize('model', [cuml.TruncatedSVD(n_components=2),
+                                   cuml.NearestNeighbors()])
+def test_dump_load(tmpdir, mmap_mode, model):
+    X_train, _, X_test = make_dataset(np.float32, 'ndarray', 20, 3)
+    model.fit(X_train)
+
+    path = str(tmpdir.join('cu_model.cuml'))
+    serialization.dump(model, path)
+    cu_after_pickle_model = serialization.load(path, mmap_mode=mmap_mode)
+
+    if isinstance(model, cuml.NearestNeighbors):
+        D_before, I_before = model.kneighbors(X_test, k=3)
+        D_after, I_after = cu_after_pickle_model.kneighbors(X_test, k=3)
+        assert array_equal(D_before, D_after)
+        assert array_equal(I_before, I_after)
+    else:
+        assert array_equal(model.transform(X_test),
+                           cu_after_pickle_model.transform(X_test))
+
+
+def test_neighbors_pickle_host_index(tmpdir):
+    X_train, _, X_test = make_dataset(np.float32, 'ndarray', 20, 3)
+    model = cuml.NearestNeighbors()
+    model.fit(X_train)
+    D_before, I_before = model.kneighbors(X_test, k=3)
+
+    # The index is copied back from the devices, not kept on the host
+    X_train[:] = 0
+    cu_after_pickle_model = pickle_save_load(tmpdir, model)
+
+    D_after, I_after = cu_after_pickle_model.kneighbors(X_test, k=3)
+    assert array_equal(D_before, D_after)
+    assert array_equal(I_before, I_after)
+
+
+def test_load_rejects_other_files(tmpdir):
+    path = str(tmpdir.join('cu_model.pickle'))
+    with open(path, 'wb') as pf:
+        pickle.dump(cuml.KMeans(), pf)
+
+    with pytest.raises(ValueError):
+        serialization.load(path)
@@ -0,0 +1,79 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+
+import numpy as np
+
+import cuml
+from sklearn.datasets.samples_generator import make_blobs
+
+
+def _blobs():
+    X, _ = make_blobs(n_samples=500, n_features=10, centers=5,
+                      random_state=0)
+    return X.astype(np.float32)
+
+
+def test_profile_stages(tmpdir):
+    X = _blobs()
+
+    with cuml.profile() as profile:
+        cuml.UMAP(n_neighbors=10, n_epochs=50).fit(X)
+        cuml.DBSCAN(eps=1.0, min_samples=5).fit(X)
+
+    report = profile.by_stage()
+    for stage in ['knn_graph', 'fuzzy_simpl_set', 'init_embed', 'optimize']:
+        assert report['UMAP'][stage]['count'] == 1
+        assert report['UMAP'][stage]['device_time'] >= 0
+    for stage in ['vertexdeg', 'adjgraph', 'labeling', 'relabel']:
+        assert report['DBSCAN'][stage]['count'] >= 1
+    assert report['UMAP']['fit']['device_time'] is None
+    assert 'knn_graph' in profile.summary()
+
+    # The C++ stages fall within the span of the estimator method
+    fit = [event for event in profile.events
+           if event.algorithm == 'UMAP' and event.stage == 'fit'][0]
+    for event in profile.events:
+        if event.algorithm == 'UMAP' and event.stage != 'fit':
+            assert fit.start <= event.start
+            assert event.start + event.wall_time <= \
+                fit.start + fit.wall_time + 1e-3
+
+    path = str(tmpdir.join('trace.json'))
+    profile.to_chrome_trace(path)
+    with open(path) as f:
+        trace = json.load(f)
+    names = set(event['name'] for event in trace['traceEvents'])
+    assert {'knn_graph', 'vertexdeg', 'fit'} <= names
+    assert all(event['ph'] == 'X' and event['dur'] >= 0
+               for event in trace['traceEvents'])
+
+
+def test_profile_inactive():
+    X = _blobs()
+
+    cuml.DBSCAN(eps=1.0, min_samples=5).fit(X)
+    with cuml.profile() as outer:
+        with cuml.profile() as inner:
+            cuml.DBSCAN(eps=1.0, min_samples=5).fit(X)
+        cuml.KMeans(n_clusters=5).fit(X)
+    cuml.DBSCAN(eps=1.0, min_samples=5).fit(X)
+
+    assert inner.by_stage()['DBSCAN']['fit']['count'] == 1
+    assert 'KMeans' not in inner.by_stage()
+    assert outer.by_stage()['DBSCAN']['fit']['count'] == 1
+    assert outer.by_stage()['KMeans']['fit']['count'] == 1
+    assert outer.by_stage()['DBSCAN']['relabel']['count'] == 1
@@ -108,3 +108,25 @@ def test_johnson_lindenstrauss_min_dim():
         cuml_value = cuml_johnson_lindenstrauss_min_dim(n_samples, eps)
         sklearn_value = sklearn_johnson_lindenstrauss_min_dim(n_samples, eps)
         assert cuml_value == sklearn_value
+
+
+@pytest.mark.parametrize('datatype', [np.float32, np.float64])
+@pytest.mark.parametrize('method', ['gaussian', 'sparse'])
+def test_random_projection_sparse_input(datatype, method):
+    scipy_sparse = pytest.importorskip('scipy.sparse')
+
+    X = scipy_sparse.random(200, 1000, density=0.01, format='csr',
+                            dtype=datatype, random_state=0)
+
+    if method == 'gaussian':
+        model = GaussianRandomProjection(n_components=50, random_state=42)
+    else:
+        model = SparseRandomProjection(n_components=50, random_state=42)
+
+    model.fit(X)
+    X_new = model.transform(X)
+    X_dense_new = model.transform(X.toarray())
+
+    assert isinstance(X_new, np.ndarray)
+    assert X_new.shape == (200, 50)
+    np.testing.assert_allclose(X_new, X_dense_new, rtol=1e-3, atol=1e-3)
@@ -74,3 +74,33 @@ def test_svd(datatype, lrate, input_type, penalty,
     cu_sgd.fit(X_train, y_train)
     cu_pred = cu_sgd.predict(X_test).to_array()
     print("cuML predictions : ", cu_pred)
+
+
+@pytest.mark.parametrize('datatype', [np.float32, np.float64])
+@pytest.mark.parametrize('penalty', ['none', 'l1', 'l2', 'elasticnet'])
+@pytest.mark.parametrize('loss', ['hinge', 'log', 'squared_loss'])
+def test_sgd_sparse_input(datatype, penalty, loss):
+    scipy_sparse = pytest.importorskip('scipy.sparse')
+
+    X_train = np.array([[-1, 0], [-2, 0], [1, 1], [2, 1]], dtype=datatype)
+    y_train = np.array([0, 0, 1, 1], dtype=datatype)
+    X_test = np.array([[3.0, 1.0], [-3.0, 0.0]]).astype(datatype)
+
+    params = dict(learning_rate='constant', eta0=0.005, epochs=2000,
+                  fit_intercept=True, batch_size=4, shuffle=False, tol=0.0,
+                  penalty=penalty, alpha=0.01, l1_ratio=0.5, loss=loss)
+
+    dense_sgd = cumlSGD(**params).fit(X_train, y_train)
+    sparse_sgd = cumlSGD(**params).fit(scipy_sparse.csr_matrix(X_train),
+                                       y_train)
+
+    np.testing.assert_allclose(sparse_sgd.coef_.to_array(),
+                               dense_sgd.coef_.to_array(),
+                               rtol=1e-2, atol=1e-3)
+    np.testing.assert_allclose(sparse_sgd.intercept_,
+                               dense_sgd.intercept_, rtol=1e-2, atol=1e-3)
+
+    sparse_pred = sparse_sgd.predictClass(scipy_sparse.csr_matrix(X_test))
+    dense_pred = dense_sgd.predictClass(X_test)
+    np.testing.assert_array_equal(sparse_pred.to_array(),
+                                  dense_pred.to_array())
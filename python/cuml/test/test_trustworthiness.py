@@ -56,3 +56,15 @@ def test_trustworthiness(input_type, n_samples, n_features, n_components):
     assert (sk_score * (1 - eps) <= cu_score and
             cu_score <= sk_score * (1 + eps))
     # assert cu_score == sk_score ideally
+
+
+@pytest.mark.parametrize('batch_size', [1, 7, 512])
+def test_trustworthiness_batch_size(batch_size):
+    X, y = make_blobs(n_samples=100, centers=40, n_features=10,
+                      random_state=0)
+    X = X.astype(np.float32)
+    X_embedded = X[:, :2].copy()
+
+    score = cuml_trustworthiness(X, X_embedded)
+    assert score == cuml_trustworthiness(X, X_embedded,
+                                         batch_size=batch_size)
@@ -169,3 +169,26 @@ def test_tsvd_inverse_transform(datatype, input_type,
     cutsvd.handle.sync()
 
     assert array_equal(input_gdf, X_cudf, 0.4, with_sign=True)
+
+
+@pytest.mark.parametrize('datatype', [np.float32, np.float64])
+@pytest.mark.parametrize('input_type', ['scipy', 'cupy'])
+def test_tsvd_fit_transform_sparse(datatype, input_type):
+    scipy_sparse = pytest.importorskip('scipy.sparse')
+    cp_sparse = pytest.importorskip('cupyx.scipy.sparse')
+
+    X = scipy_sparse.random(500, 60, density=0.02, format='csr',
+                            dtype=datatype, random_state=0)
+
+    sktsvd = skTSVD(n_components=2, algorithm='arpack')
+    Xsktsvd = sktsvd.fit_transform(X)
+
+    X_in = cp_sparse.csr_matrix(X) if input_type == 'cupy' else X
+    cutsvd = cuTSVD(n_components=2, output_type='numpy')
+    Xcutsvd = cutsvd.fit_transform(X_in)
+
+    assert array_equal(Xcutsvd, Xsktsvd, 1e-3, with_sign=False)
+    assert array_equal(cutsvd.singular_values_, sktsvd.singular_values_,
+                       1e-3, with_sign=True)
+    assert array_equal(cutsvd.transform(X_in), Xcutsvd, 1e-3,
+                       with_sign=True)
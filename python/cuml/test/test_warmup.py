@@ -0,0 +1,56 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import csv
+
+import pytest
+
+from cuml import benchmark
+from cuml.common.warmup import _estimators, warmup
+
+
+def test_warmup_first_call_time(tmpdir):
+    # Smoke test of the benchmark of the first calls, the times themselves
+    # depend on the machine
+    results = benchmark.first_call_time(
+        ['KMeans'], n_rows=[1000], n_cols=[10], dtypes=['float32'],
+        n_reps=1, cache_dir=str(tmpdir.join('kernels')))
+
+    assert len(results) == 1
+    result = results[0]
+    assert result['method'] == 'first_call' and result['error'] is None
+    assert result['cold'] > 0 and result['warm_min'] > 0
+
+    csv_path = str(tmpdir.join('results.csv'))
+    benchmark.write_csv(results, csv_path)
+    with open(csv_path) as f:
+        rows = list(csv.DictReader(f))
+    assert float(rows[0]['cold']) == result['cold']
+
+
+def test_warmup_timings():
+    timings = warmup(estimators=['LinearRegression', 'DBSCAN'])
+    assert set(timings) == {'handle', 'LinearRegression', 'DBSCAN'}
+    assert all(timing >= 0 for timing in timings.values())
+
+
+def test_warmup_defaults():
+    timings = warmup()
+    assert set(timings) == {'handle'} | set(_estimators)
+
+
+def test_warmup_unknown_estimator():
+    with pytest.raises(ValueError):
+        warmup(estimators=['KalmanFilter'])
@@ -16,5 +16,9 @@
 
 from cuml.utils.pointer_utils import device_of_gpu_matrix
 from cuml.utils.numba_utils import row_matrix, zeros
+from cuml.utils.device_pool import DevicePool, get_default_pool
 from cuml.utils.input_utils import get_cudf_column_ptr, get_dev_array_ptr, \
-    input_to_dev_array
+    input_to_dev_array, input_to_csr_matrix, is_sparse_input
+from cuml.utils.transfer_audit import audit_transfers
+from cuml.utils.output_utils import set_global_output_type, \
+    get_global_output_type, using_output_type
@@ -0,0 +1,187 @@
+#
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+import weakref
+
+import numpy as np
+
+from numba import cuda
+from numba.cuda.cudadrv.driver import device_memset
+from librmm_cffi import librmm as rmm
+
+
+# Bytes of free buffers a pool keeps for reuse by default, buffers released
+# above it are freed
+DEFAULT_MAX_CACHED_BYTES = 1 << 30
+
+# Smallest bucket, in bytes. Buffers are rounded up to a power of two, or
+# above _FINE_BUCKET_BYTES to the next multiple of an eighth of it, so that
+# large buffers waste at most 12.5% of their size.
+_MIN_BUCKET_BYTES = 512
+_FINE_BUCKET_BYTES = 1 << 20
+_FINE_BUCKET_BITS = 3
+
+
+def _bucket_size(nbytes):
+    nbytes = int(nbytes)
+    bucket = max(_MIN_BUCKET_BYTES, 1 << (nbytes - 1).bit_length())
+    if bucket > _FINE_BUCKET_BYTES:
+        step = bucket >> _FINE_BUCKET_BITS
+        bucket = -(-nbytes // step) * step
+    return bucket
+
+
+def _strides(shape, itemsize, order):
+    strides = []
+    stride = itemsize
+    dims = shape if order == 'F' else reversed(shape)
+    for dim in dims:
+        strides.append(stride)
+        stride *= dim
+    return tuple(strides) if order == 'F' else tuple(reversed(strides))
+
+
+class DevicePool(object):
+    """
+    Pool of device buffers bucketed by size, so that arrays of the same size
+    allocated over and over, like the outputs of repeated `predict` calls on
+    batches of the same shape, reuse the same device memory.
+
+    Each array returned by `empty` or `zeros` is a view of a pooled buffer
+    of the next power of two bytes, or above 1 MiB of the next multiple of
+    an eighth of that power of two. The buffer goes back to the pool when
+    `release` is called on the array, or else once the array and all the
+    arrays and cuDF objects viewing its memory are garbage collected.
+
+    Parameters
+    ----------
+    max_cached_bytes : int (default = 1 GiB)
+        Bytes of free buffers kept for reuse.
+    """
+
+    def __init__(self, max_cached_bytes=DEFAULT_MAX_CACHED_BYTES):
+        self.max_cached_bytes = max_cached_bytes
+        self._free = {}
+        self._finalizers = {}
+        # Reentrant, since a garbage collection run while it is held may
+        # recycle buffers
+        self._lock = threading.RLock()
+        self._stats = {'n_allocations': 0, 'n_reused': 0,
+                       'cached_bytes': 0, 'in_use_bytes': 0}
+
+    def _acquire(self, key, bucket):
+        with self._lock:
+            buffers = self._free.get(key)
+            if buffers:
+                self._stats['n_reused'] += 1
+                self._stats['cached_bytes'] -= bucket
+                self._stats['in_use_bytes'] += bucket
+                return buffers.pop()
+            self._stats['n_allocations'] += 1
+            self._stats['in_use_bytes'] += bucket
+        return rmm.device_array(bucket, dtype=np.uint8)
+
+    def _recycle(self, pointer_id, key, bucket, buffer):
+        with self._lock:
+            self._finalizers.pop(pointer_id, None)
+            self._stats['in_use_bytes'] -= bucket
+            if self._stats['cached_bytes'] + bucket <= \
+                    self.max_cached_bytes:
+                self._free.setdefault(key, []).append(buffer)
+                self._stats['cached_bytes'] += bucket
+
+    def empty(self, shape, dtype, order='F'):
+        """
+        Returns an uninitialized device array from the pool.
+        """
+        if not isinstance(shape, tuple):
+            shape = (shape,)
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        if nbytes == 0:
+            return rmm.device_array(shape, dtype=dtype, order=order)
+
+        bucket = _bucket_size(nbytes)
+        # Buffers are only reused on the device they were allocated on
+        key = (cuda.get_current_device().id, bucket)
+        buffer = self._acquire(key, bucket)
+        # A pointer of its own for each array, whose collection returns the
+        # buffer to the pool. Reshapes and slices of the array keep it alive.
+        gpu_data = buffer.gpu_data.view(0, nbytes)
+        finalizer = weakref.finalize(gpu_data, self._recycle, id(gpu_data),
+                                     key, bucket, buffer)
+        finalizer.atexit = False
+        with self._lock:
+            self._finalizers[id(gpu_data)] = finalizer
+
+        return cuda.devicearray.DeviceNDArray(
+            shape, _strides(shape, dtype.itemsize, order), dtype,
+            gpu_data=gpu_data)
+
+    def zeros(self, shape, dtype, order='F'):
+        """
+        Returns a device array of zeros from the pool, cleared with a memset.
+        """
+        out = self.empty(shape, dtype, order=order)
+        if out.size > 0:
+            device_memset(out, 0, out.size * out.dtype.itemsize)
+        return out
+
+    def release(self, array):
+        """
+        Returns the buffer of `array`, an array from `empty` or `zeros`, to
+        the pool right away. Neither the array nor anything viewing its
+        memory may be used afterwards.
+        """
+        with self._lock:
+            finalizer = self._finalizers.get(id(array.gpu_data))
+        if finalizer is None:
+            raise ValueError("Expected an array allocated by the pool.")
+        finalizer()
+
+    def clear(self):
+        """
+        Frees the buffers kept for reuse.
+        """
+        with self._lock:
+            self._free = {}
+            self._stats['cached_bytes'] = 0
+
+    def stats(self):
+        """
+        Returns a dict with the number of buffers allocated
+        ('n_allocations') and reused ('n_reused') so far, and the bytes of
+        the buffers in the pool ('cached_bytes') and in use
+        ('in_use_bytes').
+        """
+        with self._lock:
+            return dict(self._stats)
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool():
+    """
+    Returns the pool used by `cuml.utils.zeros` and the estimators.
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = DevicePool()
+        return _default_pool
@@ -15,17 +15,37 @@
 #
 
 import cuml.utils.numba_utils
+import cuml.utils.transfer_audit as transfer_audit
+from cuml.utils.device_pool import get_default_pool
 
 import cudf
 import cupy as cp
+import cupyx.scipy.sparse as cp_sparse
 import numpy as np
+import os
 import warnings
 
 from collections import namedtuple
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from numba import cuda
 
 from librmm_cffi import librmm as rmm
 
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import scipy.sparse as scipy_sparse
+except ImportError:
+    scipy_sparse = None
+
+# Size in bytes of each of the two pinned host buffers used to stage host
+# chunks in `stream_to_dev_array`
+STREAMING_STAGING_BYTES = 1 << 26
+
 
 def get_dev_array_ptr(ary):
     """
@@ -75,6 +95,14 @@ def input_to_dev_array(X, order='F', deepcopy=False,
     * cuda array interface compliant array (like Cupy) - returns a
         reference unless deepcopy=True
     * numba device array - returns a reference unless deepcopy=True
+    * Numpy memmap (like `np.load(path, mmap_mode='r')`) - copied to the
+        device in slabs through pinned staging buffers, so the file is never
+        fully materialized in host memory
+    * iterator or generator of chunks of any of the formats above - the
+        chunks are stacked along the rows into a single new device array
+    * pyarrow Table, RecordBatch, Array or ChunkedArray - the column buffers
+        are copied straight into a new device array, without host copies
+        unless a dtype conversion is needed
 
     Returns: namedtuple('dev_array', 'array pointer n_rows n_cols dtype')
 
@@ -84,19 +112,45 @@ def input_to_dev_array(X, order='F', deepcopy=False,
     """
 
     if convert_to_dtype:
-        X = convert_dtype(X, to_dtype=convert_to_dtype)
+        if is_arrow_input(X):
+            X = arrow_to_dev_array(X, order=order,
+                                   convert_to_dtype=convert_to_dtype)
+        elif is_streaming_input(X):
+            X = stream_to_dev_array(X, order=order,
+                                    convert_to_dtype=convert_to_dtype)
+        elif isinstance(X, cudf.DataFrame) and order == 'F':
+            # Cast the columns straight into the column major matrix
+            X = convert_dtype(X, to_dtype=convert_to_dtype,
+                              out=rmm.device_array((len(X), len(X.columns)),
+                                                   dtype=convert_to_dtype,
+                                                   order='F'))
+        else:
+            X = convert_dtype(X, to_dtype=convert_to_dtype)
         check_dtype = False
 
+    elif is_arrow_input(X):
+        X = arrow_to_dev_array(X, order=order)
+
+    elif is_streaming_input(X):
+        X = stream_to_dev_array(X, order=order)
+
     if isinstance(X, cudf.DataFrame):
         dtype = np.dtype(X[X.columns[0]]._column.dtype)
         if order == 'F':
-            X_m = X.as_gpu_matrix(order='F')
+            with transfer_audit.record('device_copy',
+                                       len(X) * len(X.columns) *
+                                       dtype.itemsize,
+                                       source=X, detail='DataFrame->F'):
+                X_m = X.as_gpu_matrix(order='F')
         elif order == 'C':
             X_m = cuml.utils.numba_utils.row_matrix(X)
 
     elif (isinstance(X, cudf.Series)):
         if deepcopy:
-            X_m = X.to_gpu_array()
+            with transfer_audit.record('device_copy',
+                                       len(X) * np.dtype(X.dtype).itemsize,
+                                       source=X, detail='Series'):
+                X_m = X.to_gpu_array()
         else:
             if X.null_count == 0:
                 X_m = X._column._data.mem
@@ -105,21 +159,32 @@ def input_to_dev_array(X, order='F', deepcopy=False,
 
     elif isinstance(X, np.ndarray):
         dtype = X.dtype
-        X_m = rmm.to_device(np.array(X, order=order, copy=False))
+        with transfer_audit.record('host_to_device', X.nbytes, source=X):
+            host = np.array(X, order=order, copy=False)
+            if order in ['C', 'F']:
+                # Same shaped inputs, e.g. batches sent to predict, reuse
+                # the device memory of the previous ones
+                X_m = get_default_pool().empty(host.shape, host.dtype,
+                                               order=order)
+                X_m.copy_to_device(host)
+            else:
+                X_m = rmm.to_device(host)
 
     elif cuda.is_cuda_array(X):
         # Use cuda array interface to create a device array by reference
         X_m = cuda.as_cuda_array(X)
 
         if deepcopy:
-            out_dev_array = rmm.device_array_like(X_m)
-            out_dev_array.copy_to_device(X_m)
+            with transfer_audit.record('device_copy', X_m.nbytes, source=X):
+                out_dev_array = rmm.device_array_like(X_m)
+                out_dev_array.copy_to_device(X_m)
             X_m = out_dev_array
 
     elif cuda.devicearray.is_cuda_ndarray(X):
         if deepcopy:
-            out_dev_array = rmm.device_array_like(X)
-            out_dev_array.copy_to_device(X)
+            with transfer_audit.record('device_copy', X.nbytes, source=X):
+                out_dev_array = rmm.device_array_like(X)
+                out_dev_array.copy_to_device(X)
             X_m = out_dev_array
         else:
             X_m = X
@@ -162,8 +227,9 @@ def input_to_dev_array(X, order='F', deepcopy=False,
             warnings.warn("Expected " + order_to_str(order) + " major order, "
                           "but got the opposite. Converting data, this will "
                           "result in additional memory utilization.")
-            cuml.utils.numba_utils.gpu_major_converter(X_m, n_rows, n_cols,
-                                                       dtype, to_order=order)
+            X_m = cuml.utils.numba_utils.gpu_major_converter(X_m, n_rows,
+                                                             n_cols, dtype,
+                                                             to_order=order)
 
     X_ptr = get_dev_array_ptr(X_m)
 
@@ -173,48 +239,583 @@ def input_to_dev_array(X, order='F', deepcopy=False,
                   dtype=dtype)
 
 
-def convert_dtype(X, to_dtype=np.float32):
+def is_arrow_input(X):
+    """
+    Returns True if X is a pyarrow Table, RecordBatch, Array or ChunkedArray.
+    """
+    return pa is not None and \
+        isinstance(X, (pa.Table, pa.RecordBatch, pa.Array, pa.ChunkedArray))
+
+
+def arrow_to_dev_array(X, order='F', convert_to_dtype=False):
+    """
+    Copy a pyarrow Table or RecordBatch into a new (n_rows, n_cols) device
+    array, or a pyarrow Array or ChunkedArray into a new 1D device array.
+
+    Every column chunk is sent to the device directly from its Arrow data
+    buffer into its slice of the column major output. For `order='C'` the
+    output is then converted on the device in a single pass. Columns of
+    different numeric types are promoted to a common dtype, or converted to
+    `convert_to_dtype` if it is set, chunk by chunk.
+
+    Columns with nulls are rejected with a ValueError.
+    """
+    if isinstance(X, (pa.Table, pa.RecordBatch)):
+        columns = list(X.columns)
+        n_rows = X.num_rows
+        shape = (n_rows, len(columns))
+    else:
+        columns = [X]
+        n_rows = len(X)
+        shape = (n_rows,)
+
+    if len(columns) == 0:
+        raise ValueError("Received an Arrow table without columns.")
+
+    for column in columns:
+        if column.null_count > 0:
+            raise ValueError("Error: Arrow column has missing/null values")
+        if not (pa.types.is_integer(column.type) or
+                pa.types.is_floating(column.type)):
+            raise TypeError("Arrow columns of type " + str(column.type) +
+                            " are not supported, only numeric columns are.")
+
+    if convert_to_dtype:
+        dtype = np.dtype(convert_to_dtype)
+    else:
+        dtype = np.result_type(*[np.dtype(column.type.to_pandas_dtype())
+                                 for column in columns])
+
+    X_m = rmm.device_array(shape, dtype=dtype, order='F')
+
+    with transfer_audit.record('host_to_device', X_m.nbytes, source=X):
+        for idx, column in enumerate(columns):
+            if isinstance(column, pa.ChunkedArray):
+                chunks = column.chunks
+            else:
+                chunks = [column]
+
+            offset = 0
+            for chunk in chunks:
+                if len(chunk) == 0:
+                    continue
+                host_chunk = _arrow_chunk_to_numpy(chunk)
+                if host_chunk.dtype != dtype:
+                    host_chunk = convert_dtype(host_chunk, to_dtype=dtype)
+
+                if len(shape) > 1:
+                    target = X_m[offset:offset + len(chunk), idx]
+                else:
+                    target = X_m[offset:offset + len(chunk)]
+                target.copy_to_device(host_chunk)
+                offset += len(chunk)
+
+    if order == 'C' and len(shape) > 1 and shape[1] > 1:
+        X_m = cuml.utils.numba_utils.gpu_major_converter(
+            X_m, shape[0], shape[1], dtype, to_order='C')
+
+    return X_m
+
+
+def _arrow_chunk_to_numpy(chunk):
+    """
+    Zero-copy NumPy view on the data buffer of a null free, numeric Arrow
+    array.
+    """
+    dtype = np.dtype(chunk.type.to_pandas_dtype())
+    return np.frombuffer(chunk.buffers()[1], dtype=dtype, count=len(chunk),
+                         offset=chunk.offset * dtype.itemsize)
+
+
+def is_streaming_input(X):
+    """
+    Returns True if X is consumed in chunks by `stream_to_dev_array`, i.e.
+    it is a memory-mapped NumPy array, an iterator of chunks or a chunked
+    reader like `cuml.io.ArrayFileReader`.
+    """
+    return isinstance(X, (np.memmap, Iterator)) or hasattr(X, 'iter_chunks')
+
+
+def stream_to_dev_array(X, order='F', convert_to_dtype=False,
+                        staging_bytes=None):
+    """
+    Assemble a single device array out of a memory-mapped NumPy array or an
+    iterator of chunks, keeping host memory usage bounded.
+
+    Host chunks are copied through two pinned staging buffers of at most
+    `staging_bytes` each, alternating between two streams so that filling
+    one buffer overlaps with the transfer of the other. Device chunks (cuDF,
+    numba or cuda array interface arrays) are copied device to device.
+
+    Parameters
+    ----------
+    X : np.memmap, iterator of NumPy ndarrays, cuDF DataFrames/Series or
+        device arrays, or an object with `shape` and
+        `iter_chunks(max_bytes)` (like `cuml.io.ArrayFileReader`) yielding
+        row blocks. All chunks must agree on dtype and number of columns.
+    order : 'F' or 'C'
+        Memory layout of the returned array.
+    convert_to_dtype : (optional) dtype
+        If set, every chunk is converted with `convert_dtype` before being
+        copied, so no full size host copy is ever made.
+    staging_bytes : (optional) int
+        Size of each pinned staging buffer. Defaults to
+        `STREAMING_STAGING_BYTES`.
+
+    Returns: numba device array of shape (n_rows, n_cols) or (n_rows,)
+    """
+
+    if staging_bytes is None:
+        staging_bytes = STREAMING_STAGING_BYTES
+
+    if isinstance(X, np.ndarray):
+        n_rows = X.shape[0]
+        row_bytes = max(X[0:1].nbytes, X.itemsize)
+        step = max(staging_bytes // row_bytes, 1)
+        chunks = (X[i:i + step] for i in range(0, n_rows, step))
+    elif hasattr(X, 'iter_chunks'):
+        n_rows = X.shape[0]
+        chunks = X.iter_chunks(staging_bytes)
+    else:
+        n_rows = None
+        chunks = X
+
+    # When the number of rows is known upfront the host chunks are written
+    # straight into the output, otherwise every chunk gets its own device
+    # piece and they are stacked once the iterator is exhausted.
+    X_m = None
+    pieces = []
+    copier = None
+    row_shape = None
+    dtype = None
+    offset = 0
+
+    for chunk in chunks:
+        if convert_to_dtype:
+            chunk = convert_dtype(chunk, to_dtype=convert_to_dtype)
+
+        if isinstance(chunk, np.ndarray):
+            if copier is None:
+                copier = _StagedCopier(chunk.shape[1:], chunk.dtype,
+                                       staging_bytes)
+            piece = None
+        else:
+            piece = input_to_dev_array(chunk, order='C').array
+            chunk = piece
+
+        if row_shape is None:
+            row_shape, dtype = chunk.shape[1:], np.dtype(chunk.dtype)
+        elif chunk.shape[1:] != row_shape:
+            raise ValueError("Expected chunks with " + str(row_shape) +
+                             " trailing shape but got " +
+                             str(chunk.shape[1:]) + " instead.")
+        elif np.dtype(chunk.dtype) != dtype:
+            raise TypeError("Expected chunks of dtype " + str(dtype) +
+                            " but got " + str(chunk.dtype) + " instead.")
+
+        n_chunk_rows = chunk.shape[0]
+
+        if n_rows is not None:
+            if X_m is None:
+                X_m = rmm.device_array((n_rows,) + row_shape, dtype=dtype,
+                                       order='C')
+            target = X_m[offset:offset + n_chunk_rows]
+        elif piece is None:
+            piece = rmm.device_array(chunk.shape, dtype=dtype, order='C')
+            target = piece
+        else:
+            target = None
+
+        if isinstance(chunk, np.ndarray):
+            copier.copy(chunk, target)
+        elif target is not None:
+            with transfer_audit.record('device_copy', piece.nbytes,
+                                       source=piece):
+                target.copy_to_device(piece)
+
+        if n_rows is None:
+            pieces.append(piece)
+
+        offset += n_chunk_rows
+
+    if copier is not None:
+        copier.sync()
+
+    if row_shape is None:
+        raise ValueError("Received an empty iterator of chunks.")
+
+    if n_rows is not None and offset != n_rows:
+        raise ValueError("Expected " + str(n_rows) + " rows but the chunks "
+                         "only contained " + str(offset) + " rows.")
+
+    if X_m is None:
+        X_m = rmm.device_array((offset,) + row_shape, dtype=dtype, order='C')
+        with transfer_audit.record('device_copy', X_m.nbytes, source=X,
+                                   detail='stack chunks'):
+            offset = 0
+            for piece in pieces:
+                X_m[offset:offset + piece.shape[0]].copy_to_device(piece)
+                offset += piece.shape[0]
+        del pieces
+
+    if order == 'F' and len(row_shape) == 1 and row_shape[0] > 1:
+        X_m = cuml.utils.numba_utils.gpu_major_converter(
+            X_m, X_m.shape[0], X_m.shape[1], dtype, to_order='F')
+
+    return X_m
+
+
+class _StagedCopier:
+    """
+    Double buffered host to device copies of C ordered row blocks. Rows are
+    packed into one of two pinned buffers and sent asynchronously on the
+    stream paired with that buffer. A buffer is only refilled after its
+    previous transfer has completed.
+    """
+
+    def __init__(self, row_shape, dtype, staging_bytes):
+        row_bytes = max(int(np.prod(row_shape)) * np.dtype(dtype).itemsize,
+                        1)
+        self.slab_rows = max(staging_bytes // row_bytes, 1)
+        self.buffers = [cuda.pinned_array((self.slab_rows,) + row_shape,
+                                          dtype=dtype)
+                        for i in range(2)]
+        self.streams = [cuda.stream() for i in range(2)]
+        self.turn = 0
+
+    def copy(self, host_ary, dev_ary):
+        with transfer_audit.record('host_to_device', dev_ary.nbytes,
+                                   source=host_ary, detail='staged'):
+            self._copy(host_ary, dev_ary)
+
+    def _copy(self, host_ary, dev_ary):
+        for start in range(0, host_ary.shape[0], self.slab_rows):
+            stop = min(start + self.slab_rows, host_ary.shape[0])
+            stream = self.streams[self.turn]
+            staged = self.buffers[self.turn][:stop - start]
+            self.turn = 1 - self.turn
+
+            stream.synchronize()
+            staged[...] = host_ary[start:stop]
+            dev_ary[start:stop].copy_to_device(staged, stream=stream)
+
+    def sync(self):
+        for stream in self.streams:
+            stream.synchronize()
+
+
+def is_sparse_input(X):
+    """
+    Returns True if X is a SciPy sparse matrix or a CuPy sparse matrix
+    (`cupyx.scipy.sparse`).
+    """
+    return cp_sparse.issparse(X) or \
+        (scipy_sparse is not None and scipy_sparse.issparse(X))
+
+
+def input_to_csr_matrix(X, convert_to_dtype=False, check_dtype=False,
+                        check_cols=False, check_rows=False):
+    """
+    Convert sparse input X to a CSR matrix on the device, without ever
+    materializing its dense (n_rows, n_cols) representation.
+    Acceptable input formats:
+    * SciPy CSR matrix - the data, indices and indptr arrays are copied to
+        the device
+    * SciPy COO or CSC matrix (or any other SciPy sparse format) - converted
+        to CSR on the host first, then copied to the device
+    * CuPy CSR matrix (`cupyx.scipy.sparse.csr_matrix`), the device CSR
+        container - returns a reference unless a dtype conversion is needed
+    * CuPy COO or CSC matrix - converted to CSR on the device
+
+    Device memory usage is proportional to the number of non-zero values.
+
+    Returns: namedtuple('csr_matrix', 'matrix n_rows n_cols nnz dtype')
+
+    `matrix` is a `cupyx.scipy.sparse.csr_matrix`.
+    """
+    if scipy_sparse is not None and scipy_sparse.issparse(X):
+        X_h = X.tocsr()
+        data = X_h.data
+        if convert_to_dtype:
+            data = convert_dtype(data, to_dtype=convert_to_dtype)
+        _check_sparse_dtype(data.dtype)
+        _check_sparse_index_range(X_h.nnz, X_h.shape[1])
+
+        indices = X_h.indices.astype(np.int32, copy=False)
+        indptr = X_h.indptr.astype(np.int32, copy=False)
+        with transfer_audit.record('host_to_device',
+                                   data.nbytes + indices.nbytes +
+                                   indptr.nbytes, source=X):
+            X_m = cp_sparse.csr_matrix((cp.asarray(data),
+                                        cp.asarray(indices),
+                                        cp.asarray(indptr)),
+                                       shape=X_h.shape)
+
+    elif cp_sparse.issparse(X):
+        X_m = X.tocsr()
+        if convert_to_dtype and X_m.dtype != convert_to_dtype:
+            data = cp.asarray(convert_dtype(X_m.data,
+                                            to_dtype=convert_to_dtype))
+            X_m = cp_sparse.csr_matrix((data, X_m.indices, X_m.indptr),
+                                       shape=X_m.shape)
+        _check_sparse_dtype(X_m.dtype)
+
+    else:
+        msg = "X matrix format " + str(X.__class__) + " not supported"
+        raise TypeError(msg)
+
+    dtype = np.dtype(X_m.dtype)
+    n_rows, n_cols = X_m.shape
+
+    if check_dtype:
+        if dtype != check_dtype:
+            raise TypeError("Expected " + str(check_dtype) + "input but got "
+                            + str(dtype) + " instead.")
+
+    if check_cols:
+        if n_cols != check_cols:
+            raise ValueError("Expected " + str(check_cols) +
+                             " columns but got " + str(n_cols) +
+                             " columns.")
+
+    if check_rows:
+        if n_rows != check_rows:
+            raise ValueError("Expected " + str(check_rows) +
+                             " rows but got " + str(n_rows) +
+                             " rows.")
+
+    result = namedtuple('csr_matrix', 'matrix n_rows n_cols nnz dtype')
+
+    return result(matrix=X_m, n_rows=n_rows, n_cols=n_cols, nnz=X_m.nnz,
+                  dtype=dtype)
+
+
+def _check_sparse_dtype(dtype):
+    if dtype not in [np.float32, np.float64]:
+        raise TypeError("Sparse input of dtype " + str(dtype) + " is not "
+                        "supported, only float32 and float64 are. Use "
+                        "convert_to_dtype to cast it.")
+
+
+def _check_sparse_index_range(nnz, n_cols):
+    # The device CSR container stores its indices and row pointers as int32
+    int32_max = np.iinfo(np.int32).max
+    if nnz > int32_max or n_cols > int32_max:
+        raise ValueError("Sparse input with more than " + str(int32_max) +
+                         " non-zero values or columns is not supported.")
+
+
+def convert_dtype(X, to_dtype=np.float32, out=None, n_threads=None):
     """
     Convert X to be of dtype `dtype`
 
+    The cast and the overflow check are done in a single pass: host arrays
+    are processed in cache sized chunks, in parallel, and device arrays and
+    DataFrame columns with a single fused kernel. A TypeError is raised if
+    the conversion turned any finite value into +/-inf or NaN.
+
     Supported float dtypes for overflow checking.
     Todo: support other dtypes if needed.
+
+    Parameters
+    ----------
+    X : NumPy ndarray, cuda array interface compliant array or cuDF DataFrame
+    to_dtype : NumPy dtype
+        Destination dtype.
+    out : (optional) array
+        Preallocated destination of dtype `to_dtype` and the same shape as
+        X. Must be a host array for NumPy inputs and a device array
+        otherwise. For DataFrames it must be a column major device array of
+        shape (n_rows, n_cols), which is then returned instead of a
+        DataFrame.
+    n_threads : (optional) int
+        Number of threads used to convert host arrays. Defaults to the
+        number of CPUs.
     """
 
-    # Using cuDF for converting numba and device array interface inputs
+    to_dtype = np.dtype(to_dtype)
+
+    if transfer_audit.is_enabled():
+        dtype = np.dtype(get_dtype(X))
+        if dtype != to_dtype or out is not None:
+            with transfer_audit.record('dtype_conversion',
+                                       _n_elements(X) * to_dtype.itemsize,
+                                       source=X,
+                                       detail=str(dtype) + '->' +
+                                       str(to_dtype)):
+                return _convert_dtype(X, to_dtype, out, n_threads)
+
+    return _convert_dtype(X, to_dtype, out, n_threads)
 
+
+def _n_elements(X):
+    if isinstance(X, cudf.DataFrame):
+        return len(X) * len(X.columns)
+    elif isinstance(X, cudf.Series):
+        return len(X)
+    return int(np.prod(X.shape))
+
+
+def _convert_dtype(X, to_dtype, out, n_threads):
     if isinstance(X, np.ndarray):
         dtype = X.dtype
-        if dtype != to_dtype:
-            X_m = X.astype(to_dtype)
-            if len(X[X == np.inf]) > 0:
-                raise TypeError("Data type conversion resulted"
-                                "in data loss.")
-            return X_m
+        if dtype != to_dtype or out is not None:
+            return _convert_host_dtype(X, to_dtype, out, n_threads)
 
     elif cuda.is_cuda_array(X):
-        X_m = cp.asarray(X)
-        X_m = X_m.astype(to_dtype)
+        if out is not None:
+            out = cp.asarray(out)
+        X_m = _convert_device_dtype(cp.asarray(X), to_dtype, out)
         return cuda.as_cuda_array(X_m)
 
     elif isinstance(X, cudf.DataFrame):
         dtype = np.dtype(X[X.columns[0]]._column.dtype)
-        if dtype != to_dtype:
-            new_cols = [(col, X._cols[col].astype(to_dtype))
-                        for col in X._cols]
-            overflowed = sum([len(colval[colval >= np.inf])
-                              for colname, colval in new_cols])
+        if dtype != to_dtype or out is not None:
+            return _convert_dataframe_dtype(X, to_dtype, out)
+
+    else:
+        raise TypeError("Received unsupported input type %s" % type(X))
+
+    return X
+
+
+# Number of bytes of the source array converted at a time by each host
+# thread in `convert_dtype`
+CONVERT_CHUNK_BYTES = 1 << 22
+
+# Casts x into y and counts, in n_overflow, the finite values of x that
+# became +/-inf or NaN in y
+_cast_with_overflow_check = cp.ElementwiseKernel(
+    'S x',
+    'D y, raw int32 n_overflow',
+    """
+    y = (D) x;
+    if (!isfinite((double) y) && isfinite((double) x)) {
+        atomicAdd(&n_overflow[0], 1);
+    }
+    """,
+    'cuml_cast_with_overflow_check')
+
+
+def _raise_conversion_overflow(n_overflow):
+    if n_overflow > 0:
+        raise TypeError("Data type conversion resulted in data loss, " +
+                        str(n_overflow) + " values overflowed.")
 
-            if overflowed > 0:
-                raise TypeError("Data type conversion resulted"
-                                "in data loss.")
 
-            return cudf.DataFrame(new_cols)
+def _check_conversion_output(X, to_dtype, out):
+    if out.shape != X.shape:
+        raise ValueError("Expected output of shape " + str(X.shape) +
+                         " but got " + str(out.shape) + " instead.")
+    if np.dtype(out.dtype) != to_dtype:
+        raise TypeError("Expected output of dtype " + str(to_dtype) +
+                        " but got " + str(out.dtype) + " instead.")
 
+
+def _convert_host_chunk(src, dst):
+    with np.errstate(over='ignore', invalid='ignore'):
+        np.copyto(dst, src, casting='unsafe')
+
+    if dst.dtype.kind != 'f':
+        return 0
+
+    finite = np.isfinite(dst)
+    if finite.all():
+        return 0
+    return int(np.count_nonzero(np.isfinite(src[~finite])))
+
+
+def _convert_host_dtype(X, to_dtype, out, n_threads):
+    if out is None:
+        out = np.empty_like(X, dtype=to_dtype)
+    else:
+        _check_conversion_output(X, to_dtype, out)
+
+    # Both arrays are split into matching chunks: flat ones when they share
+    # the same contiguous layout, row blocks otherwise.
+    same_c = X.flags['C_CONTIGUOUS'] and out.flags['C_CONTIGUOUS']
+    same_f = X.flags['F_CONTIGUOUS'] and out.flags['F_CONTIGUOUS']
+    if X.ndim > 1 and (same_c or same_f):
+        src, dst = X.ravel(order='K'), out.ravel(order='K')
     else:
-        raise TypeError("Received unsupported input type " % type(X))
+        src, dst = X, out
 
-    return X
+    if src.ndim == 0 or src.shape[0] == 0:
+        _raise_conversion_overflow(_convert_host_chunk(src, dst))
+        return out
+
+    row_bytes = max(src[0:1].nbytes, 1)
+    step = max(CONVERT_CHUNK_BYTES // row_bytes, 1)
+    bounds = [(i, i + step) for i in range(0, src.shape[0], step)]
+
+    if n_threads is None:
+        n_threads = os.cpu_count() or 1
+    n_threads = min(n_threads, len(bounds))
+
+    def convert(bound):
+        return _convert_host_chunk(src[bound[0]:bound[1]],
+                                   dst[bound[0]:bound[1]])
+
+    if n_threads > 1:
+        with ThreadPoolExecutor(max_workers=n_threads) as pool:
+            n_overflow = sum(pool.map(convert, bounds))
+    else:
+        n_overflow = sum(map(convert, bounds))
+
+    _raise_conversion_overflow(n_overflow)
+    return out
+
+
+def _convert_device_dtype(X, to_dtype, out):
+    if out is None:
+        order = 'F' if X.flags.f_contiguous and not X.flags.c_contiguous \
+            else 'C'
+        out = cp.empty(X.shape, dtype=to_dtype, order=order)
+    else:
+        _check_conversion_output(X, to_dtype, out)
+
+    n_overflow = cp.zeros(1, dtype=np.int32)
+    _cast_with_overflow_check(X, out, n_overflow)
+    _raise_conversion_overflow(int(n_overflow[0]))
+    return out
+
+
+def _convert_dataframe_dtype(X, to_dtype, out):
+    n_rows, n_cols = len(X), len(X.columns)
+
+    if out is not None:
+        if out.shape != (n_rows, n_cols):
+            raise ValueError("Expected output of shape " +
+                             str((n_rows, n_cols)) + " but got " +
+                             str(out.shape) + " instead.")
+        if not out.is_f_contiguous():
+            raise ValueError("Expected column major output.")
+
+    new_cols = []
+    for idx, col in enumerate(X.columns):
+        colval = X[col]
+
+        if colval.null_count > 0:
+            if out is not None:
+                raise ValueError("Error: cuDF DataFrame has missing/null "
+                                 "values")
+            new_col = colval.astype(to_dtype)
+            overflowed = (new_col == np.inf) | (new_col == -np.inf)
+            _raise_conversion_overflow(int(overflowed.sum()))
+            new_cols.append((col, new_col))
+            continue
+
+        col_out = None if out is None else cp.asarray(out[:, idx])
+        new_col = _convert_device_dtype(cp.asarray(colval._column._data.mem),
+                                        to_dtype, col_out)
+
+        if out is None:
+            new_cols.append((col, cudf.Series(cuda.as_cuda_array(new_col))))
+
+    if out is not None:
+        return out
+
+    return cudf.DataFrame(new_cols)
 
 
 def check_numba_order(dev_ary, order):
@@ -15,11 +15,16 @@
 
 import numba
 import math
+import numpy as np
 
 from numba import cuda
 from numba.cuda.cudadrv.driver import driver
 from librmm_cffi import librmm as rmm
 
+import cuml.utils.transfer_audit as transfer_audit
+
+from cuml.utils.device_pool import get_default_pool
+
 
 def row_matrix(df):
     """Compute the C (row major) version gpu matrix of df
@@ -35,7 +40,10 @@ def row_matrix(df):
     nrows = len(df)
     dtype = cols[0].dtype
 
-    col_major = df.as_gpu_matrix(order='F')
+    with transfer_audit.record('device_copy',
+                               nrows * ncols * np.dtype(dtype).itemsize,
+                               source=df, detail='DataFrame->F'):
+        col_major = df.as_gpu_matrix(order='F')
 
     row_major = gpu_major_converter(col_major, nrows, ncols, dtype,
                                     to_order='C')
@@ -43,27 +51,137 @@ def row_matrix(df):
     return row_major
 
 
-def gpu_major_converter(original, nrows, ncols, dtype, to_order='C'):
-    row_major = rmm.device_array((nrows, ncols), dtype=dtype, order=to_order)
+def gpu_major_converter(original, nrows, ncols, dtype, to_order='C',
+                        out=None):
+    """
+    Copy `original` into a (nrows, ncols) array with memory layout
+    `to_order`.
+
+    The transpose kernels are compiled once per (dtype, tile shape) and kept
+    in a module level cache, so only the first conversion of a given dtype in
+    a process pays for the JIT compilation.
+
+    Parameters
+    ----------
+    original : NumPy ndarray or numba device array
+        Input matrix of shape (nrows, ncols). Host arrays are converted with
+        NumPy and never touch the device.
+    nrows, ncols : int
+        Shape of the matrix.
+    dtype : NumPy dtype
+        Element type of `original`.
+    to_order : 'C' or 'F'
+        Memory layout of the output.
+    out : (optional) array of shape (nrows, ncols) in `to_order` layout
+        Preallocated output buffer, of the same kind (host or device) as
+        `original`. A new one is allocated when None.
+    """
+
+    with transfer_audit.record('order_conversion',
+                               nrows * ncols * np.dtype(dtype).itemsize,
+                               source=original, detail='->' + to_order):
+        return _convert_major(original, nrows, ncols, dtype, to_order, out)
+
+
+def _convert_major(original, nrows, ncols, dtype, to_order, out):
+    if isinstance(original, np.ndarray):
+        if out is None:
+            return np.array(original, order=to_order, copy=True)
+        _check_converter_output(out, nrows, ncols, dtype, to_order)
+        np.copyto(out, original)
+        return out
 
-    tpb = driver.get_device().MAX_THREADS_PER_BLOCK
+    if out is None:
+        out = rmm.device_array((nrows, ncols), dtype=dtype, order=to_order)
+    else:
+        _check_converter_output(out, nrows, ncols, dtype, to_order)
 
-    tile_width = int(math.pow(2, math.log(tpb, 2) / 2))
-    tile_height = int(tpb / tile_width)
+    tpb, tile_shape, threads = _transpose_geometry()
 
-    tile_shape = (tile_height, tile_width + 1)
+    general_kernel, shared_kernel = _transpose_kernels(dtype, tile_shape)
 
     # blocks and threads for the shared memory/tiled algorithm
     # see http://devblogs.nvidia.com/parallelforall/efficient-matrix-transpose-cuda-cc/ # noqa
-    blocks = int((row_major.shape[1]) / tile_height + 1), \
-        int((row_major.shape[0]) / tile_width + 1)
-
-    threads = tile_height, tile_width
+    tile_height, tile_width = threads
+    blocks = int((out.shape[1]) / tile_height + 1), \
+        int((out.shape[0]) / tile_width + 1)
 
     # blocks per gpu for the general kernel
     bpg = (nrows + tpb - 1) // tpb
 
-    if dtype == 'float32':
+    # check if we cannot call the shared memory kernel
+    # block limits: 2**31-1 for x, 65535 for y dim of blocks
+    if blocks[0] > 2147483647 or blocks[1] > 65535:
+        general_kernel[bpg, tpb](original, out)
+
+    else:
+        shared_kernel[blocks, threads](original, out)
+
+    return out
+
+
+def _check_converter_output(out, nrows, ncols, dtype, to_order):
+    if out.shape != (nrows, ncols):
+        raise ValueError("Expected output buffer of shape " +
+                         str((nrows, ncols)) + " but got " +
+                         str(out.shape) + " instead.")
+    if np.dtype(out.dtype) != np.dtype(dtype):
+        raise TypeError("Expected output buffer of dtype " + str(dtype) +
+                        " but got " + str(out.dtype) + " instead.")
+    if to_order == 'C':
+        contiguous = out.flags['C_CONTIGUOUS']
+    else:
+        contiguous = out.flags['F_CONTIGUOUS']
+    if not contiguous:
+        raise ValueError("Output buffer is not in " + to_order + " order.")
+
+
+_transpose_geometry_cache = {}
+_transpose_kernel_cache = {}
+
+
+def _transpose_geometry():
+    """
+    Returns threads per block, the shared memory tile shape and the thread
+    block shape of the tiled transpose for the current device.
+    """
+    device_id = driver.get_device().id
+    geometry = _transpose_geometry_cache.get(device_id)
+
+    if geometry is None:
+        tpb = driver.get_device().MAX_THREADS_PER_BLOCK
+
+        tile_width = int(math.pow(2, math.log(tpb, 2) / 2))
+        tile_height = int(tpb / tile_width)
+
+        tile_shape = (tile_height, tile_width + 1)
+        threads = tile_height, tile_width
+
+        geometry = (tpb, tile_shape, threads)
+        _transpose_geometry_cache[device_id] = geometry
+
+    return geometry
+
+
+def _transpose_kernels(dtype, tile_shape):
+    """
+    Returns the (general, shared) layout conversion kernels for `dtype` and
+    `tile_shape`, creating them on first use. The numba dispatchers are
+    reused, so each kernel is only compiled once per signature and process.
+    """
+    key = (np.dtype(dtype), tile_shape)
+    kernels = _transpose_kernel_cache.get(key)
+
+    if kernels is None:
+        kernels = _make_transpose_kernels(np.dtype(dtype), tile_shape)
+        _transpose_kernel_cache[key] = kernels
+
+    return kernels
+
+
+def _make_transpose_kernels(dtype, tile_shape):
+
+    if dtype == np.float32:
         dev_dtype = numba.float32
 
     else:
@@ -72,7 +190,7 @@ def gpu_major_converter(original, nrows, ncols, dtype, to_order='C'):
     @cuda.jit
     def general_kernel(input, output):
         tid = cuda.blockIdx.x * cuda.blockDim.x + cuda.threadIdx.x
-        if tid >= nrows:
+        if tid >= input.shape[0]:
             return
         _col_offset = 0
         while _col_offset < input.shape[1]:
@@ -98,44 +216,13 @@ def gpu_major_converter(original, nrows, ncols, dtype, to_order='C'):
         if y < output.shape[0] and x < output.shape[1]:
             output[y, x] = tile[tx, ty]
 
-    # check if we cannot call the shared memory kernel
-    # block limits: 2**31-1 for x, 65535 for y dim of blocks
-    if blocks[0] > 2147483647 or blocks[1] > 65535:
-        general_kernel[bpg, tpb](original, row_major)
-
-    else:
-        shared_kernel[blocks, threads](original, row_major)
-
-    return row_major
-
-
-@cuda.jit
-def gpu_zeros_1d(out):
-    i = cuda.grid(1)
-    if i < out.shape[0]:
-        out[i] = 0
-
-
-@cuda.jit
-def gpu_zeros_2d(out):
-    i, j = cuda.grid(2)
-    if i < out.shape[0] and j < out.shape[1]:
-        out[i][j] = 0
+    return general_kernel, shared_kernel
 
 
 def zeros(size, dtype, order='F'):
     """
-    Return device array of zeros generated on device.
+    Return device array of zeros from the default device buffer pool (see
+    `cuml.utils.device_pool`). Its memory returns to the pool once the array
+    is no longer referenced.
     """
-    out = rmm.device_array(size, dtype=dtype, order=order)
-    if isinstance(size, tuple):
-        tpb = driver.get_device().MAX_THREADS_PER_BLOCK
-        nrows = size[0]
-        bpg = (nrows + tpb - 1) // tpb
-
-        gpu_zeros_2d[bpg, tpb](out)
-
-    elif size > 0:
-        gpu_zeros_1d.forall(size)(out)
-
-    return out
+    return get_default_pool().zeros(size, dtype, order=order)
@@ -0,0 +1,161 @@
+#
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import cudf
+import cupy as cp
+import cupyx.scipy.sparse as cp_sparse
+import numpy as np
+
+from contextlib import contextmanager
+from numba import cuda
+
+import cuml.utils.numba_utils
+import cuml.utils.transfer_audit as transfer_audit
+
+
+# Types that the results of estimators can be returned as. 'input' mirrors
+# the type of the input of the method that produces the result.
+OUTPUT_TYPES = ['input', 'cudf', 'numpy', 'cupy', 'numba']
+
+_global_output_type = None
+
+
+def set_global_output_type(output_type):
+    """
+    Sets the type of the results returned by all estimators that do not have
+    their own `output_type` set.
+
+    Parameters
+    ----------
+    output_type : {'input', 'cudf', 'numpy', 'cupy', 'numba'} or None
+        'input' returns results of the same kind as the input of the method,
+        'numba' and 'cupy' return the device buffer of the result without any
+        copy. None restores the default return type of each method.
+    """
+    global _global_output_type
+    _global_output_type = _check_output_type(output_type)
+
+
+def get_global_output_type():
+    return _global_output_type
+
+
+@contextmanager
+def using_output_type(output_type):
+    """
+    Sets the global output type for a block of code.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import cuml
+
+        with cuml.using_output_type('cupy'):
+            labels = kmeans.predict(X)  # cupy array, no copy
+    """
+    previous = get_global_output_type()
+    set_global_output_type(output_type)
+    try:
+        yield
+    finally:
+        set_global_output_type(previous)
+
+
+def _check_output_type(output_type):
+    if output_type is not None and output_type not in OUTPUT_TYPES:
+        raise ValueError("Output type " + str(output_type) + " not "
+                         "supported, expected one of " + str(OUTPUT_TYPES) +
+                         " or None.")
+    return output_type
+
+
+def input_type_of(X):
+    """
+    Returns the output type that mirrors the type of X. Host sources that
+    are not NumPy arrays (Arrow tables, SciPy sparse matrices, iterators,
+    file readers) map to 'numpy', CuPy sparse matrices map to 'cupy'.
+    """
+    if isinstance(X, (cudf.DataFrame, cudf.Series)):
+        return 'cudf'
+    elif isinstance(X, cp.ndarray) or cp_sparse.issparse(X):
+        return 'cupy'
+    elif cuda.devicearray.is_cuda_ndarray(X) or cuda.is_cuda_array(X):
+        return 'numba'
+    else:
+        return 'numpy'
+
+
+def resolve_output_type(output_type, X, default='input'):
+    """
+    Returns the concrete output type of a result computed from input X, with
+    precedence to the estimator's `output_type`, then the global output type
+    and last the method's own `default`.
+    """
+    if output_type is None:
+        output_type = _global_output_type
+    if output_type is None:
+        output_type = default
+    if output_type == 'input':
+        output_type = input_type_of(X)
+    return output_type
+
+
+def to_output(result, output_type):
+    """
+    Converts a result to `output_type` with a single bulk conversion.
+
+    Parameters
+    ----------
+    result : numba device array, cuDF DataFrame/Series or NumPy ndarray
+        1D or 2D result as computed by the estimator.
+    output_type : {'cudf', 'numpy', 'cupy', 'numba'}
+        Concrete output type, see `resolve_output_type`.
+    """
+    if isinstance(result, (cudf.DataFrame, cudf.Series)):
+        if output_type == 'cudf':
+            return result
+        if isinstance(result, cudf.Series):
+            result = result.to_gpu_array()
+        else:
+            result = result.as_gpu_matrix(order='F')
+
+    if isinstance(result, np.ndarray):
+        if output_type == 'numpy':
+            return result
+        with transfer_audit.record('host_to_device', result.nbytes,
+                                   source=result, detail='output'):
+            result = cuda.to_device(result)
+
+    if output_type == 'numba':
+        return result
+    elif output_type == 'cupy':
+        return cp.asarray(result)
+    elif output_type == 'numpy':
+        return result.copy_to_host()
+    elif output_type == 'cudf':
+        if len(result.shape) == 1:
+            return cudf.Series(result)
+        n_rows, n_cols = result.shape
+        if n_cols > 1 and not result.is_f_contiguous():
+            result = cuml.utils.numba_utils.gpu_major_converter(
+                result, n_rows, n_cols, result.dtype, to_order='F')
+        return cudf.DataFrame.from_gpu_matrix(
+            result, columns=[str(i) for i in range(n_cols)])
+    else:
+        raise ValueError("Output type " + str(output_type) + " not "
+                         "supported.")
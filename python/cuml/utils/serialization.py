@@ -0,0 +1,252 @@
+#
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import mmap
+import struct
+
+import cudf
+import cupy as cp
+import numpy as np
+
+from numba import cuda
+
+import cuml.utils.transfer_audit as transfer_audit
+
+try:
+    import pickle5 as pickle
+except ImportError:
+    import pickle
+
+
+# Protocol used by `dumps` and `dump`. From protocol 5 on, the arrays of the
+# estimators are exported as out-of-band buffers.
+PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+# Layout of the files written by `dump`: a header, a table with the offset
+# and size of each buffer, the pickle stream and then the buffers, each one
+# aligned so that it can be mapped and copied to the device as is.
+_MAGIC = b'CUMLPKL5'
+_HEADER = struct.Struct('<8sQQ')
+_BUFFER_ENTRY = struct.Struct('<QQ')
+_ALIGNMENT = 64
+
+
+class DeviceArrayState(object):
+    """
+    Picklable stand-in for a device array held by an estimator.
+
+    The array is copied once to host memory when it is pickled. With pickle
+    protocol 5 that host copy is exported as an out-of-band
+    `pickle.PickleBuffer`, so it is neither copied into the pickle stream nor
+    copied again on unpickling: the buffer handed back to `pickle.loads` is
+    transferred straight to a new device array of the same kind.
+    """
+
+    def __init__(self, array):
+        self.array = array
+
+    def __reduce_ex__(self, protocol):
+        kind, host, meta = _to_host(self.array)
+        order = 'F' if host.ndim > 1 and host.flags['F_CONTIGUOUS'] and \
+            not host.flags['C_CONTIGUOUS'] else 'C'
+        if protocol >= 5:
+            data = pickle.PickleBuffer(host)
+        else:
+            data = host
+        return (_rebuild_device_array,
+                (kind, host.dtype.str, host.shape, order, meta, data))
+
+
+def _is_numeric(dtype):
+    return np.dtype(dtype).kind in 'biuf'
+
+
+def _device_kind(X):
+    """
+    Returns the kind of device array X is, or None if X is not a device array
+    that `DeviceArrayState` can serialize.
+    """
+    if isinstance(X, cudf.Series):
+        if _is_numeric(X.dtype) and not X.has_null_mask:
+            return 'cudf_series'
+    elif isinstance(X, cudf.DataFrame):
+        dtypes = set(X.dtypes)
+        if len(X.columns) > 0 and len(dtypes) == 1 and \
+                _is_numeric(dtypes.pop()):
+            return 'cudf_dataframe'
+    elif isinstance(X, cp.ndarray):
+        return 'cupy'
+    elif cuda.devicearray.is_cuda_ndarray(X):
+        return 'numba'
+    return None
+
+
+def _to_host(X):
+    kind = _device_kind(X)
+    meta = None
+    if kind == 'cudf_series':
+        meta = X.name
+        X = X.to_gpu_array()
+    elif kind == 'cudf_dataframe':
+        meta = list(X.columns)
+        X = X.as_gpu_matrix(order='F')
+
+    with transfer_audit.record('device_to_host', X.nbytes, source=X,
+                               detail='pickle'):
+        if kind == 'cupy':
+            host = cp.asnumpy(X)
+        else:
+            host = X.copy_to_host()
+
+    if not (host.flags['C_CONTIGUOUS'] or host.flags['F_CONTIGUOUS']):
+        host = np.ascontiguousarray(host)
+    return kind, host, meta
+
+
+def _rebuild_device_array(kind, dtype, shape, order, meta, data):
+    dtype = np.dtype(dtype)
+    if int(np.prod(shape)) == 0:
+        host = np.empty(shape, dtype=dtype, order=order)
+    else:
+        # A view of the buffer, which may be memory-mapped from a file
+        host = np.frombuffer(data, dtype=dtype).reshape(shape, order=order)
+
+    with transfer_audit.record('host_to_device', host.nbytes, source=host,
+                               detail='unpickle'):
+        if kind == 'cupy':
+            return cp.asarray(host)
+        X = cuda.to_device(host)
+
+    if kind == 'cudf_series':
+        return cudf.Series(X, name=meta)
+    elif kind == 'cudf_dataframe':
+        return cudf.DataFrame.from_gpu_matrix(X, columns=meta)
+    return X
+
+
+def serialize_state(state):
+    """
+    Returns a copy of the `__dict__` of an estimator where every device array
+    is replaced by a `DeviceArrayState`, which unpickles back into a device
+    array of the same kind.
+    """
+    return {key: DeviceArrayState(value)
+            if _device_kind(value) is not None else value
+            for key, value in state.items()}
+
+
+def dumps(obj):
+    """
+    Pickles obj with `PICKLE_PROTOCOL`.
+
+    Returns
+    -------
+    data : bytes
+        The pickle stream, which holds everything but the arrays.
+    buffers : list of pickle.PickleBuffer
+        Out-of-band buffers of the arrays, to be passed in the same order to
+        `loads`. They can be sent to another process or written anywhere
+        without copying them. Empty below protocol 5, where the arrays are
+        part of `data`.
+    """
+    buffers = []
+    if PICKLE_PROTOCOL >= 5:
+        data = pickle.dumps(obj, protocol=PICKLE_PROTOCOL,
+                            buffer_callback=buffers.append)
+    else:
+        data = pickle.dumps(obj, protocol=PICKLE_PROTOCOL)
+    return data, buffers
+
+
+def loads(data, buffers=()):
+    """
+    Unpickles an object serialized by `dumps`. `buffers` can be any objects
+    exposing the memory of the buffers returned by `dumps`, like bytes,
+    memoryviews or memory-mapped regions.
+    """
+    if PICKLE_PROTOCOL >= 5:
+        return pickle.loads(data, buffers=buffers)
+    return pickle.loads(data)
+
+
+def _aligned(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def dump(obj, path):
+    """
+    Writes obj to the file at `path`, with the out-of-band buffers of its
+    arrays stored aligned after the pickle stream so that `load` can map
+    them instead of reading them.
+    """
+    data, buffers = dumps(obj)
+    raws = [buffer.raw() for buffer in buffers]
+
+    offset = _aligned(_HEADER.size + _BUFFER_ENTRY.size * len(raws) +
+                      len(data))
+    entries = []
+    for raw in raws:
+        entries.append((offset, raw.nbytes))
+        offset = _aligned(offset + raw.nbytes)
+
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, len(data), len(raws)))
+        for entry in entries:
+            f.write(_BUFFER_ENTRY.pack(*entry))
+        f.write(data)
+        for (offset, _), raw in zip(entries, raws):
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(raw)
+
+
+def load(path, mmap_mode=True):
+    """
+    Reads an object written by `dump`.
+
+    Parameters
+    ----------
+    path : str
+        File written by `dump`.
+    mmap_mode : bool (default = True)
+        Whether to memory-map the file rather than reading it. The arrays of
+        the estimators are then copied to the device directly from the
+        mapping, and host arrays are read-only views of it.
+    """
+    with open(path, 'rb') as f:
+        if mmap_mode:
+            contents = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            contents = bytearray(f.read())
+
+    view = memoryview(contents)
+    if len(view) < _HEADER.size:
+        raise ValueError("Expected a file written by "
+                         "cuml.utils.serialization.dump but got " +
+                         str(path) + ".")
+    magic, data_size, n_buffers = _HEADER.unpack_from(view)
+    if magic != _MAGIC:
+        raise ValueError("Expected a file written by "
+                         "cuml.utils.serialization.dump but got " +
+                         str(path) + ".")
+
+    buffers = []
+    for i in range(n_buffers):
+        offset, size = _BUFFER_ENTRY.unpack_from(
+            view, _HEADER.size + i * _BUFFER_ENTRY.size)
+        buffers.append(view[offset:offset + size])
+
+    start = _HEADER.size + n_buffers * _BUFFER_ENTRY.size
+    return loads(view[start:start + data_size], buffers)
@@ -0,0 +1,193 @@
+#
+# Copyright (c) 2019, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+import time
+
+from collections import namedtuple
+from contextlib import contextmanager
+from numba import cuda
+
+
+TransferEvent = namedtuple('TransferEvent', ['kind', 'nbytes', 'elapsed',
+                                             'estimator', 'method',
+                                             'source', 'detail'])
+TransferEvent.__doc__ = """
+A data movement recorded by `audit_transfers`.
+
+kind : 'host_to_device', 'device_to_host', 'device_copy',
+    'dtype_conversion' or 'order_conversion'
+nbytes : number of bytes written by the operation
+elapsed : wall time in seconds, including device synchronization
+estimator, method : class name and method of the estimator call that
+    triggered the operation, or None outside of estimator calls
+source : type name of the input object
+detail : short description, like 'float64->float32' or 'F->C'
+"""
+
+_active_audits = []
+_audits_lock = threading.Lock()
+_call_stack = threading.local()
+
+
+class TransferAudit(object):
+    """
+    Records every host to device copy, device copy, dtype conversion and
+    memory order conversion done by cuML's input handling, and the device
+    to host copies of pickling, while it is active. Recording also
+    synchronizes the device after each operation so that the timings are
+    accurate, so auditing should only be enabled for diagnostics.
+
+    Audits can be nested and are shared by all threads: an active audit
+    receives the events of every thread.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import cuml
+        from cuml.utils import audit_transfers
+
+        with audit_transfers() as audit:
+            cuml.KMeans(n_clusters=8).fit(X_df)
+            cuml.UMAP().fit_transform(X_np)
+
+        print(audit.summary())
+        audit.by_estimator()['UMAP']['dtype_conversion']['nbytes']
+    """
+
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        with _audits_lock:
+            _active_audits.append(self)
+        return self
+
+    def stop(self):
+        with _audits_lock:
+            if self in _active_audits:
+                _active_audits.remove(self)
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _add(self, event):
+        with self._lock:
+            self.events.append(event)
+
+    @property
+    def total_bytes(self):
+        return sum(event.nbytes for event in self.events)
+
+    @property
+    def total_time(self):
+        return sum(event.elapsed for event in self.events)
+
+    def by_estimator(self):
+        """
+        Aggregates the events per estimator and kind.
+
+        Returns: dict of estimator name (or None for calls made outside of
+        estimators) to dict of kind to {'count', 'nbytes', 'elapsed'}
+        """
+        report = {}
+        for event in list(self.events):
+            per_kind = report.setdefault(event.estimator, {})
+            stats = per_kind.setdefault(event.kind, {'count': 0,
+                                                     'nbytes': 0,
+                                                     'elapsed': 0.0})
+            stats['count'] += 1
+            stats['nbytes'] += event.nbytes
+            stats['elapsed'] += event.elapsed
+        return report
+
+    def summary(self):
+        """
+        Returns a human readable table of `by_estimator`.
+        """
+        header = ('estimator', 'kind', 'count', 'bytes', 'time (ms)')
+        lines = ["%-24s %-18s %8s %14s %12s" % header]
+        report = self.by_estimator()
+        for estimator in sorted(report, key=str):
+            for kind, stats in sorted(report[estimator].items()):
+                lines.append("%-24s %-18s %8d %14d %12.3f" %
+                             (estimator or '-', kind, stats['count'],
+                              stats['nbytes'], stats['elapsed'] * 1000))
+        return '\n'.join(lines)
+
+
+def audit_transfers():
+    """
+    Returns a new `TransferAudit`, to be used as a context manager or
+    started and stopped explicitly.
+    """
+    return TransferAudit()
+
+
+def is_enabled():
+    return len(_active_audits) > 0
+
+
+@contextmanager
+def estimator_call(estimator, method):
+    """
+    Attributes the events recorded in this block to `method` of `estimator`.
+    Entered by the public methods of every `cuml.Base` subclass.
+    """
+    stack = getattr(_call_stack, 'calls', None)
+    if stack is None:
+        stack = _call_stack.calls = []
+    stack.append((type(estimator).__name__, method))
+    try:
+        yield
+    finally:
+        stack.pop()
+
+
+@contextmanager
+def record(kind, nbytes, source=None, detail=None):
+    """
+    Times the block and records it as an event of `kind` in the active
+    audits. Does nothing when no audit is active.
+    """
+    if not _active_audits:
+        yield
+        return
+
+    start = time.perf_counter()
+    yield
+    if cuda.is_available():
+        cuda.synchronize()
+    elapsed = time.perf_counter() - start
+
+    stack = getattr(_call_stack, 'calls', None)
+    estimator, method = stack[-1] if stack else (None, None)
+    source_name = type(source).__name__ if source is not None else None
+    event = TransferEvent(kind=kind, nbytes=int(nbytes), elapsed=elapsed,
+                          estimator=estimator, method=method,
+                          source=source_name, detail=detail)
+
+    with _audits_lock:
+        audits = list(_active_audits)
+    for audit in audits:
+        audit._add(event)